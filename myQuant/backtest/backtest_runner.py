@@ -27,8 +27,9 @@ import os
 import inspect
 import json
 from datetime import datetime, time
+from time import perf_counter
 from types import MappingProxyType
-from typing import Tuple, Any, Dict
+from typing import Tuple, Any, Dict, Callable, Optional
 import logging
 import importlib
 import inspect
@@ -104,13 +105,28 @@ class BacktestRunner:
     Backtesting engine for testing strategies against historical data.
     """
     
-    def __init__(self, config: MappingProxyType, data_path: str = ""):
+    def __init__(self, config: MappingProxyType, data_path: str = "",
+                 progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 cancel_event=None):
+        """
+        Args:
+            config: Frozen config from the GUI workflow
+            data_path: Tick/bar file to backtest
+            progress_callback: Called from the backtest thread with a progress dict
+                (phase, rows_processed, total_rows, ticks_per_sec, signals, trades, ...),
+                at most once per backtest.progress_interval_s during the loop
+            cancel_event: threading.Event; when set the loop stops at the next check,
+                open positions are flattened and run() returns the partial results
+        """
         # Enforce frozen MappingProxyType per workflow
         if not isinstance(config, MappingProxyType):
             raise ValueError("BacktestRunner requires a frozen MappingProxyType config produced by the GUI workflow.")
 
         self.config = config
         self.data_path = data_path
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event
+        self.cancelled = False  # True when cancel_event stopped the run early (results are partial)
 
         # Require explicit logging configuration from the frozen config.
         if "logging" not in self.config:
@@ -130,6 +146,7 @@ class BacktestRunner:
         # Create strict config accessor (will raise KeyError on missing keys)
         from utils.config_helper import ConfigAccessor
         self.config_accessor = ConfigAccessor(self.config)
+        self.export_future = None  # concurrent.futures.Future of the Excel filename when backtest.export_background
         
         # Use performance logger for initialization messages
         self.perf_logger.session_start(f"BacktestRunner initialized")
@@ -137,6 +154,26 @@ class BacktestRunner:
     # Example usage points: in the hot loops, call self.smart_logger.log_progress_smart(...)
     # or self.smart_logger.log_signal_event(...) only if self.smart_logger is not None.
 
+    def _report_progress(self, phase: str, rows: int = 0, total: int = 0, signals: int = 0,
+                         trades: int = 0, started: Optional[float] = None):
+        """Send one progress snapshot to progress_callback (no-op without one)."""
+        if self.progress_callback is None:
+            return
+        elapsed = perf_counter() - started if started is not None else 0.0
+        stats = self.position_manager.stats if getattr(self, 'position_manager', None) else None
+        self.progress_callback({
+            'phase': phase,
+            'rows_processed': rows,
+            'total_rows': total,
+            'ticks_per_sec': rows / elapsed if elapsed > 0 else 0.0,
+            'signals': signals,
+            'trades': trades,
+            'closed_trades': stats.total_trades if stats else 0,
+            'net_pnl': stats.total_pnl if stats else 0.0,
+            'elapsed_s': elapsed,
+            'cancelled': self.cancelled,
+        })
+
     def _prepare_data(self):
         """Load and prepare data for backtesting"""
         # Load data (let exceptions propagate - do not log exceptions here)
@@ -162,8 +199,10 @@ class BacktestRunner:
         """
         try:
             self.perf_logger.session_start("Starting backtest run")
+            self.cancelled = False
             
             # Prepare data
+            self._report_progress('loading')
             self._prepare_data()
             
             # Create strategy and position manager with callback
@@ -172,28 +211,37 @@ class BacktestRunner:
             
             # Run backtest logic and get trades/performance
             trades_df, performance = self._run_backtest_logic()
+            if self.cancelled:
+                self.perf_logger.session_start("Backtest cancelled - results cover the rows processed so far")
+            self._report_progress('results', trades=len(trades_df))
             
-            # --- FIX: Populate Results with trades from trades_df ---
+            # --- FIX: Populate Results with trades from trades_df (bulk, columnar) ---
             self.results = BacktestResults(self.position_manager.initial_capital)
             self.results.set_config(self.config)  # Pass config for additional info
             if not trades_df.empty:
-                for _, trade in trades_df.iterrows():
-                    self.results.add_trade({
-                        'entry_time': trade['entry_time'],
-                        'exit_time': trade['exit_time'],
-                        'entry_price': trade['entry_price'],
-                        'exit_price': trade['exit_price'],
-                        'quantity': trade['quantity'],
-                        'pnl': trade['net_pnl'],
-                        'commission': trade['commission'],
-                        'exit_reason': trade['exit_reason'],
-                    })
+                self.results.add_trades(trades_df.rename(columns={'net_pnl': 'pnl'}))
             # --- END FIX ---
 
-            # Now export results as before
-            results_dir = self.config['backtest']['results_dir']
+            backtest_cfg = self.config['backtest']
+            if backtest_cfg['mtm_equity'] and self.results.trade_count:
+                # Tick-level equity incl. open trades -> intraday drawdown, MAE/MFE
+                self.results.mark_to_market(
+                    self.data['close'],
+                    resolution=backtest_cfg['mtm_resolution'] or None,
+                    chunk_ticks=backtest_cfg['mtm_chunk_ticks'],
+                )
+
+            # Now export results as before (plus trades sidecar; optionally streamed / off-thread)
+            results_dir = backtest_cfg['results_dir']
             # self.results.export_to_csv(output_dir=results_dir)
-            self.results.export_to_excel(output_dir=results_dir)
+            export = self.results.export_to_excel(
+                output_dir=results_dir,
+                write_only=self.results.trade_count >= backtest_cfg['export_write_only_min_trades'],
+                background=backtest_cfg['export_background'],
+                sidecar_format=backtest_cfg['export_sidecar_format'],
+            )
+            self.export_future = export if backtest_cfg['export_background'] else None
+            self._report_progress('done', trades=len(trades_df))
             self.perf_logger.session_end("Backtest completed successfully")
             return self.results
         except Exception:
@@ -265,6 +313,7 @@ class BacktestRunner:
      
         # Initialize PositionManager with nested config (strategy callback not needed for this use case)
         position_manager = PositionManager(config)
+        self.position_manager = position_manager  # Progress snapshots report this run's closed trades / P&L
         
         # Skip data loading if df_normalized is provided
         df_normalized = self.data
@@ -312,6 +361,7 @@ class BacktestRunner:
         logger.info("=== PROCESSING INDICATORS INCREMENTALLY (ROW-BY-ROW) ===")
         logger.info(f"Processing {len(df_normalized)} rows incrementally without chunking")
         
+        self._report_progress('indicators', total=len(df_normalized))
         df_with_indicators = strategy.calculate_indicators(df_normalized)
         logger.info(f"Indicators calculated successfully. DataFrame shape: {df_with_indicators.shape}")
         logger.info("=== INCREMENTAL PROCESSING COMPLETE ===")
@@ -396,6 +446,16 @@ class BacktestRunner:
         signals_detected = 0
         entries_attempted = 0
         trades_executed = 0
+
+        # Progress / cancellation (GUI worker): checked every 256 rows, reported at most
+        # once per progress_interval_s so the channel stays cheap on multi-million-row runs
+        total_rows = len(df_with_indicators)
+        progress = self.progress_callback
+        cancel = self.cancel_event
+        watch = progress is not None or cancel is not None
+        progress_interval = self.config['backtest']['progress_interval_s']
+        loop_started = last_report = perf_counter()
+        self._report_progress('trading', total=total_rows, started=loop_started)
          
         for timestamp, row in df_with_indicators.iterrows():
             processed_bars += 1
@@ -403,6 +463,17 @@ class BacktestRunner:
             # ENSURE timezone awareness for timestamp
             now = ensure_tz_aware(timestamp)
 
+            if watch and not processed_bars & 0xFF:
+                if cancel is not None and cancel.is_set():
+                    self.cancelled = True
+                    logger.info(f"Backtest cancelled at {now} after {processed_bars - 1:,} of {total_rows:,} rows")
+                    break
+                tick = perf_counter()
+                if progress is not None and tick - last_report >= progress_interval:
+                    last_report = tick
+                    self._report_progress('trading', processed_bars, total_rows, signals_detected,
+                                          trades_executed, loop_started)
+
             # Check if session end reached using position manager
             if position_manager.should_exit_for_session_end(now):
                 # Close all positions and terminate
@@ -477,12 +548,18 @@ class BacktestRunner:
                 self.perf_logger.session_start(f"Progress: {processed_bars:,} bars processed, Signals: {signals_detected}, Entries: {entries_attempted}, Trades: {trades_executed}")
         
         logger.info(f"Backtest completed: {signals_detected} signals, {trades_executed} trades executed")
+        self._report_progress('trading', processed_bars, total_rows, signals_detected,
+                              trades_executed, loop_started)
         
-        # Defensive: flatten any still-open positions at backtest end
+        # Defensive: flatten any still-open positions at backtest end (or at the cancel point)
         if position_id and position_id in position_manager.positions:
-            last_price = df_with_indicators.iloc[-1]['close']
-            now = df_with_indicators.index[-1]
-            strategy.handle_exit(position_id, last_price, now, position_manager, reason="End of Backtest")
+            if self.cancelled:
+                last_price = row['close']
+            else:
+                last_price = df_with_indicators.iloc[-1]['close']
+                now = df_with_indicators.index[-1]
+            strategy.handle_exit(position_id, last_price, now, position_manager,
+                                 reason="Backtest Cancelled" if self.cancelled else "End of Backtest")
             logger.info(f"Closed final position at backtest end @ {last_price:.2f}")
         
         # Gather and print summary
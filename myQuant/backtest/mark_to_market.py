@@ -0,0 +1,202 @@
+"""
+backtest/mark_to_market.py
+
+Tick-level mark-to-market equity for a finished backtest.
+
+Equity at tick i = initial capital + net P&L of trades closed by tick i
+                   + sum over open trades of (price_i - entry_price) * quantity
+
+Everything is derived from the price array and the trade intervals
+[entry_time, exit_time) - no replay of the strategy:
+
+- open quantity / entry cost / realized P&L are step functions, built from
+  difference arrays (np.bincount) and a cumulative sum
+- per-trade max adverse / favourable excursion (MAE / MFE) come from
+  np.minimum/np.maximum.reduceat over each trade's price slice
+- the price array is processed in chunks (carrying the running state), so
+  working memory is O(chunk) whatever the length of the run; only the
+  downsampled equity (one row per `resolution` bucket: last/low/high) is kept.
+  resolution=None keeps every tick.
+
+Long-only, as PositionManager (PositionType.LONG).
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class MarkToMarketResult:
+    """Mark-to-market equity and the figures derived from it."""
+    equity: pd.DataFrame  # index: timestamp; columns equity (last), equity_low, equity_high, open_qty
+    excursions: pd.DataFrame  # One row per trade: mae, mfe (currency), mae_points, mfe_points
+    max_drawdown_percent: float
+    max_drawdown_amount: float
+    peak_equity: float
+    resolution: Optional[str]
+    ticks: int
+
+
+def _to_ns(times, tz) -> np.ndarray:
+    """Timestamps -> int64 ns (UTC), refusing to mix tz-aware and naive values."""
+    index = pd.DatetimeIndex(pd.to_datetime(times))
+    if (index.tz is None) != (tz is None):
+        raise ValueError("Trade times and price timestamps must both be tz-aware or both naive "
+                         f"(prices tz={tz}, trades tz={index.tz})")
+    return index.as_unit('ns').asi8
+
+
+def _range_reduce(ufunc, values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """ufunc-reduce values[starts[k]:ends[k]] for each k (ranges may overlap; all non-empty)."""
+    padded = np.append(values, values[-1])  # reduceat needs every index < len
+    return ufunc.reduceat(padded, np.column_stack((starts, ends)).ravel())[0::2]
+
+
+def compute_mark_to_market(prices: pd.Series, trades: pd.DataFrame, initial_capital: float,
+                           resolution: Optional[str] = "1s", chunk_ticks: int = 1_000_000) -> MarkToMarketResult:
+    """
+    Mark-to-market equity of `trades` against `prices`.
+
+    Args:
+        prices: Price per tick, indexed by (sorted) timestamp - e.g. the backtest data's 'close'
+        trades: Columns entry_time, exit_time, entry_price, exit_price, quantity, pnl, commission
+            (Results.trades_frame); realized P&L per trade is pnl - commission, as in Results
+        initial_capital: Equity before the first trade
+        resolution: Pandas offset ("1s", "1min", ...) for the stored series, or None for every tick
+        chunk_ticks: Ticks processed per chunk (bounds working memory)
+    """
+    if chunk_ticks < 1:
+        raise ValueError(f"chunk_ticks must be >= 1, got {chunk_ticks}")
+    if not isinstance(prices.index, pd.DatetimeIndex):
+        raise TypeError(f"prices must be indexed by timestamp (DatetimeIndex), got {type(prices.index).__name__}")
+    if not prices.index.is_monotonic_increasing:
+        raise ValueError("prices index must be sorted by time")
+    missing = [c for c in ('entry_time', 'exit_time', 'entry_price', 'exit_price', 'quantity', 'pnl', 'commission')
+               if c not in trades.columns]
+    if missing:
+        raise ValueError(f"trades missing columns {missing}")
+    res_ns = None
+    if resolution is not None:
+        res_ns = pd.Timedelta(resolution).value
+        if res_ns <= 0:
+            raise ValueError(f"resolution must be a positive duration, got {resolution!r}")
+
+    tz = prices.index.tz
+    times = prices.index.as_unit('ns').asi8
+    price = prices.to_numpy(dtype=float)
+    n = len(price)
+
+    # Trade intervals as tick indices: open on [start, end); realized from `end` on
+    qty = trades['quantity'].to_numpy(dtype=float)
+    entry_price = trades['entry_price'].to_numpy(dtype=float)
+    exit_price = trades['exit_price'].to_numpy(dtype=float)
+    realized = trades['pnl'].to_numpy(dtype=float) - trades['commission'].to_numpy(dtype=float)
+    if len(trades):
+        start = np.searchsorted(times, _to_ns(trades['entry_time'], tz), side='left')
+        end = np.searchsorted(times, _to_ns(trades['exit_time'], tz), side='left')
+        end = np.maximum(end, start)
+    else:
+        start = end = np.zeros(0, dtype=np.int64)
+    cost = entry_price * qty
+    price_low = np.full(len(trades), np.inf)
+    price_high = np.full(len(trades), -np.inf)
+
+    open_qty = open_cost = realized_total = 0.0
+    peak = float(initial_capital)
+    max_dd_pct = max_dd_amount = 0.0
+    kept_times: List[np.ndarray] = []
+    kept_cols: List[List[np.ndarray]] = []
+
+    for a in range(0, n, chunk_ticks):
+        b = min(n, a + chunk_ticks)
+        m = b - a
+
+        # Step functions within the chunk (difference arrays, then cumsum + carry)
+        opens = (start >= a) & (start < b)
+        closes = (end >= a) & (end < b)
+        d_qty = (np.bincount(start[opens] - a, qty[opens], minlength=m)
+                 - np.bincount(end[closes] - a, qty[closes], minlength=m))
+        d_cost = (np.bincount(start[opens] - a, cost[opens], minlength=m)
+                  - np.bincount(end[closes] - a, cost[closes], minlength=m))
+        d_real = np.bincount(end[closes] - a, realized[closes], minlength=m)
+        q = open_qty + np.cumsum(d_qty)
+        c = open_cost + np.cumsum(d_cost)
+        r = realized_total + np.cumsum(d_real)
+        open_qty, open_cost, realized_total = q[-1], c[-1], r[-1]
+
+        p = price[a:b]
+        equity = initial_capital + r + p * q - c
+
+        # Drawdown against the running peak (carried across chunks)
+        running_peak = np.maximum.accumulate(np.maximum(equity, peak))
+        peak = float(running_peak[-1])
+        drop = running_peak - equity
+        max_dd_amount = max(max_dd_amount, float(drop.max()))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            max_dd_pct = max(max_dd_pct, float(np.where(running_peak > 0, drop / running_peak, 0.0).max()) * 100)
+
+        # Price extremes per trade over its open ticks inside this chunk
+        live = (start < b) & (end > a)
+        if live.any():
+            ls = np.clip(start[live], a, b) - a
+            le = np.clip(end[live], a, b) - a
+            idx = np.flatnonzero(live)[le > ls]
+            ls, le = ls[le > ls], le[le > ls]
+            if len(idx):
+                np.minimum.at(price_low, idx, _range_reduce(np.minimum, p, ls, le))
+                np.maximum.at(price_high, idx, _range_reduce(np.maximum, p, ls, le))
+
+        # Keep every tick, or last/low/high per resolution bucket
+        t = times[a:b]
+        if res_ns is None:
+            kept_times.append(t)
+            kept_cols.append([equity, equity, equity, q])
+            continue
+        bucket = t // res_ns
+        first = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+        last = np.r_[first[1:] - 1, m - 1]
+        cols = [equity[last], np.minimum.reduceat(equity, first), np.maximum.reduceat(equity, first), q[last]]
+        bucket_ns = bucket[first] * res_ns
+        if kept_times and kept_times[-1][-1] == bucket_ns[0]:
+            # Bucket continues from the previous chunk: merge into its row
+            prev = kept_cols[-1]
+            prev[1][-1] = min(prev[1][-1], cols[1][0])
+            prev[2][-1] = max(prev[2][-1], cols[2][0])
+            prev[0][-1], prev[3][-1] = cols[0][0], cols[3][0]
+            bucket_ns, cols = bucket_ns[1:], [col[1:] for col in cols]
+        if len(bucket_ns):
+            kept_times.append(bucket_ns)
+            kept_cols.append(cols)
+
+    if kept_times:
+        stamps = pd.to_datetime(np.concatenate(kept_times), unit='ns', utc=tz is not None)
+        if tz is not None:
+            stamps = stamps.tz_convert(tz)
+        equity_frame = pd.DataFrame({name: np.concatenate([cols[i] for cols in kept_cols])
+                                     for i, name in enumerate(('equity', 'equity_low', 'equity_high', 'open_qty'))},
+                                    index=pd.DatetimeIndex(stamps, name='timestamp'))
+    else:
+        equity_frame = pd.DataFrame(columns=['equity', 'equity_low', 'equity_high', 'open_qty'])
+
+    # Excursions include the exit fill itself (trades with no tick inside still get one)
+    low = np.minimum(price_low, exit_price)
+    high = np.maximum(price_high, exit_price)
+    excursions = pd.DataFrame({
+        'mae_points': low - entry_price,
+        'mfe_points': high - entry_price,
+    }, index=trades.index)
+    excursions['mae'] = excursions['mae_points'] * qty
+    excursions['mfe'] = excursions['mfe_points'] * qty
+
+    return MarkToMarketResult(
+        equity=equity_frame,
+        excursions=excursions[['mae', 'mfe', 'mae_points', 'mfe_points']],
+        max_drawdown_percent=max_dd_pct,
+        max_drawdown_amount=max_dd_amount,
+        peak_equity=peak,
+        resolution=resolution,
+        ticks=n,
+    )
@@ -4,17 +4,23 @@ backtest/results.py - FIXED VERSION
 Complete functionality with properly working Excel output.
 """
 
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Tuple, Optional, Union
 from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
 from utils.time_utils import format_timestamp
+from backtest.mark_to_market import MarkToMarketResult, compute_mark_to_market
+import copy
 import os
+import threading
 
 # Import openpyxl with proper error handling
 try:
     from openpyxl import load_workbook, Workbook  # type: ignore[reportMissingModuleSource]
-    from openpyxl.styles import PatternFill, Font, Alignment, Border, Side  # type: ignore[reportMissingModuleSource]
+    from openpyxl.cell import WriteOnlyCell  # type: ignore[reportMissingModuleSource]
+    from openpyxl.styles import PatternFill, Font, Alignment, Border, Side, NamedStyle  # type: ignore[reportMissingModuleSource]
     from openpyxl.utils import get_column_letter  # type: ignore[reportMissingModuleSource]
     from openpyxl.worksheet.page import PageMargins  # type: ignore[reportMissingModuleSource]
     OPENPYXL_AVAILABLE = True
@@ -23,14 +29,23 @@ except ImportError:
     OPENPYXL_AVAILABLE = False
     # Define dummy classes for type hints
     class Workbook: pass
+    class WriteOnlyCell: pass
     class Font: pass
     class PatternFill: pass
     class Alignment: pass
     class Border: pass
     class Side: pass
+    class NamedStyle: pass
     class PageMargins: pass
     def get_column_letter(n): return chr(64 + n)
 
+# Parquet sidecar needs pyarrow; without it the sidecar is written as CSV
+try:
+    import pyarrow  # noqa: F401  # type: ignore[reportMissingImports]
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
 import logging
 
 # =====================================================
@@ -45,15 +60,71 @@ def safe_divide(numerator, denominator, default=0.0):
     except:
         return default
 
-def calculate_drawdown(equity_curve: List[float]) -> float:
-    max_drawdown = 0.0
-    peak = equity_curve[0] if equity_curve else 0
-    for value in equity_curve:
-        if value > peak:
-            peak = value
-        drawdown = (peak - value) / peak if peak > 0 else 0
-        max_drawdown = max(max_drawdown, drawdown)
-    return max_drawdown * 100
+def calculate_drawdown(equity_curve) -> float:
+    """Max peak-to-trough drawdown in percent (running peak via np.maximum.accumulate)."""
+    equity = np.asarray(equity_curve, dtype=float)
+    if equity.size == 0:
+        return 0.0
+    peak = np.maximum.accumulate(equity)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdown = np.where(peak > 0, (peak - equity) / peak, 0.0)
+    return float(max(drawdown.max(), 0.0)) * 100
+
+# Trades-table column -> (source column in get_trade_summary(), formatter)
+TRADE_COLUMN_FORMATS = {
+    'Entry Time': ('Entry Time', None),  # Dates are formatted column-wise below
+    'Exit Time': ('Exit Time', None),
+    'Entry ₹': ('Entry Price', lambda v: f"{v:.2f}"),
+    'Exit ₹': ('Exit Price', lambda v: f"{v:.2f}"),
+    'Total Qty': ('Total Qty', int),
+    'Gross P&L': ('Gross P&L', lambda v: f"₹{v:,.0f}"),
+    'Commission': ('Commission', lambda v: f"₹{v:,.0f}"),
+    'Net P&L': ('Net P&L', lambda v: f"₹{v:,.0f}"),
+    'Duration (min)': ('Duration (min)', lambda v: f"{v:.1f}"),
+    'Capital Outstanding': ('Capital Outstanding', lambda v: f"₹{v:,.0f}"),
+}
+PNL_COLUMNS = ('Gross P&L', 'Net P&L')
+
+def format_trade_columns(trades_data: pd.DataFrame, columns: List[str]) -> Tuple[List[List[Any]], Dict[str, List[int]]]:
+    """
+    Format the trades table one column at a time (no per-row iterrows).
+
+    Returns (column values in `columns` order, sign per P&L column) where the
+    sign is that of the displayed (rounded) value: 1, -1 or 0.
+    """
+    n = len(trades_data)
+    values, signs = [], {}
+    for col in columns:
+        if col == '#':
+            values.append(list(range(1, n + 1)))
+            continue
+        if col == 'Lots':
+            values.append(trades_data['Lots'].tolist() if 'Lots' in trades_data else ['N/A'] * n)
+            continue
+        if col == 'Exit Reason':
+            reasons = trades_data['Exit Reason'].fillna('').astype(str) if 'Exit Reason' in trades_data else pd.Series([''] * n)
+            values.append(reasons.str.slice(0, 20).tolist())
+            continue
+        if col not in TRADE_COLUMN_FORMATS or TRADE_COLUMN_FORMATS[col][0] not in trades_data:
+            values.append([''] * n)
+            continue
+        source, formatter = TRADE_COLUMN_FORMATS[col]
+        series = trades_data[source]
+        if formatter is None:
+            values.append(pd.to_datetime(series, errors='coerce').dt.strftime('%m/%d %H:%M').fillna('').tolist())
+            continue
+        numeric = pd.to_numeric(series, errors='coerce')
+        values.append(['' if pd.isna(v) else formatter(v) for v in numeric.tolist()])
+        if col in PNL_COLUMNS:
+            signs[col] = [0 if pd.isna(v) else (round(v) > 0) - (round(v) < 0) for v in numeric.tolist()]
+    return values, signs
+
+def _wall_clock_strings(times: pd.Series, fmt: str = "%Y-%m-%d %H:%M:%S") -> List[str]:
+    """Format timestamps as local wall-clock text; tz-aware series are made naive
+    first (same text, but pandas' fast formatting path instead of per-value)."""
+    if getattr(times.dt, 'tz', None) is not None:
+        times = times.dt.tz_localize(None)
+    return times.dt.strftime(fmt).tolist()
 
 @dataclass
 class TradeResult:
@@ -87,6 +158,9 @@ class TradingMetrics:
     final_capital: float = 0.0
     profit_factor: float = 0.0
     drawdown_percent: float = 0.0
+    intraday_drawdown_percent: Optional[float] = None  # Mark-to-market (ticks); None until Results.mark_to_market()
+    avg_mae: Optional[float] = None
+    avg_mfe: Optional[float] = None
 
 # =====================================================
 # FIXED OPTIMIZATION CLASSES
@@ -143,6 +217,40 @@ class StyleManager:
             top=Side(border_style="thin", color="000000"),
             bottom=Side(border_style="thin", color="000000")
         )
+        # Alignments are shared objects too - one instance per variant, not per cell
+        self.alignments = {
+            'center': Alignment(horizontal="center", vertical="center"),
+            'center_wrap': Alignment(horizontal="center", vertical="center", wrap_text=True),
+            'left_wrap': Alignment(horizontal="left", vertical="center", wrap_text=True),
+            'top_left_wrap': Alignment(horizontal="left", vertical="top", wrap_text=True),
+        }
+
+    def named_styles(self) -> Dict[str, Any]:
+        """
+        Trades-table cell styles as NamedStyles.
+
+        Assigning `cell.style = name` is one lookup into the workbook's style
+        table; setting font/fill/border/alignment separately re-hashes each
+        object per cell, which dominated export time on large trade logs.
+        """
+        if not OPENPYXL_AVAILABLE:
+            return {}
+        if not hasattr(self, '_named_styles'):
+            cell = dict(font=self.fonts['trade_data'], border=self.border, alignment=self.alignments['center_wrap'])
+            self._named_styles = {
+                'trade_header': NamedStyle(name='trade_header', font=self.fonts['header'], fill=self.fills['header'],
+                                           border=self.border, alignment=self.alignments['center_wrap']),
+                'trade_cell': NamedStyle(name='trade_cell', **cell),
+                'trade_positive': NamedStyle(name='trade_positive', fill=self.fills['positive'], **cell),
+                'trade_negative': NamedStyle(name='trade_negative', fill=self.fills['negative'], **cell),
+            }
+        return self._named_styles
+
+    def register(self, workbook) -> None:
+        """Add the named styles to `workbook` (once per workbook)."""
+        for style in self.named_styles().values():
+            if style.name not in workbook.named_styles:
+                workbook.add_named_style(style)
 
 class LayoutManager:
     """Manages worksheet layout with proper spacing and responsive design."""
@@ -414,125 +522,36 @@ class TableBuilder:
         """Create a single working trades table with actual data."""
         if not OPENPYXL_AVAILABLE:
             return
-            
+
+        ws = self.layout.ws
+        self.style.register(ws.parent)
+        columns = columns[:max(0, 16 - start_col + 1)]  # Don't exceed our column limit
+
         # Headers
         for col_idx, header in enumerate(columns):
-            if start_col + col_idx > 16:  # Don't exceed our column limit
-                break
-            header_cell = self.layout.ws.cell(
-                row=self.layout.current_row, 
-                column=start_col + col_idx, 
-                value=header
-            )
-            header_cell.font = self.style.fonts['header']
-            header_cell.fill = self.style.fills['header']
-            header_cell.border = self.style.border
-            header_cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        
+            ws.cell(row=self.layout.current_row, column=start_col + col_idx, value=header).style = 'trade_header'
+
         self.layout.advance_row(1)
-        
-        # Data rows with ACTUAL trade data
-        for trade_idx, (_, trade_row) in enumerate(trades_data.iterrows(), 1):
-            
-            # Prepare the actual data for this row
-            row_data = []
-            for col in columns:
-                if col == '#':
-                    row_data.append(trade_idx)
-                elif col == 'Entry Time':
-                    if pd.notna(trade_row.get('Entry Time')):
-                        row_data.append(pd.to_datetime(trade_row['Entry Time']).strftime('%m/%d %H:%M'))
-                    else:
-                        row_data.append('')
-                elif col == 'Exit Time':
-                    if pd.notna(trade_row.get('Exit Time')):
-                        row_data.append(pd.to_datetime(trade_row['Exit Time']).strftime('%m/%d %H:%M'))
-                    else:
-                        row_data.append('')
-                elif col == 'Entry ₹':
-                    if pd.notna(trade_row.get('Entry Price')):
-                        row_data.append(f"{trade_row['Entry Price']:.2f}")
-                    else:
-                        row_data.append('')
-                elif col == 'Exit ₹':
-                    if pd.notna(trade_row.get('Exit Price')):
-                        row_data.append(f"{trade_row['Exit Price']:.2f}")
-                    else:
-                        row_data.append('')
-                elif col == 'Lots':
-                    row_data.append(trade_row.get('Lots', 'N/A'))
-                elif col == 'Total Qty':
-                    if pd.notna(trade_row.get('Total Qty')):
-                        row_data.append(int(trade_row['Total Qty']))
-                    else:
-                        row_data.append('')
-                elif col == 'Gross P&L':
-                    if pd.notna(trade_row.get('Gross P&L')):
-                        row_data.append(f"₹{trade_row['Gross P&L']:,.0f}")
-                    else:
-                        row_data.append('')
-                elif col == 'Commission':
-                    if pd.notna(trade_row.get('Commission')):
-                        row_data.append(f"₹{trade_row['Commission']:,.0f}")
-                    else:
-                        row_data.append('')
-                elif col == 'Net P&L':
-                    if pd.notna(trade_row.get('Net P&L')):
-                        row_data.append(f"₹{trade_row['Net P&L']:,.0f}")
-                    else:
-                        row_data.append('')
-                elif col == 'Exit Reason':
-                    reason = str(trade_row.get('Exit Reason', ''))
-                    row_data.append(reason[:20] if len(reason) > 20 else reason)  # Limit length
-                elif col == 'Duration (min)':
-                    if pd.notna(trade_row.get('Duration (min)')):
-                        row_data.append(f"{trade_row['Duration (min)']:.1f}")
-                    else:
-                        row_data.append('')
-                elif col == 'Capital Outstanding':
-                    if pd.notna(trade_row.get('Capital Outstanding')):
-                        row_data.append(f"₹{trade_row['Capital Outstanding']:,.0f}")
-                    else:
-                        row_data.append('')
-                else:
-                    row_data.append('')
-            
-            # Write the actual data to cells
+
+        # Data rows with ACTUAL trade data - formatted column-wise, written row-wise with shared styles
+        values, signs = format_trade_columns(trades_data, columns)
+        pnl_signs = [signs.get(col) for col in columns]
+        sign_styles = {1: 'trade_positive', -1: 'trade_negative', 0: 'trade_cell'}
+        row_dims = ws.row_dimensions
+        for row_idx, row_data in enumerate(zip(*values)):
+            row = self.layout.current_row
             for col_idx, value in enumerate(row_data):
-                if start_col + col_idx > 16:  # Don't exceed our column limit
-                    break
-                    
-                cell = self.layout.ws.cell(
-                    row=self.layout.current_row,
-                    column=start_col + col_idx,
-                    value=value
-                )
-                cell.font = self.style.fonts['trade_data']  # Use trade-specific font
-                cell.border = self.style.border
-                cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-                
-                # Color code P&L columns
-                if columns[col_idx] in ['Gross P&L', 'Net P&L'] and isinstance(value, str):
-                    if '₹' in value:
-                        try:
-                            # Extract numeric value
-                            numeric_part = value.replace('₹', '').replace(',', '').strip()
-                            if numeric_part and numeric_part != '':
-                                numeric_val = float(numeric_part)
-                                if numeric_val > 0:
-                                    cell.fill = self.style.fills['positive']
-                                elif numeric_val < 0:
-                                    cell.fill = self.style.fills['negative']
-                        except ValueError:
-                            pass
-            
+                sign = pnl_signs[col_idx]
+                ws.cell(row=row, column=start_col + col_idx, value=value).style = (
+                    sign_styles[sign[row_idx]] if sign is not None else 'trade_cell')
+
             # Set row height
-            self.layout.ws.row_dimensions[self.layout.current_row].height = 35
+            row_dims[row].height = 35
             self.layout.advance_row(1)
-        
+
         # Set column widths for better readability
         self._set_working_column_widths(start_col, len(columns))
-    
+
     def _set_working_column_widths(self, start_col: int, num_columns: int):
         """Set optimal column widths for trades table with larger sizes."""
         if not OPENPYXL_AVAILABLE:
@@ -573,7 +592,11 @@ class DataPreparator:
             ("Final Capital", f"₹{self.metrics.final_capital:,.2f}"),
             ("Profit Factor", f"{self.metrics.profit_factor:.2f}"),
             ("Drawdown", f"{self.metrics.drawdown_percent:.2f}%")
-        ]
+        ] + ([] if self.metrics.intraday_drawdown_percent is None else [
+            ("Intraday Drawdown", f"{self.metrics.intraday_drawdown_percent:.2f}%"),
+            ("Avg MAE", f"₹{self.metrics.avg_mae:,.2f}"),
+            ("Avg MFE", f"₹{self.metrics.avg_mfe:,.2f}"),
+        ])
 
 # =====================================================
 # MAIN RESULTS CLASS (COMPLETE & WORKING)
@@ -585,29 +608,110 @@ class Results:
     and outputs performance metrics and reports with optimized Excel output.
     """
 
+    # Columnar trade store: one DataFrame column per TradeResult field
+    TRADE_COLUMNS = ['entry_time', 'exit_time', 'entry_price', 'exit_price',
+                     'quantity', 'pnl', 'commission', 'exit_reason']
+
     def __init__(self, initial_capital: float):
         self.initial_capital = initial_capital
-        self.current_capital = initial_capital
-        self.trades: List[TradeResult] = []
-        self.equity_curve: List[Tuple[datetime, float]] = []
         self.config: Optional[Dict[str, Any]] = None
+        self.sidecar_file: Optional[str] = None
+        self._store: Optional[pd.DataFrame] = None  # Consolidated trades, never mutated in place
+        self._pending: Dict[str, list] = {col: [] for col in self.TRADE_COLUMNS}  # add_trade() rows not yet in _store
+        self._trade_list: Optional[List[TradeResult]] = None  # Cached row view for .trades
+        self.mtm: Optional[MarkToMarketResult] = None  # Set by mark_to_market()
+        self.equity_sidecar_file: Optional[str] = None
 
     def add_trade(self, trade_data: Dict[str, Any]) -> None:
         """Appends a trade and updates capital/equity."""
-        trade = TradeResult(
-            entry_time=trade_data['entry_time'],
-            exit_time=trade_data['exit_time'],
-            entry_price=trade_data['entry_price'],
-            exit_price=trade_data['exit_price'],
-            quantity=trade_data['quantity'],
-            pnl=trade_data['pnl'],
-            commission=trade_data['commission'],
-            exit_reason=trade_data.get('exit_reason', ''),
-        )
+        pending = self._pending
+        for col in self.TRADE_COLUMNS[:-1]:
+            pending[col].append(trade_data[col])
+        pending['exit_reason'].append(trade_data.get('exit_reason', ''))
+        self._trade_list = None
+        self.mtm = None
+
+    def add_trades(self, trades: pd.DataFrame) -> None:
+        """
+        Bulk-append trades from a DataFrame with the add_trade() keys as columns
+        (exit_reason optional, extra columns ignored). Order is preserved.
+        """
+        if not isinstance(trades, pd.DataFrame):
+            raise TypeError(f"add_trades expects a pandas DataFrame, got {type(trades).__name__}")
+        missing = [col for col in self.TRADE_COLUMNS[:-1] if col not in trades.columns]
+        if missing:
+            raise ValueError(f"add_trades: missing trade columns {missing}; "
+                             f"expected {self.TRADE_COLUMNS} (rename e.g. net_pnl -> pnl before calling)")
+        if trades.empty:
+            return
+        frame = trades.reindex(columns=self.TRADE_COLUMNS).reset_index(drop=True)
+        frame['exit_reason'] = frame['exit_reason'].fillna('')
+        self._append_frame(frame)
+        self.mtm = None
+
+    def mark_to_market(self, prices: pd.Series, resolution: Optional[str] = "1s",
+                       chunk_ticks: int = 1_000_000) -> MarkToMarketResult:
+        """
+        Mark the trades to market against the backtest's tick prices: equity incl.
+        unrealized P&L (kept per `resolution` bucket, or per tick when None),
+        intraday drawdown and MAE/MFE per trade. See backtest/mark_to_market.py.
+        Adding trades afterwards clears it.
+        """
+        self.mtm = compute_mark_to_market(prices, self.trades_frame, self.initial_capital,
+                                          resolution=resolution, chunk_ticks=chunk_ticks)
+        return self.mtm
+
+    def _append_frame(self, frame: pd.DataFrame) -> None:
+        for col in ('entry_time', 'exit_time'):
+            if not pd.api.types.is_datetime64_any_dtype(frame[col]):
+                frame[col] = pd.to_datetime(frame[col])
+        store = self.trades_frame  # Flushes pending add_trade() rows first
+        self._store = frame if store.empty else pd.concat([store, frame], ignore_index=True)
+        self._trade_list = None
+
+    @property
+    def trades_frame(self) -> pd.DataFrame:
+        """All trades as the columnar store (TRADE_COLUMNS)."""
+        if self._pending['entry_time']:
+            pending, self._pending = self._pending, {col: [] for col in self.TRADE_COLUMNS}
+            self._append_frame(pd.DataFrame(pending, columns=self.TRADE_COLUMNS))
+        if self._store is None:
+            return pd.DataFrame(columns=self.TRADE_COLUMNS)
+        return self._store
+
+    @property
+    def trade_count(self) -> int:
+        return (0 if self._store is None else len(self._store)) + len(self._pending['entry_time'])
+
+    @property
+    def trades(self) -> List[TradeResult]:
+        """Row view of the store (built on demand - prefer trades_frame for bulk work)."""
+        if self._trade_list is None:
+            self._trade_list = [TradeResult(*row) for row in
+                                self.trades_frame.itertuples(index=False, name=None)]
+        return self._trade_list
 
-        self.trades.append(trade)
-        self.current_capital += (trade.pnl - trade.commission)
-        self.equity_curve.append((trade.exit_time, self.current_capital))
+    def _net_pnl(self) -> np.ndarray:
+        frame = self.trades_frame
+        return frame['pnl'].to_numpy(dtype=float) - frame['commission'].to_numpy(dtype=float)
+
+    @property
+    def current_capital(self) -> float:
+        return self.initial_capital + float(self._net_pnl().sum())
+
+    @property
+    def equity_curve(self) -> List[Tuple[datetime, float]]:
+        """(exit_time, capital after the trade) per trade."""
+        capital = self.initial_capital + np.cumsum(self._net_pnl())
+        return list(zip(self.trades_frame['exit_time'].tolist(), capital.tolist()))
+
+    def _snapshot(self) -> "Results":
+        """Detached copy sharing the (immutable) consolidated store - safe to export off-thread."""
+        self.trades_frame  # Consolidate pending rows
+        snapshot = copy.copy(self)
+        snapshot._pending = {col: [] for col in self.TRADE_COLUMNS}
+        snapshot._trade_list = None
+        return snapshot
 
     def set_config(self, config: Dict[str, Any]):
         self.config = config
@@ -680,30 +784,41 @@ class Results:
         return pd.DataFrame(rows)
 
     def calculate_metrics(self) -> TradingMetrics:
-        if not self.trades:
+        if self.trade_count == 0:
             return TradingMetrics(final_capital=self.initial_capital)
 
-        total_trades = len(self.trades)
-        wins = [t for t in self.trades if t.pnl > 0]
-        losses = [t for t in self.trades if t.pnl < 0]
+        frame = self.trades_frame
+        pnl = frame['pnl'].to_numpy(dtype=float)
+        commission = frame['commission'].to_numpy(dtype=float)
+        total_trades = len(pnl)
+        wins = pnl > 0
+        losses = pnl < 0
+        win_count = int(wins.sum())
+        loss_count = int(losses.sum())
 
-        gross_profit = sum(t.pnl for t in wins)
-        gross_loss = sum(t.pnl for t in losses)
-        total_commission = sum(t.commission for t in self.trades)
+        gross_profit = float(pnl[wins].sum())
+        gross_loss = float(pnl[losses].sum())
+        total_commission = float(commission.sum())
         total_pnl = gross_profit + gross_loss
         net_pnl = total_pnl - total_commission
 
-        avg_win = safe_divide(gross_profit, len(wins))
-        avg_loss = safe_divide(abs(gross_loss), len(losses))
+        avg_win = safe_divide(gross_profit, win_count)
+        avg_loss = safe_divide(abs(gross_loss), loss_count)
         final_capital = self.initial_capital + net_pnl
         return_percent = safe_divide(net_pnl, self.initial_capital, 0.0) * 100
-        drawdown = calculate_drawdown([v for _, v in self.equity_curve])
+        drawdown = calculate_drawdown(self.initial_capital + np.cumsum(pnl - commission))
+
+        excursion = {}
+        if self.mtm is not None:
+            excursion = dict(intraday_drawdown_percent=self.mtm.max_drawdown_percent,
+                             avg_mae=float(self.mtm.excursions['mae'].mean()),
+                             avg_mfe=float(self.mtm.excursions['mfe'].mean()))
 
         return TradingMetrics(
             total_trades=total_trades,
-            winning_trades=len(wins),
-            losing_trades=len(losses),
-            win_rate=100 * safe_divide(len(wins), total_trades),
+            winning_trades=win_count,
+            losing_trades=loss_count,
+            win_rate=100 * safe_divide(win_count, total_trades),
             gross_profit=gross_profit,
             gross_loss=gross_loss,
             avg_win=avg_win,
@@ -711,12 +826,13 @@ class Results:
             total_pnl=total_pnl,
             total_commission=total_commission,
             net_pnl=net_pnl,
-            best_trade=max((t.pnl for t in self.trades), default=0.0),
-            worst_trade=min((t.pnl for t in self.trades), default=0.0),
+            best_trade=float(pnl.max()),
+            worst_trade=float(pnl.min()),
             return_percent=return_percent,
             final_capital=final_capital,
             profit_factor=safe_divide(gross_profit, abs(gross_loss), 0.0),
             drawdown_percent=drawdown,
+            **excursion,
         )
 
     def print_summary(self):
@@ -736,52 +852,45 @@ class Results:
         print(f"Worst Trade (P&L): ₹{m.worst_trade:.2f}")
         print(f"Return (%)       : {m.return_percent:.2f}")
         print(f"Drawdown (%)     : {m.drawdown_percent:.2f}")
+        if m.intraday_drawdown_percent is not None:
+            print(f"Intraday DD (%)  : {m.intraday_drawdown_percent:.2f}  (mark-to-market)")
+            print(f"Avg MAE / MFE    : ₹{m.avg_mae:.2f} / ₹{m.avg_mfe:.2f}")
         print(f"Final Capital    : ₹{m.final_capital:,.2f}")
         print(f"Profit Factor    : {m.profit_factor:.2f}")
         print(f"Total Commission : ₹{m.total_commission:.2f}")
         print(f"{'='*60}")
 
     def get_trade_summary(self) -> pd.DataFrame:
-        rows = []
-        capital = self.initial_capital
-
-        # Insert starting capital row
-        rows.append({
-            "Entry Time": "",
-            "Exit Time": "",
-            "Entry Price": "",
-            "Exit Price": "",
-            "Lots": "",
-            "Total Qty": "",
-            "Gross P&L": "",
-            "Commission": "",
-            "Net P&L": "",
-            "Exit Reason": "Starting Capital",
-            "Duration (min)": "",
-            "Capital Outstanding": round(capital, 2)
-        })
-
-        for t in self.trades:
-            net_pnl = t.pnl - t.commission
-            capital += net_pnl
-            lots_display = getattr(t, 'lots_traded', t.quantity // getattr(t, 'lot_size', 1)) if hasattr(t, 'lot_size') else 'N/A'
-
-            rows.append({
-                "Entry Time": t.entry_time.strftime("%Y-%m-%d %H:%M:%S"),
-                "Exit Time": t.exit_time.strftime("%Y-%m-%d %H:%M:%S"),
-                "Entry Price": round(t.entry_price, 2),
-                "Exit Price": round(t.exit_price, 2),
-                "Lots": lots_display,
-                "Total Qty": t.quantity,
-                "Gross P&L": round(t.pnl, 2),
-                "Commission": round(t.commission, 2),
-                "Net P&L": round(net_pnl, 2),
-                "Exit Reason": t.exit_reason,
-                "Duration (min)": round((t.exit_time - t.entry_time).total_seconds() / 60, 2),
-                "Capital Outstanding": round(capital, 2)
-            })
-
-        return pd.DataFrame(rows)
+        # Starting capital row, then one display row per trade (built column-wise)
+        columns = {
+            "Entry Time": [""],
+            "Exit Time": [""],
+            "Entry Price": [""],
+            "Exit Price": [""],
+            "Lots": [""],
+            "Total Qty": [""],
+            "Gross P&L": [""],
+            "Commission": [""],
+            "Net P&L": [""],
+            "Exit Reason": ["Starting Capital"],
+            "Duration (min)": [""],
+            "Capital Outstanding": [round(self.initial_capital, 2)]
+        }
+        if self.trade_count:
+            trades = self.get_trades_frame()
+            columns["Entry Time"] += _wall_clock_strings(trades['entry_time'])
+            columns["Exit Time"] += _wall_clock_strings(trades['exit_time'])
+            columns["Entry Price"] += trades['entry_price'].astype(float).round(2).tolist()
+            columns["Exit Price"] += trades['exit_price'].astype(float).round(2).tolist()
+            columns["Lots"] += ['N/A'] * len(trades)  # TradeResult carries no lot size
+            columns["Total Qty"] += trades['quantity'].tolist()
+            columns["Gross P&L"] += trades['pnl'].astype(float).round(2).tolist()
+            columns["Commission"] += trades['commission'].astype(float).round(2).tolist()
+            columns["Net P&L"] += trades['net_pnl'].round(2).tolist()
+            columns["Exit Reason"] += trades['exit_reason'].tolist()
+            columns["Duration (min)"] += trades['duration_min'].round(2).tolist()
+            columns["Capital Outstanding"] += trades['capital'].round(2).tolist()
+        return pd.DataFrame(columns)
 
     def get_equity_curve(self) -> pd.DataFrame:
         """Return equity curve as DataFrame."""
@@ -807,7 +916,169 @@ class Results:
 
         return trades_file
 
-    def create_optimized_excel_report(self, output_dir: str = "results") -> str:
+    def get_trades_frame(self) -> pd.DataFrame:
+        """Trades as a typed, unformatted frame (one row per trade) - the sidecar contents."""
+        columns = ['entry_time', 'exit_time', 'entry_price', 'exit_price', 'quantity',
+                   'pnl', 'commission', 'net_pnl', 'exit_reason', 'duration_min', 'capital']
+        if self.trade_count == 0:
+            return pd.DataFrame(columns=columns)
+        frame = self.trades_frame.copy()
+        frame['net_pnl'] = self._net_pnl()
+        frame['duration_min'] = (frame['exit_time'] - frame['entry_time']).dt.total_seconds() / 60
+        frame['capital'] = self.initial_capital + frame['net_pnl'].cumsum()
+        if self.mtm is not None:
+            columns += ['mae', 'mfe', 'mae_points', 'mfe_points']
+            for col in ('mae', 'mfe', 'mae_points', 'mfe_points'):
+                frame[col] = self.mtm.excursions[col].to_numpy()
+        return frame[columns]
+
+    def export_sidecar(self, output_dir: str = "results", timestamp: Optional[str] = None,
+                       sidecar_format: str = "parquet") -> str:
+        """
+        Write the trades as Parquet (or CSV) next to the Excel report so downstream
+        tools never have to parse xlsx. Parquet falls back to CSV without pyarrow.
+        With mark_to_market() done, the equity series goes to Backtest_Equity_<ts> too.
+        """
+        if sidecar_format not in ("parquet", "csv"):
+            raise ValueError(f"sidecar_format must be 'parquet' or 'csv', got {sidecar_format!r}")
+        os.makedirs(output_dir, exist_ok=True)
+        timestamp = timestamp or format_timestamp(datetime.now())
+
+        def write(frame: pd.DataFrame, stem: str, index: bool) -> str:
+            if sidecar_format == "parquet" and PARQUET_AVAILABLE:
+                path = os.path.join(output_dir, f"{stem}_{timestamp}.parquet")
+                frame.to_parquet(path, index=index)
+            else:
+                path = os.path.join(output_dir, f"{stem}_{timestamp}.csv")
+                frame.to_csv(path, index=index)
+            return path
+
+        if self.mtm is not None:
+            self.equity_sidecar_file = write(self.mtm.equity, "Backtest_Equity", index=True)
+        return write(self.get_trades_frame(), "Backtest_Trades", index=False)
+
+    def create_streaming_excel_report(self, output_dir: str = "results", timestamp: Optional[str] = None) -> str:
+        """
+        Same dashboard built with openpyxl's write-only mode: rows are streamed to
+        disk as they are appended, so memory stays flat however many trades there
+        are. Trades are one table (no split), and trade rows keep the default height.
+        """
+        if not OPENPYXL_AVAILABLE:
+            print("Warning: openpyxl not available. Please install it with: pip install openpyxl")
+            return self.export_to_csv(output_dir)
+
+        os.makedirs(output_dir, exist_ok=True)
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Backtest Results")
+        style = StyleManager(scale_factor=1.0)
+        style.register(wb)
+
+        start_col, end_col = 2, 16  # B..P, as LayoutManager(max_columns=15)
+        trade_columns = ['#', 'Entry Time', 'Exit Time', 'Entry ₹', 'Exit ₹',
+                         'Lots', 'Total Qty', 'Gross P&L', 'Commission', 'Net P&L',
+                         'Exit Reason', 'Duration (min)', 'Capital Outstanding']
+        ws.column_dimensions['A'].width = 4
+        widths = [8, 18, 18, 14, 14, 10, 12, 16, 14, 16, 22, 14, 18]
+        for i, width in enumerate(widths):
+            ws.column_dimensions[get_column_letter(start_col + i)].width = width
+        ws.page_margins = PageMargins(left=1.0, right=0.7, top=0.75, bottom=0.75)
+
+        row = [0]  # Next row number (write-only sheets only append)
+
+        def cell(value, font=None, fill=None, alignment=None, border=None):
+            c = WriteOnlyCell(ws, value=value)
+            if font is not None:
+                c.font = font
+            if fill is not None:
+                c.fill = fill
+            if alignment is not None:
+                c.alignment = alignment
+            if border is not None:
+                c.border = border
+            return c
+
+        def append(cells_by_col: Dict[int, Any], height: Optional[float] = None, merge_to: Optional[int] = None):
+            row[0] += 1
+            if height is not None:
+                ws.row_dimensions[row[0]].height = height
+            if merge_to is not None:
+                first = min(cells_by_col)
+                ws.merged_cells.add(f"{get_column_letter(first)}{row[0]}:{get_column_letter(merge_to)}{row[0]}")
+            values = [None] * max(cells_by_col)
+            for col, value in cells_by_col.items():
+                values[col - 1] = value
+            ws.append(values)
+
+        def blank():
+            row[0] += 1
+            ws.append([])
+
+        append({start_col: cell("BACKTEST RESULTS DASHBOARD", style.fonts['title'], style.fills['title'],
+                                style.alignments['center'])}, height=55, merge_to=end_col)
+        blank()
+
+        metrics = self.calculate_metrics()
+        net_pnl_positive = metrics.net_pnl > 0 if metrics.net_pnl != 0 else None
+        value_fill = style.fills['title'] if net_pnl_positive is None else style.fills['positive' if net_pnl_positive else 'negative']
+        append({start_col + 3: cell("TOTAL NET P&L", Font(size=20, bold=True), style.fills['summary'],
+                                    style.alignments['center'], style.border)}, height=65, merge_to=end_col - 3)
+        append({start_col + 3: cell(f"₹{metrics.net_pnl:,.2f}", style.fonts['highlight'], value_fill,
+                                    style.alignments['center'], style.border)}, height=85, merge_to=end_col - 3)
+        blank()
+
+        append({start_col: cell("PERFORMANCE SUMMARY", style.fonts['header'], style.fills['header'],
+                                style.alignments['center'])}, height=45, merge_to=end_col)
+        metrics_data = DataPreparator(self).get_metrics_data()
+        for i in range(0, len(metrics_data), 2):
+            cells = {}
+            for (label, value), (label_col, value_col) in zip(metrics_data[i:i + 2], ((3, 4), (8, 9))):
+                cells[label_col] = cell(label, style.fonts['metric_label'], None, style.alignments['center_wrap'], style.border)
+                cells[value_col] = cell(value, style.fonts['metric_value'], None, style.alignments['center_wrap'], style.border)
+            append(cells, height=45)
+        blank()
+
+        append({start_col: cell("STRATEGY CONFIGURATION", style.fonts['header'], style.fills['header'],
+                                style.alignments['center'])}, height=50, merge_to=end_col)
+        config_data = self._create_additional_info_table()
+        for key, value in zip(config_data['Key'].tolist(), config_data['Value'].tolist()):
+            append({start_col: cell(key, style.fonts['subheader'], style.fills['summary'],
+                                    style.alignments['left_wrap'], style.border),
+                    start_col + 4: cell(str(value), style.fonts['normal'], None,
+                                        style.alignments['top_left_wrap'], style.border)}, height=30)
+        blank()
+
+        trades_data = self.get_trade_summary()
+        main_trades = trades_data.iloc[1:] if len(trades_data) > 1 else trades_data.iloc[0:0]
+        if not main_trades.empty:
+            append({start_col: cell("DETAILED TRADES LOG", style.fonts['header'], style.fills['header'],
+                                    style.alignments['center'])}, height=30, merge_to=end_col)
+            header = [None] * (start_col - 1)
+            for name in trade_columns:
+                c = WriteOnlyCell(ws, value=name)
+                c.style = 'trade_header'
+                header.append(c)
+            row[0] += 1
+            ws.append(header)
+
+            values, signs = format_trade_columns(main_trades, trade_columns)
+            pnl_signs = [signs.get(col) for col in trade_columns]
+            sign_styles = {1: 'trade_positive', -1: 'trade_negative', 0: 'trade_cell'}
+            pad = [None] * (start_col - 1)
+            for row_idx, row_data in enumerate(zip(*values)):
+                out = list(pad)
+                for col_idx, value in enumerate(row_data):
+                    c = WriteOnlyCell(ws, value=value)
+                    sign = pnl_signs[col_idx]
+                    c.style = sign_styles[sign[row_idx]] if sign is not None else 'trade_cell'
+                    out.append(c)
+                ws.append(out)
+
+        timestamp = timestamp or format_timestamp(datetime.now())
+        filename = os.path.join(output_dir, f"Fixed_Backtest_Results_{timestamp}.xlsx")
+        wb.save(filename)
+        return filename
+
+    def create_optimized_excel_report(self, output_dir: str = "results", timestamp: Optional[str] = None) -> str:
         """Create FIXED Excel report with working trade data and larger text."""
         if not OPENPYXL_AVAILABLE:
             print("Warning: openpyxl not available. Please install it with: pip install openpyxl")
@@ -853,7 +1124,7 @@ class Results:
             table_builder.create_trades_table(main_trades)
 
         # Save file
-        timestamp = format_timestamp(datetime.now())
+        timestamp = timestamp or format_timestamp(datetime.now())
         filename = os.path.join(output_dir, f"Fixed_Backtest_Results_{timestamp}.xlsx")
         wb.save(filename)
 
@@ -867,9 +1138,55 @@ class Results:
         """Legacy method - redirects to fixed version."""
         return self.create_optimized_excel_report(output_dir)
 
-    def export_to_excel(self, output_dir: str = "results") -> str:
-        """Export to Excel - redirects to fixed version."""
-        return self.create_optimized_excel_report(output_dir)
+    def export_to_excel(self, output_dir: str = "results", write_only: bool = False,
+                        background: bool = False, sidecar_format: str = "parquet") -> Union[str, Future]:
+        """
+        Export the Excel report plus a Parquet/CSV trades sidecar (same timestamp).
+
+        Args:
+            write_only: Stream rows with openpyxl write-only mode (flat memory; for large trade logs)
+            background: Run the export on the shared export thread and return a
+                concurrent.futures.Future resolving to the Excel filename. Trades are
+                snapshotted first, so the caller may keep adding to this Results.
+            sidecar_format: "parquet" (CSV when pyarrow is missing) or "csv"
+
+        Returns:
+            Excel filename, or a Future of it when background=True. The sidecar
+            path is set on `self.sidecar_file` once it has been written.
+        """
+        if sidecar_format not in ("parquet", "csv"):
+            raise ValueError(f"sidecar_format must be 'parquet' or 'csv', got {sidecar_format!r}")
+        if not background:
+            return self._export(output_dir, write_only, sidecar_format)
+
+        snapshot = self._snapshot()
+        def run() -> str:
+            try:
+                return snapshot._export(output_dir, write_only, sidecar_format)
+            finally:
+                self.sidecar_file = snapshot.sidecar_file
+                self.equity_sidecar_file = snapshot.equity_sidecar_file
+
+        return _export_executor().submit(run)
+
+    def _export(self, output_dir: str, write_only: bool, sidecar_format: str) -> str:
+        timestamp = format_timestamp(datetime.now())
+        # Sidecar first: it is cheap and must exist even if the xlsx step fails
+        self.sidecar_file = self.export_sidecar(output_dir, timestamp, sidecar_format)
+        if write_only:
+            return self.create_streaming_excel_report(output_dir, timestamp)
+        return self.create_optimized_excel_report(output_dir, timestamp)
+
+_EXPORTER: Optional[ThreadPoolExecutor] = None
+_EXPORTER_LOCK = threading.Lock()
+
+def _export_executor() -> ThreadPoolExecutor:
+    """Single shared export thread - exports queue behind each other instead of competing for the GIL."""
+    global _EXPORTER
+    with _EXPORTER_LOCK:
+        if _EXPORTER is None:
+            _EXPORTER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="results-export")
+        return _EXPORTER
 
 # Backward compatibility
 BacktestResults = Results
\ No newline at end of file
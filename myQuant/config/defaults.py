@@ -81,7 +81,12 @@ DEFAULT_CONFIG: Dict[str, Any] = {
         "backup_count": 0,   # Not used
         "log_level_overrides": {},
         "json_event_log": False,  # Disabled
-        "json_event_file": "not_used.jsonl"  # Dummy value
+        "json_event_file": "not_used.jsonl",  # Dummy value
+        "async_logging": False,  # Opt-in: handlers run on a listener thread; hot-path threads only enqueue
+        "async_queue_size": 10000,  # Bounded queue; INFO/DEBUG records are dropped (and counted) when full
+        # Never dropped: WARNING+ and these logger prefixes (trade entries/exits) are handled
+        # synchronously on the caller's thread when the queue is full
+        "async_lossless_loggers": ["core.position_manager", "live.trader", "live.forward_test_results"]
     },
     "debug": {
         # Environment-aware error handling configuration
@@ -170,6 +175,9 @@ DEFAULT_CONFIG: Dict[str, Any] = {
         "instrumentation_enabled": False,  # Enable for Phase 1 baseline measurement
         "instrumentation_window_size": 1000,  # Number of ticks to track
         "baseline_measurement_ticks": 1000,  # Ticks for baseline measurement
+        "resource_sample_interval": 1.0,  # Seconds between background memory/CPU samples (PerformanceInstrumentor)
+        "latency_histograms": False,  # Per-stage tick latency histograms in LiveTrader (exported to results/ at session end)
+        "latency_histogram_precision_bits": 8,  # Log-linear sub-bucket bits (relative error 2^-(bits-1))
     },
     "instrument": {
         "symbol": "NIFTY",  # Default to Nifty options - lot_size now comes from instrument_mappings (SSOT)
@@ -260,13 +268,37 @@ DEFAULT_CONFIG: Dict[str, Any] = {
         "close_at_session_end": True,
         "save_results": True,
         "results_dir": r"C:\Users\user\Desktop\BotResults\results\Back Test",
+        "export_write_only_min_trades": 5000,  # From this many trades the Excel report is streamed (openpyxl write-only, flat memory)
+        "export_background": False,  # Write the report on the export thread; run() returns at once (BacktestRunner.export_future)
+        "export_sidecar_format": "parquet",  # Trades sidecar next to the xlsx: "parquet" (CSV without pyarrow) or "csv"
+        "mtm_equity": True,  # Mark trades to market on every tick: intraday drawdown + MAE/MFE (backtest/mark_to_market.py)
+        "mtm_resolution": "1s",  # Stored equity series granularity (last/low/high per bucket); "" = every tick (unbounded)
+        "mtm_chunk_ticks": 1000000,  # Ticks per vectorized chunk - bounds working memory on long runs
+        "progress_interval_s": 0.5,  # Min seconds between progress reports to a progress_callback (GUI worker)
         "log_level": "INFO"
     },
     "live": {
         "paper_trading": True,
         "exchange_type": "NFO",
         "feed_type": "Quote",
+        "clock_mode": "wall",  # "wall" = system clock, "replay" = file simulation drives time from data timestamps (full speed)
         "log_ticks": False,
+        "tick_log_dir": r"C:\Users\user\Desktop\BotResults\LiveTickPrice",  # Live session tick CSVs (livePrice_*.csv); "" = off
+        "retain_raw_tick": False,  # Keep full websocket message on Tick.raw (debug only - extra memory per tick)
+        "ws_binary_decode": False,  # Decode SmartWebSocketV2 binary packets directly into Tick (off when retain_raw_tick).
+                                    # Opt-in until verified against recorded live frames (ws_record_frames + scripts/bench_ws_decode.py)
+        "ws_record_frames": "",  # Path to append raw binary frames to (fixture capture); "" = off
+        "ws_url": "",  # WebSocket endpoint override (e.g. scripts/ws_replay_server.py for load tests); "" = SmartAPI
+        "feed_latency_monitor": True,  # Per-symbol exchange->receive delay stats + lag alerts (live/feed_latency.py)
+        "feed_latency_window": 2048,  # Recent ticks per symbol kept for rolling delay percentiles
+        "feed_lag_alert_ms": 1000,  # Alert when delay exceeds the skew baseline by this much...
+        "feed_lag_alert_ticks": 5,  # ...for this many consecutive ticks
+        "risk_first_exits": False,  # Evaluate SL/TP/trailing on the feed thread before the tick reaches queue/strategy
+        "router_workers": 4,  # TickRouter worker threads (each symbol is pinned to one worker - per-symbol ordering)
+        "router_queue_size": 10000,  # Per-worker tick queue bound (ticks dropped and counted when full)
+        "process_topology": False,  # Forward test runs feed and trading in separate processes (live/process_topology.py); GUI only polls status
+        "tick_ring_capacity": 65536,  # ProcessTopology shared-memory tick ring slots (64 bytes each)
+        "status_snapshot_interval": 0.5,  # Seconds between trading-process status snapshots for the GUI
         "visual_indicator": True,
         "api_key": "",  # Loaded during live trading authentication only
         "client_code": "",  # Loaded during live trading authentication only
@@ -10,7 +10,7 @@ core/liveStrategy.py - High-Performance Live Trading Strategy
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
 from datetime import datetime, time, timedelta
 import pytz
 
@@ -22,6 +22,7 @@ from utils.logger import HighPerfLogger, increment_tick_counter, get_tick_counte
 
 from utils.config_helper import ConfigAccessor
 from core.indicators import IncrementalEMA, IncrementalMACD, IncrementalVWAP, IncrementalATR
+from core.tick import Tick
 from utils.enhanced_error_handler import (
     create_error_handler_from_config, ErrorSeverity, 
     safe_tick_processing, safe_indicator_calculation
@@ -193,7 +194,10 @@ class ModularIntradayStrategy:
         self.warmup_complete = False
         
         # Phase 1: Performance instrumentation
-        self.instrumentor = PerformanceInstrumentor(window_size=1000)
+        self.instrumentor = PerformanceInstrumentor(
+            window_size=1000,
+            resource_sample_interval=self.config['performance']['resource_sample_interval']
+        )
         self.instrumentation_enabled = False  # Control flag (enabled for Phase 1 baseline)
         
         # Initialize enhanced error handler
@@ -323,6 +327,10 @@ class ModularIntradayStrategy:
         except Exception as e:
             pass  # Suppress errors in session reset
 
+    def close(self):
+        """Release background resources (instrumentor resource sampler). Safe to call more than once."""
+        self.instrumentor.close()
+
     def on_position_closed(self, position_id: str, reason: str = "Unknown"):
         """
         Notify strategy that a position has been closed.
@@ -592,12 +600,12 @@ class ModularIntradayStrategy:
 
 
 
-    def on_tick(self, tick: Dict[str, Any]) -> Optional[TradingSignal]:
+    def on_tick(self, tick) -> Optional[TradingSignal]:
         """
         Unified tick-by-tick entry point for live trading.
         
         Args:
-            tick: Dictionary containing tick data (price, volume, timestamp, etc.)
+            tick: core.tick.Tick record (live path) or legacy dict with price, volume, timestamp
             
         Returns:
             TradingSignal if action should be taken, None otherwise
@@ -624,7 +632,7 @@ class ModularIntradayStrategy:
             self._ontick_call_count += 1
             
             if self._ontick_call_count == 1 or self._ontick_call_count % 300 == 0:
-                logger.info(f"📊 [STRATEGY] on_tick called #{self._ontick_call_count}, tick keys: {list(tick.keys())}")
+                logger.info(f"📊 [STRATEGY] on_tick called #{self._ontick_call_count}, tick: {tick!r}")
             
             # Phase A optimization: Pass tick dict directly (no pandas conversion)
             # This eliminates expensive pd.Series() construction on every tick
@@ -647,13 +655,17 @@ class ModularIntradayStrategy:
                         self.instrumentor.end_tick()
                     return None
             
-            # GRACEFUL: Check for timestamp - return None if missing (live trading safe)
-            if 'timestamp' not in tick:
-                logger.warning(f"⚠️ [STRATEGY] Tick missing timestamp, skipping. Tick keys: {list(tick.keys())}")
-                if self.instrumentation_enabled:
-                    self.instrumentor.end_tick()
-                return None
-            timestamp = tick['timestamp']
+            # Tick records always carry a timestamp; legacy dicts are checked
+            if isinstance(tick, Tick):
+                timestamp = tick.timestamp
+            else:
+                # GRACEFUL: Check for timestamp - return None if missing (live trading safe)
+                if 'timestamp' not in tick:
+                    logger.warning(f"⚠️ [STRATEGY] Tick missing timestamp, skipping. Tick keys: {list(tick.keys())}")
+                    if self.instrumentation_enabled:
+                        self.instrumentor.end_tick()
+                    return None
+                timestamp = tick['timestamp']
             
             # Phase 1: Measure signal evaluation
             if self.instrumentation_enabled:
@@ -804,6 +816,60 @@ class ModularIntradayStrategy:
 
 
 
+    def _prepare_row_input(self, row):
+        """
+        Normalize legacy dict/Series/DataFrame input for process_tick_or_bar.
+
+        Returns:
+            (close, volume, high, low, open, updated) - always this shape. When the
+            row carries no usable price, close/high/low/open are None, volume is 0
+            and `updated` is the (normalized) input, returned to the caller as-is.
+        """
+        # Phase A: Support both dict and pandas inputs (backward compatibility)
+        # New code passes dicts, old code may still pass Series
+        if isinstance(row, pd.DataFrame):
+            if len(row) == 1:
+                row = row.iloc[0]
+            else:
+                return None, 0, None, None, None, row
+        
+        # Convert pandas Series to dict for uniform processing
+        if isinstance(row, pd.Series):
+            row = row.to_dict()
+
+        # GRACEFUL: Extract required price - return safely if missing (live trading resilient)
+        # Extract close price (required) - graceful fallback approach
+        close_price = row.get('close')
+        if close_price is None:
+            close_price = row.get('price')
+            if close_price is None:
+                # No valid price found - return original row without processing
+                return None, 0, None, None, None, row
+        
+        try:
+            close_price = float(close_price)
+        except Exception:
+            return None, 0, None, None, None, row
+        if close_price <= 0:
+            return None, 0, None, None, None, row
+
+        # Extract optional fields with sensible defaults for OHLCV
+        volume = row.get('volume', 0)
+        try:
+            volume = int(volume) if volume is not None else 0
+        except Exception:
+            volume = 0
+            
+        # Extract OHLC with fallback to close price
+        high_price = float(row.get('high', close_price) if row.get('high') is not None else close_price)
+        low_price = float(row.get('low', close_price) if row.get('low') is not None else close_price)
+        open_price = float(row.get('open', close_price) if row.get('open') is not None else close_price)
+
+        # Phase A: Build result dict directly (no .copy())
+        # Start with original tick data
+        updated = dict(row)
+        return close_price, volume, high_price, low_price, open_price, updated
+
     def process_tick_or_bar(self, row):
         """
         Process tick data and update indicators.
@@ -812,17 +878,22 @@ class ModularIntradayStrategy:
         expensive object construction on every tick. Returns dict with indicator values.
         
         Args:
-            row: Dict or Series-like object with tick data
+            row: Tick record, dict or Series-like object with tick data
         
         Returns:
-            Dict with original tick data plus calculated indicator values
+            Dict with tick fields (timestamp/price/volume for Tick input, full row
+            otherwise) plus calculated indicator values
         """
         # Tick counter and hot-path perf logging
         increment_tick_counter()
+        is_tick = isinstance(row, Tick)
         if self.perf_logger:
             # STRICT: Use actual values or skip logging if missing
-            close_val = row.get('close', 0) if hasattr(row, 'get') else (row['close'] if 'close' in row else 0)
-            volume_val = row.get('volume') if hasattr(row, 'get') else (row['volume'] if 'volume' in row else None)
+            if is_tick:
+                close_val, volume_val = row.price, row.volume
+            else:
+                close_val = row.get('close', 0) if hasattr(row, 'get') else (row['close'] if 'close' in row else 0)
+                volume_val = row.get('volume') if hasattr(row, 'get') else (row['volume'] if 'volume' in row else None)
             self.perf_logger.tick_debug(
                 format_tick_message,
                 get_tick_counter(), 
@@ -830,49 +901,19 @@ class ModularIntradayStrategy:
                 volume_val
             )
         try:
-            # Phase A: Support both dict and pandas inputs (backward compatibility)
-            # New code passes dicts, old code may still pass Series
-            if isinstance(row, pd.DataFrame):
-                if len(row) == 1:
-                    row = row.iloc[0]
-                else:
-                    return row
-            
-            # Convert pandas Series to dict for uniform processing
-            if isinstance(row, pd.Series):
-                row = row.to_dict()
-
-            # GRACEFUL: Extract required price - return safely if missing (live trading resilient)
-            # Extract close price (required) - graceful fallback approach
-            close_price = row.get('close')
-            if close_price is None:
-                close_price = row.get('price')
+            if is_tick:
+                # Live fast path: attribute access, single-price tick (O=H=L=C),
+                # small result dict instead of copying the whole feed record
+                close_price = row.price
+                volume = row.volume
+                updated = {'timestamp': row.timestamp, 'price': close_price, 'volume': volume}
+                if close_price <= 0:
+                    return updated
+                high_price = low_price = open_price = close_price
+            else:
+                close_price, volume, high_price, low_price, open_price, updated = self._prepare_row_input(row)
                 if close_price is None:
-                    # No valid price found - return original row without processing
-                    return row
-            
-            try:
-                close_price = float(close_price)
-            except Exception:
-                return row
-            if close_price <= 0:
-                return row
-
-            # Extract optional fields with sensible defaults for OHLCV
-            volume = row.get('volume', 0)
-            try:
-                volume = int(volume) if volume is not None else 0
-            except Exception:
-                volume = 0
-                
-            # Extract OHLC with fallback to close price
-            high_price = float(row.get('high', close_price) if row.get('high') is not None else close_price)
-            low_price = float(row.get('low', close_price) if row.get('low') is not None else close_price)
-            open_price = float(row.get('open', close_price) if row.get('open') is not None else close_price)
-
-            # Phase A: Build result dict directly (no .copy())
-            # Start with original tick data
-            updated = dict(row)
+                    return updated
             # Add the close price to the updated row for downstream processing
             updated['close'] = close_price
 
@@ -19,8 +19,11 @@ from dataclasses import dataclass, field
 from enum import Enum
 import logging
 import uuid
+import heapq
+import itertools
 from utils.config_helper import ConfigAccessor
 from utils.time_utils import now_ist, is_within_session, apply_buffer_to_time
+from core.tick import Tick
 
 logger = logging.getLogger(__name__)
 
@@ -120,6 +123,51 @@ class Position:
 
     exit_transactions: List[Dict] = field(default_factory=list)
 
+    # Precomputed trigger band: no exit can fire while band_low < price < band_high
+    band_low: float = float('-inf')   # highest stop below price (SL or trailing stop)
+    band_high: float = float('inf')   # lowest pending TP (or trailing activation price)
+    trigger_version: int = 0          # bumps on every re-index; older heap entries are stale
+    open_seq: int = 0                 # open order, keeps same-tick exits in legacy sequence
+
+    def __post_init__(self):
+        self.refresh_trigger_band()
+
+    def refresh_trigger_band(self):
+        """Recompute the next-trigger band after any SL/TP/trailing state change."""
+        low = self.stop_loss_price
+        if self.trailing_activated and self.trailing_stop_price and self.trailing_stop_price > low:
+            low = self.trailing_stop_price
+        high = float('inf')
+        for tp_level, tp_executed in zip(self.tp_levels, self.tp_executed):
+            if not tp_executed and tp_level < high:
+                high = tp_level
+        if self.trailing_enabled and not self.trailing_activated:
+            activation_price = self.entry_price + self.trailing_activation_points
+            if activation_price < high:
+                high = activation_price
+        self.band_low = low
+        self.band_high = high
+
+    def track_high(self, current_price: float) -> bool:
+        """
+        Running-high update for in-band ticks: ratchets an active trailing stop
+        and raises band_low with it (same rule as update_trailing_stop).
+
+        Returns True when an active trailing position made a new high (its
+        trigger index must be refreshed).
+        """
+        if not self.trailing_enabled or current_price <= self.highest_price:
+            return False
+        self.highest_price = current_price
+        if self.trailing_activated:
+            new_stop = current_price - self.trailing_distance_points
+            if new_stop > (self.trailing_stop_price or 0):
+                self.trailing_stop_price = new_stop
+                if new_stop > self.band_low:
+                    self.band_low = new_stop
+            return True
+        return False
+
     def update_unrealized_pnl(self, current_price: float):
         if self.current_quantity > 0:
             self.unrealized_pnl = (current_price - self.entry_price) * self.current_quantity
@@ -170,6 +218,63 @@ class Trade:
         else:
             self.lots_traded = self.quantity
 
+@dataclass
+class PerformanceAggregates:
+    """
+    Running performance totals, updated once per completed trade (add) so the
+    summary is O(1) however many trades the session has. Equity here is
+    realized: initial capital + cumulative net P&L.
+    """
+    initial_capital: float
+    total_trades: int = 0
+    winning_trades: int = 0
+    losing_trades: int = 0
+    total_pnl: float = 0.0
+    gross_profit: float = 0.0  # Sum of winning net P&L
+    gross_loss: float = 0.0  # Sum of losing net P&L (negative)
+    total_commission: float = 0.0
+    max_win: Optional[float] = None  # Largest / smallest net P&L of any trade
+    max_loss: Optional[float] = None
+    peak_equity: float = field(init=False)
+    trough_equity: float = field(init=False)
+    max_drawdown: float = 0.0  # Largest peak-to-trough drop in realized equity
+    win_streak: int = 0  # Current run of winning / losing trades (a flat trade ends both)
+    loss_streak: int = 0
+    max_win_streak: int = 0
+    max_loss_streak: int = 0
+
+    def __post_init__(self):
+        self.peak_equity = self.trough_equity = self.initial_capital
+
+    def add(self, net_pnl: float, commission: float) -> None:
+        self.total_trades += 1
+        self.total_pnl += net_pnl
+        self.total_commission += commission
+        if self.max_win is None or net_pnl > self.max_win:
+            self.max_win = net_pnl
+        if self.max_loss is None or net_pnl < self.max_loss:
+            self.max_loss = net_pnl
+        if net_pnl > 0:
+            self.winning_trades += 1
+            self.gross_profit += net_pnl
+            self.win_streak += 1
+            self.loss_streak = 0
+            self.max_win_streak = max(self.max_win_streak, self.win_streak)
+        elif net_pnl < 0:
+            self.losing_trades += 1
+            self.gross_loss += net_pnl
+            self.loss_streak += 1
+            self.win_streak = 0
+            self.max_loss_streak = max(self.max_loss_streak, self.loss_streak)
+        else:
+            self.win_streak = self.loss_streak = 0
+        equity = self.initial_capital + self.total_pnl
+        if equity > self.peak_equity:
+            self.peak_equity = equity
+        if equity < self.trough_equity:
+            self.trough_equity = equity
+        self.max_drawdown = max(self.max_drawdown, self.peak_equity - equity)
+
 class PositionManager:
     def __init__(self, config: Dict[str, Any], strategy_callback=None, **kwargs):
         # Existing initialization...
@@ -200,8 +305,21 @@ class PositionManager:
 
         self.positions: Dict[str, Position] = {}
         self.completed_trades: List[Trade] = []
+        self.stats = PerformanceAggregates(self.initial_capital)  # Updated per completed trade
         self.daily_pnl = 0.0
         self.session_config = config['session']
+        # Risk trigger index (lazy-invalidated heaps keyed by price, entries: (key, seq, position_id, version))
+        #   _below_heap: max-heap of band_low (SL / trailing stop)   -> fires when price <= key
+        #   _above_heap: min-heap of band_high (TP / trail activation) -> fires when price >= key
+        #   _high_heap:  min-heap of highest_price (active trailing)  -> ratchets when price > key
+        self._below_heap: List[Tuple[float, int, str, int]] = []
+        self._above_heap: List[Tuple[float, int, str, int]] = []
+        self._high_heap: List[Tuple[float, int, str, int]] = []
+        self._trigger_seq = itertools.count()
+        # Per-day session-exit boundary for the scalar fast path (epoch ns, recomputed on day change)
+        self._session_day_start_ns = 0
+        self._session_day_end_ns = 0
+        self._session_exit_ns = 0
         logger.info(f"PositionManager initialized with capital: {self.initial_capital:,}")
 
     def _ensure_timezone(self, dt):
@@ -320,7 +438,9 @@ class PositionManager:
         )
         self.current_capital -= required_capital
         self.reserved_margin += required_capital
+        position.open_seq = next(self._trigger_seq)
         self.positions[position_id] = position
+        self._index_position(position)
         logger.info("Opened position %s", position_id)
         logger.info("Lots: %s (%s total units)", lots, quantity)
         logger.info("Entry price: â‚¹%.2f per unit", actual_entry_price)
@@ -369,6 +489,7 @@ class PositionManager:
             lots_traded=lots_closed
         )
         self.completed_trades.append(trade)
+        self.stats.add(net_pnl, commission)
         position.exit_transactions.append({
             'timestamp': timestamp,
             'price': exit_price,
@@ -443,6 +564,61 @@ class PositionManager:
         if position_id not in self.positions:
             return []
         position = self.positions[position_id]
+        
+        # Fast path: price inside the trigger band - nothing can fire, only track the high
+        if position.band_low < current_price < position.band_high:
+            if position.track_high(current_price):
+                self._index_position(position)
+            return []
+        
+        exits = self._evaluate_exit_conditions(position, current_price)
+        position.refresh_trigger_band()
+        self._index_position(position)
+        return exits
+
+    def _index_position(self, position: Position) -> None:
+        """Push the position's current trigger band into the heaps (older entries become stale)."""
+        position.trigger_version += 1
+        version = position.trigger_version
+        seq = next(self._trigger_seq)
+        pid = position.position_id
+        heapq.heappush(self._below_heap, (-position.band_low, seq, pid, version))
+        if position.band_high != float('inf'):
+            heapq.heappush(self._above_heap, (position.band_high, seq, pid, version))
+        if position.trailing_activated:
+            heapq.heappush(self._high_heap, (position.highest_price, seq, pid, version))
+        # Compact when stale entries dominate (amortized O(1) per push)
+        if len(self._below_heap) > 8 * len(self.positions) + 64:
+            self._rebuild_trigger_index()
+
+    def _rebuild_trigger_index(self) -> None:
+        """Drop stale heap entries by re-indexing only the open positions."""
+        self._below_heap.clear()
+        self._above_heap.clear()
+        self._high_heap.clear()
+        for position in self.positions.values():
+            seq = next(self._trigger_seq)
+            version = position.trigger_version
+            pid = position.position_id
+            self._below_heap.append((-position.band_low, seq, pid, version))
+            if position.band_high != float('inf'):
+                self._above_heap.append((position.band_high, seq, pid, version))
+            if position.trailing_activated:
+                self._high_heap.append((position.highest_price, seq, pid, version))
+        heapq.heapify(self._below_heap)
+        heapq.heapify(self._above_heap)
+        heapq.heapify(self._high_heap)
+
+    def _pop_live(self, heap: List[Tuple[float, int, str, int]]) -> Optional[Position]:
+        """Pop the heap top; return its position if the entry is still current."""
+        _, _, pid, version = heapq.heappop(heap)
+        position = self.positions.get(pid)
+        if position is None or position.trigger_version != version:
+            return None
+        return position
+
+    def _evaluate_exit_conditions(self, position: Position, current_price: float) -> List[Tuple[int, str]]:
+        """Full SL / trailing / TP evaluation (runs only when the trigger band is crossed)."""
         exits = []
         
         # Update trailing stop
@@ -486,8 +662,13 @@ class PositionManager:
         return exits
 
     def process_positions(self, row, timestamp, session_config=None):
-        """Enhanced position processing with session awareness"""
-        current_price = row['close']
+        """Enhanced position processing with session awareness
+
+        Args:
+            row: Live Tick record (uses tick.price) or bar/row with 'close'
+            timestamp: Current timestamp
+        """
+        current_price = row.price if isinstance(row, Tick) else row['close']
         
         # Debug logging
         if len(self.positions) > 0:
@@ -503,9 +684,88 @@ class PositionManager:
                 self.close_position_full(position_id, current_price, timestamp, ExitReason.SESSION_END.value)
             return
         
-        for position_id in list(self.positions.keys()):
-            position = self.positions.get(position_id)
-            if not position or position.status == PositionStatus.CLOSED:
+        self._process_exits(current_price, timestamp)
+
+    def process_price(self, price: float, ts_ns: int, timestamp: Optional[datetime] = None) -> None:
+        """
+        Scalar fast path for live ticks (no pandas, no row objects).
+
+        - Returns immediately when no position is open
+        - Session-end check is one integer comparison against a per-day cached boundary
+        - A datetime is only built from ts_ns (if not given) once an exit actually fires;
+          in-band ticks never construct one
+
+        Args:
+            price: Current traded price
+            ts_ns: Tick time in epoch nanoseconds
+            timestamp: IST-aware datetime of the tick (optional, used for trade records)
+        """
+        if not self.positions:
+            return
+
+        if not (self._session_day_start_ns <= ts_ns < self._session_day_end_ns):
+            self._update_session_boundary(ts_ns)
+
+        if ts_ns >= self._session_exit_ns:
+            timestamp = timestamp or self._ts_from_ns(ts_ns)
+            for position_id in list(self.positions):
+                self.close_position_full(position_id, price, timestamp, ExitReason.SESSION_END.value)
+            return
+
+        self._process_exits(price, timestamp, ts_ns)
+
+    def _ts_from_ns(self, ts_ns: int) -> datetime:
+        from utils.time_utils import IST
+        return datetime.fromtimestamp(ts_ns / 1_000_000_000, IST)
+
+    def _update_session_boundary(self, ts_ns: int) -> None:
+        """Cache the calendar day containing ts_ns and that day's session-exit instant (epoch ns)."""
+        from utils.time_utils import IST
+        day = self._ts_from_ns(ts_ns).date()
+        day_start = IST.localize(datetime.combine(day, time(0, 0)))
+        effective_end = apply_buffer_to_time(
+            time(self.session_config['end_hour'], self.session_config['end_min']),
+            self.session_config['end_buffer_minutes'], is_start=False)
+        session_exit = IST.localize(datetime.combine(day, effective_end))
+        self._session_day_start_ns = int(day_start.timestamp()) * 1_000_000_000
+        self._session_day_end_ns = self._session_day_start_ns + 86_400 * 1_000_000_000
+        self._session_exit_ns = int(session_exit.timestamp()) * 1_000_000_000
+
+    def _process_exits(self, current_price: float, timestamp: Optional[datetime],
+                       ts_ns: Optional[int] = None) -> None:
+        """
+        Run TP/SL/trailing exit checks at one price.
+
+        Only positions whose indexed triggers are crossed are visited: stops at or
+        above the price, targets at or below it, and active trailing stops whose
+        running high is exceeded. In-band positions cost nothing, so per-tick work
+        does not grow with the number of open positions. timestamp may be None
+        (scalar path): it is then built from ts_ns only if a trigger is crossed.
+        """
+        if not self.positions:
+            return
+        
+        crossed: Dict[str, Position] = {}
+        while self._high_heap and self._high_heap[0][0] < current_price:
+            position = self._pop_live(self._high_heap)
+            if position:
+                crossed[position.position_id] = position
+        while self._below_heap and -self._below_heap[0][0] >= current_price:
+            position = self._pop_live(self._below_heap)
+            if position:
+                crossed[position.position_id] = position
+        while self._above_heap and self._above_heap[0][0] <= current_price:
+            position = self._pop_live(self._above_heap)
+            if position:
+                crossed[position.position_id] = position
+        if not crossed:
+            return
+        if timestamp is None:
+            timestamp = self._ts_from_ns(ts_ns)
+        
+        for position in sorted(crossed.values(), key=lambda p: p.open_seq):
+            position_id = position.position_id
+            if position_id not in self.positions or position.status == PositionStatus.CLOSED:
                 continue
             
             exits = self.check_exit_conditions(position_id, current_price, timestamp)
@@ -564,7 +824,18 @@ class PositionManager:
         return trades
 
     def get_performance_summary(self) -> Dict[str, Any]:
-        if not self.completed_trades:
+        """Summary from the running aggregates (O(1) - no pass over completed_trades)."""
+        stats = self.stats
+        extended = {
+            'peak_equity': stats.peak_equity,
+            'trough_equity': stats.trough_equity,
+            'max_drawdown': stats.max_drawdown,
+            'win_streak': stats.win_streak,
+            'loss_streak': stats.loss_streak,
+            'max_win_streak': stats.max_win_streak,
+            'max_loss_streak': stats.max_loss_streak,
+        }
+        if not stats.total_trades:
             return {
                 'total_trades': 0,
                 'winning_trades': 0,
@@ -576,26 +847,23 @@ class PositionManager:
                 'profit_factor': 0.0,
                 'max_win': 0.0,
                 'max_loss': 0.0,
-                'total_commission': 0.0                
+                'total_commission': 0.0,
+                **extended
             }
-        winning_trades = [t for t in self.completed_trades if t.net_pnl > 0]
-        losing_trades = [t for t in self.completed_trades if t.net_pnl < 0]
-        total_pnl = sum(t.net_pnl for t in self.completed_trades)
-        total_commission = sum(t.commission for t in self.completed_trades)
-        gross_profit = sum(t.net_pnl for t in winning_trades)
-        gross_loss = abs(sum(t.net_pnl for t in losing_trades))
+        gross_loss = abs(stats.gross_loss)
         return {
-            'total_trades': len(self.completed_trades),
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(losing_trades),
-            'win_rate': (len(winning_trades) / len(self.completed_trades)) * 100,
-            'total_pnl': total_pnl,
-            'avg_win': gross_profit / len(winning_trades) if winning_trades else 0,
-            'avg_loss': gross_loss / len(losing_trades) if losing_trades else 0,
-            'profit_factor': gross_profit / gross_loss if gross_loss > 0 else 0,
-            'max_win': max(t.net_pnl for t in self.completed_trades),
-            'max_loss': min(t.net_pnl for t in self.completed_trades),
-            'total_commission': total_commission
+            'total_trades': stats.total_trades,
+            'winning_trades': stats.winning_trades,
+            'losing_trades': stats.losing_trades,
+            'win_rate': (stats.winning_trades / stats.total_trades) * 100,
+            'total_pnl': stats.total_pnl,
+            'avg_win': stats.gross_profit / stats.winning_trades if stats.winning_trades else 0,
+            'avg_loss': gross_loss / stats.losing_trades if stats.losing_trades else 0,
+            'profit_factor': stats.gross_profit / gross_loss if gross_loss > 0 else 0,
+            'max_win': stats.max_win,
+            'max_loss': stats.max_loss,
+            'total_commission': stats.total_commission,
+            **extended
         }
 
     def reset(self, initial_capital: Optional[float] = None):
@@ -606,6 +874,8 @@ class PositionManager:
         self.daily_pnl = 0.0
         self.positions.clear()
         self.completed_trades.clear()
+        self.stats = PerformanceAggregates(self.initial_capital)
+        self._rebuild_trigger_index()
         logger.info(f"Position Manager reset with capital: {self.initial_capital:,}")
 
     # Legacy compatibility methods for backtest engine
@@ -749,6 +749,19 @@ class ModularIntradayStrategy:
         
         return True
 
+    def on_position_exit(self, exit_info: Dict):
+        """
+        PositionManager exit callback (same contract as the live strategy).
+        
+        Args:
+            exit_info: Dictionary containing exit details including position_id and exit_reason
+        """
+        # Reset position state to allow new entries
+        position_id = exit_info.get('position_id')
+        if self.current_position == position_id:
+            self.current_position = None
+            self.perf_logger.session_start(f"Position state reset after exit: {position_id} ({exit_info.get('exit_reason')})")
+
     def can_open_long(self, row: pd.Series, timestamp: datetime) -> bool:
         """PRODUCTION INTERFACE: Entry signal detection."""
         try:
@@ -809,6 +822,7 @@ class ModularIntradayStrategy:
             if hasattr(self, 'daily_stats'):
                 self.daily_stats['trades_today'] += 1
             self.last_signal_time = current_time
+            self.current_position = position_id
             
             # Unified position opening logging with quantity details
             qty = 0
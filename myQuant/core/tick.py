@@ -0,0 +1,92 @@
+"""
+core/tick.py - Slotted tick record for the live hot path
+
+A single Tick object is created once per market update and carried unchanged
+through websocket -> broker -> trader -> strategy -> position manager.
+
+Design:
+- __slots__ only: no per-instance __dict__, no per-tick dict allocation
+- Attribute access on the hot path (tick.price, tick.timestamp)
+- Integer nanosecond timestamps for latency accounting (exchange vs receive)
+- Monotonic receive stamp (mono_ns, perf_counter_ns) for in-process stage latency
+- Raw feed message is NOT retained unless explicitly requested (live.retain_raw_tick)
+- Minimal read-only mapping view (tick['price'], tick.get(...), 'timestamp' in tick)
+  so legacy dict consumers (scripts, GUI, CSV logging) keep working unchanged
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+class Tick:
+    """One market update. Mutable by attribute, never re-created along the path."""
+
+    __slots__ = ('timestamp', 'ts_ns', 'price', 'volume', 'symbol_id', 'symbol',
+                 'exchange_ts_ns', 'last_trade_ts_ns', 'recv_ts_ns', 'mono_ns', 'seq', 'raw')
+
+    # Keys exposed through the legacy mapping view (matches the former tick dict)
+    _MAPPING_KEYS = ('timestamp', 'price', 'volume', 'symbol')
+
+    def __init__(self, timestamp: datetime, price: float, volume: int = 0,
+                 symbol_id: int = 0, symbol: str = "",
+                 exchange_ts_ns: int = 0, recv_ts_ns: int = 0,
+                 ts_ns: int = 0, raw: Optional[Dict[str, Any]] = None, mono_ns: int = 0,
+                 last_trade_ts_ns: int = 0, seq: int = 0):
+        """
+        Args:
+            timestamp: IST-aware tick time (session clock)
+            price: Last traded price in rupees
+            volume: Traded volume
+            symbol_id: Numeric instrument token (0 if unknown)
+            symbol: Trading symbol (display/logging only)
+            exchange_ts_ns: Exchange timestamp in epoch ns (0 if feed does not provide it)
+            recv_ts_ns: Local receive time in epoch ns (0 if not measured)
+            ts_ns: Tick time in epoch ns (derived from timestamp when 0)
+            raw: Original feed message - only kept when raw retention is enabled
+            mono_ns: Local receive time on the perf_counter_ns clock (0 if not stamped)
+            last_trade_ts_ns: Last traded time in epoch ns (SnapQuote only, 0 otherwise)
+            seq: Feed sequence number (SmartAPI packet sequence_number, 0 if not provided)
+        """
+        self.timestamp = timestamp
+        self.price = price
+        self.volume = volume
+        self.symbol_id = symbol_id
+        self.symbol = symbol
+        self.exchange_ts_ns = exchange_ts_ns
+        self.recv_ts_ns = recv_ts_ns
+        self.ts_ns = ts_ns or int(timestamp.timestamp() * 1_000_000_000)
+        self.raw = raw
+        self.mono_ns = mono_ns
+        self.last_trade_ts_ns = last_trade_ts_ns
+        self.seq = seq
+
+    # ---- Legacy read-only mapping view (not used on the hot path) ----
+
+    def __getitem__(self, key: str) -> Any:
+        if key in Tick._MAPPING_KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in Tick._MAPPING_KEYS
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in Tick._MAPPING_KEYS:
+            return getattr(self, key)
+        return default
+
+    def keys(self):
+        return list(Tick._MAPPING_KEYS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict copy for DataFrame/CSV consumers."""
+        return {
+            'timestamp': self.timestamp,
+            'price': self.price,
+            'volume': self.volume,
+            'symbol': self.symbol,
+        }
+
+    def __repr__(self) -> str:
+        return (f"Tick(timestamp={self.timestamp}, price={self.price}, volume={self.volume}, "
+                f"symbol_id={self.symbol_id}, symbol={self.symbol!r})")
@@ -22,6 +22,7 @@ import subprocess
 import os
 import json
 import threading
+import queue
 import logging
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
@@ -43,7 +44,7 @@ from live.trader import LiveTrader
 from live.forward_test_results import ForwardTestResults
 
 from config.defaults import DEFAULT_CONFIG
-from utils.logger import setup_from_config
+from utils.logger import setup_from_config, add_log_handler, remove_log_handler
 
 # Build, validate and freeze the canonical config (FAIL-FAST if defaults are invalid).
 # This ensures setup_from_config receives a proper MappingProxyType.
@@ -255,6 +256,12 @@ class UnifiedTradingGUI(tk.Tk):
         # Data / misc placeholders
         self.bt_data_file = tk.StringVar(value="")
 
+        # Backtest worker: progress line, cancel flag and the worker -> Tk channel
+        self.bt_progress_text = tk.StringVar(value="")
+        self.bt_cancel_event = None
+        self.bt_channel = None
+        self.bt_thread = None
+
         # Logger UI placeholders
         self.logger_levels = {}
         for logger_name in ["core.indicators", "core.researchStrategy", "backtest.backtest_runner", "utils.simple_loader"]:
@@ -335,6 +342,7 @@ class UnifiedTradingGUI(tk.Tk):
         live_config = self.runtime_config.get('live', {})
         self.ft_exchange = tk.StringVar(value=str(instrument_config['exchange']))
         self.ft_feed_type = tk.StringVar(value=live_config.get('feed_type', 'LTP'))
+        self.ft_use_process_topology = tk.BooleanVar(value=live_config.get('process_topology', False))
 
         # Forward Test UI-only variables (status displays - can be hardcoded)
         self.ft_symbol = tk.StringVar()  # Selected dynamically
@@ -1087,6 +1095,9 @@ class UnifiedTradingGUI(tk.Tk):
                                   "📊 Polling Mode: Queue-based processing (~70ms latency, proven stable)", 
                              font=('TkDefaultFont', 8), foreground='gray', justify='left')
         perf_help.grid(row=1, column=0, columnspan=2, sticky="w", padx=5, pady=(0,5))
+
+        ttk.Checkbutton(perf_frame, text="🧩 Separate feed/trading processes (GUI only polls status)",
+                        variable=self.ft_use_process_topology).grid(row=2, column=0, columnspan=2, sticky="w", padx=5, pady=(0,5))
         row += 1
 
         # Add separator between Performance and Capital Management
@@ -1184,15 +1195,110 @@ class UnifiedTradingGUI(tk.Tk):
             if not data_path:
                 messagebox.showerror("Missing Data", "Please select a data file for backtest.")
                 return
- 
-            # Construct runner with frozen config (strict)
-            runner = BacktestRunner(config=frozen_config, data_path=data_path)
-            results = runner.run()
-            self.display_backtest_results(results)
+            if self.bt_thread is not None and self.bt_thread.is_alive():
+                messagebox.showwarning("Backtest Running", "A backtest is already running - cancel it or wait for it to finish.")
+                return
+
+            # Run on a worker thread; the Tk thread only drains the channel (_bt_poll_backtest)
+            channel = queue.Queue()
+            cancel_event = threading.Event()
+
+            def run_backtest_worker():
+                try:
+                    # Construct runner with frozen config (strict)
+                    runner = BacktestRunner(config=frozen_config, data_path=data_path,
+                                            progress_callback=lambda p: channel.put(('progress', p)),
+                                            cancel_event=cancel_event)
+                    results = runner.run()
+                    channel.put(('done', (results, runner.cancelled)))
+                except Exception as e:
+                    logger.exception("Backtest run failed: %s", e)
+                    channel.put(('error', e))
+
+            self.bt_channel = channel
+            self.bt_cancel_event = cancel_event
+            self.bt_thread = threading.Thread(target=run_backtest_worker, name="backtest-worker", daemon=True)
+            self._bt_set_running(True)
+            self.bt_progress_text.set("Starting backtest...")
+            self.bt_thread.start()
+            self.after(100, self._bt_poll_backtest)
         except Exception as e:
             logger.exception("Backtest run failed: %s", e)
             messagebox.showerror("Backtest Error", f"Backtest failed: {e}")
 
+    def _bt_cancel_backtest(self):
+        """Ask the running backtest to stop; it flattens positions and returns partial results"""
+        if self.bt_cancel_event is not None and self.bt_thread is not None and self.bt_thread.is_alive():
+            self.bt_cancel_event.set()
+            self.bt_progress_text.set(self.bt_progress_text.get() + "  - cancelling...")
+            if hasattr(self, 'bt_cancel_button'):
+                self.bt_cancel_button.config(state='disabled')
+
+    def _bt_set_running(self, running):
+        """Toggle Run / Cancel buttons for the backtest worker"""
+        if hasattr(self, 'bt_run_button'):
+            self.bt_run_button.config(state='disabled' if running else 'normal')
+        if hasattr(self, 'bt_cancel_button'):
+            self.bt_cancel_button.config(state='normal' if running else 'disabled')
+
+    def _bt_poll_backtest(self):
+        """Drain the backtest worker's channel on the Tk thread (never blocks), then reschedule"""
+        channel = self.bt_channel
+        if channel is None:
+            return
+        # Sampled before draining: a dead worker has already posted everything it ever will
+        worker_alive = self.bt_thread is not None and self.bt_thread.is_alive()
+        while True:
+            try:
+                kind, payload = channel.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                self.bt_progress_text.set(self._bt_format_progress(payload))
+                if hasattr(self, 'bt_progress_bar') and payload['total_rows']:
+                    self.bt_progress_bar['value'] = 100.0 * payload['rows_processed'] / payload['total_rows']
+            elif kind == 'done':
+                results, cancelled = payload
+                self._bt_finish()
+                if cancelled:
+                    self.bt_progress_text.set(self.bt_progress_text.get() + "  - cancelled (partial results)")
+                    self.display_backtest_results(results, title="Backtest Results (partial - cancelled)")
+                else:
+                    self.display_backtest_results(results)
+                return
+            elif kind == 'error':
+                self._bt_finish()
+                self.bt_progress_text.set(f"Backtest failed: {payload}")
+                messagebox.showerror("Backtest Error", f"Backtest failed: {payload}")
+                return
+        if not worker_alive:
+            # Worker died without reporting (e.g. BaseException) - don't poll forever with Run disabled
+            self._bt_finish()
+            self.bt_progress_text.set("Backtest failed: worker stopped without a result")
+            messagebox.showerror("Backtest Error", "Backtest failed: the worker thread stopped without a result (see log)")
+            return
+        self.after(100, self._bt_poll_backtest)
+
+    def _bt_finish(self):
+        """Reset worker state once the backtest thread has reported done / error"""
+        self.bt_channel = None
+        self.bt_cancel_event = None
+        self.bt_thread = None
+        self._bt_set_running(False)
+
+    @staticmethod
+    def _bt_format_progress(progress):
+        """One-line status for a BacktestRunner progress snapshot"""
+        phase = progress['phase']
+        if phase == 'trading':
+            return (f"Rows {progress['rows_processed']:,}/{progress['total_rows']:,}  "
+                    f"{progress['ticks_per_sec']:,.0f} ticks/s  Signals: {progress['signals']}  "
+                    f"Trades: {progress['trades']} ({progress['closed_trades']} closed, "
+                    f"P&L {progress['net_pnl']:,.2f})  {progress['elapsed_s']:.1f}s")
+        labels = {'loading': "Loading data...", 'indicators': "Calculating indicators...",
+                  'results': "Building results / export...", 'done': "Backtest complete"}
+        return labels.get(phase, phase)
+
     def _validate_nested_config(self, config):
         """Validate the nested configuration structure"""
         required_sections = ['strategy', 'risk', 'capital', 'instrument', 'session']
@@ -1201,12 +1307,12 @@ class UnifiedTradingGUI(tk.Tk):
                 raise ValueError(f"Missing required configuration section: {section}")
         logger.info("Configuration validation passed")
 
-    def display_backtest_results(self, results):
+    def display_backtest_results(self, results, title="Backtest Results"):
         """Display backtest results in the results box"""
         if hasattr(self, 'bt_result_box'):
             self.bt_result_box.config(state="normal")
             self.bt_result_box.delete(1.0, tk.END)
-            self.bt_result_box.insert(tk.END, f"Backtest Results:\n{results}\n")
+            self.bt_result_box.insert(tk.END, f"{title}:\n{results}\n")
             self.bt_result_box.config(state="disabled")
 
     def _merge_user_preferences_into_runtime_config(self):
@@ -1979,8 +2085,16 @@ class UnifiedTradingGUI(tk.Tk):
         button_frame = ttk.Frame(parent)
         button_frame.grid(row=0, column=0, columnspan=2, sticky='ew', pady=(5,10))
         
-        # Run button
-        ttk.Button(button_frame, text="Run Backtest", command=self._bt_run_backtest, style='RunBacktest.TButton').pack(side='left')
+        # Run / Cancel buttons (backtest runs on a worker thread)
+        self.bt_run_button = ttk.Button(button_frame, text="Run Backtest", command=self._bt_run_backtest, style='RunBacktest.TButton')
+        self.bt_run_button.pack(side='left')
+        self.bt_cancel_button = ttk.Button(button_frame, text="Cancel", command=self._bt_cancel_backtest, state='disabled')
+        self.bt_cancel_button.pack(side='left', padx=(5, 0))
+
+        # Progress: bar + rows / ticks/s / signals / trades from the worker
+        self.bt_progress_bar = ttk.Progressbar(button_frame, mode='determinate', maximum=100, length=160)
+        self.bt_progress_bar.pack(side='left', padx=(10, 0))
+        ttk.Label(button_frame, textvariable=self.bt_progress_text).pack(side='left', padx=(10, 0))
 
     def _build_monitor_tab(self):
         """Build the dedicated monitoring tab for forward test visual feedback"""
@@ -2148,9 +2262,8 @@ class UnifiedTradingGUI(tk.Tk):
             # Set level to INFO to avoid too much debug noise in GUI
             self.gui_log_handler.setLevel(logging.INFO)
             
-            # Add handler to root logger
-            root_logger = logging.getLogger()
-            root_logger.addHandler(self.gui_log_handler)
+            # Add handler to the logging pipeline (listener thread when async logging is on)
+            add_log_handler(self.gui_log_handler)
             
         except Exception as e:
             logger.error(f"Failed to setup GUI logging: {e}")
@@ -2468,14 +2581,15 @@ class UnifiedTradingGUI(tk.Tk):
         # Update instrument settings from forward test GUI (lot_size comes from SSOT, not GUI)
         # Note: lot_size is read-only and sourced from instrument_mappings
 
-        # Add live trading specific configuration
-        config_dict['live'] = {
+        # Add live trading specific configuration (on top of the defaults.py live section)
+        config_dict['live'].update({
             'feed_type': self.ft_feed_type.get(),
             'paper_trading': True,  # Always use paper trading for safety
             'max_positions': int(self.ft_max_positions.get()),
             'reconnect_attempts': 3,
-            'tick_timeout': 30
-        }
+            'tick_timeout': 30,
+            'process_topology': self.ft_use_process_topology.get()
+        })
         
         # Load SmartAPI credentials for live data streaming (required for both live and paper trading)
         from config.defaults import load_live_trading_credentials
@@ -2607,6 +2721,11 @@ class UnifiedTradingGUI(tk.Tk):
             setup_from_config(ft_frozen_config)
             logger.info("✅ Logging reconfigured with fresh user configuration")
             
+            # Separate feed/trading processes: this process only polls status snapshots
+            if ft_frozen_config['live']['process_topology']:
+                self._ft_start_process_topology(ft_frozen_config, config_text)
+                return
+            
             # Create LiveTrader with frozen config and dialog text
             try:
                 trader = LiveTrader(frozen_config=ft_frozen_config, dialog_text=config_text)
@@ -2686,6 +2805,57 @@ class UnifiedTradingGUI(tk.Tk):
     
 
     
+    def _ft_start_process_topology(self, ft_frozen_config, config_text):
+        """Launch feed and trading processes; status arrives via _ft_poll_process_topology."""
+        from live.process_topology import ProcessTopology
+        try:
+            topology = ProcessTopology(ft_frozen_config, dialog_text=config_text)
+            topology.start()
+        except Exception as e:
+            logger.exception(f"Failed to start process topology: {e}")
+            messagebox.showerror("Process Topology Error", f"Could not start feed/trading processes: {e}")
+            self._update_ft_status(connection="🔴 Disconnected", trading="❌ Failed")
+            return
+        self.active_topology = topology
+        self._ft_topology_interval_ms = max(100, int(ft_frozen_config['live']['status_snapshot_interval'] * 1000))
+        self._update_ft_result_box(f"🧩 Feed process pid {topology.feed_process.pid}, "
+                                   f"trading process pid {topology.trading_process.pid}\n", "live")
+        self._update_ft_status(connection="🟢 Connected", trading="▶️ Active")
+        self.after(self._ft_topology_interval_ms, self._ft_poll_process_topology)
+
+    def _ft_poll_process_topology(self):
+        """Tk after() poll: show the latest trading-process snapshot, finish when it exits."""
+        topology = getattr(self, 'active_topology', None)
+        if topology is None:
+            return
+        status = topology.read_status()
+        if status:
+            total_pnl = (status.get('performance') or {}).get('total_pnl', 0.0)
+            self._update_ft_status(
+                price=status.get('last_price'),
+                position="📈 Position Open" if status.get('position_open') else "📭 No Position",
+                pnl=total_pnl,
+                tick_count=status.get('ticks'),
+                # P&L-based, as _update_performance_summary (status 'capital' includes reservations)
+                current_capital=topology.config['capital']['initial_capital'] + total_pnl
+            )
+        if topology.is_alive():
+            self.after(self._ft_topology_interval_ms, self._ft_poll_process_topology)
+            return
+        # Trading process has exported its results and exited (file finished or stop requested)
+        self.active_topology = None
+        try:
+            topology.stop()
+        except Exception as e:
+            logger.warning(f"Process topology cleanup failed: {e}")
+        exitcode = topology.trading_process.exitcode
+        if exitcode == 0:
+            self._update_ft_result_box("⏹️ Forward test finished - results exported by the trading process.\n", "live")
+            self._update_ft_status(connection="🔴 Disconnected", trading="⏸️ Stopped")
+        else:
+            self._update_ft_result_box(f"❌ Trading process exited with code {exitcode}\n", "live")
+            self._update_ft_status(connection="🔴 Disconnected", trading="❌ Failed")
+
     def _update_ft_result_box(self, message, tab="live"):
         """Thread-safe update of forward test result boxes"""
         try:
@@ -2797,6 +2967,8 @@ class UnifiedTradingGUI(tk.Tk):
         lines.append(f"Winning Trades:      {perf_data['winning_trades']}")
         lines.append(f"Losing Trades:       {perf_data['losing_trades']}")
         lines.append(f"Win Rate:            {perf_data['win_rate']:.1f}%")
+        lines.append(f"Streak (now/max):    {perf_data['win_streak']}W {perf_data['loss_streak']}L / "
+                     f"{perf_data['max_win_streak']}W {perf_data['max_loss_streak']}L")
         lines.append("")
         
         # Financial Summary
@@ -2825,6 +2997,8 @@ class UnifiedTradingGUI(tk.Tk):
         lines.append(f"Initial Capital:     ₹{initial_capital:,.2f}")
         lines.append(f"Current Capital:     ₹{current_capital:,.2f}")
         lines.append(f"Capital Change:      ₹{capital_change:,.2f} ({capital_change_pct:+.2f}%)")
+        lines.append(f"Peak / Trough:       ₹{perf_data['peak_equity']:,.2f} / ₹{perf_data['trough_equity']:,.2f}")
+        lines.append(f"Max Drawdown:        ₹{perf_data['max_drawdown']:,.2f}")
         lines.append("")
         
         # Trade Details (if any trades exist)
@@ -2863,7 +3037,22 @@ class UnifiedTradingGUI(tk.Tk):
     def _ft_stop_forward_test(self):
         """Stop running forward test with proper thread cleanup - requires user confirmation"""
         try:
-            if hasattr(self, 'active_trader') and self.active_trader:
+            if getattr(self, 'active_topology', None) is not None:
+                confirm = messagebox.askyesno(
+                    "⚠️ Confirm Stop",
+                    "Stop the feed and trading processes?\n\n"
+                    "✓ Position will be force-closed safely.\n"
+                    "✓ The trading process exports results before exiting.",
+                    icon='warning'
+                )
+                if not confirm:
+                    logger.info("❌ Stop cancelled by user - processes continue")
+                    return
+                logger.info("🛑 User confirmed stop - signalling feed/trading processes...")
+                self._update_ft_status(connection="🟡 Disconnecting...", trading="⏹️ Stopping...")
+                # Non-blocking: _ft_poll_process_topology finishes up once the trading process exits
+                self.active_topology.request_stop()
+            elif hasattr(self, 'active_trader') and self.active_trader:
                 # CRITICAL: Ask for user confirmation before stopping
                 # Robustness priority - avoid accidental disconnection
                 confirm = messagebox.askyesno(
@@ -3369,8 +3558,7 @@ class UnifiedTradingGUI(tk.Tk):
         try:
             # Remove GUI log handler to prevent memory leaks
             if hasattr(self, 'gui_log_handler'):
-                root_logger = logging.getLogger()
-                root_logger.removeHandler(self.gui_log_handler)
+                remove_log_handler(self.gui_log_handler)
         except Exception as e:
             logger.error(f"Error cleaning up GUI log handler: {e}")
         finally:
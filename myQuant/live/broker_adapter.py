@@ -33,14 +33,12 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Callable
 
-from utils.time_utils import now_ist, normalize_datetime_to_ist, IST
+from utils.time_utils import now_ist, normalize_datetime_to_ist, create_clock, set_clock, get_clock, WallClock
+from core.tick import Tick
+from live.feed_latency import FeedLatencyMonitor
 
 from types import MappingProxyType
 
-# Set tick log directory to user's Desktop BotResults folder
-TICK_LOG_DIR = Path(r"C:\Users\user\Desktop\BotResults\LiveTickPrice")
-TICK_LOG_DIR.mkdir(parents=True, exist_ok=True)
-
 logger = logging.getLogger(__name__)
 
 # Phase 1.5: Pre-convergence instrumentation
@@ -53,11 +51,14 @@ def set_pre_convergence_instrumentor(instrumentor):
     logger.info(f"🔬 [BROKER_ADAPTER] Instrumentor SET: {instrumentor is not None}, Type: {type(instrumentor).__name__ if instrumentor else 'None'}")
 
 class BrokerAdapter:
-    def __init__(self, config: MappingProxyType = None):
+    def __init__(self, config: MappingProxyType = None, queue_ticks: bool = True):
         """Initialize BrokerAdapter with frozen config from upstream
         
         Args:
             config: Frozen MappingProxyType config from LiveTrader
+            queue_ticks: Keep the in-process tick_buffer / df_tick for get_next_tick()
+                consumers. False when every tick leaves through on_tick_callback only
+                (ProcessTopology feed process) - nothing would ever drain the buffer.
         """
         if config is None:
             raise ValueError("BrokerAdapter requires frozen config from upstream (LiveTrader)")
@@ -91,6 +92,8 @@ class BrokerAdapter:
 
         # Data streaming components
         self.tick_buffer = queue.Queue(maxsize=1000)  # Thread-safe queue (no lock needed)
+        self.queue_ticks = queue_ticks
+        self.dropped_ticks = 0  # WebSocket ticks evicted from a full tick_buffer
         self.df_tick = pd.DataFrame(columns=["timestamp", "price", "volume"])
         self.last_price: float = 0.0
         self.connection = None
@@ -107,6 +110,23 @@ class BrokerAdapter:
         # Direct callback support (Wind-style, optional)
         self.on_tick_callback: Optional[Callable] = None
         
+        # Risk-first exits (optional): position manager runs on the feed thread
+        # before the tick is queued or handed to the strategy
+        self.risk_first_exits = self.live_params["risk_first_exits"]
+        self.risk_position_manager = None
+        # Serializes position manager changes across the feed, trading and heartbeat threads.
+        # Never held around strategy.on_tick (LiveTrader queues exit notifications for its tick
+        # thread), so risk-first exits do not wait for indicator work. Re-entrant:
+        # close_position runs inside tick handling.
+        self.risk_lock = threading.RLock()
+        
+        # Exchange -> receive feed delay per symbol (tells feed lag apart from our own pipeline)
+        self.feed_latency = FeedLatencyMonitor(
+            window=self.live_params["feed_latency_window"],
+            alert_ms=self.live_params["feed_lag_alert_ms"],
+            alert_ticks=self.live_params["feed_lag_alert_ticks"]
+        ) if self.live_params["feed_latency_monitor"] else None
+        
         # Auto-recovery settings
         self.reconnect_attempts = 0
         self.max_reconnect_attempts = 3
@@ -121,14 +141,19 @@ class BrokerAdapter:
         self._init_tick_logging(config)
         
         # Optional file simulation (ONLY when explicitly enabled by user)
+        # Clock: live data always runs on the wall clock; file simulation may use
+        # a replay clock driven by the file's timestamps (live.clock_mode)
+        self.clock = WallClock()
         self.file_simulator = None
         if config.get('data_simulation', {}).get('enabled', False):
             file_path = config.get('data_simulation', {}).get('file_path', '')
             if file_path:
                 from live.data_simulator import DataSimulator
-                # DataSimulator only takes file_path parameter
-                self.file_simulator = DataSimulator(file_path)
-                logger.info(f"File simulation enabled with: {file_path}")
+                self.clock = create_clock(self.live_params["clock_mode"])
+                self.file_simulator = DataSimulator(file_path, clock=self.clock)
+                logger.info(f"File simulation enabled with: {file_path} (clock: {self.live_params['clock_mode']})")
+        # Install as the SSOT clock read by now_ist() across trader/strategy/position manager
+        set_clock(self.clock)
 
         # Dynamic imports for SmartAPI
         try:
@@ -163,6 +188,14 @@ class BrokerAdapter:
                 logger.info("📁 File simulation mode: tick logging disabled (source file already exists)")
                 return
             
+            tick_log_dir = self.live_params['tick_log_dir']
+            if not tick_log_dir:
+                self.tick_logging_enabled = False
+                self.tick_file = None
+                self.tick_writer = None
+                logger.info("Live tick logging off (live.tick_log_dir is empty)")
+                return
+            
             # Generate session-based filename with symbol and session end time
             date = datetime.now().strftime("%Y%m%d")
             eh, em = config['session']['end_hour'], config['session']['end_min']
@@ -170,7 +203,8 @@ class BrokerAdapter:
             fname = f"livePrice_{symbol_clean}_{date}_{eh:02d}{em:02d}.csv"
             
             # Open file with buffered I/O for performance
-            tick_log_path = TICK_LOG_DIR / fname
+            Path(tick_log_dir).mkdir(parents=True, exist_ok=True)
+            tick_log_path = Path(tick_log_dir) / fname
             self.tick_file = tick_log_path.open("w", newline="", encoding="utf-8", buffering=8192)
             self.tick_writer = csv.writer(self.tick_file)
             
@@ -254,15 +288,16 @@ class BrokerAdapter:
         # Attempt connection with retry logic
         self._connect_with_retry()
 
-    def get_next_tick(self) -> Optional[Dict[str, Any]]:
+    def get_next_tick(self) -> Optional[Tick]:
         """Fetch next tick from live SmartAPI connection (WebSocket preferred, polling fallback)."""
         
         # File simulation mode (user-enabled only)
         if self.file_simulator:
             tick = self.file_simulator.get_next_tick()
             if tick:
-                self.last_price = tick['price']
-                self._buffer_tick(tick)
+                self.last_price = tick.price
+                if self.queue_ticks:
+                    self._buffer_tick(tick)
             return tick
         
         # Priority 1: WebSocket streaming (real-time) - ONLY mode when WebSocket is active
@@ -271,7 +306,7 @@ class BrokerAdapter:
                 try:
                     # Non-blocking get from thread-safe queue (no lock needed)
                     tick = self.tick_buffer.get_nowait()
-                    self.last_price = tick['price']
+                    self.last_price = tick.price
                     return tick
                 except queue.Empty:
                     # WebSocket is active but buffer is empty - return None (don't poll)
@@ -289,14 +324,14 @@ class BrokerAdapter:
         logger.warning("WebSocket inactive and polling disabled - no data available")
         return None
 
-    def _buffer_tick(self, tick: Dict[str, Any]):
+    def _buffer_tick(self, tick: Tick):
         """Buffer each tick for historical df_tick tracking (file simulation only)"""
         # Update historical dataframe for compatibility with existing code
         # Fix pandas warning: avoid concatenating empty DataFrame
         if len(self.df_tick) == 0:
-            self.df_tick = pd.DataFrame([tick])
+            self.df_tick = pd.DataFrame([tick.to_dict()])
         else:
-            self.df_tick = pd.concat([self.df_tick, pd.DataFrame([tick])], ignore_index=True)
+            self.df_tick = pd.concat([self.df_tick, pd.DataFrame([tick.to_dict()])], ignore_index=True)
         if len(self.df_tick) > 2500:
             self.df_tick = self.df_tick.tail(2000)  # Keep last 2000 for memory management
         
@@ -325,6 +360,9 @@ class BrokerAdapter:
         # Close tick logging file
         self._close_tick_logging()
         
+        if self.feed_latency is not None:
+            self.feed_latency.log_summary()
+        
         # Clean up WebSocket connection first
         if self.ws_streamer:
             try:
@@ -346,6 +384,17 @@ class BrokerAdapter:
         self.streaming_mode = False
         self.feed_active = False
 
+    def restore_wall_clock(self) -> None:
+        """
+        Reinstall the wall clock once the session is over (after finalize/export,
+        which still read session time). set_clock() is process-global, so a
+        ReplayClock left installed would put the next session in the same
+        process (e.g. the GUI) on replay time.
+        """
+        if get_clock() is self.clock and not isinstance(self.clock, WallClock):
+            set_clock(WallClock())
+            logger.info("Replay clock released - now_ist() back on the wall clock")
+
     # Additional methods would be implemented here for full functionality...
     def _connect_with_retry(self):
         """Establish SmartAPI connection with retry logic for live data streaming"""
@@ -453,7 +502,11 @@ class BrokerAdapter:
                 auth_token=session_info['jwt_token'],  # Add missing auth_token
                 symbol_tokens=symbol_tokens,
                 feed_type=live.get('feed_type', 'LTP'),
-                on_tick=self._handle_websocket_tick
+                on_tick=self._handle_websocket_tick,
+                retain_raw=live['retain_raw_tick'],
+                binary_decode=live['ws_binary_decode'],
+                record_frames_path=live['ws_record_frames'],
+                ws_url=live['ws_url']
             )
             
             # Start WebSocket in background thread
@@ -466,6 +519,30 @@ class BrokerAdapter:
             logger.info("📊 Falling back to polling mode")
             self.streaming_mode = False
     
+    def get_feed_latency_report(self) -> Dict[str, Any]:
+        """Per-symbol exchange->receive delay report ({} when live.feed_latency_monitor is off)."""
+        return self.feed_latency.get_report() if self.feed_latency is not None else {}
+    
+    def attach_risk_engine(self, position_manager) -> None:
+        """
+        Register the position manager for risk-first exit evaluation.
+        
+        No-op unless live.risk_first_exits is enabled. Exits are evaluated on the
+        WebSocket thread with the position manager's O(1) trigger check, so stop-outs
+        do not wait for indicator updates, signal evaluation or GUI contention.
+        """
+        if self.risk_first_exits:
+            self.risk_position_manager = position_manager
+            logger.info("🛡️ Risk-first exit evaluation enabled (feed thread)")
+    
+    def _risk_first_check(self, tick: Tick) -> None:
+        """Run TP/SL/trailing exits for one tick ahead of strategy processing."""
+        try:
+            with self.risk_lock:
+                self.risk_position_manager.process_price(tick.price, tick.ts_ns, tick.timestamp)
+        except Exception as e:
+            logger.error(f"Error in risk-first exit evaluation: {e}")
+    
     def _handle_websocket_tick(self, tick, symbol):
         """Handle incoming WebSocket tick data with hybrid approach
         
@@ -484,6 +561,17 @@ class BrokerAdapter:
                     logger.warning("🔬 [BROKER_ADAPTER._handle_websocket_tick] Instrumentor is NONE during tick processing")
                     self._instrumentor_warning_logged = True
             
+            if self.feed_latency is not None:
+                self.feed_latency.observe(tick)
+            
+            # Risk-first: SL/TP/trailing exits fire before any queue/strategy work
+            if self.risk_position_manager is not None and self.risk_position_manager.positions:
+                if _pre_convergence_instrumentor:
+                    with _pre_convergence_instrumentor.measure_broker('risk_first'):
+                        self._risk_first_check(tick)
+                else:
+                    self._risk_first_check(tick)
+            
             # Phase 1.5: Measure counter initialization and logging
             if _pre_convergence_instrumentor:
                 with _pre_convergence_instrumentor.measure_broker('tick_counting'):
@@ -508,26 +596,19 @@ class BrokerAdapter:
             
             # Log outside of measurement to avoid polluting metrics
             if should_log and not _pre_convergence_instrumentor:
-                logger.info(f"🌐 [BROKER] WebSocket tick #{self._broker_tick_count} received, price: ₹{tick.get('price', 'N/A')}")
+                logger.info(f"🌐 [BROKER] WebSocket tick #{self._broker_tick_count} received, price: ₹{tick.price}")
             
             # Phase 1.5: Measure timestamp operations
             if _pre_convergence_instrumentor:
                 with _pre_convergence_instrumentor.measure_broker('timestamp_ops'):
-                    # Add timestamp if not present
-                    if 'timestamp' not in tick:
-                        tick['timestamp'] = pd.Timestamp.now(tz=IST)
-                    
+                    # Tick record always carries its timestamp (set once in the streamer)
                     # Update state (no lock needed - simple assignment is atomic)
-                    self.last_price = float(tick.get('price', tick.get('ltp', 0)))
-                    self.last_tick_time = pd.Timestamp.now(tz=IST)
+                    self.last_price = tick.price
+                    self.last_tick_time = tick.timestamp
             else:
-                # Add timestamp if not present
-                if 'timestamp' not in tick:
-                    tick['timestamp'] = pd.Timestamp.now(tz=IST)
-                
                 # Update state (no lock needed - simple assignment is atomic)
-                self.last_price = float(tick.get('price', tick.get('ltp', 0)))
-                self.last_tick_time = pd.Timestamp.now(tz=IST)
+                self.last_price = tick.price
+                self.last_tick_time = tick.timestamp
             
             # Phase 1.5: Measure CSV logging
             if _pre_convergence_instrumentor:
@@ -539,7 +620,9 @@ class BrokerAdapter:
                 self._log_tick_to_csv(tick, symbol)
             
             # Phase 1.5: Measure queue operations
-            if _pre_convergence_instrumentor:
+            if not self.queue_ticks:
+                pass  # Callback-only consumer (feed process): no in-process buffer to fill
+            elif _pre_convergence_instrumentor:
                 with _pre_convergence_instrumentor.measure_broker('queue_ops'):
                     # Option 2: Queue for polling (backwards compatible)
                     # Always queue tick for backwards compatibility with trader.py
@@ -547,6 +630,7 @@ class BrokerAdapter:
                         self.tick_buffer.put_nowait(tick)
                     except queue.Full:
                         # Queue full, drop oldest tick and retry
+                        self.dropped_ticks += 1
                         try:
                             self.tick_buffer.get_nowait()  # Drop oldest
                             self.tick_buffer.put_nowait(tick)  # Add new
@@ -559,6 +643,7 @@ class BrokerAdapter:
                     self.tick_buffer.put_nowait(tick)
                 except queue.Full:
                     # Queue full, drop oldest tick and retry
+                    self.dropped_ticks += 1
                     try:
                         self.tick_buffer.get_nowait()  # Drop oldest
                         self.tick_buffer.put_nowait(tick)  # Add new
@@ -617,9 +702,9 @@ class BrokerAdapter:
         if self.tick_logging_enabled and self.tick_writer:
             try:
                 # Extract essential tick data efficiently
-                timestamp = tick.get('timestamp', datetime.now())
-                price = tick.get('price', tick.get('ltp', 0))
-                volume = tick.get('volume', 0)
+                timestamp = tick.timestamp
+                price = tick.price
+                volume = tick.volume
                 
                 # Write row (buffered, non-blocking)
                 self.tick_writer.writerow([timestamp, price, volume, symbol])
@@ -22,24 +22,30 @@ import os
 import time
 import logging
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Optional
 
 try:
-    from utils.time_utils import now_ist
+    from utils.time_utils import now_ist, ReplayClock
+    from core.tick import Tick
 except ImportError:
-    from myQuant.utils.time_utils import now_ist
+    from myQuant.utils.time_utils import now_ist, ReplayClock
+    from myQuant.core.tick import Tick
 
 logger = logging.getLogger(__name__)
 
 class DataSimulator:
     """Optional file-based data simulator. Does not affect live trading."""
     
-    def __init__(self, file_path: str = None):
+    def __init__(self, file_path: str = None, clock=None):
         self.file_path = file_path
         self.data = None
         self.index = 0
-        # Fixed delay for consistent simulation speed
-        self.tick_delay = 0.0005  # 100 tps - good balance of speed and visibility
+        # Replay clock: ticks carry the file's own timestamps and advance the clock,
+        # so the run is paced by CPU only (no sleep) and is reproducible
+        self.replay_clock = clock if isinstance(clock, ReplayClock) else None
+        # Fixed delay for consistent simulation speed (wall-clock mode only)
+        self.tick_delay = 0.0 if self.replay_clock else 0.0005  # 100 tps - good balance of speed and visibility
+        self.timestamps = None
         self.loaded = False
         self.completed = False  # Flag to prevent repeated completion messages
         
@@ -54,54 +60,75 @@ class DataSimulator:
             
             # Read CSV file
             self.data = pd.read_csv(self.file_path)
-            
-            # Standardize columns
-            if 'close' in self.data.columns:
-                self.data['price'] = self.data['close']
-            elif 'Close' in self.data.columns:
-                self.data['price'] = self.data['Close']
-            elif 'ltp' in self.data.columns:
-                self.data['price'] = self.data['ltp']
-            elif 'LTP' in self.data.columns:
-                self.data['price'] = self.data['LTP']
-            
-            # Ensure we have a price column
-            if 'price' not in self.data.columns:
-                # Use first numeric column as price
-                numeric_cols = self.data.select_dtypes(include=['number']).columns
-                if len(numeric_cols) > 0:
-                    self.data['price'] = self.data[numeric_cols[0]]
-                else:
-                    raise ValueError("No numeric price column found")
-            
-            # Add default volume if not present
-            if 'volume' not in self.data.columns:
-                self.data['volume'] = 1000
-                
-            self.index = 0
-            self.loaded = True
-            
-            # Provide user with time estimates
-            total_ticks = len(self.data)
-            estimated_time = total_ticks * self.tick_delay
-            
-            if estimated_time < 60:
-                time_str = f"{estimated_time:.0f} seconds"
-            elif estimated_time < 3600:
-                time_str = f"{estimated_time/60:.1f} minutes"  
-            else:
-                time_str = f"{estimated_time/3600:.1f} hours"
-                
-            logger.info(f"📁 Loaded {total_ticks:,} data points for simulation")
-            logger.info(f"⏱️  Estimated completion time: ~{time_str}")
-                
-            return True
+            return self._prepare_data()
             
         except Exception as e:
             logger.error(f"Failed to load simulation data: {e}")
             return False
+
+    def load_frame(self, data: pd.DataFrame) -> bool:
+        """Use an in-memory DataFrame (e.g. utils.tick_generator output) instead of a file."""
+        try:
+            if 'timestamp' not in data.columns and isinstance(data.index, pd.DatetimeIndex):
+                data = data.rename_axis('timestamp').reset_index()
+            self.data = data
+            return self._prepare_data()
+        except Exception as e:
+            logger.error(f"Failed to load simulation data: {e}")
+            return False
+
+    def _prepare_data(self) -> bool:
+        """Standardize self.data columns and reset replay state (raises on unusable data)."""
+        # Standardize columns
+        if 'close' in self.data.columns:
+            self.data['price'] = self.data['close']
+        elif 'Close' in self.data.columns:
+            self.data['price'] = self.data['Close']
+        elif 'ltp' in self.data.columns:
+            self.data['price'] = self.data['ltp']
+        elif 'LTP' in self.data.columns:
+            self.data['price'] = self.data['LTP']
+        
+        # Ensure we have a price column
+        if 'price' not in self.data.columns:
+            # Use first numeric column as price
+            numeric_cols = self.data.select_dtypes(include=['number']).columns
+            if len(numeric_cols) > 0:
+                self.data['price'] = self.data[numeric_cols[0]]
+            else:
+                raise ValueError("No numeric price column found")
+        
+        # Add default volume if not present
+        if 'volume' not in self.data.columns:
+            self.data['volume'] = 1000
+
+        # Replay clock requires data timestamps - fail fast if the file has none
+        if self.replay_clock:
+            if 'timestamp' not in self.data.columns:
+                raise ValueError("Replay clock requires a 'timestamp' column in the simulation file. "
+                                 "Use live.clock_mode='wall' for files without timestamps.")
+            self.timestamps = pd.to_datetime(self.data['timestamp']).tolist()
+            
+        self.index = 0
+        self.loaded = True
+        
+        # Provide user with time estimates
+        total_ticks = len(self.data)
+        estimated_time = total_ticks * self.tick_delay
+        
+        if estimated_time < 60:
+            time_str = f"{estimated_time:.0f} seconds"
+        elif estimated_time < 3600:
+            time_str = f"{estimated_time/60:.1f} minutes"  
+        else:
+            time_str = f"{estimated_time/3600:.1f} hours"
+            
+        logger.info(f"📁 Loaded {total_ticks:,} data points for simulation")
+        logger.info(f"⏱️  Estimated completion time: ~{time_str}")
+            
+        return True
     
-    def get_next_tick(self) -> Optional[Dict]:
+    def get_next_tick(self) -> Optional[Tick]:
         """Get next tick from file data. Returns None if no data or end reached."""
         if not self.loaded or self.data is None:
             return None
@@ -122,16 +149,19 @@ class DataSimulator:
         row = self.data.iloc[self.index]
         self.index += 1
         
-        # Create tick
-        tick = {
-            "timestamp": now_ist(),
-            "price": float(row['price']),
-            "volume": int(row.get('volume', 1000))
-        }
+        # Create tick (replay mode: data timestamp drives the clock)
+        if self.replay_clock:
+            self.replay_clock.advance(self.timestamps[self.index - 1])
+        tick = Tick(
+            timestamp=now_ist(),
+            price=float(row['price']),
+            volume=int(row.get('volume', 1000))
+        )
         
         # Apply configurable delay (isolated from live trading)
         if self.tick_delay > 0:
             time.sleep(self.tick_delay)
+        tick.mono_ns = time.perf_counter_ns()  # "Received" when handed to the trading path
         
         return tick
     
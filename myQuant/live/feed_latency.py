@@ -0,0 +1,178 @@
+"""
+live/feed_latency.py
+
+Exchange-to-receive feed latency per symbol.
+
+SmartAPI tick packets carry the exchange timestamp (epoch ms, on
+Tick.exchange_ts_ns); the streamer stamps local receive time (Tick.recv_ts_ns).
+Their difference is feed delay plus the offset between the exchange clock and
+ours, so for each symbol this keeps:
+
+- a bounded window of recent delays (rolling percentiles on demand)
+- a clock-skew estimate: a long-horizon minimum of the delay. The quickest
+  ticks travel with ~zero queueing, so that floor is offset + minimum network
+  time. It drops immediately to any faster tick and otherwise rises by at most
+  _SKEW_DRIFT_NS_PER_S per second of feed time (clock offsets drift slowly),
+  and it is frozen while ticks run above the alert threshold - sustained lag
+  can never be absorbed into the baseline.
+- excess delay = delay - skew estimate: queueing on the feed side (broker/exchange)
+- lag alerts: excess delay above live.feed_lag_alert_ms for
+  live.feed_lag_alert_ticks consecutive ticks logs a warning (and calls the
+  optional on_alert callback); a recovery is logged once the lag clears
+
+Compare with StageLatencyRecorder (receive -> signal/order, our pipeline) to
+tell feed-side delay from in-process delay.
+
+observe() is amortized O(1) per tick and is called from the feed thread only.
+"""
+
+import logging
+from array import array
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_SKEW_DRIFT_NS_PER_S = 1_000_000  # Max upward drift of the skew floor: 1 ms per second of feed time
+
+
+class _SymbolFeedStats:
+    """Ring of recent exchange->receive delays (ns) for one symbol."""
+
+    __slots__ = ('delays', 'size', 'index', 'count', 'skew_ns', 'skew_recv_ns',
+                 'lag_streak', 'lagging', 'alerts', 'max_excess_ns', 'missing_exchange_ts',
+                 'last_trade_delay_ns')
+
+    def __init__(self, window: int):
+        self.delays = array('q', bytes(8 * window))
+        self.size = window
+        self.index = 0
+        self.count = 0  # Ticks observed with an exchange timestamp
+        self.skew_ns: Optional[int] = None
+        self.skew_recv_ns = 0  # Receive time the floor was last moved to
+        self.lag_streak = 0
+        self.lagging = False
+        self.alerts = 0
+        self.max_excess_ns = 0
+        self.missing_exchange_ts = 0
+        self.last_trade_delay_ns = 0
+
+    def window_values(self):
+        return sorted(self.delays[:min(self.count, self.size)])
+
+
+def _pick(ordered, pct: float) -> int:
+    return ordered[min(len(ordered) - 1, int(pct / 100.0 * len(ordered)))]
+
+
+class FeedLatencyMonitor:
+    """
+    Per-symbol feed delay statistics with skew estimation and lag alerts.
+
+    Usage:
+        monitor = FeedLatencyMonitor(window=2048, alert_ms=1000, alert_ticks=5)
+        monitor.observe(tick)              # feed thread, every tick
+        monitor.get_report()               # any thread (snapshot)
+    """
+
+    def __init__(self, window: int = 2048, alert_ms: float = 1000.0, alert_ticks: int = 5,
+                 on_alert: Optional[Callable[[str, float], None]] = None):
+        if window < 16:
+            raise ValueError(f"live.feed_latency_window must be >= 16, got {window}")
+        if alert_ticks < 1:
+            raise ValueError(f"live.feed_lag_alert_ticks must be >= 1, got {alert_ticks}")
+        self.window = int(window)
+        self.alert_ns = int(alert_ms * 1_000_000)
+        self.alert_ticks = int(alert_ticks)
+        self.on_alert = on_alert
+        self._symbols: Dict[str, _SymbolFeedStats] = {}
+
+    def observe(self, tick) -> None:
+        """Account one tick (needs tick.exchange_ts_ns and tick.recv_ts_ns)."""
+        key = tick.symbol or str(tick.symbol_id)
+        stats = self._symbols.get(key)
+        if stats is None:
+            stats = self._symbols[key] = _SymbolFeedStats(self.window)
+        if not tick.exchange_ts_ns or not tick.recv_ts_ns:
+            stats.missing_exchange_ts += 1
+            return
+        if tick.last_trade_ts_ns:
+            stats.last_trade_delay_ns = tick.recv_ts_ns - tick.last_trade_ts_ns
+
+        delay = tick.recv_ts_ns - tick.exchange_ts_ns
+        stats.delays[stats.index] = delay
+        stats.index = (stats.index + 1) % stats.size
+        stats.count += 1
+        recv_ns = tick.recv_ts_ns
+        if stats.skew_ns is None or delay <= stats.skew_ns:
+            stats.skew_ns = delay  # Faster than the floor: track it immediately
+            stats.skew_recv_ns = recv_ns
+        elif not stats.lag_streak:
+            # Slow upward drift toward the current delay; frozen while lagging
+            drift = (recv_ns - stats.skew_recv_ns) * _SKEW_DRIFT_NS_PER_S // 1_000_000_000
+            if drift > 0:
+                stats.skew_ns = min(delay, stats.skew_ns + drift)
+                stats.skew_recv_ns = recv_ns
+        else:
+            stats.skew_recv_ns = recv_ns  # No drift credit accrues during a lag streak
+
+        excess = delay - stats.skew_ns
+        if excess > stats.max_excess_ns:
+            stats.max_excess_ns = excess
+        if excess > self.alert_ns:
+            stats.lag_streak += 1
+            if stats.lag_streak == self.alert_ticks and not stats.lagging:
+                stats.lagging = True
+                stats.alerts += 1
+                excess_ms = excess / 1_000_000
+                logger.warning(f"⏱️ FEED LAG {key}: exchange->receive {excess_ms:.0f} ms above baseline "
+                               f"for {stats.lag_streak} ticks (skew est. {stats.skew_ns / 1_000_000:.0f} ms)")
+                if self.on_alert is not None:
+                    try:
+                        self.on_alert(key, excess_ms)
+                    except Exception as e:
+                        logger.error(f"Feed lag alert callback failed: {e}")
+        else:
+            if stats.lagging:
+                logger.info(f"Feed lag cleared for {key} (excess {excess / 1_000_000:.0f} ms)")
+                stats.lagging = False
+            stats.lag_streak = 0
+
+    def is_lagging(self, symbol: Optional[str] = None) -> bool:
+        """True if `symbol` (or any symbol) is currently in a lag alert."""
+        if symbol is not None:
+            stats = self._symbols.get(symbol)
+            return bool(stats and stats.lagging)
+        return any(s.lagging for s in self._symbols.values())
+
+    def get_report(self) -> Dict[str, Any]:
+        """Per-symbol delay percentiles (ms), skew estimate, excess delay and alert counts."""
+        report = {}
+        for key, stats in list(self._symbols.items()):
+            entry: Dict[str, Any] = {'ticks': stats.count, 'missing_exchange_ts': stats.missing_exchange_ts,
+                                     'alerts': stats.alerts, 'lagging': stats.lagging}
+            values = stats.window_values()
+            if values:
+                skew = stats.skew_ns
+                entry.update({
+                    'delay_ms': {name: round(_pick(values, pct) / 1_000_000, 3)
+                                 for name, pct in (('p50', 50), ('p90', 90), ('p99', 99), ('max', 100))},
+                    'skew_estimate_ms': round(skew / 1_000_000, 3),
+                    'excess_ms': {name: round((_pick(values, pct) - skew) / 1_000_000, 3)
+                                  for name, pct in (('p50', 50), ('p99', 99))},
+                    'max_excess_ms': round(stats.max_excess_ns / 1_000_000, 3),
+                })
+                if stats.last_trade_delay_ns:
+                    entry['last_trade_age_ms'] = round(stats.last_trade_delay_ns / 1_000_000, 3)
+            report[key] = entry
+        return report
+
+    def log_summary(self) -> None:
+        for key, entry in self.get_report().items():
+            if 'delay_ms' in entry:
+                d, x = entry['delay_ms'], entry['excess_ms']
+                logger.info(f"Feed latency {key}: {entry['ticks']} ticks, delay p50 {d['p50']:.1f} / "
+                            f"p99 {d['p99']:.1f} ms, skew est. {entry['skew_estimate_ms']:.1f} ms, "
+                            f"excess p99 {x['p99']:.1f} ms, lag alerts {entry['alerts']}")
+            elif entry['missing_exchange_ts']:
+                logger.info(f"Feed latency {key}: no exchange timestamps "
+                            f"({entry['missing_exchange_ts']} ticks - simulated feed?)")
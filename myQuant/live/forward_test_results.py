@@ -16,6 +16,8 @@ from typing import Dict, Any, List, Callable, Optional, Tuple, TYPE_CHECKING
 import logging
 from threading import Thread
 
+from utils.time_utils import now_ist
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -97,7 +99,7 @@ class ForwardTestResults:
 
         """Mark the forward test as completed"""
 
-        self.end_time = datetime.now()
+        self.end_time = now_ist()  # Session clock (data time during replays)
 
     
 
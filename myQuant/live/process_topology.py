@@ -0,0 +1,449 @@
+"""
+live/process_topology.py
+
+Optional multi-process topology that isolates the tick hot path from GUI and I/O work.
+
+    feed process     : BrokerAdapter + WebSocketTickStreamer + tick CSV journal
+                       -> publishes every tick into a shared-memory TickRing
+    trading process  : LiveTrader reading the ring through SharedMemoryTickSource
+                       -> publishes status snapshots into a shared-memory StatusBoard
+    GUI process      : only reads StatusBoard snapshots (ProcessTopology.read_status)
+
+Each process has its own interpreter and GIL, so Tk redraws, logging and CSV
+writes no longer add latency to strategy/risk processing.
+
+Status / limits:
+- Selected by live.process_topology (GUI: "Separate feed/trading processes"). The
+  forward-test start then launches ProcessTopology and polls read_status() from a
+  Tk after() callback; with the flag off the in-process LiveTrader path is unchanged.
+- Single instrument (config['instrument']); use live.tick_router for baskets.
+- The feed-process BrokerAdapter runs with queue_ticks=False: ticks leave only
+  through the ring, so its in-process tick_buffer is never filled (nothing there
+  would drain it).
+
+Shared memory layouts (little endian):
+- TickRing: 64-byte header [capacity u64, write_seq u64, read_seq u64, closed u64, ...]
+  followed by capacity * 64-byte slots [seq, ts_ns, exchange_ts_ns, recv_ts_ns,
+  price f64, volume, symbol_id, seq]. Single producer, single consumer. A slot is
+  valid only when both seq stamps equal the expected sequence (torn/overwritten
+  slots are detected and counted as overruns).
+- StatusBoard: seqlock header [seq u64 (odd while writing), length u64] + JSON payload.
+"""
+
+import json
+import logging
+import struct
+import threading
+import time
+import multiprocessing as mp
+from datetime import datetime
+from multiprocessing import shared_memory
+from types import MappingProxyType
+from typing import Any, Dict, Optional
+from copy import deepcopy
+
+from core.tick import Tick
+from utils.time_utils import IST, WallClock, ReplayClock, create_clock, get_clock, set_clock
+
+logger = logging.getLogger(__name__)
+
+_RING_HEADER = 64
+_SLOT = struct.Struct('<QqqqdqqQ')  # 64 bytes
+_U64 = struct.Struct('<Q')
+_OFF_CAPACITY, _OFF_WRITE, _OFF_READ, _OFF_CLOSED = 0, 8, 16, 24
+
+_BOARD_HEADER = struct.Struct('<QQ')  # seq, payload length
+_BOARD_SIZE = 256 * 1024
+
+
+class TickRing:
+    """Single-producer / single-consumer tick ring in shared memory."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.buf = shm.buf
+        self.owner = owner
+        self.capacity = _U64.unpack_from(self.buf, _OFF_CAPACITY)[0]
+        self._write_seq = _U64.unpack_from(self.buf, _OFF_WRITE)[0]
+        self._read_seq = _U64.unpack_from(self.buf, _OFF_READ)[0]
+        self.overruns = 0
+
+    @classmethod
+    def create(cls, capacity: int) -> "TickRing":
+        if capacity <= 0:
+            raise ValueError(f"TickRing capacity must be positive, got {capacity}")
+        shm = shared_memory.SharedMemory(create=True, size=_RING_HEADER + capacity * _SLOT.size)
+        shm.buf[:_RING_HEADER] = bytes(_RING_HEADER)
+        _U64.pack_into(shm.buf, _OFF_CAPACITY, capacity)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "TickRing":
+        return cls(shared_memory.SharedMemory(name=name), owner=False)  # owner unlinks
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    # ---- Producer ----
+
+    def publish(self, tick: Tick, symbol: str = None, block: bool = False) -> None:
+        """
+        Append one tick. Live feeds never block (a lapped consumer counts overruns);
+        block=True applies back-pressure instead (file simulation).
+        """
+        seq = self._write_seq + 1
+        if block:
+            while seq - _U64.unpack_from(self.buf, _OFF_READ)[0] > self.capacity:
+                time.sleep(0.0001)
+        _SLOT.pack_into(self.buf, _RING_HEADER + ((seq - 1) % self.capacity) * _SLOT.size,
+                        seq, tick.ts_ns, tick.exchange_ts_ns, tick.recv_ts_ns,
+                        float(tick.price), int(tick.volume or 0), int(tick.symbol_id or 0), seq)
+        _U64.pack_into(self.buf, _OFF_WRITE, seq)  # publish after the slot is complete
+        self._write_seq = seq
+
+    def mark_closed(self) -> None:
+        """Producer finished (e.g. file simulation exhausted)."""
+        _U64.pack_into(self.buf, _OFF_CLOSED, 1)
+
+    # ---- Consumer ----
+
+    @property
+    def closed(self) -> bool:
+        return _U64.unpack_from(self.buf, _OFF_CLOSED)[0] == 1
+
+    def pending(self) -> int:
+        return _U64.unpack_from(self.buf, _OFF_WRITE)[0] - self._read_seq
+
+    def read(self) -> Optional[tuple]:
+        """Next slot as (ts_ns, exchange_ts_ns, recv_ts_ns, price, volume, symbol_id), or None."""
+        head = _U64.unpack_from(self.buf, _OFF_WRITE)[0]
+        while self._read_seq < head:
+            seq = self._read_seq + 1
+            if head - seq >= self.capacity:  # lapped by the producer - skip to oldest live slot
+                skipped = head - self.capacity + 1 - seq
+                self.overruns += skipped
+                seq += skipped
+            rec = _SLOT.unpack_from(self.buf, _RING_HEADER + ((seq - 1) % self.capacity) * _SLOT.size)
+            self._read_seq = seq
+            _U64.pack_into(self.buf, _OFF_READ, seq)
+            if rec[0] == seq and rec[7] == seq:
+                return rec[1:7]
+            self.overruns += 1  # overwritten while reading
+            head = _U64.unpack_from(self.buf, _OFF_WRITE)[0]
+        return None
+
+    def close(self) -> None:
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class StatusBoard:
+    """Seqlock-protected JSON snapshot in shared memory (one writer, many readers)."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        self._seq = _BOARD_HEADER.unpack_from(shm.buf, 0)[0]
+
+    @classmethod
+    def create(cls, size: int = _BOARD_SIZE) -> "StatusBoard":
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        _BOARD_HEADER.pack_into(shm.buf, 0, 0, 0)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "StatusBoard":
+        return cls(shared_memory.SharedMemory(name=name), owner=False)  # owner unlinks
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def write(self, status: Dict[str, Any]) -> None:
+        payload = json.dumps(status, default=str).encode('utf-8')
+        limit = self.shm.size - _BOARD_HEADER.size
+        if len(payload) > limit:
+            payload = json.dumps({'error': f'status snapshot exceeds {limit} bytes'}).encode('utf-8')
+        self._seq += 1  # odd: write in progress
+        _U64.pack_into(self.shm.buf, 0, self._seq)
+        self.shm.buf[_BOARD_HEADER.size:_BOARD_HEADER.size + len(payload)] = payload
+        _U64.pack_into(self.shm.buf, 8, len(payload))
+        self._seq += 1  # even: stable
+        _U64.pack_into(self.shm.buf, 0, self._seq)
+
+    def read(self, retries: int = 10) -> Optional[Dict[str, Any]]:
+        """Latest consistent snapshot, or None if none written yet / writer too busy."""
+        buf = self.shm.buf
+        for _ in range(retries):
+            seq, length = _BOARD_HEADER.unpack_from(buf, 0)
+            if seq == 0:
+                return None
+            if seq % 2:
+                time.sleep(0.0005)
+                continue
+            payload = bytes(buf[_BOARD_HEADER.size:_BOARD_HEADER.size + length])
+            if _U64.unpack_from(buf, 0)[0] == seq:
+                return json.loads(payload.decode('utf-8'))
+        return None
+
+    def close(self) -> None:
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class SharedMemoryTickSource:
+    """
+    BrokerAdapter stand-in for the trading process: ticks come from a TickRing.
+
+    Implements the subset of the BrokerAdapter interface LiveTrader uses.
+    """
+
+    # Max time get_next_tick waits for a tick before returning None (trader then idles)
+    WAIT_SECONDS = 1.0
+
+    def __init__(self, ring: TickRing, config: MappingProxyType, stop_event=None):
+        self.ring = ring
+        self.stop_event = stop_event
+        self.symbol = config['instrument']['symbol']
+        self.file_simulator = None
+        self.streaming_mode = True
+        self.on_tick_callback = None
+        self.risk_lock = threading.RLock()
+        self.last_price = 0.0
+        self.tick_count = 0
+        # Replay clock follows the file timestamps carried through the ring
+        if config.get('data_simulation', {}).get('enabled', False):
+            self.clock = create_clock(config['live']['clock_mode'])
+        else:
+            self.clock = WallClock()
+        set_clock(self.clock)
+
+    def connect(self) -> None:
+        logger.info(f"Trading process attached to tick ring {self.ring.name} (capacity {self.ring.capacity})")
+
+    def disconnect(self) -> None:
+        pass
+
+    def attach_risk_engine(self, position_manager) -> None:
+        """Risk-first evaluation already runs first in this process (nothing else competes for the ticks)."""
+        pass
+
+    def get_last_price(self) -> float:
+        return self.last_price or 0.0
+
+    def restore_wall_clock(self) -> None:
+        """Reinstall the wall clock after the session (as BrokerAdapter.restore_wall_clock)."""
+        if get_clock() is self.clock and not isinstance(self.clock, WallClock):
+            set_clock(WallClock())
+            logger.info("Replay clock released - now_ist() back on the wall clock")
+
+    def get_next_tick(self) -> Optional[Tick]:
+        deadline = None
+        while True:
+            rec = self.ring.read()
+            if rec is not None:
+                break
+            if self.ring.closed and self.ring.pending() <= 0:
+                # Producer finished and ring drained - end the session
+                if self.stop_event is not None:
+                    self.stop_event.set()
+                return None
+            now = time.perf_counter()
+            if deadline is None:
+                deadline = now + self.WAIT_SECONDS
+            elif now >= deadline:
+                return None
+            time.sleep(0.0001)
+        ts_ns, exchange_ts_ns, recv_ts_ns, price, volume, symbol_id = rec
+        tick = Tick(timestamp=datetime.fromtimestamp(ts_ns / 1_000_000_000, IST), price=price, volume=volume,
+                    symbol_id=symbol_id, symbol=self.symbol, exchange_ts_ns=exchange_ts_ns,
+                    recv_ts_ns=recv_ts_ns, ts_ns=ts_ns, mono_ns=time.perf_counter_ns())
+        if isinstance(self.clock, ReplayClock):
+            self.clock.advance(tick.timestamp)
+        self.last_price = price
+        self.tick_count += 1
+        return tick
+
+
+def _thaw(config: MappingProxyType) -> Dict[str, Any]:
+    """Picklable plain-dict copy of a frozen config (spawned processes re-freeze it)."""
+    return {k: deepcopy(v) for k, v in config.items()}
+
+
+def run_feed_process(config_dict: Dict[str, Any], ring_name: str, stop_event) -> None:
+    """Feed-handler process: owns the broker session, WebSocket stream and tick journal."""
+    from utils.config_helper import freeze_config
+    from utils.logger import setup_from_config
+    from live.broker_adapter import BrokerAdapter
+
+    config = freeze_config(config_dict)
+    setup_from_config(config)
+    ring = TickRing.attach(ring_name)
+    broker = BrokerAdapter(config, queue_ticks=False)  # ring is the only consumer
+    try:
+        if broker.file_simulator:
+            broker.connect()
+            while not stop_event.is_set():
+                tick = broker.get_next_tick()
+                if tick is None:
+                    if broker.file_simulator.completed:
+                        break
+                    continue
+                ring.publish(tick, block=True)
+        else:
+            broker.on_tick_callback = ring.publish  # WebSocket thread -> ring (never blocks)
+            broker.connect()
+            while not stop_event.is_set():
+                stop_event.wait(0.5)
+    finally:
+        ring.mark_closed()
+        try:
+            broker.disconnect()
+        except Exception as e:
+            logger.warning(f"Feed process disconnect error: {e}")
+        ring.close()
+
+
+def _trader_status(trader, source: SharedMemoryTickSource) -> Dict[str, Any]:
+    pm = trader.position_manager
+    return {
+        'timestamp': time.time(),
+        'ticks': source.tick_count,
+        'last_price': source.last_price,
+        'ring_pending': source.ring.pending(),
+        'ring_overruns': source.ring.overruns,
+        'position_open': trader.active_position_id is not None,
+        'open_positions': pm.get_open_positions(),
+        'capital': pm.current_capital,
+        'performance': pm.get_performance_summary(),
+    }
+
+
+def run_trading_process(config_dict: Dict[str, Any], ring_name: str, board_name: str,
+                        stop_event, dialog_text: Optional[str] = None) -> None:
+    """Trading process: LiveTrader on ring ticks, publishes status snapshots."""
+    from utils.config_helper import freeze_config
+    from utils.logger import setup_from_config
+    from live.trader import LiveTrader
+
+    config = freeze_config(config_dict)
+    setup_from_config(config)
+    interval = float(config['live']['status_snapshot_interval'])
+    ring = TickRing.attach(ring_name)
+    board = StatusBoard.attach(board_name)
+    source = SharedMemoryTickSource(ring, config, stop_event)
+    trader = LiveTrader(frozen_config=config, dialog_text=dialog_text, broker=source)
+
+    def publish_status():
+        while not stop_event.wait(interval):
+            try:
+                board.write(_trader_status(trader, source))
+            except Exception as e:
+                logger.warning(f"Status snapshot failed: {e}")
+
+    finished = threading.Event()
+
+    def watch_stop():
+        # End the loop and flatten; LiveTrader.start() then disconnects and exports results
+        stop_event.wait()
+        trader.is_running = False
+        trader.close_position("Stop Requested")
+        # A stop requested before start() set is_running would otherwise be lost
+        while not finished.wait(0.1):
+            trader.is_running = False
+
+    threading.Thread(target=publish_status, name="StatusSnapshot", daemon=True).start()
+    stopper = threading.Thread(target=watch_stop, name="StopWatcher", daemon=True)
+    stopper.start()
+    try:
+        trader.start()
+    finally:
+        finished.set()
+        stop_event.set()
+        stopper.join()
+        board.write(dict(_trader_status(trader, source), finished=True))
+        ring.close()
+        board.close()
+
+
+class ProcessTopology:
+    """
+    Launch feed and trading processes connected by shared memory (caller stays a reader).
+
+    Usage (launching process, e.g. the GUI forward test when live.process_topology is set):
+        topo = ProcessTopology(frozen_config, dialog_text)
+        topo.start()
+        status = topo.read_status()   # poll from a Tk after() callback
+        topo.request_stop()           # non-blocking; poll is_alive() until the trading process exits
+        topo.stop()                   # join and release shared memory
+    """
+
+    def __init__(self, config: MappingProxyType, dialog_text: Optional[str] = None):
+        if not isinstance(config, MappingProxyType):
+            raise TypeError(f"ProcessTopology requires frozen MappingProxyType config, got {type(config)}")
+        self.config = config
+        self.dialog_text = dialog_text
+        self.capacity = int(config['live']['tick_ring_capacity'])
+        self._ctx = mp.get_context('spawn')  # same behaviour on Windows and Linux
+        self.ring: Optional[TickRing] = None
+        self.board: Optional[StatusBoard] = None
+        self.stop_event = None
+        self.feed_process = None
+        self.trading_process = None
+
+    def start(self) -> None:
+        self.ring = TickRing.create(self.capacity)
+        self.board = StatusBoard.create()
+        self.stop_event = self._ctx.Event()
+        cfg = _thaw(self.config)
+        # Trading process first so it is attached before the first tick is published
+        self.trading_process = self._ctx.Process(
+            target=run_trading_process, name="TradingProcess",
+            args=(cfg, self.ring.name, self.board.name, self.stop_event, self.dialog_text))
+        self.feed_process = self._ctx.Process(
+            target=run_feed_process, name="FeedProcess",
+            args=(cfg, self.ring.name, self.stop_event))
+        self.trading_process.start()
+        self.feed_process.start()
+        logger.info(f"Process topology started: feed pid={self.feed_process.pid}, "
+                    f"trading pid={self.trading_process.pid}, ring={self.capacity} slots")
+
+    def read_status(self) -> Optional[Dict[str, Any]]:
+        """Latest trading-process snapshot (None until the first snapshot)."""
+        return self.board.read() if self.board else None
+
+    def is_alive(self) -> bool:
+        return bool(self.trading_process and self.trading_process.is_alive())
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until the trading process exits (e.g. file simulation finished)."""
+        if self.trading_process:
+            self.trading_process.join(timeout)
+
+    def request_stop(self) -> None:
+        """Signal both processes without waiting (the trading process flattens and exports first)."""
+        if self.stop_event is not None:
+            self.stop_event.set()
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Signal both processes, wait for results export, release shared memory."""
+        if self.stop_event is None:
+            return
+        self.stop_event.set()
+        for proc in (self.feed_process, self.trading_process):
+            if proc is not None:
+                proc.join(timeout)
+                if proc.is_alive():
+                    logger.warning(f"{proc.name} did not exit within {timeout}s - terminating")
+                    proc.terminate()
+        final = self.read_status()
+        if final:
+            logger.info(f"Process topology stopped: {final.get('ticks')} ticks, "
+                        f"{final.get('ring_overruns')} ring overruns")
+        self.ring.close()
+        self.board.close()
+        self.stop_event = None
@@ -0,0 +1,144 @@
+"""
+live/smartapi_binary.py
+
+SmartWebSocketV2 binary tick packet codec (decode fast path + encoder for fixtures/replay).
+
+Packet layout (little endian, prices in paise):
+    offset  size  field
+    0       1     subscription_mode (1=LTP, 2=Quote, 3=SnapQuote)
+    1       1     exchange_type
+    2       25    token (NUL-padded ASCII)
+    27      8     sequence_number
+    35      8     exchange_timestamp (epoch ms)
+    43      8     last_traded_price
+    -- Quote / SnapQuote --
+    51      8     last_traded_quantity
+    59      8     average_traded_price
+    67      8     volume_trade_for_the_day
+    75      8     total_buy_quantity (double)
+    83      8     total_sell_quantity (double)
+    91      8     open_price_of_the_day
+    99      8     high_price_of_the_day
+    107     8     low_price_of_the_day
+    115     8     closed_price
+    -- SnapQuote only --
+    123     8     last_traded_timestamp (epoch s)
+    131     8     open_interest
+    139     8     open_interest_change_percentage
+    147     200   best 5 buy/sell levels
+    347     32    upper/lower circuit, 52 week high/low
+
+Only the fields the trading path uses are decoded (token, sequence number,
+exchange time, LTP, last traded quantity, SnapQuote last traded time) with precompiled struct
+formats - no per-field dict.
+"""
+
+import struct
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+from core.tick import Tick
+from utils.time_utils import now_ist
+
+LTP_MODE = 1
+QUOTE_MODE = 2
+SNAP_QUOTE_MODE = 3
+
+LTP_PACKET_SIZE = 51
+QUOTE_PACKET_SIZE = 123
+SNAP_QUOTE_PACKET_SIZE = 379
+PACKET_SIZES = {LTP_MODE: LTP_PACKET_SIZE, QUOTE_MODE: QUOTE_PACKET_SIZE, SNAP_QUOTE_MODE: SNAP_QUOTE_PACKET_SIZE}
+
+# mode, exchange_type, token, sequence_number, exchange_timestamp, last_traded_price
+_HEADER = struct.Struct('<BB25sqqq')
+_LAST_TRADED_QTY = struct.Struct('<q')  # offset 51 (Quote / SnapQuote)
+_LAST_TRADED_TS = struct.Struct('<q')  # offset 123 (SnapQuote)
+_QUOTE_BODY = struct.Struct('<qqqddqqqq')  # offset 51..123 (encoder only)
+
+# Recorded frame files: repeated [u32 length][frame bytes]
+_FRAME_LEN = struct.Struct('<I')
+
+
+class BinaryTickDecoder:
+    """
+    Decode SmartWebSocketV2 binary packets straight into Tick records.
+
+    Token bytes -> (symbol_id, symbol) are cached per distinct token, so the
+    per-tick cost is one struct unpack, one dict lookup and the Tick itself.
+    """
+
+    def __init__(self, token_symbols: Optional[Dict[str, str]] = None):
+        """token_symbols: token string -> trading symbol (for Tick.symbol)."""
+        self.token_symbols = dict(token_symbols or {})
+        self._token_cache: Dict[bytes, Tuple[int, str]] = {}
+
+    def _resolve_token(self, raw: bytes) -> Tuple[int, str]:
+        token = raw.split(b'\x00', 1)[0].decode('ascii', 'replace')
+        entry = (int(token) if token.isdigit() else 0, self.token_symbols.get(token, token))
+        self._token_cache[raw] = entry
+        return entry
+
+    def decode(self, frame: bytes, recv_ns: Optional[int] = None) -> Optional[Tick]:
+        """Tick for a tick packet, None for anything shorter than an LTP packet."""
+        if len(frame) < LTP_PACKET_SIZE:
+            return None
+        mode, _, token_raw, seq, exchange_ts_ms, ltp_paise = _HEADER.unpack_from(frame, 0)
+        ident = self._token_cache.get(token_raw) or self._resolve_token(token_raw)
+        volume = _LAST_TRADED_QTY.unpack_from(frame, LTP_PACKET_SIZE)[0] \
+            if mode != LTP_MODE and len(frame) >= QUOTE_PACKET_SIZE else 0
+        mono_ns = time.perf_counter_ns()
+        last_trade_s = _LAST_TRADED_TS.unpack_from(frame, QUOTE_PACKET_SIZE)[0] \
+            if mode == SNAP_QUOTE_MODE and len(frame) >= SNAP_QUOTE_PACKET_SIZE else 0
+        if recv_ns is None:
+            recv_ns = time.time_ns()
+        return Tick(
+            timestamp=now_ist(),
+            price=ltp_paise / 100.0,  # paise -> rupees
+            volume=volume,
+            symbol_id=ident[0],
+            symbol=ident[1],
+            exchange_ts_ns=exchange_ts_ms * 1_000_000,
+            recv_ts_ns=recv_ns,
+            ts_ns=recv_ns,
+            mono_ns=mono_ns,
+            last_trade_ts_ns=last_trade_s * 1_000_000_000,
+            seq=seq,
+        )
+
+
+def encode_packet(mode: int, exchange_type: int, token: str, sequence_number: int,
+                  exchange_timestamp_ms: int, ltp_paise: int, last_traded_quantity: int = 0,
+                  volume_for_day: int = 0) -> bytes:
+    """Build a full-size packet for `mode` (fields not given are zero). Used for fixtures/replay."""
+    if mode not in PACKET_SIZES:
+        raise ValueError(f"Unknown subscription mode {mode} (expected 1=LTP, 2=Quote, 3=SnapQuote)")
+    buf = bytearray(PACKET_SIZES[mode])
+    _HEADER.pack_into(buf, 0, mode, exchange_type, token.encode('ascii'), sequence_number,
+                      exchange_timestamp_ms, ltp_paise)
+    if mode != LTP_MODE:
+        _QUOTE_BODY.pack_into(buf, LTP_PACKET_SIZE, last_traded_quantity, ltp_paise, volume_for_day,
+                              0.0, 0.0, ltp_paise, ltp_paise, ltp_paise, ltp_paise)
+    return bytes(buf)
+
+
+def write_frames(path: str, frames) -> int:
+    """Write frames as a length-prefixed recording; returns frame count."""
+    count = 0
+    with open(path, 'wb') as f:
+        for frame in frames:
+            f.write(_FRAME_LEN.pack(len(frame)))
+            f.write(frame)
+            count += 1
+    return count
+
+
+def read_frames(path: str) -> Iterator[bytes]:
+    """Iterate frames from a length-prefixed recording."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    pos = 0
+    while pos + _FRAME_LEN.size <= len(data):
+        (length,) = _FRAME_LEN.unpack_from(data, pos)
+        pos += _FRAME_LEN.size
+        yield data[pos:pos + length]
+        pos += length
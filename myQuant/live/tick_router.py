@@ -0,0 +1,416 @@
+"""
+live/tick_router.py
+
+Multi-instrument tick router for forward testing a basket of instruments
+(e.g. an option strike ladder) inside one process.
+
+- Subscribes any number of tokens, split across several WebSocket connections
+  (SmartAPI caps tokens per connection - see websocket_stream.MAX_TOKENS_PER_CONNECTION)
+- Dispatches each tick by instrument token to a per-symbol SymbolWorker
+  (own strategy + PositionManager + active position)
+- Worker pool with per-symbol ordering: every symbol is pinned to one worker
+  thread whose queue is FIFO, so ticks of a symbol are processed in arrival order
+- Portfolio capital is NOT pooled: capital.initial_capital is split evenly across
+  symbols up front (an instrument's own 'capital' key overrides its share), each
+  symbol trades only its share, and PortfolioCapital aggregates them for reporting
+- Results: export_results() writes per-symbol trades + per-symbol/portfolio summary
+  (entry point: scripts/run_tick_router.py)
+- Per-symbol config: instrument symbol/token/exchange plus lot_size/tick_size from
+  instrument_mappings (key: the instrument's 'instrument_type', else its symbol or
+  the longest mapping key the symbol starts with, e.g. BANKNIFTY25NOV48000CE -> BANKNIFTY)
+- Simulation only: never sends real orders
+"""
+
+import csv
+import json
+import logging
+import queue
+import threading
+from copy import deepcopy
+from types import MappingProxyType
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.position_manager import PositionManager
+from core.tick import Tick
+from live.feed_latency import FeedLatencyMonitor
+from live.trader import get_strategy
+from utils.config_helper import freeze_config
+from utils.time_utils import now_ist
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()  # Worker queue sentinel
+
+
+class SymbolWorker:
+    """
+    Strategy + PositionManager pair for one instrument.
+
+    Only ever called from its pinned worker thread, so it needs no locks.
+    Mirrors LiveTrader's per-tick flow: strategy signal -> entry/exit -> risk exits.
+    """
+
+    def __init__(self, config: MappingProxyType, instrument: Dict[str, Any]):
+        self.config = config
+        self.token = str(instrument['token'])
+        self.symbol = instrument.get('symbol') or self.token
+        self.strategy = get_strategy(config)
+        self.position_manager = PositionManager(config, strategy_callback=self.strategy.on_position_exit)
+        self.active_position_id: Optional[str] = None
+        self.tick_count = 0
+        self.error_count = 0
+        self.last_price: Optional[float] = None
+
+    def process(self, tick: Tick) -> None:
+        """Process one tick for this instrument."""
+        self.tick_count += 1
+        self.last_price = tick.price
+        now = tick.timestamp
+
+        signal = self.strategy.on_tick(tick)
+        if signal:
+            if signal.action == 'BUY' and not self.active_position_id:
+                entry_row = {
+                    'close': signal.price,
+                    'high': signal.price,
+                    'low': signal.price,
+                    'open': signal.price,
+                    'volume': tick.volume,
+                    'timestamp': now
+                }
+                self.active_position_id = self.strategy.open_long(entry_row, now, self.position_manager)
+                if self.active_position_id:
+                    qty = self.position_manager.positions[self.active_position_id].current_quantity
+                    logger.info(f"[ROUTER {self.symbol}] ENTERED LONG at ₹{signal.price:.2f} ({qty} contracts) - {signal.reason}")
+            elif signal.action == 'CLOSE' and self.active_position_id:
+                self.close_position(tick.price, now, f"Strategy Signal: {signal.reason}")
+
+        if self.active_position_id:
+            self.position_manager.process_price(tick.price, tick.ts_ns, now)
+            if self.active_position_id not in self.position_manager.positions:
+                logger.info(f"[ROUTER {self.symbol}] Position closed by risk management @ ₹{tick.price:.2f}")
+                self.strategy.on_position_closed(self.active_position_id, "Risk Management")
+                self.active_position_id = None
+
+    def close_position(self, price: float, now, reason: str) -> None:
+        """Flatten the open position (if any) and notify the strategy."""
+        if not self.active_position_id:
+            return
+        if self.position_manager.close_position_full(self.active_position_id, price, now, reason):
+            logger.info(f"[ROUTER {self.symbol}] Position closed at {price} for reason: {reason}")
+            self.strategy.on_position_closed(self.active_position_id, reason)
+            self.active_position_id = None
+        elif self.active_position_id not in self.position_manager.positions:
+            # Already gone (closed elsewhere) - drop the stale id, strategy was notified then
+            self.active_position_id = None
+
+
+class PortfolioCapital:
+    """
+    Aggregated capital view over all per-symbol position managers.
+
+    Reporting only - capital is not pooled: each symbol sizes its trades from its
+    own share (TickRouter splits initial_capital evenly), so idle symbols' cash is
+    never lent to busy ones.
+    """
+
+    def __init__(self, initial_capital: float, workers: List[SymbolWorker]):
+        self.initial_capital = initial_capital
+        self.workers = workers
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Portfolio totals (read-only; safe to call from GUI/monitor threads).
+
+        equity = cash + market value of open positions at each symbol's last price.
+        """
+        cash = 0.0
+        market_value = 0.0
+        realized_pnl = 0.0
+        open_positions = 0
+        trades = 0
+        for w in self.workers:
+            pm = w.position_manager
+            cash += pm.current_capital
+            for position in list(pm.positions.values()):
+                open_positions += 1
+                market_value += position.current_quantity * (w.last_price or position.entry_price)
+            completed = list(pm.completed_trades)
+            trades += len(completed)
+            realized_pnl += sum(t.net_pnl for t in completed)
+        equity = cash + market_value
+        return {
+            'initial_capital': self.initial_capital,
+            'cash': cash,
+            'market_value': market_value,
+            'equity': equity,
+            'realized_pnl': realized_pnl,
+            'total_return_percent': (equity - self.initial_capital) / self.initial_capital * 100
+                                    if self.initial_capital else 0.0,
+            'open_positions': open_positions,
+            'total_trades': trades,
+        }
+
+
+class TickRouter:
+    """
+    Route ticks from one or more WebSocket connections to per-symbol workers.
+
+    Usage:
+        router = TickRouter(frozen_config, [{"symbol": "NIFTY..CE", "token": "43512", "exchange": "NFO"}, ...])
+        router.start()
+        router.start_streams(session_info)   # or feed router.route(tick, symbol) directly
+        ...
+        router.stop()
+    """
+
+    def __init__(self, config: MappingProxyType, instruments: List[Dict[str, Any]]):
+        if not isinstance(config, MappingProxyType):
+            raise TypeError(f"TickRouter requires frozen MappingProxyType config, got {type(config)}")
+        if not instruments:
+            raise ValueError("TickRouter requires at least one instrument ({'symbol', 'token', 'exchange'})")
+
+        tokens = [str(i['token']) for i in instruments]  # KeyError if token missing - fail fast
+        if len(set(tokens)) != len(tokens):
+            raise ValueError(f"TickRouter: duplicate instrument tokens in {tokens}")
+
+        live = config['live']
+        self.config = config
+        self.instruments = list(instruments)
+        self.num_workers = max(1, min(int(live['router_workers']), len(instruments)))
+        queue_size = int(live['router_queue_size'])
+        if queue_size <= 0:
+            raise ValueError(f"live.router_queue_size must be positive, got {queue_size}")
+
+        # Portfolio capital split evenly (not pooled) unless an instrument carries its own 'capital'
+        total_capital = float(config['capital']['initial_capital'])
+        default_share = total_capital / len(instruments)
+
+        self.workers: List[SymbolWorker] = []
+        self._queues: List[queue.Queue] = [queue.Queue(maxsize=queue_size) for _ in range(self.num_workers)]
+        self._routes: Dict[Any, tuple] = {}  # symbol_id / token / symbol -> (queue, worker)
+        for idx, instrument in enumerate(self.instruments):
+            worker = SymbolWorker(self._symbol_config(instrument, instrument.get('capital', default_share)), instrument)
+            self.workers.append(worker)
+            route = (self._queues[idx % self.num_workers], worker)  # pinned worker -> per-symbol ordering
+            self._routes[worker.token] = route
+            self._routes[worker.symbol] = route
+            if worker.token.isdigit():
+                self._routes[int(worker.token)] = route
+
+        self.portfolio = PortfolioCapital(total_capital, self.workers)
+        self.streamers: List[Any] = []
+        self._threads: List[threading.Thread] = []
+        self.dropped_ticks = 0
+        self.unrouted_ticks = 0
+        self.running = False
+        self.feed_latency = FeedLatencyMonitor(
+            window=live['feed_latency_window'],
+            alert_ms=live['feed_lag_alert_ms'],
+            alert_ticks=live['feed_lag_alert_ticks']
+        ) if live['feed_latency_monitor'] else None
+
+    def _mapping_key(self, instrument: Dict[str, Any]) -> str:
+        """instrument_mappings key for an instrument (lot_size/tick_size SSOT)."""
+        mappings = self.config['instrument_mappings']
+        key = instrument.get('instrument_type')
+        if key:
+            if key not in mappings:
+                raise ValueError(f"TickRouter: instrument_type '{key}' not in instrument_mappings "
+                                 f"(available: {list(mappings)})")
+            return key
+        symbol = str(instrument.get('symbol') or '')
+        if symbol in mappings:
+            return symbol
+        prefixes = [k for k in mappings if symbol.startswith(k)]
+        if not prefixes:
+            raise ValueError(f"TickRouter: cannot find lot/tick size for '{symbol or instrument['token']}' - "
+                             f"add 'instrument_type' (an instrument_mappings key, e.g. 'NIFTY') to the instrument")
+        return max(prefixes, key=len)
+
+    def _symbol_config(self, instrument: Dict[str, Any], capital: float) -> MappingProxyType:
+        """
+        Frozen per-symbol config: instrument symbol/token/exchange, lot_size/tick_size
+        (instrument_mappings SSOT) and capital share overridden.
+        """
+        key = self._mapping_key(instrument)
+        mapping = self.config['instrument_mappings'][key]
+        cfg = deepcopy(dict(self.config))
+        cfg['instrument'] = dict(cfg['instrument'])
+        cfg['instrument']['symbol'] = str(instrument.get('symbol') or instrument['token'])
+        cfg['instrument']['token'] = str(instrument['token'])
+        cfg['instrument']['instrument_type'] = key
+        cfg['instrument']['exchange'] = instrument.get('exchange') or mapping['exchange']
+        cfg['instrument']['lot_size'] = mapping['lot_size']
+        cfg['instrument']['tick_size'] = mapping['tick_size']
+        cfg['capital'] = dict(cfg['capital'], initial_capital=float(capital))
+        return freeze_config(cfg)
+
+    # ---- Dispatch ----
+
+    def _on_stream_tick(self, tick: Tick, symbol: str = None) -> None:
+        """on_tick of the router's own streams: feed latency is accounted once, here."""
+        if self.feed_latency is not None:
+            self.feed_latency.observe(tick)
+        self.route(tick, symbol)
+
+    def route(self, tick: Tick, symbol: str = None) -> None:
+        """
+        Enqueue a tick to its symbol's worker (never blocks the feed thread).
+
+        Does not touch feed_latency: ticks handed over by a BrokerAdapter were
+        already observed there, the router's own streams go through _on_stream_tick.
+        """
+        route = self._routes.get(tick.symbol_id) or self._routes.get(symbol or tick.symbol)
+        if route is None:
+            self.unrouted_ticks += 1
+            return
+        try:
+            route[0].put_nowait((route[1], tick))
+        except queue.Full:
+            self.dropped_ticks += 1
+            if self.dropped_ticks == 1 or self.dropped_ticks % 1000 == 0:
+                logger.warning(f"TickRouter: worker queue full - {self.dropped_ticks} ticks dropped")
+
+    def _worker_loop(self, q: queue.Queue) -> None:
+        while True:
+            item = q.get()
+            if item is _STOP:
+                break
+            worker, tick = item
+            try:
+                worker.process(tick)
+            except Exception as e:
+                worker.error_count += 1
+                logger.error(f"TickRouter: error processing {worker.symbol} tick: {e}")
+
+    # ---- Lifecycle ----
+
+    def start(self) -> None:
+        """Start worker threads (ticks may be routed afterwards)."""
+        if self.running:
+            return
+        self.running = True
+        for i, q in enumerate(self._queues):
+            t = threading.Thread(target=self._worker_loop, args=(q,), name=f"TickRouterWorker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        logger.info(f"TickRouter started: {len(self.workers)} symbols on {self.num_workers} workers")
+
+    def start_streams(self, session_info: Dict[str, Any]) -> None:
+        """Open as many WebSocket connections as the token count requires, all routed here."""
+        from live.websocket_stream import WebSocketTickStreamer, MAX_TOKENS_PER_CONNECTION
+        live = self.config['live']
+        subs = [{'symbol': w.symbol, 'token': w.token,
+                 'exchange': i.get('exchange') or self.config['instrument']['exchange']}
+                for w, i in zip(self.workers, self.instruments)]
+        for start in range(0, len(subs), MAX_TOKENS_PER_CONNECTION):
+            streamer = WebSocketTickStreamer(
+                api_key=live['api_key'],
+                client_code=live['client_code'],
+                feed_token=session_info['feed_token'],
+                auth_token=session_info['jwt_token'],
+                symbol_tokens=subs[start:start + MAX_TOKENS_PER_CONNECTION],
+                feed_type=live['feed_type'],
+                on_tick=self._on_stream_tick,
+                retain_raw=live['retain_raw_tick'],
+                binary_decode=live['ws_binary_decode']
+            )
+            streamer.start_stream()
+            self.streamers.append(streamer)
+        logger.info(f"TickRouter: {len(subs)} tokens over {len(self.streamers)} WebSocket connections")
+
+    def stop(self, reason: str = "Stop Requested") -> None:
+        """Stop streams, drain worker queues, then flatten open positions at last price."""
+        for streamer in self.streamers:
+            try:
+                streamer.stop_stream()
+            except Exception as e:
+                logger.warning(f"TickRouter: error stopping stream: {e}")
+        if self.running:
+            for q in self._queues:
+                q.put(_STOP)
+            for t in self._threads:
+                t.join()
+            self._threads.clear()
+            self.running = False
+        now = now_ist()
+        for worker in self.workers:
+            if worker.active_position_id and worker.last_price is not None:
+                worker.close_position(worker.last_price, now, reason)
+        for worker in self.workers:
+            worker.strategy.close()
+        if self.feed_latency is not None:
+            self.feed_latency.log_summary()
+        logger.info(f"TickRouter stopped: {self.portfolio.snapshot()}")
+
+    def backlog(self) -> int:
+        """Ticks queued to workers and not yet processed."""
+        return sum(q.qsize() for q in self._queues)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Router + portfolio snapshot for GUI/monitoring."""
+        return {
+            'symbols': {w.symbol: {'ticks': w.tick_count, 'last_price': w.last_price,
+                                   'position': w.active_position_id is not None, 'errors': w.error_count}
+                        for w in self.workers},
+            'queued': self.backlog(),
+            'dropped_ticks': self.dropped_ticks,
+            'unrouted_ticks': self.unrouted_ticks,
+            'feed_latency': self.feed_latency.get_report() if self.feed_latency is not None else {},
+            'portfolio': self.portfolio.snapshot(),
+        }
+
+    def export_results(self, output_dir, prefix: str = "tick_router") -> Dict[str, str]:
+        """
+        Write per-symbol trades (<prefix>_trades.csv) and the per-symbol + portfolio
+        summary (<prefix>_summary.json) to output_dir. Call after stop().
+
+        Returns {'trades': path, 'summary': path}.
+        """
+        out = Path(output_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        trades_path = out / f"{prefix}_trades.csv"
+        summary_path = out / f"{prefix}_summary.json"
+
+        symbols = {}
+        with open(trades_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['symbol', 'token', 'trade_id', 'entry_time', 'exit_time', 'entry_price',
+                             'exit_price', 'quantity', 'gross_pnl', 'commission', 'net_pnl',
+                             'exit_reason', 'duration_minutes'])
+            for w in self.workers:
+                pm = w.position_manager
+                completed = list(pm.completed_trades)
+                for t in completed:
+                    writer.writerow([w.symbol, w.token, t.trade_id,
+                                     t.entry_time.isoformat() if t.entry_time else '',
+                                     t.exit_time.isoformat() if t.exit_time else '',
+                                     t.entry_price, t.exit_price, t.quantity, t.gross_pnl,
+                                     t.commission, t.net_pnl, t.exit_reason, t.duration_minutes])
+                wins = sum(1 for t in completed if t.net_pnl > 0)
+                symbols[w.symbol] = {
+                    'token': w.token,
+                    'initial_capital': pm.initial_capital,
+                    'final_capital': pm.current_capital,
+                    'realized_pnl': sum(t.net_pnl for t in completed),
+                    'total_trades': len(completed),
+                    'win_rate': wins / len(completed) * 100 if completed else 0.0,
+                    'open_positions': len(pm.positions),
+                    'ticks': w.tick_count,
+                    'errors': w.error_count,
+                }
+
+        summary = {
+            'timestamp': now_ist().isoformat(),
+            'capital_allocation': 'split evenly per symbol (not pooled) unless an instrument sets capital',
+            'symbols': symbols,
+            'portfolio': self.portfolio.snapshot(),
+            'dropped_ticks': self.dropped_ticks,
+            'unrouted_ticks': self.unrouted_ticks,
+        }
+        with open(summary_path, 'w') as f:
+            json.dump(summary, f, indent=2, default=str)
+        logger.info(f"TickRouter results written: {trades_path}, {summary_path}")
+        return {'trades': str(trades_path), 'summary': str(summary_path)}
@@ -11,12 +11,15 @@ Unified forward-test/live simulation runner.
 import time
 import logging
 import importlib
-import pandas as pd
+from collections import deque
+from typing import Any, Dict
 from types import MappingProxyType
 from core.position_manager import PositionManager
 from live.broker_adapter import BrokerAdapter
 from live.forward_test_results import ForwardTestResults
-from utils.time_utils import now_ist
+from utils.time_utils import now_ist, ReplayClock
+from core.tick import Tick
+from utils.latency_histogram import StageLatencyRecorder
 from utils.config_helper import validate_config, freeze_config, create_config_from_defaults
 
 # Module-level logger
@@ -41,7 +44,8 @@ def get_strategy(config):
     return strat_module.ModularIntradayStrategy(config, ind_mod)
 
 class LiveTrader:
-    def __init__(self, config_path: str = None, config_dict: dict = None, frozen_config: MappingProxyType = None, dialog_text: str = None):
+    def __init__(self, config_path: str = None, config_dict: dict = None, frozen_config: MappingProxyType = None, dialog_text: str = None,
+                 broker=None):
         """Initialize LiveTrader with frozen config validation
         
         Args:
@@ -49,6 +53,8 @@ class LiveTrader:
             config_dict: Raw dict config (legacy) 
             frozen_config: MappingProxyType from GUI workflow (preferred)
             dialog_text: Configuration dialog text from GUI (REQUIRED for results export)
+            broker: Optional tick source with the BrokerAdapter interface
+                    (e.g. live.process_topology.SharedMemoryTickSource); default BrokerAdapter(config)
         """
         # Accept frozen config directly from GUI (preferred path)
         if frozen_config is not None:
@@ -82,9 +88,17 @@ class LiveTrader:
         # Pass complete frozen config to strategy (not partial params)
         self.strategy = get_strategy(config)
         
+        # Strategy notifications from any thread are queued and run on the tick thread
+        # (_drain_strategy_notifications), so exits never wait for on_tick to finish
+        self._strategy_notifications = deque()
         # Pass frozen config directly to PositionManager with strategy callback
-        self.position_manager = PositionManager(config, strategy_callback=self.strategy.on_position_exit)
-        self.broker = BrokerAdapter(config)  # Pass frozen config downstream
+        self.position_manager = PositionManager(config, strategy_callback=self._queue_position_exit)
+        # Pass frozen config downstream (installs the session clock)
+        self.broker = broker if broker is not None else BrokerAdapter(config)
+        # Replay clock: file simulation runs at CPU speed on data timestamps
+        self.replay_mode = isinstance(self.broker.clock, ReplayClock)
+        # Risk-first exits (live.risk_first_exits): broker evaluates TP/SL/trailing on the feed thread
+        self.broker.attach_risk_engine(self.position_manager)
         
         # 🔍 DEBUG: Log dialog_text before passing to ForwardTestResults
         logger.info(f"🔍 LiveTrader creating ForwardTestResults - dialog_text type: {type(dialog_text)}, length: {len(dialog_text) if dialog_text else 0}")
@@ -102,6 +116,11 @@ class LiveTrader:
         self.tick_count = 0
         self.last_price = None  # Track last seen price for heartbeat logging
         self._last_no_tick_log = None
+        
+        # Per-stage tick latency histograms (performance.latency_histograms) - None = no stamping
+        perf = config['performance']
+        self.latency_recorder = (StageLatencyRecorder(perf['latency_histogram_precision_bits'])
+                                 if perf['latency_histograms'] else None)
 
     def stop(self):
         """Stop the forward test session gracefully"""
@@ -126,9 +145,28 @@ class LiveTrader:
             logger.info(f"Forward test results automatically exported to: {filename}")
         except Exception as e:
             logger.error(f"Failed to export results: {e}")
+        self.broker.restore_wall_clock()
+        self.strategy.close()
         
         logger.info("✅ Forward test session stopped successfully")
 
+    def prepare_session(self, run_once=False, result_box=None, performance_callback=None):
+        """Session state the tick handlers rely on; start() calls this before connecting.
+
+        Harnesses that drive _on_tick_direct / _process_polled_tick themselves
+        (scripts/ws_load_test.py, scripts/alloc_audit.py) call it instead of start().
+        """
+        self.is_running = True
+        self.performance_callback = performance_callback
+        self.result_box = result_box
+        self.run_once = run_once
+        
+        # Initialize NaN tracking - shared by both modes
+        self.nan_streak = 0
+        self.nan_threshold = self.config['strategy']['nan_streak_threshold']
+        self.nan_recovery_threshold = self.config['strategy']['nan_recovery_threshold']
+        self.consecutive_valid_ticks = 0
+
     def start(self, run_once=False, result_box=None, performance_callback=None):
         """Start trading session with hybrid mode support
         
@@ -138,18 +176,9 @@ class LiveTrader:
         
         Toggle with self.use_direct_callbacks = True
         """
-        self.is_running = True
-        self.performance_callback = performance_callback
+        self.prepare_session(run_once, result_box, performance_callback)
         logger = logging.getLogger(__name__)
         
-        # Initialize NaN tracking - shared by both modes
-        self.nan_streak = 0
-        self.nan_threshold = self.config['strategy']['nan_streak_threshold']
-        self.nan_recovery_threshold = self.config['strategy']['nan_recovery_threshold']
-        self.consecutive_valid_ticks = 0
-        self.result_box = result_box
-        self.run_once = run_once
-        
         # Register callback if Wind-style mode enabled
         if self.use_direct_callbacks:
             self.broker.on_tick_callback = self._on_tick_direct
@@ -170,10 +199,6 @@ class LiveTrader:
     def _run_polling_loop(self, run_once, result_box, performance_callback):
         """Original polling-based trading loop (backwards compatible)"""
         logger = logging.getLogger(__name__)
-        nan_streak = 0
-        nan_threshold = self.nan_threshold
-        nan_recovery_threshold = self.nan_recovery_threshold
-        consecutive_valid_ticks = 0
         tick_count = 0
         
         try:
@@ -222,92 +247,10 @@ class LiveTrader:
                         logger.info("Stop requested during GUI yield - exiting immediately")
                         break
 
-                
-                now = tick['timestamp'] if 'timestamp' in tick else now_ist()
-                
-                # STEP 2: Session end enforcement (before processing)
-                if hasattr(self.strategy, "should_exit_for_session"):
-                    should_exit, exit_reason = self.strategy.should_exit_for_session(now)
-                    if should_exit:
-                        self.close_position("Session End")
-                        logger.info(f"🛑 Session ended - stopping trading: {exit_reason}")
-                        logger.info("All positions flattened (if any).")
-                        break
-                
-                # STEP 3: TRUE TICK-BY-TICK PROCESSING - Use on_tick() directly
-                try:
-                    signal = self.strategy.on_tick(tick)
-                    
-                    # Reset NaN streak on successful processing
-                    nan_streak = 0
-                    consecutive_valid_ticks += 1
-                    
-                except Exception as e:
-                    # NaN threshold implementation
-                    nan_streak += 1
-                    consecutive_valid_ticks = 0
-                    logger.warning(f"Tick processing failed (streak: {nan_streak}/{nan_threshold}): {e}")
-                    
-                    if nan_streak >= nan_threshold:
-                        logger.error(f"NaN streak threshold ({nan_threshold}) exceeded. Stopping trading.")
-                        self.close_position("NaN Threshold Exceeded")
-                        break
-                    continue
-                
-                # STEP 4: Process signal immediately if generated
-                if signal:
-                    current_price = tick.get('price', tick.get('ltp', 0))
-                    
-                    if signal.action == 'BUY' and not self.active_position_id:
-                        # Trust the strategy's entry validation - signal was already generated with proper checks
-                        # Create optimized tick row for position manager
-                        tick_row = self._create_tick_row(tick, signal.price, now)
-                        
-                        self.active_position_id = self.strategy.open_long(tick_row, now, self.position_manager)
-                        if self.active_position_id:
-                            qty = self.position_manager.positions[self.active_position_id].current_quantity
-                            logger.info(f"[TICK] ENTERED LONG at ₹{signal.price:.2f} ({qty} contracts) - {signal.reason}")
-                            self._update_result_box(result_box, f"Tick BUY: {qty} @ {signal.price:.2f} ({signal.reason})")
-                    
-                    elif signal.action == 'CLOSE' and self.active_position_id:
-                        self.close_position(f"Strategy Signal: {signal.reason}")
-                        self._update_result_box(result_box, f"Tick CLOSE: @ {signal.price:.2f} ({signal.reason})")
-                
-                # Check stop condition before position processing
-                if not self.is_running:
-                    logger.info("Stop requested before position processing - exiting")
+
+                # STEPS 2-6: session end, strategy, entries/exits, TP/SL/trailing
+                if not self._process_polled_tick(tick, tick_count, result_box):
                     break
-                
-                # STEP 5: Position manager processes TP/SL/trail exits (if position exists)
-                if self.active_position_id:
-                    # Debug logging every 100 ticks when in position
-                    if tick_count % 100 == 0:
-                        logger.info(f"[DEBUG] Position active: {self.active_position_id} | Tick count: {tick_count} | Price: ₹{tick.get('price', 0):.2f}")
-                    
-                    current_price = tick.get('price', tick.get('ltp', 0))
-                    current_tick_row = self._create_tick_row(tick, current_price, now)
-                    
-                    try:
-                        self.position_manager.process_positions(current_tick_row, now)
-                    except Exception as e:
-                        logger.error(f"Error in position_manager.process_positions: {e}")
-                        logger.exception("Position processing exception details:")
-                    
-                    # Check if position was closed by risk management
-                    if self.active_position_id not in self.position_manager.positions:
-                        logger.info("Position closed by risk management (TP/SL/trailing).")
-                        self._update_result_box(result_box, f"Risk CLOSE: @ {current_price:.2f}")
-                        # CRITICAL FIX: Notify strategy of position closure to reset state
-                        try:
-                            self.strategy.on_position_closed(self.active_position_id, "Risk Management")
-                        except Exception as e:
-                            # Log notification failed, but continue trading
-                            logger.warning(f"Strategy notification failed: {e}")
-                        self.active_position_id = None
-                
-                # STEP 6: Check for single-run mode
-                if run_once:
-                    self.is_running = False
         except KeyboardInterrupt:
             logger.info("Forward test interrupted by user.")
             self.close_position("Keyboard Interrupt")
@@ -325,6 +268,126 @@ class LiveTrader:
                 logger.info(f"Forward test results automatically exported to: {filename}")
             except Exception as e:
                 logger.error(f"Failed to export results: {e}")
+            self._export_latency_histograms()
+            self.broker.restore_wall_clock()
+            self.strategy.close()
+    
+    def _process_polled_tick(self, tick, tick_count, result_box):
+        """One polling-loop iteration for a dequeued tick (STEPS 2-6 below).
+
+        Session end check, strategy, entries/exits and TP/SL/trailing exits, all as
+        the polling session runs them; uses the session state start() sets.
+        Returns False when the session must end.
+        """
+        self._drain_strategy_notifications()
+        try:
+            return self._polled_tick_steps(tick, tick_count, result_box)
+        finally:
+            self._drain_strategy_notifications()
+
+    def _polled_tick_steps(self, tick, tick_count, result_box):
+        logger = logging.getLogger(__name__)
+        now = tick.timestamp
+        recorder = self.latency_recorder
+        if recorder is not None:
+            recorder.stamp(tick, 'queue_out')
+        
+        # STEP 2: Session end enforcement (before processing)
+        if hasattr(self.strategy, "should_exit_for_session"):
+            should_exit, exit_reason = self.strategy.should_exit_for_session(now)
+            if should_exit:
+                self.close_position("Session End")
+                logger.info(f"🛑 Session ended - stopping trading: {exit_reason}")
+                logger.info("All positions flattened (if any).")
+                return False
+        
+        # STEP 3: TRUE TICK-BY-TICK PROCESSING - Use on_tick() directly
+        # No risk_lock: exits on the feed/heartbeat threads queue their strategy notification
+        try:
+            if recorder is not None:
+                strategy_start = recorder.stamp(tick, 'strategy_start')
+                signal = self.strategy.on_tick(tick)
+                recorder.record('strategy', recorder.stamp(tick, 'strategy_end') - strategy_start)
+            else:
+                signal = self.strategy.on_tick(tick)
+            
+            # Reset NaN streak on successful processing
+            self.nan_streak = 0
+            self.consecutive_valid_ticks += 1
+            
+        except Exception as e:
+            # NaN threshold implementation
+            self.nan_streak += 1
+            self.consecutive_valid_ticks = 0
+            logger.warning(f"Tick processing failed (streak: {self.nan_streak}/{self.nan_threshold}): {e}")
+            
+            if self.nan_streak >= self.nan_threshold:
+                logger.error(f"NaN streak threshold ({self.nan_threshold}) exceeded. Stopping trading.")
+                self.close_position("NaN Threshold Exceeded")
+                return False
+            return True
+        
+        # STEP 4: Process signal immediately if generated
+        if signal:
+            current_price = tick.price
+            
+            if signal.action == 'BUY' and not self.active_position_id:
+                # Trust the strategy's entry validation - signal was already generated with proper checks
+                # Create optimized tick row for position manager
+                tick_row = self._create_tick_row(tick, signal.price, now)
+                
+                # risk_lock: feed thread may be evaluating exits (risk-first mode)
+                with self.broker.risk_lock:
+                    self.active_position_id = self.strategy.open_long(tick_row, now, self.position_manager)
+                if self.active_position_id:
+                    if recorder is not None:
+                        recorder.stamp(tick, 'order_decision')
+                    qty = self.position_manager.positions[self.active_position_id].current_quantity
+                    logger.info(f"[TICK] ENTERED LONG at ₹{signal.price:.2f} ({qty} contracts) - {signal.reason}")
+                    self._update_result_box(result_box, f"Tick BUY: {qty} @ {signal.price:.2f} ({signal.reason})")
+            
+            elif signal.action == 'CLOSE' and self.active_position_id:
+                self.close_position(f"Strategy Signal: {signal.reason}")
+                if recorder is not None:
+                    recorder.stamp(tick, 'order_decision')
+                self._update_result_box(result_box, f"Tick CLOSE: @ {signal.price:.2f} ({signal.reason})")
+        
+        # Check stop condition before position processing
+        if not self.is_running:
+            logger.info("Stop requested before position processing - exiting")
+            return False
+        
+        # STEP 5: Position manager processes TP/SL/trail exits (if position exists)
+        if self.active_position_id:
+            # Debug logging every 100 ticks when in position
+            if tick_count % 100 == 0:
+                logger.info(f"[DEBUG] Position active: {self.active_position_id} | Tick count: {tick_count} | Price: ₹{tick.price:.2f}")
+            
+            current_price = tick.price
+            
+            with self.broker.risk_lock:
+                try:
+                    self.position_manager.process_price(tick.price, tick.ts_ns, now)
+                except Exception as e:
+                    logger.error(f"Error in position_manager.process_price: {e}")
+                    logger.exception("Position processing exception details:")
+                
+                # Check if position was closed by risk management
+                if self.active_position_id and self.active_position_id not in self.position_manager.positions:
+                    logger.info("Position closed by risk management (TP/SL/trailing).")
+                    self._update_result_box(result_box, f"Risk CLOSE: @ {current_price:.2f}")
+                    # CRITICAL FIX: Notify strategy of position closure to reset state
+                    try:
+                        self.strategy.on_position_closed(self.active_position_id, "Risk Management")
+                    except Exception as e:
+                        # Log notification failed, but continue trading
+                        logger.warning(f"Strategy notification failed: {e}")
+                    self.active_position_id = None
+        
+        # STEP 6: Check for single-run mode
+        if self.run_once:
+            self.is_running = False
+        return True
     
     def _run_callback_loop(self):
         """Wind-style callback-driven trading loop (high performance)
@@ -407,6 +470,9 @@ class LiveTrader:
                 logger.info(f"Forward test results automatically exported to: {filename}")
             except Exception as e:
                 logger.error(f"Failed to export results: {e}")
+            self._export_latency_histograms()
+            self.broker.restore_wall_clock()
+            self.strategy.close()
     
     def _run_file_simulation_callback_mode(self):
         """Dedicated file simulation loop for callback mode testing
@@ -423,6 +489,10 @@ class LiveTrader:
                 tick = self.broker.get_next_tick()
                 
                 if tick:
+                    # Replay clock: session starts at the first data timestamp, not at wall time
+                    if self.replay_mode and self.tick_count == 0:
+                        self.results_exporter.start_time = tick.timestamp
+
                     # Process tick through callback handler (testing callback logic)
                     self._on_tick_direct(tick, "FILE_SIM")
                     self.tick_count += 1
@@ -440,7 +510,8 @@ class LiveTrader:
                     
                     # CRITICAL: Yield to GUI thread to prevent freezing
                     # Small sleep simulates realistic tick timing and allows GUI updates
-                    time.sleep(0.001)  # 1ms delay = ~1000 ticks/sec max
+                    # Replay clock: yield only (sleep(0)) - time comes from data, not pacing
+                    time.sleep(0 if self.replay_mode else 0.001)  # 1ms delay = ~1000 ticks/sec max
                 else:
                     # Simulation complete
                     logger.info("📋 File simulation completed - all data processed")
@@ -469,8 +540,40 @@ class LiveTrader:
                 logger.info(f"File simulation results exported to: {filename}")
             except Exception as e:
                 logger.error(f"Failed to export results: {e}")
+            self._export_latency_histograms()
+            self.broker.restore_wall_clock()
+            self.strategy.close()
     
     def _on_tick_direct(self, tick, symbol):
+        """
+        Direct callback entry point (feed thread, or the file-simulation loop).
+
+        Only position manager changes take broker.risk_lock; strategy.on_tick runs
+        unlocked so risk-first exits never wait for indicator work. Strategy
+        notifications queued by exits on other threads run here, before and after
+        the tick, so they never interleave with on_tick.
+        """
+        self._drain_strategy_notifications()
+        try:
+            self._handle_direct_tick(tick, symbol)
+        finally:
+            self._drain_strategy_notifications()
+
+    def _queue_position_exit(self, exit_info):
+        """PositionManager strategy_callback: may fire on the feed or heartbeat thread."""
+        self._strategy_notifications.append((self.strategy.on_position_exit, (exit_info,)))
+
+    def _drain_strategy_notifications(self):
+        """Run queued strategy notifications on the tick thread (the only thread calling the strategy)."""
+        pending = self._strategy_notifications
+        while pending:
+            notify, args = pending.popleft()
+            try:
+                notify(*args)
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"Strategy notification failed: {e}")
+
+    def _handle_direct_tick(self, tick, symbol):
         """Direct callback handler for Wind-style tick processing
         
         Called directly from WebSocket thread when tick arrives.
@@ -497,15 +600,12 @@ class LiveTrader:
             
             # Log FIRST tick and every 100 ticks to verify callback is receiving ticks
             if self._callback_tick_count == 1 or self._callback_tick_count % 100 == 0:
-                logger.info(f"🔍 [CALLBACK] Processing tick #{self._callback_tick_count}, price: ₹{tick.get('price', 'N/A')}, keys: {list(tick.keys())}")
-            # Add timestamp if not present
-            if 'timestamp' not in tick:
-                tick['timestamp'] = now_ist()
-            
-            now = tick['timestamp']
+                logger.info(f"🔍 [CALLBACK] Processing tick #{self._callback_tick_count}, price: ₹{tick.price}, symbol: {tick.symbol or symbol}")
+            # Tick record carries its timestamp from the source (streamer/simulator)
+            now = tick.timestamp
             
             # Update last price for heartbeat logging
-            self.last_price = tick.get('price', tick.get('ltp', None))
+            self.last_price = tick.price
             
             # Phase 1.5: Measure session checks
             if _pre_convergence_instrumentor:
@@ -543,11 +643,16 @@ class LiveTrader:
             # Process tick through strategy (KEEP MEASURING - this is part of pre-convergence)
             try:
                 # Phase 1.5: Measure strategy call overhead (NOT strategy internals)
+                recorder = self.latency_recorder
+                if recorder is not None:
+                    strategy_start = recorder.stamp(tick, 'strategy_start')
                 if _pre_convergence_instrumentor:
                     with _pre_convergence_instrumentor.measure_trader('strategy_call'):
                         signal = self.strategy.on_tick(tick)
                 else:
                     signal = self.strategy.on_tick(tick)
+                if recorder is not None:
+                    recorder.record('strategy', recorder.stamp(tick, 'strategy_end') - strategy_start)
                 
                 # Log signal result for FIRST tick and occasionally
                 if self._callback_tick_count == 1 or self._callback_tick_count % 300 == 0:
@@ -581,38 +686,50 @@ class LiveTrader:
                 with _pre_convergence_instrumentor.measure_trader('signal_handling'):
                     # Handle signal immediately
                     if signal:
-                        current_price = tick.get('price', tick.get('ltp', 0))
+                        current_price = tick.price
                         self.last_price = current_price
                         
                         if signal.action == 'BUY' and not self.active_position_id:
                             tick_row = self._create_tick_row(tick, signal.price, now)
-                            self.active_position_id = self.strategy.open_long(tick_row, now, self.position_manager)
+                            # risk_lock: feed thread may be evaluating exits (risk-first mode)
+                            with self.broker.risk_lock:
+                                self.active_position_id = self.strategy.open_long(tick_row, now, self.position_manager)
                             
                             if self.active_position_id:
+                                if recorder is not None:
+                                    recorder.stamp(tick, 'order_decision')
                                 qty = self.position_manager.positions[self.active_position_id].current_quantity
                                 logger.info(f"[DIRECT] ENTERED LONG at ₹{signal.price:.2f} ({qty} contracts) - {signal.reason}")
                                 self._update_result_box(self.result_box, f"Direct BUY: {qty} @ {signal.price:.2f} ({signal.reason})")
                         
                         elif signal.action == 'CLOSE' and self.active_position_id:
                             self.close_position(f"Strategy Signal: {signal.reason}")
+                            if recorder is not None:
+                                recorder.stamp(tick, 'order_decision')
                             self._update_result_box(self.result_box, f"Direct CLOSE: @ {signal.price:.2f} ({signal.reason})")
             else:
                 # Handle signal immediately (no instrumentation)
                 if signal:
-                    current_price = tick.get('price', tick.get('ltp', 0))
+                    current_price = tick.price
                     self.last_price = current_price
                     
                     if signal.action == 'BUY' and not self.active_position_id:
                         tick_row = self._create_tick_row(tick, signal.price, now)
-                        self.active_position_id = self.strategy.open_long(tick_row, now, self.position_manager)
+                        # risk_lock: feed thread may be evaluating exits (risk-first mode)
+                        with self.broker.risk_lock:
+                            self.active_position_id = self.strategy.open_long(tick_row, now, self.position_manager)
                         
                         if self.active_position_id:
+                            if recorder is not None:
+                                recorder.stamp(tick, 'order_decision')
                             qty = self.position_manager.positions[self.active_position_id].current_quantity
                             logger.info(f"[DIRECT] ENTERED LONG at ₹{signal.price:.2f} ({qty} contracts) - {signal.reason}")
                             self._update_result_box(self.result_box, f"Direct BUY: {qty} @ {signal.price:.2f} ({signal.reason})")
                     
                     elif signal.action == 'CLOSE' and self.active_position_id:
                         self.close_position(f"Strategy Signal: {signal.reason}")
+                        if recorder is not None:
+                            recorder.stamp(tick, 'order_decision')
                         self._update_result_box(self.result_box, f"Direct CLOSE: @ {signal.price:.2f} ({signal.reason})")
             
             # Phase 1.5: Measure position management
@@ -620,17 +737,19 @@ class LiveTrader:
                 with _pre_convergence_instrumentor.measure_trader('position_mgmt'):
                     # Position management (TP/SL/trailing)
                     if self.active_position_id:
-                        current_price = tick.get('price', tick.get('ltp', 0))
+                        current_price = tick.price
                         self.last_price = current_price
-                        current_tick_row = self._create_tick_row(tick, current_price, now)
-                        
-                        try:
-                            self.position_manager.process_positions(current_tick_row, now)
-                        except Exception as e:
-                            logger.error(f"Error in position_manager.process_positions: {e}")
                         
-                        # Check if position was closed by risk management
-                        if self.active_position_id not in self.position_manager.positions:
+                        with self.broker.risk_lock:
+                            try:
+                                self.position_manager.process_price(tick.price, tick.ts_ns, now)
+                            except Exception as e:
+                                logger.error(f"Error in position_manager.process_price: {e}")
+                            
+                            # Check if position was closed by risk management
+                            closed_by_risk = (self.active_position_id and
+                                              self.active_position_id not in self.position_manager.positions)
+                        if closed_by_risk:
                             logger.info("Position closed by risk management (TP/SL/trailing) [Direct Callback]")
                             self._update_result_box(self.result_box, f"Risk CLOSE: @ {current_price:.2f}")
                             
@@ -644,22 +763,24 @@ class LiveTrader:
             else:
                 # Position management (TP/SL/trailing) - no instrumentation
                 if self.active_position_id:
-                    current_price = tick.get('price', tick.get('ltp', 0))
+                    current_price = tick.price
                     self.last_price = current_price
-                    current_tick_row = self._create_tick_row(tick, current_price, now)
                     
                     # Debug log every 100 ticks when in position
                     if self._callback_tick_count % 100 == 0:
                         logger.info(f"[DEBUG] Position active: {self.active_position_id} | Tick count: {self._callback_tick_count} | Price: ₹{current_price:.2f}")
                     
-                    try:
-                        self.position_manager.process_positions(current_tick_row, now)
-                    except Exception as e:
-                        logger.error(f"Error in position_manager.process_positions: {e}")
-                        logger.exception("Position processing exception details:")
-                    
-                    # Check if position was closed by risk management
-                    if self.active_position_id not in self.position_manager.positions:
+                    with self.broker.risk_lock:
+                        try:
+                            self.position_manager.process_price(tick.price, tick.ts_ns, now)
+                        except Exception as e:
+                            logger.error(f"Error in position_manager.process_price: {e}")
+                            logger.exception("Position processing exception details:")
+                        
+                        # Check if position was closed by risk management
+                        closed_by_risk = (self.active_position_id and
+                                          self.active_position_id not in self.position_manager.positions)
+                    if closed_by_risk:
                         logger.info("Position closed by risk management (TP/SL/trailing) [Direct Callback]")
                         self._update_result_box(self.result_box, f"Risk CLOSE: @ {current_price:.2f}")
                         
@@ -684,16 +805,25 @@ class LiveTrader:
                 _pre_convergence_instrumentor.end_trader_tick()
 
     def close_position(self, reason: str = "Manual"):
-        if self.active_position_id and self.active_position_id in self.position_manager.positions:
-            last_price = self.broker.get_last_price()
-            now = now_ist()
-            self.position_manager.close_position_full(self.active_position_id, last_price, now, reason)
-            logger = logging.getLogger(__name__)
-            logger.info(f"[SIM] Position closed at {last_price} for reason: {reason}")
-            # CRITICAL FIX: Notify strategy of position closure to reset state
-            self.strategy.on_position_closed(self.active_position_id, reason)
-            self.active_position_id = None
-            
+        if not self.active_position_id:
+            return
+        last_price = self.broker.get_last_price()
+        now = now_ist()
+        # risk_lock: with risk-first exits the feed thread may close the same position concurrently.
+        # Callers include the heartbeat/GUI threads, so the strategy notification is queued for the
+        # tick thread instead of running here next to a possibly in-flight on_tick
+        with self.broker.risk_lock:
+            if not self.active_position_id:
+                return
+            closed = self.position_manager.close_position_full(self.active_position_id, last_price, now, reason)
+            if closed:
+                logger = logging.getLogger(__name__)
+                logger.info(f"[SIM] Position closed at {last_price} for reason: {reason}")
+                # CRITICAL FIX: Notify strategy of position closure to reset state
+                self._strategy_notifications.append((self.strategy.on_position_closed,
+                                                     (self.active_position_id, reason)))
+                self.active_position_id = None
+        if closed:
             # Update performance summary in GUI when trade completes
             if hasattr(self, 'performance_callback') and self.performance_callback:
                 try:
@@ -701,16 +831,31 @@ class LiveTrader:
                 except Exception as e:
                     logger.warning(f"Failed to update performance callback: {e}")
 
-    def _create_tick_row(self, tick: dict, price: float, timestamp) -> pd.Series:
-        """Create standardized tick row for position manager compatibility."""
-        return pd.Series({
+    def get_latency_snapshot(self, reset: bool = False) -> Dict[str, Any]:
+        """Per-stage latency percentiles (us) since start/last reset; {} when histograms are disabled."""
+        if self.latency_recorder is None:
+            return {}
+        return self.latency_recorder.snapshot(reset=reset)
+    
+    def _export_latency_histograms(self):
+        """Write stage latency histograms to results/ (session end, when enabled)."""
+        if self.latency_recorder is None:
+            return
+        try:
+            self.latency_recorder.export_json()
+        except Exception as e:
+            logger.error(f"Failed to export latency histograms: {e}")
+    
+    def _create_tick_row(self, tick: Tick, price: float, timestamp) -> Dict[str, Any]:
+        """Create standardized entry row for strategy.open_long (plain dict, no pandas)."""
+        return {
             'close': price,
             'high': price,
             'low': price,
             'open': price,
-            'volume': tick.get('volume', 1000),
+            'volume': tick.volume,
             'timestamp': timestamp
-        })
+        }
     
     def _update_result_box(self, result_box, message: str):
         """Update result box with thread-safe GUI operations."""
@@ -4,9 +4,10 @@ live/websocket_stream.py
 SmartAPI WebSocket streaming module for unified trading system.
 
 Features:
-- Multiple instrument streams (up to 3 per SmartAPI account)
+- Multiple instrument streams (up to 3 per connection; live.tick_router shards larger sets)
 - User-selectable feed type: LTP, Quote, SnapQuote
 - Event-driven tick delivery to tick buffer and OHLC aggregator
+- Binary fast path: SmartWebSocketV2 packets decoded straight into Tick (live.smartapi_binary)
 - Robust reconnect and error handling
 - Integration with GUI controls and manual refresh
 - Angel One compatible exchange type mapping
@@ -18,12 +19,14 @@ Usage:
 
 import logging
 import threading
+import time
 import json
 import pytz
-from datetime import datetime
 
 # Import timezone from SSOT
-from utils.time_utils import IST
+from utils.time_utils import now_ist
+from core.tick import Tick
+from live.smartapi_binary import BinaryTickDecoder, LTP_PACKET_SIZE
 
 try:
     from SmartApi.smartWebSocketV2 import SmartWebSocketV2  # Capital 'A' - correct package name
@@ -35,6 +38,9 @@ from utils.exchange_mapper import map_to_angel_exchange_type
 
 logger = logging.getLogger(__name__)
 
+# SmartAPI subscription limit per WebSocket connection (use live.tick_router for more instruments)
+MAX_TOKENS_PER_CONNECTION = 3
+
 # Suppress known SmartAPI WebSocket callback signature mismatch
 class SmartAPIWebSocketFilter(logging.Filter):
     """Filter out known SmartAPI library bugs that don't affect functionality."""
@@ -60,7 +66,8 @@ def set_pre_convergence_instrumentor(instrumentor):
     logger.info(f"🔬 [WEBSOCKET_STREAM] Variable ID when SET: {id(_pre_convergence_instrumentor)}")
 
 class WebSocketTickStreamer:
-    def __init__(self, api_key, client_code, feed_token, symbol_tokens, feed_type="Quote", on_tick=None, auth_token=None):
+    def __init__(self, api_key, client_code, feed_token, symbol_tokens, feed_type="Quote", on_tick=None, auth_token=None,
+                 retain_raw=False, binary_decode=False, record_frames_path="", ws_url=""):
         """
         api_key: SmartAPI API key
         client_code: User/Account code
@@ -68,7 +75,11 @@ class WebSocketTickStreamer:
         auth_token: JWT token for authentication (required for SmartWebSocketV2)
         symbol_tokens: list of dicts [{"symbol": ..., "token": ..., "exchange": ...}]
         feed_type: 'LTP', 'Quote', or 'SnapQuote'
-        on_tick: callback(tick_dict, symbol) called when new tick arrives
+        on_tick: callback(tick, symbol) called with a core.tick.Tick when new tick arrives
+        retain_raw: keep the full feed message on tick.raw (debugging only - costs a reference per tick)
+        binary_decode: decode binary tick packets directly (skips SmartAPI's per-field dict parse)
+        record_frames_path: if set, append raw binary frames to this file (fixture capture)
+        ws_url: endpoint override (local replay server); "" keeps SmartWebSocketV2.ROOT_URI
         """
         if SmartWebSocketV2 is None:
             raise ImportError("SmartWebSocketV2 (smartapi) package not available.")
@@ -76,9 +87,21 @@ class WebSocketTickStreamer:
         self.auth_token = auth_token
         self.client_code = client_code
         self.feed_token = feed_token
-        self.symbol_tokens = symbol_tokens[:3]  # SmartAPI allows max 3
+        if len(symbol_tokens) > MAX_TOKENS_PER_CONNECTION:
+            logger.warning(f"WebSocketTickStreamer: {len(symbol_tokens)} tokens requested, only the first "
+                           f"{MAX_TOKENS_PER_CONNECTION} are subscribed on this connection (use TickRouter for more)")
+        self.symbol_tokens = symbol_tokens[:MAX_TOKENS_PER_CONNECTION]  # SmartAPI allows max 3
         self.feed_type = feed_type
         self.on_tick = on_tick or (lambda tick, symbol: None)
+        self.retain_raw = retain_raw
+        # token -> symbol lookup (feed messages carry the token, not the trading symbol)
+        self._token_symbols = {str(s['token']): s['symbol'] for s in self.symbol_tokens}
+        self.binary_decode = binary_decode and not retain_raw  # raw retention needs the parsed dict
+        self._decoder = BinaryTickDecoder(self._token_symbols)
+        self.record_frames_path = record_frames_path
+        self._frame_file = None
+        self.ws_url = ws_url
+        self._library_on_data = None  # SmartWebSocketV2's own frame handler (text/control frames)
         self.ws = None
         self.running = False
         self.thread = None
@@ -162,16 +185,17 @@ class WebSocketTickStreamer:
             else:
                 data = message  # Already a dictionary
             
-            # Phase 1.5: Measure dict creation/processing
+            # Phase 1.5: Measure tick record creation
             if _pre_convergence_instrumentor:
                 with _pre_convergence_instrumentor.measure_websocket('dict_creation'):
-                    # Use timezone-aware timestamp for consistency with strategy
-                    # Create timestamp if needed
-                    ts = datetime.now(IST)
+                    # Receive time: ns counter for latency accounting, IST datetime for strategy/session
+                    recv_ns = time.time_ns()
+                    mono_ns = time.perf_counter_ns()
+                    ts = now_ist()
             else:
-                # Use timezone-aware timestamp for consistency with strategy
-                # Create timestamp if needed
-                ts = datetime.now(IST)
+                recv_ns = time.time_ns()
+                mono_ns = time.perf_counter_ns()
+                ts = now_ist()
             # Extract price with better error handling and logging
             raw_price = data.get("ltp", data.get("last_traded_price", 0))
             if raw_price == 0:
@@ -183,31 +207,27 @@ class WebSocketTickStreamer:
             # Need to divide by 100 to get actual rupee price
             actual_price = float(raw_price) / 100.0
             
-            tick = {
-                "timestamp": ts,
-                "price": actual_price,  # Use converted price in rupees
-                "volume": int(data.get("volume", 0)),
-                "symbol": data.get("tradingsymbol", data.get("symbol", "")),
-                "exchange": data.get("exchange", ""),
-                "raw": data
-            }
-            
-            # Validate reasonable price range for options  
-            if tick['price'] > 5000:  # Still log if something seems wrong
-                logger.warning(f"🚨 Unusually high option price: {tick['symbol']} @ ₹{tick['price']} - Raw data: {data}")
-            elif tick['price'] < 0.01:  # Also log extremely low prices
-                logger.warning(f"🚨 Unusually low option price: {tick['symbol']} @ ₹{tick['price']} - Raw data: {data}")
+            token = str(data.get("token", ""))
+            exchange_ts_ms = data.get("exchange_timestamp", 0) or 0
+            last_trade_s = data.get("last_traded_timestamp", 0) or 0  # SnapQuote only
+            # Same field as the binary path (BinaryTickDecoder): last traded quantity; LTP packets carry none
+            volume = data.get("last_traded_quantity", data.get("volume", 0)) or 0
+            tick = Tick(
+                timestamp=ts,
+                price=actual_price,  # Use converted price in rupees
+                volume=int(volume),
+                symbol_id=int(token) if token.isdigit() else 0,
+                symbol=data.get("tradingsymbol") or data.get("symbol") or self._token_symbols.get(token, ""),
+                exchange_ts_ns=int(exchange_ts_ms) * 1_000_000,
+                recv_ts_ns=recv_ns,
+                ts_ns=recv_ns,
+                raw=data if self.retain_raw else None,
+                mono_ns=mono_ns,
+                last_trade_ts_ns=int(last_trade_s) * 1_000_000_000,
+                seq=int(data.get("sequence_number", 0) or 0)
+            )
             
-            if self.on_tick:
-                # Phase 1.5: End websocket measurement before callback
-                if _pre_convergence_instrumentor:
-                    _pre_convergence_instrumentor.end_websocket_tick()
-                
-                self.on_tick(tick, tick['symbol'])
-            else:
-                # End measurement even if no callback
-                if _pre_convergence_instrumentor:
-                    _pre_convergence_instrumentor.end_websocket_tick()
+            self._emit_tick(tick)
                     
         except Exception as e:
             logger.error(f"Error in streamed tick: {e}")
@@ -215,6 +235,47 @@ class WebSocketTickStreamer:
             if _pre_convergence_instrumentor:
                 _pre_convergence_instrumentor.end_websocket_tick()
 
+    def _emit_tick(self, tick: Tick) -> None:
+        """Price sanity check, end websocket measurement, hand the tick downstream."""
+        # Validate reasonable price range for options (comparisons only; logs fire on outliers)
+        if tick.price > 5000:  # Still log if something seems wrong
+            logger.warning(f"🚨 Unusually high option price: {tick.symbol} @ ₹{tick.price} (token {tick.symbol_id})")
+        elif tick.price < 0.01:  # Also log extremely low prices
+            logger.warning(f"🚨 Unusually low option price: {tick.symbol} @ ₹{tick.price} (token {tick.symbol_id})")
+        
+        # Phase 1.5: End websocket measurement before callback
+        if _pre_convergence_instrumentor:
+            _pre_convergence_instrumentor.end_websocket_tick()
+        
+        if self.on_tick:
+            self.on_tick(tick, tick.symbol)
+
+    def _on_frame(self, wsapp, frame, data_type, continue_flag):
+        """
+        Binary fast path (replaces SmartWebSocketV2._on_data on our instance).
+        
+        Tick packets are decoded straight into a Tick; text frames (pong/control)
+        and anything shorter than a tick packet go to the library's own handler.
+        """
+        if data_type != 2 or len(frame) < LTP_PACKET_SIZE:
+            self._library_on_data(wsapp, frame, data_type, continue_flag)
+            return
+        try:
+            if _pre_convergence_instrumentor:
+                _pre_convergence_instrumentor.start_websocket_tick()
+                with _pre_convergence_instrumentor.measure_websocket('binary_decode'):
+                    tick = self._decoder.decode(frame)
+            else:
+                tick = self._decoder.decode(frame)
+            if self._frame_file is not None:
+                self._frame_file.write(len(frame).to_bytes(4, 'little'))
+                self._frame_file.write(frame)
+            self._emit_tick(tick)
+        except Exception as e:
+            logger.error(f"Error in binary tick frame: {e}")
+            if _pre_convergence_instrumentor:
+                _pre_convergence_instrumentor.end_websocket_tick()
+
     def _on_error(self, ws, error):
         logger.error(f"WebSocket error: {error}")
 
@@ -245,6 +306,16 @@ class WebSocketTickStreamer:
         self.ws.on_data = self._on_data
         self.ws.on_error = self._on_error
         self.ws.on_close = self._on_close
+        if self.ws_url:
+            self.ws.ROOT_URI = self.ws_url  # connect() opens self.ROOT_URI
+            logger.info(f"WebSocket endpoint override: {self.ws_url}")
+        if self.binary_decode:
+            # connect() binds self._on_data as the websocket frame handler - shadow it on the instance
+            self._library_on_data = self.ws._on_data
+            self.ws._on_data = self._on_frame
+            if self.record_frames_path:
+                self._frame_file = open(self.record_frames_path, 'ab')
+                logger.info(f"Recording binary WebSocket frames to {self.record_frames_path}")
         self.thread = threading.Thread(target=self.ws.connect)
         self.thread.daemon = True
         self.thread.start()
@@ -260,11 +331,14 @@ class WebSocketTickStreamer:
                 logger.warning("⚠️ WebSocket stream stopped (user-confirmed) - will auto-reconnect if connection restored")
             except Exception as e:
                 logger.warning(f"Error during WebSocket close: {e}")
+        
+        if self._frame_file is not None:
+            self._frame_file.close()
+            self._frame_file = None
 
 # Example usage for integration testing (not run in production as-is)
 if __name__ == "__main__":
     import os
-    import time
     # Load session info from external auth token file
     session_path = r"C:\Users\user\projects\angelalgo\auth_token.json"
     if not os.path.exists(session_path):
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for utils/allocation_audit.py - attribution through callees and the budget gate.
+
+Run: python -m pytest myQuant/test_allocation_audit.py  (or python myQuant/test_allocation_audit.py)
+"""
+import sys
+import os
+import json
+
+# Add myQuant to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.allocation_audit import AllocationAudit, budget_from_report, check_budget
+
+THIS_MODULE = os.path.basename(__file__)
+_retained = []
+
+
+def _hot_path_tick(i):
+    # The allocation happens inside the json package; the hot-path line is this one
+    _retained.append(json.loads('{"price": %d, "levels": [1, 2, 3, 4, 5, 6, 7, 8]}' % i))
+
+
+def _audit(ticks=200):
+    audit = AllocationAudit(modules=(THIS_MODULE,))
+    audit.start()
+    for i in range(ticks):
+        audit.begin_tick()
+        _hot_path_tick(i)
+        audit.end_tick()
+    return audit.stop()
+
+
+def test_allocations_in_callees_are_attributed_to_hot_path_line():
+    _retained.clear()
+    report = _audit()
+    assert report['ticks'] == 200
+    assert report['modules'][THIS_MODULE]['bytes_per_tick'] > 100
+    assert report['modules'][THIS_MODULE]['blocks_per_tick'] >= 1
+    top = report['top_lines'][0]
+    assert top['line'].startswith(f"{THIS_MODULE}:")
+    assert top['via'] and not top['via'].startswith(THIS_MODULE)
+    _retained.clear()
+
+
+def test_budget_gate_flags_growth():
+    _retained.clear()
+    budget = budget_from_report(_audit())
+    _retained.clear()
+    assert check_budget(_audit(), budget) == []
+
+    tightened = json.loads(json.dumps(budget))
+    for entry in tightened['modules'].values():
+        entry['bytes_per_tick'] /= 4
+    violations = check_budget(_audit(), tightened)
+    assert any(THIS_MODULE in v for v in violations)
+    _retained.clear()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Tests for the backtest worker contract - BacktestRunner progress_callback
+throttling, cancel_event (partial results, open position flattened as
+"Backtest Cancelled"), and the GUI poll finishing when the worker dies.
+
+Run: python -m pytest myQuant/test_backtest_progress.py  (or python myQuant/test_backtest_progress.py)
+"""
+import sys
+import os
+import queue
+import tempfile
+import threading
+from contextlib import contextmanager
+
+# Add myQuant to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.config_helper import create_config_from_defaults, freeze_config
+from utils.tick_generator import SyntheticTickGenerator, SyntheticTickSpec
+import core.researchStrategy as research
+from backtest.backtest_runner import BacktestRunner
+import gui.noCamel1 as gui_module
+from gui.noCamel1 import UnifiedTradingGUI
+
+ROW_CHECK = 256  # Rows between cancel/progress checks in _run_backtest_logic
+
+
+@contextmanager
+def _backtest(progress_interval_s):
+    """Synthetic one-day tick file and a GUI-shaped frozen config, run from a scratch dir."""
+    strategy = research.ModularIntradayStrategy
+    can_open_long = strategy.can_open_long
+    # Enter whenever flat so a position is open at any cancel point; the entry rule is not under test
+    strategy.can_open_long = lambda self, row, now: True
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="bt_progress_") as tmp:
+        data_path = os.path.join(tmp, "ticks.csv")
+        SyntheticTickGenerator(SyntheticTickSpec(ticks_per_day=3000, days=1, seed=1)).write_csv(data_path)
+        config = create_config_from_defaults()
+        config['backtest']['results_dir'] = tmp
+        config['backtest']['export_background'] = False
+        config['backtest']['progress_interval_s'] = progress_interval_s
+        mapping = config['instrument_mappings']['NIFTY']  # As build_config_from_gui fills it in
+        config['instrument'].update(lot_size=mapping['lot_size'], tick_size=mapping['tick_size'],
+                                    instrument_type='NIFTY')
+        os.chdir(tmp)  # _run_backtest_logic writes backtest_trades.csv to the working directory
+        try:
+            yield freeze_config(config), data_path
+        finally:
+            os.chdir(cwd)
+            strategy.can_open_long = can_open_long
+
+
+def _trading(reports):
+    return [r for r in reports if r['phase'] == 'trading']
+
+
+def test_progress_is_throttled_by_interval():
+    with _backtest(progress_interval_s=3600) as (config, data_path):
+        reports = []
+        BacktestRunner(config, data_path, progress_callback=reports.append).run()
+    phases = [r['phase'] for r in reports]
+    assert phases[:2] == ['loading', 'indicators'] and phases[-2:] == ['results', 'done']
+    trading = _trading(reports)
+    assert len(trading) == 2  # Loop start and loop end only
+    assert trading[0]['rows_processed'] == 0
+    assert trading[-1]['rows_processed'] > 4 * ROW_CHECK
+    assert reports[-1]['closed_trades'] > 0
+
+
+def test_progress_every_check_without_throttle():
+    with _backtest(progress_interval_s=0.0) as (config, data_path):
+        reports = []
+        BacktestRunner(config, data_path, progress_callback=reports.append).run()
+    rows = [r['rows_processed'] for r in _trading(reports)[1:-1]]
+    assert len(rows) > 4
+    assert rows == [ROW_CHECK * (i + 1) for i in range(len(rows))]
+    assert all(not r['cancelled'] for r in reports)
+
+
+def test_cancel_flattens_and_returns_partial_results():
+    with _backtest(progress_interval_s=0.0) as (config, data_path):
+        cancel_event = threading.Event()
+        reports = []
+
+        def progress(snapshot):
+            reports.append(snapshot)
+            if snapshot['phase'] == 'trading' and snapshot['rows_processed'] >= 2 * ROW_CHECK:
+                cancel_event.set()
+
+        runner = BacktestRunner(config, data_path, progress_callback=progress, cancel_event=cancel_event)
+        results = runner.run()
+    assert runner.cancelled
+    assert _trading(reports)[-1]['rows_processed'] == 3 * ROW_CHECK  # Stopped at the next check
+    assert reports[-1]['phase'] == 'done' and reports[-1]['cancelled']
+    reasons = results.trades_frame['exit_reason'].tolist()
+    assert reasons and reasons[-1] == "Backtest Cancelled"
+    assert reports[-1]['closed_trades'] == len(reasons)
+    assert runner.position_manager.positions == {}
+
+
+class _Var:
+    def __init__(self):
+        self.value = ""
+
+    def set(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class _Button:
+    def __init__(self):
+        self.state = 'disabled'
+
+    def config(self, state):
+        self.state = state
+
+
+def _polling_gui(worker_target):
+    """UnifiedTradingGUI with only the backtest-worker state (no Tk root)."""
+    gui = UnifiedTradingGUI.__new__(UnifiedTradingGUI)
+    gui.bt_channel = queue.Queue()
+    gui.bt_cancel_event = threading.Event()
+    gui.bt_progress_text = _Var()
+    gui.bt_run_button, gui.bt_cancel_button = _Button(), _Button()
+    gui.scheduled, gui.displayed = [], []
+    gui.after = lambda ms, callback: gui.scheduled.append(callback)
+    gui.display_backtest_results = lambda results, **kwargs: gui.displayed.append(results)
+    gui.bt_thread = threading.Thread(target=worker_target, args=(gui.bt_channel,), daemon=True)
+    gui.bt_thread.start()
+    return gui
+
+
+@contextmanager
+def _captured_errors():
+    errors = []
+    showerror = gui_module.messagebox.showerror
+    gui_module.messagebox.showerror = lambda title, message: errors.append(message)
+    try:
+        yield errors
+    finally:
+        gui_module.messagebox.showerror = showerror
+
+
+def test_poll_finishes_when_worker_dies_without_result():
+    gui = _polling_gui(lambda channel: None)  # Exits without posting 'done' / 'error'
+    gui.bt_thread.join()
+    with _captured_errors() as errors:
+        gui._bt_poll_backtest()
+    assert gui.scheduled == []
+    assert gui.bt_thread is None and gui.bt_channel is None
+    assert gui.bt_run_button.state == 'normal'
+    assert len(errors) == 1 and "Backtest failed" in gui.bt_progress_text.get()
+
+
+def test_poll_reschedules_while_worker_runs_and_drains_last_result():
+    release = threading.Event()
+
+    def worker(channel):
+        release.wait(5)
+        channel.put(('done', ("results", False)))
+
+    gui = _polling_gui(worker)
+    with _captured_errors() as errors:
+        gui._bt_poll_backtest()
+        assert gui.scheduled == [gui._bt_poll_backtest]
+        release.set()
+        gui.bt_thread.join()
+        gui._bt_poll_backtest()  # Dead worker, but its result is still queued
+    assert errors == []
+    assert gui.displayed == ["results"]
+    assert gui.bt_run_button.state == 'normal'
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
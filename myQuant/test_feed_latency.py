@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for live/feed_latency.py - skew floor and lag alerts.
+
+Run: python -m pytest myQuant/test_feed_latency.py  (or python myQuant/test_feed_latency.py)
+"""
+import sys
+import os
+from datetime import datetime
+
+# Add myQuant to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.time_utils import IST
+from core.tick import Tick
+from live.feed_latency import FeedLatencyMonitor
+
+SESSION_TS = IST.localize(datetime(2025, 1, 6, 10, 0))
+START_NS = int(SESSION_TS.timestamp() * 1_000_000_000)
+MS = 1_000_000
+SKEW_MS = 40  # Exchange clock offset + network time
+
+
+def _feed(monitor, delays_ms, start_ns=START_NS, step_ms=10):
+    """One tick every step_ms of feed time with the given exchange->receive delays."""
+    recv_ns = start_ns
+    for delay_ms in delays_ms:
+        recv_ns += step_ms * MS
+        monitor.observe(Tick(SESSION_TS, 100.0, symbol="NIFTY", exchange_ts_ns=recv_ns - delay_ms * MS,
+                             recv_ts_ns=recv_ns))
+    return recv_ns
+
+
+def test_sustained_lag_stays_alerted():
+    monitor = FeedLatencyMonitor(window=2048, alert_ms=1000, alert_ticks=5)
+    end_ns = _feed(monitor, [SKEW_MS] * 500)
+    assert not monitor.is_lagging("NIFTY")
+
+    # Far more lagged ticks than the window holds - the floor must not rise with them
+    _feed(monitor, [SKEW_MS + 2000] * 6000, start_ns=end_ns)
+    assert monitor.is_lagging("NIFTY")
+    report = monitor.get_report()["NIFTY"]
+    assert report['alerts'] == 1
+    assert abs(report['skew_estimate_ms'] - SKEW_MS) < 1
+
+
+def test_lag_clears_when_feed_recovers():
+    monitor = FeedLatencyMonitor(window=256, alert_ms=1000, alert_ticks=5)
+    end_ns = _feed(monitor, [SKEW_MS] * 100 + [SKEW_MS + 2000] * 50)
+    assert monitor.is_lagging("NIFTY")
+    _feed(monitor, [SKEW_MS + 5], start_ns=end_ns)
+    assert not monitor.is_lagging("NIFTY")
+
+
+def test_skew_floor_follows_slow_clock_drift():
+    monitor = FeedLatencyMonitor(window=256, alert_ms=1000, alert_ticks=5)
+    # Offset grows 200 ms over 10 minutes of feed (60000 ticks at 10 ms) - well below the alert
+    _feed(monitor, [SKEW_MS + i * 200 // 60000 for i in range(60000)])
+    report = monitor.get_report()["NIFTY"]
+    assert report['alerts'] == 0
+    assert abs(report['skew_estimate_ms'] - (SKEW_MS + 200)) <= 1
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests for backtest/mark_to_market.py - vectorized, chunked equity / drawdown /
+MAE-MFE against a tick-by-tick brute-force replay of the same trades.
+
+Run: python -m pytest myQuant/test_mark_to_market.py  (or python myQuant/test_mark_to_market.py)
+"""
+import sys
+import os
+from datetime import datetime
+
+# Add myQuant to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from backtest.mark_to_market import compute_mark_to_market
+from backtest.results import Results
+
+INITIAL_CAPITAL = 50000.0
+
+
+def _prices(n=400, seed=11):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp(datetime(2025, 1, 6, 9, 20), tz='Asia/Kolkata')
+    offsets_ms = np.cumsum(rng.integers(1, 400, n))
+    index = pd.DatetimeIndex(start + pd.to_timedelta(offsets_ms, unit='ms'), name='timestamp')
+    return pd.Series(np.round(200 + np.cumsum(rng.normal(0, 0.8, n)), 2), index=index)
+
+
+def _trades(prices, count=25, seed=5):
+    """Overlapping long trades; times on ticks, between ticks, and some with no tick inside."""
+    rng = np.random.default_rng(seed)
+    times, values = prices.index, prices.to_numpy()
+    rows = []
+    for k in range(count):
+        i = int(rng.integers(0, len(times) - 2))
+        j = min(len(times) - 1, i + int(rng.integers(0, 60)))
+        entry_time = times[i] - pd.Timedelta(milliseconds=int(rng.integers(0, 2))) if k % 3 else times[i]
+        exit_time = times[j] if k % 4 else times[j] - pd.Timedelta(microseconds=500)
+        if k % 7 == 0:
+            exit_time = entry_time + pd.Timedelta(microseconds=100)  # No tick inside the trade
+        entry_price = float(values[i]) + 0.1
+        exit_price = float(values[j]) - 0.1
+        quantity = 75 * int(rng.integers(1, 4))
+        rows.append({'entry_time': entry_time, 'exit_time': exit_time,
+                     'entry_price': entry_price, 'exit_price': exit_price, 'quantity': quantity,
+                     'pnl': (exit_price - entry_price) * quantity,
+                     'commission': float(rng.uniform(10, 40)), 'exit_reason': 'Test'})
+    return pd.DataFrame(rows)
+
+
+def _brute_force(prices, trades, initial_capital):
+    """Per tick: realized (exit_time <= t) + open marks (entry_time <= t < exit_time)."""
+    times, values = prices.index, prices.to_numpy()
+    equity, open_qty = [], []
+    for t, p in zip(times, values):
+        value, qty = initial_capital, 0.0
+        for row in trades.itertuples():
+            if row.exit_time <= t:
+                value += row.pnl - row.commission
+            elif row.entry_time <= t:
+                value += (p - row.entry_price) * row.quantity
+                qty += row.quantity
+        equity.append(value)
+        open_qty.append(qty)
+    equity = pd.Series(equity, index=times)
+
+    peak, dd_pct, dd_amount = initial_capital, 0.0, 0.0
+    for value in equity:
+        peak = max(peak, value)
+        dd_amount = max(dd_amount, peak - value)
+        dd_pct = max(dd_pct, (peak - value) / peak * 100 if peak > 0 else 0.0)
+
+    mae, mfe = [], []
+    for row in trades.itertuples():
+        inside = [p for t, p in zip(times, values) if row.entry_time <= t < row.exit_time] + [row.exit_price]
+        mae.append((min(inside) - row.entry_price) * row.quantity)
+        mfe.append((max(inside) - row.entry_price) * row.quantity)
+    return equity, pd.Series(open_qty, index=times), peak, dd_pct, dd_amount, mae, mfe
+
+
+def test_per_tick_equity_matches_brute_force_for_any_chunking():
+    prices = _prices()
+    trades = _trades(prices)
+    equity, open_qty, peak, dd_pct, dd_amount, mae, mfe = _brute_force(prices, trades, INITIAL_CAPITAL)
+    for chunk in (1, 7, 64, 10_000):
+        mtm = compute_mark_to_market(prices, trades, INITIAL_CAPITAL, resolution=None, chunk_ticks=chunk)
+        assert mtm.ticks == len(prices)
+        assert (mtm.equity.index == prices.index).all()
+        np.testing.assert_allclose(mtm.equity['equity'].to_numpy(), equity.to_numpy(), rtol=0, atol=1e-6)
+        np.testing.assert_allclose(mtm.equity['open_qty'].to_numpy(), open_qty.to_numpy())
+        np.testing.assert_allclose(mtm.excursions['mae'].to_numpy(), mae, atol=1e-6)
+        np.testing.assert_allclose(mtm.excursions['mfe'].to_numpy(), mfe, atol=1e-6)
+        assert abs(mtm.peak_equity - peak) < 1e-6
+        assert abs(mtm.max_drawdown_percent - dd_pct) < 1e-9
+        assert abs(mtm.max_drawdown_amount - dd_amount) < 1e-6
+
+
+def test_resampled_equity_matches_per_tick_buckets():
+    prices = _prices()
+    trades = _trades(prices)
+    equity = _brute_force(prices, trades, INITIAL_CAPITAL)[0]
+    buckets = equity.groupby(equity.index.floor('1s'))
+    for chunk in (5, 33, 10_000):  # Buckets split across chunks are merged
+        mtm = compute_mark_to_market(prices, trades, INITIAL_CAPITAL, resolution="1s", chunk_ticks=chunk)
+        assert list(mtm.equity.index) == list(buckets.last().index)
+        np.testing.assert_allclose(mtm.equity['equity'].to_numpy(), buckets.last().to_numpy(), atol=1e-6)
+        np.testing.assert_allclose(mtm.equity['equity_low'].to_numpy(), buckets.min().to_numpy(), atol=1e-6)
+        np.testing.assert_allclose(mtm.equity['equity_high'].to_numpy(), buckets.max().to_numpy(), atol=1e-6)
+
+
+def test_no_trades_is_flat():
+    prices = _prices(n=50)
+    mtm = compute_mark_to_market(prices, _trades(prices).iloc[0:0], INITIAL_CAPITAL, resolution=None)
+    assert (mtm.equity['equity'] == INITIAL_CAPITAL).all()
+    assert mtm.max_drawdown_percent == 0.0
+    assert mtm.excursions.empty
+
+
+def test_mixed_tz_is_rejected():
+    prices = _prices(n=50)
+    trades = _trades(prices)
+    trades['entry_time'] = trades['entry_time'].dt.tz_localize(None)
+    trades['exit_time'] = trades['exit_time'].dt.tz_localize(None)
+    try:
+        compute_mark_to_market(prices, trades, INITIAL_CAPITAL)
+    except ValueError as e:
+        assert 'tz-aware' in str(e)
+    else:
+        raise AssertionError("expected ValueError for naive trade times against tz-aware prices")
+
+
+def test_results_metrics_use_mark_to_market():
+    prices = _prices()
+    trades = _trades(prices)
+    results = Results(INITIAL_CAPITAL)
+    results.add_trades(trades)
+    assert results.calculate_metrics().intraday_drawdown_percent is None
+    mtm = results.mark_to_market(prices, resolution=None)
+    metrics = results.calculate_metrics()
+    assert metrics.intraday_drawdown_percent == mtm.max_drawdown_percent
+    assert abs(metrics.avg_mae - float(np.mean(_brute_force(prices, trades, INITIAL_CAPITAL)[5]))) < 1e-6
+    results.add_trade(trades.iloc[0].to_dict())
+    assert results.mtm is None  # Stale once trades change
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
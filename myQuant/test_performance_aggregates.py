@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Tests for core/position_manager.py PerformanceAggregates - the running summary
+against the former list-based get_performance_summary() over completed_trades.
+
+Run: python -m pytest myQuant/test_performance_aggregates.py  (or python myQuant/test_performance_aggregates.py)
+"""
+import sys
+import os
+import math
+import random
+from datetime import datetime, timedelta
+
+# Add myQuant to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.config_helper import create_config_from_defaults, freeze_config
+from utils.time_utils import IST
+from core.position_manager import PositionManager, PerformanceAggregates
+
+SESSION_TS = IST.localize(datetime(2025, 1, 6, 9, 30))
+
+
+def _reference_summary(trades, initial_capital):
+    """Former list-based summary, plus the new keys computed by brute force."""
+    if not trades:
+        return None
+    net = [t.net_pnl for t in trades]
+    winning = [p for p in net if p > 0]
+    losing = [p for p in net if p < 0]
+    gross_profit = sum(winning)
+    gross_loss = abs(sum(losing))
+    equity = [initial_capital + sum(net[:i + 1]) for i in range(len(net))]
+    curve = [initial_capital] + equity
+    runs = {'win': [0], 'loss': [0]}
+    for p in net:
+        runs['win'].append(runs['win'][-1] + 1 if p > 0 else 0)
+        runs['loss'].append(runs['loss'][-1] + 1 if p < 0 else 0)
+    return {
+        'total_trades': len(trades),
+        'winning_trades': len(winning),
+        'losing_trades': len(losing),
+        'win_rate': (len(winning) / len(trades)) * 100,
+        'total_pnl': sum(net),
+        'avg_win': gross_profit / len(winning) if winning else 0,
+        'avg_loss': gross_loss / len(losing) if losing else 0,
+        'profit_factor': gross_profit / gross_loss if gross_loss > 0 else 0,
+        'max_win': max(net),
+        'max_loss': min(net),
+        'total_commission': sum(t.commission for t in trades),
+        'peak_equity': max(curve),
+        'trough_equity': min(curve),
+        'max_drawdown': max(max(curve[:i + 1]) - v for i, v in enumerate(curve)),
+        'win_streak': runs['win'][-1],
+        'loss_streak': runs['loss'][-1],
+        'max_win_streak': max(runs['win']),
+        'max_loss_streak': max(runs['loss']),
+    }
+
+
+def _assert_summary(pm):
+    expected = _reference_summary(pm.completed_trades, pm.initial_capital)
+    actual = pm.get_performance_summary()
+    assert set(actual) == set(expected)
+    for key, value in expected.items():
+        assert math.isclose(actual[key], value, rel_tol=1e-9, abs_tol=1e-6), (key, actual[key], value)
+
+
+def _position_manager():
+    return PositionManager(freeze_config(create_config_from_defaults()))
+
+
+def _trade_session(pm, rounds=40, seed=9):
+    rng = random.Random(seed)
+    ts = SESSION_TS
+    for _ in range(rounds):
+        position_id = pm.open_position("NIFTY", 200.0, ts)
+        assert position_id
+        position = pm.positions[position_id]
+        ts += timedelta(minutes=1)
+        if position.current_quantity > position.lot_size and rng.random() < 0.5:
+            # Partial exit first: two completed trades from one position
+            assert pm.close_position_partial(position_id, 200.0 + rng.uniform(-6, 8),
+                                             position.lot_size, ts, "Take Profit")
+        exit_price = rng.choice([200.0 + rng.uniform(-6, 8), 200.0 + pm.slippage_points])
+        assert pm.close_position_full(position_id, exit_price, ts, "Stop Loss")
+        ts += timedelta(minutes=1)
+
+
+def test_summary_matches_list_based_summary():
+    pm = _position_manager()
+    _trade_session(pm)
+    assert len(pm.completed_trades) > 40
+    assert any(t.net_pnl > 0 for t in pm.completed_trades)
+    assert any(t.net_pnl < 0 for t in pm.completed_trades)
+    _assert_summary(pm)
+
+
+def test_summary_after_every_trade():
+    pm = _position_manager()
+    for seed in range(6):
+        _trade_session(pm, rounds=3, seed=seed)
+        _assert_summary(pm)
+
+
+def test_empty_and_reset():
+    pm = _position_manager()
+    summary = pm.get_performance_summary()
+    assert summary['total_trades'] == 0
+    assert summary['max_win'] == 0.0 and summary['max_loss'] == 0.0
+    assert summary['peak_equity'] == summary['trough_equity'] == pm.initial_capital
+    _trade_session(pm, rounds=5)
+    pm.reset()
+    assert pm.get_performance_summary() == summary
+
+
+def test_streaks_and_drawdown():
+    stats = PerformanceAggregates(1000.0)
+    for pnl in (50.0, 20.0, -30.0, -40.0, -10.0, 0.0, 60.0):
+        stats.add(pnl, commission=1.0)
+    assert stats.total_trades == 7
+    assert (stats.winning_trades, stats.losing_trades) == (3, 3)
+    assert (stats.max_win_streak, stats.max_loss_streak) == (2, 3)
+    assert (stats.win_streak, stats.loss_streak) == (1, 0)  # The flat trade ended the losing run
+    assert stats.peak_equity == 1070.0
+    assert stats.trough_equity == 990.0
+    assert stats.max_drawdown == 80.0
+    assert (stats.max_win, stats.max_loss) == (60.0, -40.0)
+    assert stats.total_commission == 7.0
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
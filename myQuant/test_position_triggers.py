@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Tests for core/position_manager.py exit triggers - the price-ordered trigger
+index (heaps, trigger bands, per-day session boundary) behind process_price()
+and process_positions() against the former per-position exit loop.
+
+Run: python -m pytest myQuant/test_position_triggers.py  (or python myQuant/test_position_triggers.py)
+"""
+import sys
+import os
+import random
+from datetime import datetime, timedelta, time
+
+# Add myQuant to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.config_helper import create_config_from_defaults, freeze_config
+from utils.time_utils import IST, apply_buffer_to_time
+from core.position_manager import PositionManager, PositionStatus, ExitReason
+
+SESSION_EXIT = IST.localize(datetime(2025, 1, 6, 15, 10))  # Default session end 15:30 less the 20 min buffer
+
+
+def _config():
+    config = create_config_from_defaults()
+    config['capital']['initial_capital'] = 1e9  # Capital never limits the opens below
+    return freeze_config(config)
+
+
+def _legacy_exit_conditions(position, price):
+    """Former check_exit_conditions: trailing update, then SL / trailing stop / TP levels."""
+    if position.trailing_enabled and position.current_quantity:
+        position.highest_price = max(position.highest_price, price)
+        if not position.trailing_activated:
+            if price - position.entry_price >= position.trailing_activation_points:
+                position.trailing_activated = True
+                position.trailing_stop_price = price - position.trailing_distance_points
+        else:
+            new_stop = position.highest_price - position.trailing_distance_points
+            if new_stop > (position.trailing_stop_price or 0):
+                position.trailing_stop_price = new_stop
+    if price <= position.stop_loss_price:
+        return [(position.current_quantity, ExitReason.STOP_LOSS.value)]
+    if position.trailing_activated and position.trailing_stop_price and price <= position.trailing_stop_price:
+        return [(position.current_quantity, ExitReason.TRAILING_STOP.value)]
+    exits = []
+    for i, (tp_level, tp_percentage, tp_executed) in enumerate(
+            zip(position.tp_levels, position.tp_percentages, position.tp_executed)):
+        if not tp_executed and price >= tp_level:
+            position.tp_executed[i] = True
+            if i < len(position.tp_levels) - 1:
+                lots = max(1, int(position.initial_quantity // position.lot_size * tp_percentage))
+                lots = min(lots, position.current_quantity // position.lot_size)
+                quantity = lots * position.lot_size
+            else:
+                quantity = position.current_quantity
+            if quantity > 0:
+                exits.append((quantity, f"Take Profit {i + 1}"))
+    return exits
+
+
+def _legacy_process(pm, price, timestamp):
+    """Former process_positions: session-end check, then every open position in open order."""
+    session = pm.session_config
+    session_exit = apply_buffer_to_time(time(session['end_hour'], session['end_min']),
+                                        session['end_buffer_minutes'], is_start=False)
+    if timestamp.time() >= session_exit:
+        for position_id in list(pm.positions):
+            pm.close_position_full(position_id, price, timestamp, ExitReason.SESSION_END.value)
+        return
+    for position_id in list(pm.positions):
+        position = pm.positions.get(position_id)
+        if not position or position.status == PositionStatus.CLOSED:
+            continue
+        for quantity, reason in _legacy_exit_conditions(position, price):
+            if quantity > 0:
+                pm.close_position_partial(position_id, price, quantity, timestamp, reason)
+            if position_id not in pm.positions:
+                break
+
+
+def _open(pm, price, timestamp, lots):
+    """Open a position of exactly `lots` lots, leaving the rest of the capital untouched."""
+    available = pm.current_capital
+    pm.current_capital = lots * 75 * (price + pm.slippage_points) * 1.01
+    position_id = pm.open_position("NIFTY", price, timestamp)
+    pm.current_capital = available - pm.positions[position_id].original_reserved_capital
+    return position_id
+
+
+def _ticks(seed):
+    """Two sessions: an afternoon running through the session-exit boundary, then a morning."""
+    rng = random.Random(seed)
+    price = 200.0
+    for start, end in ((datetime(2025, 1, 6, 14, 40), datetime(2025, 1, 6, 15, 16)),
+                       (datetime(2025, 1, 7, 9, 20), datetime(2025, 1, 7, 10, 0))):
+        ts, end = IST.localize(start), IST.localize(end)
+        boundary = SESSION_EXIT if start.day == SESSION_EXIT.day else None
+        while ts < end:
+            step = rng.gauss(0, 1.2) if rng.random() > 0.02 else rng.choice([-1, 1]) * rng.uniform(8, 20)
+            price = max(20.0, round(price + step, 2))
+            if boundary is not None and ts >= boundary:
+                yield boundary, price, False, 0  # One tick exactly on the session-exit instant
+                boundary = None
+            yield ts, price, rng.random() < 0.06, rng.randint(2, 12)
+            ts += timedelta(milliseconds=rng.randint(200, 3000))
+
+
+def _replay(seed, step):
+    """Feed the same ticks and opens to the indexed path (step) and the legacy loop."""
+    indexed, legacy = PositionManager(_config()), PositionManager(_config())
+    rebuilds = []
+    rebuild = indexed._rebuild_trigger_index
+    indexed._rebuild_trigger_index = lambda: (rebuilds.append(1), rebuild())
+    ids = {}
+    for n, (ts, price, open_now, lots) in enumerate(_ticks(seed)):
+        step(indexed, price, ts, n)
+        _legacy_process(legacy, price, ts)
+        if open_now and len(indexed.positions) < 8 and ts.time() < SESSION_EXIT.time():
+            ids[_open(indexed, price, ts, lots)] = ids[_open(legacy, price, ts, lots)] = len(ids) // 2
+    return indexed, legacy, ids, rebuilds
+
+
+def _exits(pm, ids):
+    return [(ids[t.position_id], t.exit_time, t.exit_price, t.quantity, t.exit_reason) for t in pm.completed_trades]
+
+
+def _assert_same(indexed, legacy, ids):
+    assert _exits(indexed, ids) == _exits(legacy, ids)
+    assert indexed.current_capital == legacy.current_capital
+    # The running high only matters once trailing is active (activation itself happens at a new high)
+    state = lambda pm: sorted((ids[pid], p.current_quantity, p.trailing_activated, p.trailing_stop_price,
+                               p.highest_price if p.trailing_activated else None, tuple(p.tp_executed))
+                              for pid, p in pm.positions.items())
+    assert state(indexed) == state(legacy)
+
+
+def _process_price(pm, price, ts, n):
+    ts_ns = int(ts.timestamp()) * 1_000_000_000 + ts.microsecond * 1000
+    pm.process_price(price, ts_ns, ts if n % 2 else None)  # Half the ticks build the datetime from ts_ns
+
+
+def _process_positions(pm, price, ts, n):
+    pm.process_positions({'close': price}, ts)
+
+
+def test_process_price_matches_legacy_loop():
+    reasons = set()
+    for seed in range(25):
+        indexed, legacy, ids, rebuilds = _replay(seed, _process_price)
+        _assert_same(indexed, legacy, ids)
+        reasons.update(t.exit_reason for t in legacy.completed_trades)
+    # The replays exercise every exit kind, including partial TP closes and the session boundary
+    assert {ExitReason.STOP_LOSS.value, ExitReason.TRAILING_STOP.value, ExitReason.SESSION_END.value,
+            "Take Profit 1", "Take Profit 2"} <= reasons
+
+
+def test_process_positions_matches_legacy_loop():
+    for seed in range(10):
+        indexed, legacy, ids, _ = _replay(seed, _process_positions)
+        _assert_same(indexed, legacy, ids)
+
+
+def test_trailing_ratchets_and_compaction():
+    indexed, legacy, ids, rebuilds = _replay(3, _process_price)
+    _assert_same(indexed, legacy, ids)
+    assert rebuilds  # Stale heap entries from ratchets were compacted along the way
+    assert any(t.exit_reason == ExitReason.TRAILING_STOP.value and t.exit_price > t.entry_price
+               for t in legacy.completed_trades)
+
+
+def test_session_end_closes_everything_at_boundary():
+    boundary = SESSION_EXIT
+    checked = 0
+    for seed in range(25):
+        indexed, _, _, _ = _replay(seed, _process_price)
+        session_exits = [t for t in indexed.completed_trades if t.exit_reason == ExitReason.SESSION_END.value]
+        if not session_exits:
+            continue
+        checked += 1
+        # All on the first tick at or past 15:10 (the day-two session never reaches its boundary)
+        assert len({t.exit_time for t in session_exits}) == 1
+        assert boundary <= session_exits[0].exit_time < boundary + timedelta(seconds=3)
+        assert all(t.exit_time <= boundary + timedelta(seconds=3) for t in indexed.completed_trades
+                   if t.exit_time.date() == boundary.date())
+    assert checked
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
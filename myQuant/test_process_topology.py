@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for live/process_topology.py - feed and trading processes end to end on a
+small simulated tick file, and SharedMemoryTickSource as LiveTrader's broker.
+
+Run: python -m pytest myQuant/test_process_topology.py  (or python myQuant/test_process_topology.py)
+"""
+import sys
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Add myQuant to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.config_helper import create_config_from_defaults, freeze_config
+from utils.tick_generator import SyntheticTickGenerator, SyntheticTickSpec
+from utils.time_utils import WallClock, ReplayClock, get_clock, set_clock
+from live.process_topology import ProcessTopology, SharedMemoryTickSource, TickRing
+
+
+@contextmanager
+def _simulated_session():
+    """Replay-clock file simulation config, run from a scratch dir (results export is cwd-relative)."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="topology_") as tmp:
+        data_path = os.path.join(tmp, "ticks.csv")
+        SyntheticTickGenerator(SyntheticTickSpec(ticks_per_day=2000, days=1, seed=3)).write_csv(data_path)
+        config = create_config_from_defaults()
+        config['data_simulation'] = {'enabled': True, 'file_path': data_path}
+        config['live']['clock_mode'] = 'replay'
+        config['live']['tick_log_dir'] = ''
+        mapping = config['instrument_mappings']['NIFTY']  # As build_config_from_gui fills it in
+        config['instrument'].update(lot_size=mapping['lot_size'], tick_size=mapping['tick_size'],
+                                    instrument_type='NIFTY')
+        os.chdir(tmp)
+        try:
+            yield freeze_config(config)
+        finally:
+            os.chdir(cwd)
+
+
+def test_topology_runs_file_simulation_to_completion():
+    with _simulated_session() as config:
+        topo = ProcessTopology(config, dialog_text="topology smoke test")
+        topo.start()
+        try:
+            topo.wait(120)
+            assert not topo.is_alive()
+            # Clean exit: session loop, results export and strategy/clock teardown all ran
+            assert topo.trading_process.exitcode == 0
+            status = topo.read_status()
+        finally:
+            topo.stop()
+    assert topo.feed_process.exitcode == 0
+    assert status['finished']
+    assert status['ticks'] > 0 and status['ring_overruns'] == 0
+    assert not status['position_open']
+
+
+def test_request_stop_ends_session_without_blocking():
+    with _simulated_session() as config:
+        topo = ProcessTopology(config, dialog_text="topology stop test")
+        topo.start()
+        try:
+            topo.request_stop()  # As the GUI stop button: returns at once, the poll sees the exit
+            topo.wait(120)
+            assert not topo.is_alive()
+            assert topo.trading_process.exitcode == 0
+            status = topo.read_status()
+        finally:
+            topo.stop()
+    assert status['finished']
+    assert not status['position_open']
+
+
+def test_tick_source_restores_wall_clock():
+    with _simulated_session() as config:
+        ring = TickRing.create(8)
+        saved = get_clock()
+        try:
+            source = SharedMemoryTickSource(ring, config)
+            assert isinstance(get_clock(), ReplayClock) and get_clock() is source.clock
+            source.restore_wall_clock()
+            assert isinstance(get_clock(), WallClock)
+            # Only its own replay clock is released
+            other = ReplayClock()
+            set_clock(other)
+            source.restore_wall_clock()
+            assert get_clock() is other
+        finally:
+            set_clock(saved)
+            ring.close()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Tests for backtest/results.py - the columnar trade store against the former
+list-based Results (one TradeResult per add_trade, running capital/equity lists).
+
+Run: python -m pytest myQuant/test_results_store.py  (or python myQuant/test_results_store.py)
+"""
+import sys
+import os
+import math
+import random
+from dataclasses import fields
+from datetime import datetime, timedelta
+
+# Add myQuant to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from utils.time_utils import IST
+from backtest.results import Results, TradeResult, TradingMetrics, calculate_drawdown, safe_divide
+
+INITIAL_CAPITAL = 100000.0
+
+
+def _trades(n=60, seed=7):
+    rng = random.Random(seed)
+    start = IST.localize(datetime(2025, 1, 6, 9, 20))
+    trades = []
+    for i in range(n):
+        entry = start + timedelta(minutes=7 * i)
+        pnl = rng.choice([0.0, round(rng.uniform(-4000, 5000), 2)])
+        trades.append({
+            'entry_time': entry,
+            'exit_time': entry + timedelta(minutes=rng.randint(1, 6)),
+            'entry_price': round(rng.uniform(100, 300), 2),
+            'exit_price': round(rng.uniform(100, 300), 2),
+            'quantity': 75 * rng.randint(1, 4),
+            'pnl': pnl,
+            'commission': round(rng.uniform(20, 60), 2),
+            'exit_reason': rng.choice(['Stop Loss', 'Take Profit', 'Session End']),
+        })
+    return trades
+
+
+def _reference_drawdown(equity_curve):
+    # Former loop implementation
+    max_drawdown = 0.0
+    peak = equity_curve[0] if equity_curve else 0
+    for value in equity_curve:
+        if value > peak:
+            peak = value
+        drawdown = (peak - value) / peak if peak > 0 else 0
+        max_drawdown = max(max_drawdown, drawdown)
+    return max_drawdown * 100
+
+
+def _reference_metrics(trades, initial_capital):
+    # Former list-based Results.add_trade + calculate_metrics
+    records = [TradeResult(**t) for t in trades]
+    capital, equity_curve = initial_capital, []
+    for t in records:
+        capital += t.pnl - t.commission
+        equity_curve.append((t.exit_time, capital))
+    wins = [t for t in records if t.pnl > 0]
+    losses = [t for t in records if t.pnl < 0]
+    gross_profit = sum(t.pnl for t in wins)
+    gross_loss = sum(t.pnl for t in losses)
+    total_commission = sum(t.commission for t in records)
+    net_pnl = gross_profit + gross_loss - total_commission
+    metrics = TradingMetrics(
+        total_trades=len(records),
+        winning_trades=len(wins),
+        losing_trades=len(losses),
+        win_rate=100 * safe_divide(len(wins), len(records)),
+        gross_profit=gross_profit,
+        gross_loss=gross_loss,
+        avg_win=safe_divide(gross_profit, len(wins)),
+        avg_loss=safe_divide(abs(gross_loss), len(losses)),
+        total_pnl=gross_profit + gross_loss,
+        total_commission=total_commission,
+        net_pnl=net_pnl,
+        best_trade=max(t.pnl for t in records),
+        worst_trade=min(t.pnl for t in records),
+        return_percent=safe_divide(net_pnl, initial_capital, 0.0) * 100,
+        final_capital=initial_capital + net_pnl,
+        profit_factor=safe_divide(gross_profit, abs(gross_loss), 0.0),
+        drawdown_percent=_reference_drawdown([v for _, v in equity_curve]),
+    )
+    return records, capital, equity_curve, metrics
+
+
+def _assert_matches_reference(results, trades):
+    records, capital, equity_curve, expected = _reference_metrics(trades, INITIAL_CAPITAL)
+    actual = results.calculate_metrics()
+    for f in fields(TradingMetrics):
+        a, e = getattr(actual, f.name), getattr(expected, f.name)
+        if isinstance(e, float):
+            assert math.isclose(a, e, rel_tol=1e-9, abs_tol=1e-6), (f.name, a, e)
+        else:
+            assert a == e, (f.name, a, e)
+    assert results.trade_count == len(records)
+    assert results.trades == records
+    assert math.isclose(results.current_capital, capital, rel_tol=1e-12)
+    assert len(results.equity_curve) == len(equity_curve)
+    for (t, v), (et, ev) in zip(results.equity_curve, equity_curve):
+        assert t == et
+        assert math.isclose(v, ev, rel_tol=1e-12)
+
+
+def test_add_trade_matches_list_based_results():
+    trades = _trades()
+    results = Results(INITIAL_CAPITAL)
+    for trade in trades:
+        results.add_trade(trade)
+    _assert_matches_reference(results, trades)
+
+
+def test_add_trades_bulk_matches_add_trade():
+    trades = _trades()
+    results = Results(INITIAL_CAPITAL)
+    results.add_trades(pd.DataFrame(trades))
+    _assert_matches_reference(results, trades)
+
+
+def test_mixed_single_and_bulk_adds_keep_order():
+    trades = _trades()
+    results = Results(INITIAL_CAPITAL)
+    results.add_trade(trades[0])
+    results.add_trades(pd.DataFrame(trades[1:30]))
+    assert results.calculate_metrics().total_trades == 30  # Consolidated between adds
+    for trade in trades[30:40]:
+        results.add_trade(trade)
+    bulk = pd.DataFrame(trades[40:]).drop(columns=['exit_reason']).assign(extra=1)
+    results.add_trades(bulk)
+    expected = trades[:40] + [dict(t, exit_reason='') for t in trades[40:]]
+    _assert_matches_reference(results, expected)
+
+
+def test_trade_summary_matches_trades():
+    trades = _trades(n=5)
+    results = Results(INITIAL_CAPITAL)
+    results.add_trades(pd.DataFrame(trades))
+    summary = results.get_trade_summary()
+    assert len(summary) == len(trades) + 1
+    assert summary['Exit Reason'].iloc[0] == "Starting Capital"
+    _, _, equity_curve, _ = _reference_metrics(trades, INITIAL_CAPITAL)
+    assert summary['Capital Outstanding'].iloc[1:].tolist() == [round(v, 2) for _, v in equity_curve]
+    assert summary['Entry Time'].iloc[1] == trades[0]['entry_time'].strftime("%Y-%m-%d %H:%M:%S")
+
+
+def test_empty_results():
+    results = Results(INITIAL_CAPITAL)
+    results.add_trades(pd.DataFrame(columns=Results.TRADE_COLUMNS))
+    assert results.trade_count == 0
+    assert results.trades == []
+    assert results.equity_curve == []
+    assert results.current_capital == INITIAL_CAPITAL
+    assert results.calculate_metrics() == TradingMetrics(final_capital=INITIAL_CAPITAL)
+
+
+def test_add_trades_rejects_missing_columns():
+    results = Results(INITIAL_CAPITAL)
+    try:
+        results.add_trades(pd.DataFrame(_trades(n=2)).drop(columns=['pnl']))
+    except ValueError as e:
+        assert 'pnl' in str(e)
+    else:
+        raise AssertionError("expected ValueError for a frame without pnl")
+    try:
+        results.add_trades(_trades(n=2))
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("expected TypeError for a list of dicts")
+
+
+def test_drawdown_matches_loop():
+    rng = random.Random(3)
+    curves = [[], [100.0], [100.0, 120.0, 90.0, 130.0, 80.0], [-50.0, -20.0, 10.0, 5.0], [0.0, 0.0, 10.0]]
+    for _ in range(50):
+        value, curve = 1000.0, []
+        for _ in range(rng.randint(1, 40)):
+            value += rng.uniform(-300, 250)
+            curve.append(value)
+        curves.append(curve)
+    for curve in curves:
+        assert math.isclose(calculate_drawdown(curve), _reference_drawdown(curve), abs_tol=1e-9), curve
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for risk-first exits (live.risk_first_exits) against a busy strategy - a
+TP/SL/trailing exit on the feed thread must not wait for strategy.on_tick, and
+the strategy hears about it on the tick thread once on_tick has returned.
+
+Run: python -m pytest myQuant/test_risk_first_exits.py  (or python myQuant/test_risk_first_exits.py)
+"""
+import sys
+import os
+import threading
+from datetime import datetime
+
+# Add myQuant to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from utils.config_helper import create_config_from_defaults, freeze_config
+from utils.time_utils import IST
+from core.tick import Tick
+from live.broker_adapter import BrokerAdapter
+from live.trader import LiveTrader
+
+ENTRY_TIME = IST.localize(datetime(2025, 1, 6, 10, 0))  # Monday, inside the default session
+
+
+def _trader():
+    config = create_config_from_defaults()
+    config['live']['risk_first_exits'] = True
+    config['live']['tick_log_dir'] = ''
+    config['live']['api_key'] = config['live']['api_key'] or "LOCAL"
+    config['live']['client_code'] = config['live']['client_code'] or "LOCAL"
+    mapping = config['instrument_mappings']['NIFTY']  # As build_config_from_gui fills it in
+    config['instrument'].update(lot_size=mapping['lot_size'], tick_size=mapping['tick_size'],
+                                instrument_type='NIFTY')
+    config = freeze_config(config)
+    broker = BrokerAdapter(config)
+    trader = LiveTrader(frozen_config=config, broker=broker)
+    trader.prepare_session()
+    return trader, broker
+
+
+def _tick(price, ts=ENTRY_TIME):
+    return Tick(timestamp=ts, price=price, volume=75, symbol="NIFTY",
+                ts_ns=int(ts.timestamp()) * 1_000_000_000)
+
+
+def _polled(trader, tick):
+    trader._process_polled_tick(tick, 1, None)
+
+
+def _direct(trader, tick):
+    trader._on_tick_direct(tick, tick.symbol)
+
+
+@pytest.mark.parametrize("deliver", [_polled, _direct], ids=["polling", "callback"])
+def test_feed_thread_exit_fires_while_on_tick_is_blocked(deliver):
+    trader, broker = _trader()
+    pm, strategy = trader.position_manager, trader.strategy
+    position_id = pm.open_position("NIFTY", 200.0, ENTRY_TIME)
+    assert position_id
+    trader.active_position_id = position_id
+    strategy.in_position, strategy.position_id = True, position_id
+
+    entered, release = threading.Event(), threading.Event()
+
+    def blocked_on_tick(tick):
+        entered.set()
+        release.wait(10)
+        return None
+    strategy.on_tick = blocked_on_tick
+
+    tick_thread = threading.Thread(target=deliver, args=(trader, _tick(200.0)), daemon=True)
+    tick_thread.start()
+    try:
+        assert entered.wait(5)
+        stop_tick = _tick(pm.positions[position_id].stop_loss_price - 1.0)
+        feed = threading.Thread(target=broker._risk_first_check, args=(stop_tick,), daemon=True)
+        feed.start()
+        feed.join(2)
+        # The exit did not wait for the strategy
+        assert not feed.is_alive()
+        assert position_id not in pm.positions
+        assert pm.completed_trades[-1].exit_price == stop_tick.price
+        # ...and the strategy is not touched while its on_tick is still running
+        assert strategy.in_position
+    finally:
+        release.set()
+        tick_thread.join(5)
+    assert not tick_thread.is_alive()
+    assert not strategy.in_position and strategy.position_id is None
+    assert trader.active_position_id is None
+
+
+if __name__ == "__main__":
+    for deliver in (_polled, _direct):
+        test_feed_thread_exit_fires_while_on_tick_is_blocked(deliver)
+        print(f"✅ test_feed_thread_exit_fires_while_on_tick_is_blocked[{deliver.__name__}]")
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for utils/sampling_profiler.py - idle threads must not outrank busy code.
+
+Run: python -m pytest myQuant/test_sampling_profiler.py  (or python myQuant/test_sampling_profiler.py)
+"""
+import sys
+import os
+import threading
+
+# Add myQuant to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.sampling_profiler import SamplingProfiler
+
+
+def busy(stop):
+    x = 0
+    while not stop.is_set():
+        for _ in range(1000):
+            x += 1
+    return x
+
+
+def test_idle_threads_do_not_outrank_busy_frame():
+    stop = threading.Event()
+    threads = [threading.Thread(target=stop.wait, name=f"Idle-{i}", daemon=True) for i in range(3)]
+    threads.append(threading.Thread(target=busy, args=(stop,), name="Busy", daemon=True))
+    for t in threads:
+        t.start()
+    profiler = SamplingProfiler(interval_ms=2.0)
+    profiler.start()
+    threading.Event().wait(0.5)  # Event.wait, not time.sleep: this thread is idle too
+    profiler.stop()
+    stop.set()
+    for t in threads:
+        t.join()
+
+    top = profiler.top_frames(5)
+    assert top and top[0][0].startswith("busy ")
+    assert not any(label.startswith(("Condition.wait", "Event.wait")) for label, _ in top)
+    idle = profiler.idle_totals()
+    totals = profiler.thread_totals()
+    for i in range(3):
+        assert idle[f"Idle-{i}"] == totals[f"Idle-{i}"]
+    assert "Busy" not in idle
+    assert profiler.top_frames(5, thread="Busy")[0][0].startswith("busy ")
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
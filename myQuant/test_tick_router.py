@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for live/tick_router.py - per-symbol config and trade attribution.
+
+Run: python -m pytest myQuant/test_tick_router.py  (or python myQuant/test_tick_router.py)
+"""
+import sys
+import os
+import csv
+import json
+import tempfile
+from datetime import datetime
+
+# Add myQuant to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.config_helper import create_config_from_defaults, freeze_config
+from utils.time_utils import IST
+from core.tick import Tick
+from live.tick_router import TickRouter
+
+SESSION_TS = IST.localize(datetime(2025, 1, 6, 10, 0))
+
+INSTRUMENTS = [
+    {'symbol': 'NIFTY25JAN23500CE', 'token': '43512', 'exchange': 'NFO'},
+    {'symbol': 'BANKNIFTY25JAN50000CE', 'token': '43620'},
+]
+
+
+def _router(instruments=INSTRUMENTS):
+    return TickRouter(freeze_config(create_config_from_defaults()), instruments)
+
+
+def test_symbol_config_uses_instrument_mappings():
+    router = _router()
+    mappings = router.config['instrument_mappings']
+    for worker, key in zip(router.workers, ('NIFTY', 'BANKNIFTY')):
+        instrument = worker.config['instrument']
+        assert instrument['symbol'] == worker.symbol
+        assert instrument['instrument_type'] == key
+        assert instrument['lot_size'] == mappings[key]['lot_size']
+        assert instrument['tick_size'] == mappings[key]['tick_size']
+        assert instrument['exchange'] == mappings[key]['exchange']
+
+
+def test_unknown_instrument_fails_fast():
+    try:
+        _router([{'symbol': 'XYZ25JAN100CE', 'token': '1'}])
+    except ValueError as e:
+        assert 'instrument_type' in str(e)
+    else:
+        raise AssertionError("expected ValueError for an instrument without lot/tick size")
+
+
+def test_trades_carry_symbol_and_lot_size():
+    router = _router()
+    for worker in router.workers:
+        worker.active_position_id = worker.strategy.open_long({'close': 100.0}, SESSION_TS, worker.position_manager)
+        assert worker.active_position_id
+
+    router.start()
+    for worker in router.workers:
+        router.route(Tick(SESSION_TS, 100.0, 10, symbol_id=int(worker.token), symbol=worker.symbol))
+    router.stop()
+
+    mappings = router.config['instrument_mappings']
+    for worker, key in zip(router.workers, ('NIFTY', 'BANKNIFTY')):
+        trades = worker.position_manager.completed_trades
+        assert worker.tick_count == 1
+        assert len(trades) == 1
+        assert trades[0].symbol == worker.symbol
+        assert trades[0].lot_size == mappings[key]['lot_size']
+        assert trades[0].quantity % mappings[key]['lot_size'] == 0
+        assert worker.active_position_id is None
+
+
+def test_close_position_notifies_only_on_success():
+    worker = _router().workers[0]
+    notified = []
+    worker.strategy.on_position_closed = lambda position_id, reason: notified.append(position_id)
+    position_id = worker.strategy.open_long({'close': 100.0}, SESSION_TS, worker.position_manager)
+    worker.active_position_id = position_id
+
+    close_full = worker.position_manager.close_position_full
+    worker.position_manager.close_position_full = lambda *args, **kwargs: False
+    worker.close_position(100.0, SESSION_TS, "Manual")
+    assert notified == []
+    assert worker.active_position_id == position_id
+
+    worker.position_manager.close_position_full = close_full
+    worker.close_position(100.0, SESSION_TS, "Manual")
+    assert notified == [position_id]
+    assert worker.active_position_id is None
+
+
+def test_capital_split_evenly_and_results_exported():
+    router = _router()
+    total = router.config['capital']['initial_capital']
+    for worker in router.workers:
+        assert worker.position_manager.initial_capital == total / len(router.workers)
+        worker.active_position_id = worker.strategy.open_long({'close': 100.0}, SESSION_TS, worker.position_manager)
+    router.start()
+    for worker in router.workers:
+        router.route(Tick(SESSION_TS, 101.0, 10, symbol_id=int(worker.token), symbol=worker.symbol))
+    router.stop()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = router.export_results(tmp, prefix="basket")
+        with open(paths['trades'], newline='') as f:
+            rows = list(csv.DictReader(f))
+        with open(paths['summary']) as f:
+            summary = json.load(f)
+    assert sorted(r['symbol'] for r in rows) == sorted(w.symbol for w in router.workers)
+    assert set(summary['symbols']) == {w.symbol for w in router.workers}
+    assert all(s['total_trades'] == 1 for s in summary['symbols'].values())
+    assert summary['portfolio']['initial_capital'] == total
+    assert summary['portfolio']['total_trades'] == len(router.workers)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
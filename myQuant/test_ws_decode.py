@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the two WebSocket decode paths - the binary fast path
+(live.smartapi_binary.BinaryTickDecoder) and the SmartAPI dict path
+(WebSocketTickStreamer._on_data) must build the same Tick from one packet.
+
+Run: python -m pytest myQuant/test_ws_decode.py  (or python myQuant/test_ws_decode.py)
+"""
+import sys
+import os
+
+# Add myQuant to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from live.smartapi_binary import (BinaryTickDecoder, encode_packet, LTP_MODE, QUOTE_MODE,
+                                  SNAP_QUOTE_MODE, SNAP_QUOTE_PACKET_SIZE)
+from live.websocket_stream import WebSocketTickStreamer, SmartWebSocketV2
+
+TOKEN = "54452"
+SYMBOL = "NIFTY07OCT2524800CE"
+EXCHANGE_TS_MS = 1759465200000  # 2025-10-03 09:50 IST
+
+if SmartWebSocketV2 is None:
+    pytest.skip("smartapi-python not installed (dict path needs SmartWebSocketV2)", allow_module_level=True)
+
+
+def _dict_path_tick(frame):
+    """Decode as live does with binary_decode off: library parse -> WebSocketTickStreamer._on_data."""
+    ticks = []
+    streamer = WebSocketTickStreamer("", "", "", [{"symbol": SYMBOL, "token": TOKEN, "exchange": "NFO"}],
+                                     on_tick=lambda tick, symbol: ticks.append(tick), binary_decode=False)
+    parser = SmartWebSocketV2.__new__(SmartWebSocketV2)  # __init__ opens a log file; parsing needs no state
+    streamer._on_data(None, parser._parse_binary_data(frame))
+    assert len(ticks) == 1
+    return ticks[0]
+
+
+def _fields(tick):
+    return (tick.price, tick.volume, tick.symbol_id, tick.symbol, tick.exchange_ts_ns, tick.last_trade_ts_ns,
+            tick.seq)
+
+
+def _snap_quote_packet(last_trade_s):
+    frame = bytearray(encode_packet(QUOTE_MODE, 2, TOKEN, 9, EXCHANGE_TS_MS, 28005, last_traded_quantity=150))
+    frame[0] = SNAP_QUOTE_MODE
+    frame.extend(bytes(SNAP_QUOTE_PACKET_SIZE - len(frame)))
+    frame[123:131] = last_trade_s.to_bytes(8, 'little')
+    return bytes(frame)
+
+
+def test_quote_packet_same_tick_on_both_paths():
+    frame = encode_packet(QUOTE_MODE, 2, TOKEN, 7, EXCHANGE_TS_MS, 29510, last_traded_quantity=75,
+                          volume_for_day=120000)
+    fast = BinaryTickDecoder({TOKEN: SYMBOL}).decode(frame)
+    assert _fields(_dict_path_tick(frame)) == _fields(fast)
+    assert fast.volume == 75  # last traded quantity, not the day's volume
+    assert fast.seq == 7
+    assert fast.price == 295.10
+
+
+def test_ltp_packet_same_tick_on_both_paths():
+    frame = encode_packet(LTP_MODE, 2, TOKEN, 8, EXCHANGE_TS_MS, 29510)
+    fast = BinaryTickDecoder({TOKEN: SYMBOL}).decode(frame)
+    assert _fields(_dict_path_tick(frame)) == _fields(fast)
+    assert fast.volume == 0
+
+
+def test_snap_quote_packet_same_tick_on_both_paths():
+    frame = _snap_quote_packet(EXCHANGE_TS_MS // 1000)
+    fast = BinaryTickDecoder({TOKEN: SYMBOL}).decode(frame)
+    assert _fields(_dict_path_tick(frame)) == _fields(fast)
+    assert fast.last_trade_ts_ns == EXCHANGE_TS_MS // 1000 * 1_000_000_000
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,220 @@
+"""
+utils/allocation_audit.py
+
+tracemalloc-based per-tick allocation audit for the live hot path.
+
+Per tick (begin_tick()/end_tick() around one tick's processing):
+- peak bytes: highest traced memory during the tick above the level it started
+  at - the transient churn (dict copies, Series, f-strings, signal objects)
+  that is allocated and freed inside the tick
+- net bytes / net blocks: what the tick left allocated (caches, growing lists)
+
+Over the audit window (start() .. stop()), a snapshot diff attributes the
+surviving allocations to source lines in the hot-path modules (liveStrategy,
+trader, broker_adapter, position_manager) as bytes and blocks per tick.
+Tracebacks are `frames` deep and an allocation counts if ANY of its frames is
+in a hot-path module: memory allocated inside indicators, pandas or helpers is
+charged to the innermost hot-path line that called into them (the line table
+shows the actual allocation site as 'via').
+tracemalloc only sees blocks alive at snapshot time, so short-lived churn is
+visible in the per-tick peak figures, not in the line table.
+
+check_budget() compares a report with a stored budget (JSON) so a change that
+adds per-tick allocations fails scripts/alloc_audit.py.
+
+tracemalloc slows allocation-heavy code 2-4x (more with deep tracebacks): audit
+runs are for allocation counts, never for latency figures.
+"""
+
+import json
+import logging
+import os
+import tracemalloc
+from array import array
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+AUDIT_MODULES = ('liveStrategy.py', 'trader.py', 'broker_adapter.py', 'position_manager.py')
+
+
+def _pct(ordered: Sequence[int], q: float) -> int:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0
+
+
+class AllocationAudit:
+    """
+    Per-tick allocation counters plus per-line attribution for the audit modules.
+
+    Usage:
+        audit = AllocationAudit()
+        audit.start()
+        for tick in ticks:
+            audit.begin_tick()
+            process(tick)
+            audit.end_tick()
+        report = audit.stop()
+    """
+
+    def __init__(self, modules: Sequence[str] = AUDIT_MODULES, frames: int = 32, top_lines: int = 25):
+        if frames < 1:
+            raise ValueError(f"tracemalloc frames must be >= 1, got {frames}")
+        self.modules = tuple(modules)
+        self.frames = frames
+        self.top_lines = top_lines
+        self._filters = [tracemalloc.Filter(True, f"*{os.sep}{m}", all_frames=True) for m in self.modules]
+        self._peak_bytes = array('q')
+        self._net_bytes = array('q')
+        self._tick_start = 0
+        self._start_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._started_tracing = False
+        self.report: Optional[Dict[str, Any]] = None
+
+    @property
+    def ticks(self) -> int:
+        return len(self._peak_bytes)
+
+    def start(self) -> None:
+        """Start tracing (if not already on) and take the baseline snapshot."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        elif tracemalloc.get_traceback_limit() < self.frames:
+            logger.warning(f"tracemalloc already tracing with {tracemalloc.get_traceback_limit()} frame(s) - "
+                           f"allocations in deeper callees are not attributed (wanted {self.frames})")
+        del self._peak_bytes[:]
+        del self._net_bytes[:]
+        self._start_snapshot = tracemalloc.take_snapshot().filter_traces(self._filters)
+        logger.info(f"🧮 Allocation audit started (tracemalloc, {self.frames} frame(s))")
+
+    def begin_tick(self) -> None:
+        tracemalloc.reset_peak()
+        self._tick_start = tracemalloc.get_traced_memory()[0]
+
+    def end_tick(self) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        self._peak_bytes.append(peak - self._tick_start)
+        self._net_bytes.append(current - self._tick_start)
+
+    def stop(self) -> Dict[str, Any]:
+        """Take the closing snapshot, stop tracing if we started it, and build the report."""
+        if self._start_snapshot is None:
+            raise RuntimeError("AllocationAudit.stop() called before start()")
+        end_snapshot = tracemalloc.take_snapshot().filter_traces(self._filters)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self.report = self._build_report(end_snapshot.compare_to(self._start_snapshot, 'traceback'))
+        self._start_snapshot = None
+        return self.report
+
+    def _build_report(self, diffs: List[tracemalloc.StatisticDiff]) -> Dict[str, Any]:
+        ticks = max(self.ticks, 1)
+        peaks = sorted(self._peak_bytes)
+        nets = sorted(self._net_bytes)
+        modules = {m: {'bytes_per_tick': 0.0, 'blocks_per_tick': 0.0} for m in self.modules}
+        by_line: Dict[str, Dict[str, Any]] = {}
+        for diff in diffs:
+            if not diff.size_diff and not diff.count_diff:
+                continue
+            # Innermost frame in a hot-path module owns the allocation (traceback is oldest first)
+            owner = next((f for f in reversed(diff.traceback)
+                          if os.path.basename(f.filename) in modules), None)
+            if owner is None:
+                continue
+            module = os.path.basename(owner.filename)
+            modules[module]['bytes_per_tick'] += diff.size_diff / ticks
+            modules[module]['blocks_per_tick'] += diff.count_diff / ticks
+            key = f"{module}:{owner.lineno}"
+            entry = by_line.setdefault(key, {'line': key, 'size': 0, 'count': 0, 'via': '', 'via_size': 0})
+            entry['size'] += diff.size_diff
+            entry['count'] += diff.count_diff
+            site = diff.traceback[-1]
+            if site != owner and abs(diff.size_diff) > entry['via_size']:
+                entry['via'] = f"{os.path.basename(site.filename)}:{site.lineno}"
+                entry['via_size'] = abs(diff.size_diff)
+        lines = [{'line': e['line'], 'via': e['via'],
+                  'bytes_per_tick': round(e['size'] / ticks, 3),
+                  'blocks_per_tick': round(e['count'] / ticks, 4)} for e in by_line.values()]
+        lines.sort(key=lambda entry: -abs(entry['bytes_per_tick']))
+        for entry in modules.values():
+            entry['bytes_per_tick'] = round(entry['bytes_per_tick'], 3)
+            entry['blocks_per_tick'] = round(entry['blocks_per_tick'], 4)
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'ticks': self.ticks,
+            'peak_bytes_per_tick': {'p50': _pct(peaks, 0.50), 'p90': _pct(peaks, 0.90),
+                                    'p99': _pct(peaks, 0.99), 'max': peaks[-1] if peaks else 0},
+            'net_bytes_per_tick': {'mean': round(sum(nets) / ticks, 1), 'p50': _pct(nets, 0.50),
+                                   'max': nets[-1] if nets else 0},
+            'modules': modules,
+            'top_lines': lines[:self.top_lines],
+        }
+
+    def log_report(self, report: Optional[Dict[str, Any]] = None) -> None:
+        report = report or self.report
+        if not report:
+            logger.warning("No allocation audit data")
+            return
+        peak, net = report['peak_bytes_per_tick'], report['net_bytes_per_tick']
+        logger.info(f"Allocation audit: {report['ticks']} ticks, peak/tick p50 {peak['p50']:,} B "
+                    f"p99 {peak['p99']:,} B, net/tick mean {net['mean']:,.1f} B")
+        for module, entry in report['modules'].items():
+            logger.info(f"  {module:22s} {entry['bytes_per_tick']:10.1f} B/tick  "
+                        f"{entry['blocks_per_tick']:8.3f} blocks/tick retained")
+        for entry in report['top_lines'][:10]:
+            via = f"  (via {entry['via']})" if entry['via'] else ""
+            logger.info(f"  {entry['line']:40s} {entry['bytes_per_tick']:10.1f} B/tick  "
+                        f"{entry['blocks_per_tick']:8.3f} blocks/tick{via}")
+
+    def export_json(self, output_dir: str = "results") -> str:
+        if not self.report:
+            raise RuntimeError("No allocation audit report - call stop() first")
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, f"alloc_audit_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        with open(path, 'w') as f:
+            json.dump(self.report, f, indent=2)
+        logger.info(f"Allocation audit saved to {path}")
+        return path
+
+
+def budget_from_report(report: Dict[str, Any]) -> Dict[str, Any]:
+    """Budget document (what check_budget() compares against) from an accepted report."""
+    return {
+        'created': report['timestamp'],
+        'ticks': report['ticks'],
+        'peak_bytes_per_tick_p50': report['peak_bytes_per_tick']['p50'],
+        'peak_bytes_per_tick_p99': report['peak_bytes_per_tick']['p99'],
+        'net_bytes_per_tick_mean': report['net_bytes_per_tick']['mean'],
+        'modules': {m: dict(entry) for m, entry in report['modules'].items()},
+    }
+
+
+def check_budget(report: Dict[str, Any], budget: Dict[str, Any], tolerance: float = 0.10,
+                 slack_bytes: float = 64.0, slack_blocks: float = 0.05) -> List[str]:
+    """
+    Violations of `budget` by `report` (empty list = within budget).
+
+    A figure may exceed its budget by `tolerance` (relative) plus a small absolute
+    slack, so near-zero budgets don't fail on noise.
+    """
+    if tolerance < 0:
+        raise ValueError(f"Budget tolerance must be >= 0, got {tolerance}")
+    violations = []
+
+    def check(label: str, actual: float, allowed: float, slack: float):
+        limit = allowed + abs(allowed) * tolerance + slack  # abs: net bytes can be negative
+        if actual > limit:
+            violations.append(f"{label}: {actual:,.2f} > budget {allowed:,.2f} (limit {limit:,.2f})")
+
+    check('peak bytes/tick p50', report['peak_bytes_per_tick']['p50'], budget['peak_bytes_per_tick_p50'], slack_bytes)
+    check('peak bytes/tick p99', report['peak_bytes_per_tick']['p99'], budget['peak_bytes_per_tick_p99'], slack_bytes)
+    check('net bytes/tick', report['net_bytes_per_tick']['mean'], budget['net_bytes_per_tick_mean'], slack_bytes)
+    for module, allowed in budget['modules'].items():
+        actual = report['modules'].get(module)
+        if actual is None:
+            continue
+        check(f"{module} bytes/tick", actual['bytes_per_tick'], allowed['bytes_per_tick'], slack_bytes)
+        check(f"{module} blocks/tick", actual['blocks_per_tick'], allowed['blocks_per_tick'], slack_blocks)
+    return violations
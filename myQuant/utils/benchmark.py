@@ -0,0 +1,262 @@
+"""
+utils/benchmark.py
+
+Shared pieces of the benchmark suite (scripts/bench_suite.py):
+
+- BenchMetric: one tracked number (value, unit, direction, optional own threshold)
+- machine_tag() / machine_info(): baselines are only comparable on the same
+  hardware, interpreter and numpy/pandas, so each baseline file is keyed by a
+  tag that hashes all of them; the gate also refuses a baseline whose stored
+  info differs (e.g. one selected with --machine)
+- BaselineStore: one JSON file per machine tag (metrics + machine info + git commit)
+- compare_to_baseline(): per-metric relative change; a metric is a regression
+  when it moves the wrong way by more than its threshold
+- best_of() / percentiles_us(): timing helpers (min over repeats for throughput
+  figures, percentiles for per-tick latency)
+- quiet_logging() / frozen_default_config() / local_feed_config(): run conditions
+  shared by the benchmark scripts (no log I/O in timed code, GUI-equivalent
+  frozen config, login-free config for locally fed BrokerAdapter sessions)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import platform
+import re
+import subprocess
+import time
+from contextlib import contextmanager
+from copy import deepcopy
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+@dataclass
+class BenchMetric:
+    """One tracked benchmark figure."""
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool = False
+    threshold: Optional[float] = None  # Relative regression threshold; None = suite default
+
+
+@dataclass
+class MetricComparison:
+    name: str
+    value: float
+    baseline: Optional[float]
+    unit: str
+    change: Optional[float]  # Relative, signed so that > 0 is worse
+    threshold: float
+    status: str  # 'ok' | 'regression' | 'improved' | 'new'
+
+
+# machine_info() keys that must match for timings to be comparable
+COMPARABLE_INFO_KEYS = ('machine', 'cpu_model', 'cpu_count', 'python', 'implementation', 'numpy', 'pandas')
+
+
+class BaselineMismatch(ValueError):
+    """The stored baseline was recorded on a different machine or stack."""
+
+
+def cpu_model() -> str:
+    """CPU model name ('' when unknown); platform.processor() is empty on most Linux builds."""
+    try:
+        with open('/proc/cpuinfo') as f:
+            for line in f:
+                if line.startswith('model name'):
+                    return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or ''
+
+
+def machine_info() -> Dict[str, Any]:
+    info = {
+        'node': platform.node(),
+        'system': f"{platform.system()} {platform.release()}",
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_model': cpu_model(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+    }
+    for module in ('numpy', 'pandas'):
+        try:
+            info[module] = __import__(module).__version__
+        except ImportError:
+            info[module] = None
+    return info
+
+
+def machine_tag(info: Optional[Dict[str, Any]] = None) -> str:
+    """Key for this machine + stack, e.g. 'trading-pc_AMD64_py311_3f9a1c2e'.
+
+    The suffix hashes COMPARABLE_INFO_KEYS, so a host with the same name but a
+    different CPU, core count or numpy/pandas version gets its own baseline.
+    """
+    info = info or machine_info()
+    node = re.sub(r'[^A-Za-z0-9_.-]+', '-', info.get('node') or 'unknown')
+    fingerprint = json.dumps({k: info.get(k) for k in COMPARABLE_INFO_KEYS}, sort_keys=True)
+    digest = hashlib.sha1(fingerprint.encode()).hexdigest()[:8]
+    py = ''.join(str(info.get('python') or '0.0').split('.')[:2])
+    return f"{node}_{info.get('machine') or 'cpu'}_py{py}_{digest}"
+
+
+def info_mismatch(stored: Optional[Dict[str, Any]], current: Dict[str, Any]) -> Dict[str, tuple]:
+    """COMPARABLE_INFO_KEYS whose stored value differs from `current`: {key: (stored, current)}.
+
+    A baseline without an info block counts as mismatched on every key.
+    """
+    stored = stored or {}
+    return {k: (stored.get(k), current.get(k)) for k in COMPARABLE_INFO_KEYS
+            if stored.get(k) != current.get(k)}
+
+
+def git_commit(repo_dir: str) -> Optional[str]:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=repo_dir,
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def best_of(fn: Callable[[], Any], repeat: int = 5) -> float:
+    """Fastest wall time (seconds) of `repeat` calls - least disturbed by other load."""
+    if repeat < 1:
+        raise ValueError(f"repeat must be >= 1, got {repeat}")
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def percentiles_us(samples_ns: Sequence[int]) -> Dict[str, float]:
+    """p50/p90/p99/p99.9/max/mean in microseconds."""
+    if not samples_ns:
+        return {}
+    ordered = sorted(samples_ns)
+    n = len(ordered)
+    pick = lambda q: ordered[min(n - 1, int(q * n))] / 1000.0
+    return {'p50': pick(0.50), 'p90': pick(0.90), 'p99': pick(0.99), 'p99_9': pick(0.999),
+            'max': ordered[-1] / 1000.0, 'mean': sum(ordered) / n / 1000.0}
+
+
+@contextmanager
+def quiet_logging():
+    """Disable all logging for the duration (records are not even created)."""
+    logging.disable(logging.CRITICAL)
+    try:
+        yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def local_feed_config(token: str, exchange: str, ws_url: str = ""):
+    """Frozen DEFAULT_CONFIG for a BrokerAdapter fed locally (replay server / in-process), no broker login."""
+    from config.defaults import DEFAULT_CONFIG
+    from utils.config_helper import freeze_config
+    config = deepcopy(DEFAULT_CONFIG)
+    config['live']['ws_url'] = ws_url
+    config['live']['api_key'] = config['live']['api_key'] or "LOCAL"
+    config['live']['client_code'] = config['live']['client_code'] or "LOCAL"
+    config['live']['feed_type'] = 'Quote'
+    config['live']['tick_log_dir'] = ""  # No livePrice CSV for synthetic ticks
+    config['instrument']['token'] = token
+    config['instrument']['exchange'] = exchange
+    return freeze_config(config)
+
+
+def frozen_default_config(results_dir: Optional[str] = None):
+    """DEFAULT_CONFIG with instrumentation off and the instrument filled in, frozen."""
+    from config.defaults import DEFAULT_CONFIG
+    from utils.config_helper import freeze_config
+    config = deepcopy(DEFAULT_CONFIG)
+    config['performance']['instrumentation_enabled'] = False
+    # The GUI fills these from instrument_mappings (SSOT) before freezing
+    info = config['instrument_mappings'][config['instrument']['symbol']]
+    config['instrument']['lot_size'] = info['lot_size']
+    config['instrument']['tick_size'] = info['tick_size']
+    config['instrument']['instrument_type'] = config['instrument']['symbol']
+    if results_dir:
+        config['backtest']['results_dir'] = results_dir
+    return freeze_config(config)
+
+
+class BaselineStore:
+    """Machine-tagged baseline files: <directory>/<machine_tag>.json."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def path_for(self, tag: str) -> str:
+        return os.path.join(self.directory, f"{tag}.json")
+
+    def load(self, tag: str) -> Optional[Dict[str, Any]]:
+        path = self.path_for(tag)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def save(self, tag: str, metrics: List[BenchMetric], commit: Optional[str] = None,
+             merge: bool = True) -> str:
+        """Write `metrics` as the baseline for `tag`.
+
+        Merged into the existing file by default, unless that file was recorded
+        on a different machine/stack - then it is replaced.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        info = machine_info()
+        existing = self.load(tag) if merge else None
+        if existing and info_mismatch(existing.get('info'), info):
+            existing = None
+        stored = dict(existing['metrics']) if existing else {}
+        for m in metrics:
+            stored[m.name] = {k: v for k, v in asdict(m).items() if k != 'name'}
+        document = {'machine': tag, 'info': info, 'commit': commit,
+                    'updated': datetime.now().isoformat(), 'metrics': stored}
+        path = self.path_for(tag)
+        with open(path, 'w') as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+        return path
+
+
+def compare_to_baseline(metrics: List[BenchMetric], baseline: Optional[Dict[str, Any]],
+                        threshold: float = 0.15,
+                        info: Optional[Dict[str, Any]] = None) -> List[MetricComparison]:
+    """Compare each metric with its baseline value; status 'regression' fails the gate.
+
+    Raises BaselineMismatch when the baseline's stored info differs from `info`
+    (default: machine_info()) - timings from another machine or stack are not
+    comparable, so no verdict is given.
+    """
+    if threshold <= 0:
+        raise ValueError(f"Regression threshold must be positive, got {threshold}")
+    if baseline is not None:
+        differing = info_mismatch(baseline.get('info'), info or machine_info())
+        if differing:
+            detail = ', '.join(f"{k}: {old!r} -> {new!r}" for k, (old, new) in differing.items())
+            raise BaselineMismatch(f"Baseline '{baseline.get('machine')}' was recorded on a different "
+                                   f"machine/stack ({detail})")
+    stored = baseline['metrics'] if baseline else {}
+    rows = []
+    for m in metrics:
+        limit = m.threshold if m.threshold is not None else threshold
+        base = stored.get(m.name, {}).get('value')
+        if base is None or base == 0:
+            rows.append(MetricComparison(m.name, m.value, base, m.unit, None, limit, 'new'))
+            continue
+        change = (m.value - base) / abs(base)
+        if m.higher_is_better:
+            change = -change
+        status = 'regression' if change > limit else 'improved' if change < -limit else 'ok'
+        rows.append(MetricComparison(m.name, m.value, base, m.unit, change, limit, status))
+    return rows
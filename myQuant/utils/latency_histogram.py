@@ -0,0 +1,192 @@
+"""
+utils/latency_histogram.py
+
+Fixed-memory latency histograms for the live tick path.
+
+- LatencyHistogram: HDR-style log-linear buckets over integer nanoseconds.
+  Values below 2^precision_bits are counted exactly; above that every power of
+  two is split into 2^(precision_bits-1) linear sub-buckets, so the relative
+  error is bounded by 2^-(precision_bits-1) (0.8% at the default 8 bits) for
+  any value up to max_value_ns. Memory is one counter array sized at construction.
+- StageLatencyRecorder: one histogram per tick stage, measured on the
+  perf_counter_ns clock from the tick's receive stamp (Tick.mono_ns):
+      queue_out       tick left the broker queue (polling path)
+      strategy_start  strategy.on_tick() entered
+      strategy_end    strategy.on_tick() returned (feed receive -> signal)
+      order_decision  entry/exit decision applied (feed receive -> simulated order)
+      strategy        strategy.on_tick() duration
+  snapshot()/reset() for live monitoring, export_json() for results/.
+
+Recording is a handful of integer operations per stamp; LiveTrader only creates
+a recorder when performance.latency_histograms is enabled.
+"""
+
+import json
+import logging
+import os
+import time
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('queue_out', 'strategy_start', 'strategy_end', 'order_decision', 'strategy')
+_PERCENTILES = (('p50', 50.0), ('p90', 90.0), ('p99', 99.0), ('p99_9', 99.9), ('p99_99', 99.99))
+
+
+class LatencyHistogram:
+    """Log-linear (HDR-style) histogram of nanosecond values with fixed memory."""
+
+    def __init__(self, precision_bits: int = 8, max_value_ns: int = 60_000_000_000):
+        if not 2 <= precision_bits <= 16:
+            raise ValueError(f"precision_bits must be in [2, 16], got {precision_bits}")
+        if max_value_ns < (1 << precision_bits):
+            raise ValueError(f"max_value_ns must be >= {1 << precision_bits}, got {max_value_ns}")
+        self.precision_bits = precision_bits
+        self.max_value_ns = max_value_ns
+        self._sub_count = 1 << precision_bits
+        self._half = self._sub_count >> 1
+        self._max_shift = max(0, max_value_ns.bit_length() - precision_bits)
+        self._last_index = self._max_shift * self._half + self._sub_count - 1
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all counts."""
+        self.counts = array('Q', bytes(8 * (self._last_index + 1)))
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+
+    def _index(self, value_ns: int) -> int:
+        if value_ns < self._sub_count:
+            return value_ns
+        shift = value_ns.bit_length() - self.precision_bits
+        if shift > self._max_shift:
+            return self._last_index  # Clamped (max_ns still records the true value)
+        return shift * self._half + (value_ns >> shift)
+
+    def _bucket_bounds(self, index: int):
+        """(lowest, highest) value mapping to bucket `index`."""
+        if index < self._sub_count:
+            return index, index
+        shift = index // self._half - 1
+        sub = index - shift * self._half
+        return sub << shift, ((sub + 1) << shift) - 1
+
+    def record(self, value_ns: int) -> None:
+        """Count one value (negative values - clock misuse - are counted as 0)."""
+        if value_ns < 0:
+            value_ns = 0
+        self.counts[self._index(value_ns)] += 1
+        if self.count == 0 or value_ns < self.min_ns:
+            self.min_ns = value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+        self.count += 1
+        self.total_ns += value_ns
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram with the same layout into this one."""
+        if (other.precision_bits, other.max_value_ns) != (self.precision_bits, self.max_value_ns):
+            raise ValueError("Cannot merge histograms with different precision_bits/max_value_ns")
+        if other.count == 0:
+            return
+        for i, c in enumerate(other.counts):
+            if c:
+                self.counts[i] += c
+        self.min_ns = other.min_ns if self.count == 0 else min(self.min_ns, other.min_ns)
+        self.max_ns = max(self.max_ns, other.max_ns)
+        self.count += other.count
+        self.total_ns += other.total_ns
+
+    def value_at_percentile(self, percentile: float) -> int:
+        """Highest value equivalent to the given percentile (0-100), capped at the observed max."""
+        if self.count == 0:
+            return 0
+        target = max(1, int(round(percentile / 100.0 * self.count)))
+        running = 0
+        for i, c in enumerate(self.counts):
+            if c:
+                running += c
+                if running >= target:
+                    return min(self._bucket_bounds(i)[1], self.max_ns)
+        return self.max_ns
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Summary in microseconds (count, min, mean, percentiles, max)."""
+        summary = {'count': self.count,
+                   'min_us': round(self.min_ns / 1000.0, 3),
+                   'mean_us': round(self.total_ns / self.count / 1000.0, 3) if self.count else 0.0}
+        for name, pct in _PERCENTILES:
+            summary[f'{name}_us'] = round(self.value_at_percentile(pct) / 1000.0, 3)
+        summary['max_us'] = round(self.max_ns / 1000.0, 3)
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Snapshot plus non-empty buckets as [lowest_ns, count] (for offline re-aggregation)."""
+        data = self.snapshot()
+        data['precision_bits'] = self.precision_bits
+        data['buckets'] = [[self._bucket_bounds(i)[0], c] for i, c in enumerate(self.counts) if c]
+        return data
+
+
+class StageLatencyRecorder:
+    """
+    Per-stage latency histograms for ticks stamped with Tick.mono_ns at receive.
+
+    Usage (LiveTrader):
+        start = recorder.stamp(tick, 'strategy_start')
+        signal = strategy.on_tick(tick)
+        recorder.record('strategy', recorder.stamp(tick, 'strategy_end') - start)
+    """
+
+    def __init__(self, precision_bits: int = 8, max_value_ns: int = 60_000_000_000):
+        self.histograms = {stage: LatencyHistogram(precision_bits, max_value_ns) for stage in STAGES}
+        self.unstamped_ticks = 0  # Ticks without a receive stamp (mono_ns == 0)
+        self.started_at = datetime.now()
+
+    def stamp(self, tick, stage: str) -> int:
+        """Record receive -> now for `stage`; returns now (perf_counter_ns)."""
+        now = time.perf_counter_ns()
+        if tick.mono_ns:
+            self.histograms[stage].record(now - tick.mono_ns)
+        elif stage == 'strategy_start':
+            self.unstamped_ticks += 1
+        return now
+
+    def record(self, stage: str, duration_ns: int) -> None:
+        """Record a precomputed duration for `stage`."""
+        self.histograms[stage].record(duration_ns)
+
+    def snapshot(self, reset: bool = False) -> Dict[str, Any]:
+        """Per-stage summaries (microseconds); optionally reset afterwards (interval reporting)."""
+        snap = {stage: h.snapshot() for stage, h in self.histograms.items() if h.count}
+        if reset:
+            self.reset()
+        return snap
+
+    def reset(self) -> None:
+        for h in self.histograms.values():
+            h.reset()
+        self.unstamped_ticks = 0
+        self.started_at = datetime.now()
+
+    def export_json(self, output_dir: str = "results", filename: Optional[str] = None) -> str:
+        """Write all stage histograms (summaries + buckets) to output_dir; returns the path."""
+        os.makedirs(output_dir, exist_ok=True)
+        if filename is None:
+            filename = f"latency_histograms_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        path = os.path.join(output_dir, filename)
+        payload = {
+            'started_at': self.started_at.isoformat(),
+            'exported_at': datetime.now().isoformat(),
+            'clock': 'perf_counter_ns from Tick.mono_ns (feed receive)',
+            'unstamped_ticks': self.unstamped_ticks,
+            'stages': {stage: h.to_dict() for stage, h in self.histograms.items()},
+        }
+        with open(path, 'w') as f:
+            json.dump(payload, f, indent=2)
+        logger.info(f"Latency histograms exported to {path}")
+        return path
@@ -39,24 +39,114 @@ utils/logger.py - Single high-performanc        # File handler - STRICT CONFIG A
 
 - Enforces frozen MappingProxyType input (no internal fallbacks).
 - Idempotent, thread-safe setup_from_config(...)
-- Hot-loop helpers: increment_tick_counter, get_tick_counter, should_log_tick
+- Lock-free hot-loop helpers: increment_tick_counter, get_tick_counter, should_log_tick
 - HighPerfLogger: lazy formatting + rate-limited tick_debug, guaranteed INFO for signals/trades
 - Optional JSON event stream for reproducible backtest analysis
+- Optional async pipeline (logging.async_logging): hot-path threads only enqueue,
+  a listener thread owns every handler; bounded queue with drop accounting.
+  WARNING+ records and trade loggers (logging.async_lossless_loggers) are never
+  dropped: when the queue is full they are handled synchronously instead
 """
 from types import MappingProxyType
 import logging
 import logging.handlers
 import os
 import json
+import queue
+import atexit
+import itertools
 import threading
-from typing import Optional, Any, Mapping
+import time
+from typing import Optional, Any, Mapping, Dict, List
 
 _config_lock = threading.RLock()
 _setup_done = False
 
-_tick_lock = threading.RLock()
+# Tick counter: itertools.count.__next__ is a single C call (atomic under the GIL),
+# so increments from any thread need no lock; readers see the last value issued.
+_tick_seq = itertools.count(1)
 _tick_counter = 0
 
+# Async pipeline state (set by setup_from_config when logging.async_logging is enabled)
+_queue_handler: Optional["_BoundedQueueHandler"] = None
+_queue_listener: Optional["_DrainingQueueListener"] = None
+
+
+class _BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Root-level handler for the async pipeline: never blocks and never formats.
+    Only the message string is rendered (so mutable args are captured), the
+    listener thread does timestamp/level formatting and all I/O.
+
+    When the queue is full:
+    - WARNING+ records, records from lossless loggers (trades/exits) and records
+      logged with extra={'lossless': True} are handled synchronously on the
+      caller's thread through the listener's handlers - never dropped
+    - anything else is dropped and counted; a WARNING with the running total is
+      queued (at most every _DROP_REPORT_INTERVAL_S) once the queue has room again
+    """
+    _DROP_REPORT_INTERVAL_S = 5.0
+
+    def __init__(self, log_queue: queue.Queue, listener: logging.handlers.QueueListener,
+                 lossless_loggers: tuple = ()):
+        super().__init__(log_queue)
+        self.listener = listener
+        self.lossless_loggers = tuple(lossless_loggers)
+        self._drop_seq = itertools.count(1)  # atomic under the GIL, no lock
+        self._sync_seq = itertools.count(1)
+        self.dropped = 0
+        self.sync_fallback = 0  # Lossless records handled on the caller's thread (queue full)
+        self._reported = 0
+        self._next_report = 0.0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def _is_lossless(self, record: logging.LogRecord) -> bool:
+        return (record.levelno >= logging.WARNING
+                or getattr(record, 'lossless', False)
+                or record.name.startswith(self.lossless_loggers))
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if self._is_lossless(record):
+                self.sync_fallback = next(self._sync_seq)
+                self.listener.handle(record)
+            else:
+                self.dropped = next(self._drop_seq)
+            return
+        if self.dropped != self._reported:
+            self._report_drops()
+
+    def _report_drops(self) -> None:
+        """Queue a WARNING with the drop total (rate-limited; only runs after drops)."""
+        now = time.monotonic()
+        if now < self._next_report:
+            return
+        dropped = self.dropped
+        report = logging.makeLogRecord({
+            'name': __name__, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+            'msg': f"Async logging queue full: {dropped - self._reported} records dropped "
+                   f"({dropped} total, capacity {self.queue.maxsize})",
+        })
+        try:
+            self.queue.put_nowait(report)
+        except queue.Full:
+            return
+        self._reported = dropped
+        self._next_report = now + self._DROP_REPORT_INTERVAL_S
+
+
+class _DrainingQueueListener(logging.handlers.QueueListener):
+    """QueueListener whose stop() drains a full queue instead of failing on the sentinel."""
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
 def setup_from_config(frozen_cfg: MappingProxyType) -> logging.Logger:
     """
     Idempotent setup from frozen config. Requires MappingProxyType and 'logging' key.
@@ -120,20 +210,100 @@ def setup_from_config(frozen_cfg: MappingProxyType) -> logging.Logger:
             except Exception:
                 pass
 
+        # Async pipeline - move every handler behind a bounded queue - STRICT CONFIG ACCESS
+        if bool(log_cfg['async_logging']):
+            _start_async_pipeline(root, int(log_cfg['async_queue_size']),
+                                  tuple(log_cfg['async_lossless_loggers']))
+
         root.info("Logging system initialized with default configuration")
         _setup_done = True
         return root
 
+def _start_async_pipeline(root: logging.Logger, queue_size: int, lossless_loggers: tuple = ()) -> None:
+    """Detach root handlers onto a listener thread; root keeps only the queue handler."""
+    global _queue_handler, _queue_listener
+    if queue_size <= 0:
+        raise ValueError(f"logging.async_queue_size must be positive, got {queue_size}")
+    handlers = list(root.handlers)
+    for h in handlers:
+        root.removeHandler(h)
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    _queue_listener = _DrainingQueueListener(log_queue, *handlers, respect_handler_level=True)
+    _queue_handler = _BoundedQueueHandler(log_queue, _queue_listener, lossless_loggers)
+    root.addHandler(_queue_handler)
+    _queue_listener.start()
+    atexit.register(shutdown_logging)
+
+def add_log_handler(handler: logging.Handler) -> None:
+    """Attach a handler (e.g. GUI) to the listener thread when async, else to root."""
+    with _config_lock:
+        if _queue_listener is not None:
+            # Tuple swap is atomic; the listener reads .handlers once per record
+            _queue_listener.handlers = _queue_listener.handlers + (handler,)
+        else:
+            logging.getLogger().addHandler(handler)
+
+def remove_log_handler(handler: logging.Handler) -> None:
+    """Detach a handler previously added with add_log_handler (no-op if absent)."""
+    with _config_lock:
+        if _queue_listener is not None:
+            _queue_listener.handlers = tuple(h for h in _queue_listener.handlers if h is not handler)
+        else:
+            logging.getLogger().removeHandler(handler)
+
+def get_emitting_handlers() -> List[logging.Handler]:
+    """Handlers that format and write records: the listener thread's when async, else root's."""
+    with _config_lock:
+        if _queue_listener is not None:
+            return list(_queue_listener.handlers)
+        return list(logging.getLogger().handlers)
+
+def get_logging_stats() -> Dict[str, Any]:
+    """Async pipeline counters: enabled, queued (current depth), capacity, dropped, sync_fallback."""
+    if _queue_handler is None:
+        return {'async': False, 'queued': 0, 'capacity': 0, 'dropped': 0, 'sync_fallback': 0}
+    return {
+        'async': True,
+        'queued': _queue_handler.queue.qsize(),
+        'capacity': _queue_handler.queue.maxsize,
+        'dropped': _queue_handler.dropped,
+        'sync_fallback': _queue_handler.sync_fallback,
+    }
+
+def shutdown_logging() -> None:
+    """
+    Flush and stop the async pipeline (idempotent, registered with atexit).
+    Handlers are re-attached to root so later records are still written (synchronously).
+    """
+    global _queue_handler, _queue_listener
+    with _config_lock:
+        if _queue_listener is None:
+            return
+        listener, qh = _queue_listener, _queue_handler
+        _queue_listener = None
+        _queue_handler = None
+        root = logging.getLogger()
+        root.removeHandler(qh)
+        listener.stop()  # drains everything queued before the sentinel
+        for h in listener.handlers:
+            root.addHandler(h)
+            try:
+                h.flush()
+            except Exception:
+                pass
+        if qh.dropped or qh.sync_fallback:
+            root.warning(f"Async logging dropped {qh.dropped} records, handled {qh.sync_fallback} "
+                         f"WARNING+/trade records synchronously (queue capacity {qh.queue.maxsize})")
+
 def increment_tick_counter() -> int:
-    """Increment the global tick counter (thread-safe). Call once per tick."""
+    """Increment the global tick counter (thread-safe, lock-free). Call once per tick."""
     global _tick_counter
-    with _tick_lock:
-        _tick_counter += 1
-        return _tick_counter
+    _tick_counter = value = next(_tick_seq)
+    return value
 
 def get_tick_counter() -> int:
-    with _tick_lock:
-        return _tick_counter
+    """Latest tick count (plain read, no lock)."""
+    return _tick_counter
 
 def should_log_tick(interval: int) -> bool:
     """True when tick counter % interval == 0. interval <= 0 => always True."""
@@ -143,8 +313,9 @@ def should_log_tick(interval: int) -> bool:
         return True
     if interval <= 0:
         return True
-    with _tick_lock:
-        return (_tick_counter % interval) == 0
+    return (_tick_counter % interval) == 0
+
+_LOSSLESS = {'lossless': True}  # extra= marker: record must never be dropped by the async queue
 
 class HighPerfLogger:
     """
@@ -160,13 +331,16 @@ class HighPerfLogger:
         self.logger = logging.getLogger(name)
         self._cfg = frozen_cfg
         self._tick_interval = int(frozen_cfg['logging']['tick_log_interval'])
+        if self._tick_interval <= 0:
+            self._tick_interval = 1  # log every tick (matches should_log_tick semantics)
         self._entry_block_count = 0
         self.event_logger = logging.getLogger(f"{name}.events")
 
     def tick_debug(self, lazy_msg_func, *args, **kwargs):
-        """Evaluate lazy_msg_func only if DEBUG enabled and rate-limited."""
+        """Evaluate lazy_msg_func only if DEBUG enabled and rate-limited (lock-free checks)."""
         try:
-            if self.logger.isEnabledFor(logging.DEBUG) and should_log_tick(self._tick_interval):
+            # isEnabledFor is served from the logger's level cache; modulo on a plain int read
+            if self.logger.isEnabledFor(logging.DEBUG) and (_tick_counter % self._tick_interval) == 0:
                 try:
                     msg = lazy_msg_func(*args, **kwargs)
                 except Exception:
@@ -201,11 +375,12 @@ class HighPerfLogger:
                 pass
 
     def trade_executed(self, action: str, price: float, quantity: int, reason: str = "", trade_id: Optional[str] = None, run_id: Optional[str] = None):
-        self.logger.info(f"TRADE {action}: {quantity} @ {price:.2f} - {reason}")
+        # lossless: never dropped by the async queue (handled synchronously when full)
+        self.logger.info(f"TRADE {action}: {quantity} @ {price:.2f} - {reason}", extra=_LOSSLESS)
         if bool(self._cfg['logging']['json_event_log']):
             evt = {"type": "trade", "name": self.logger.name, "action": action, "price": price, "quantity": quantity, "reason": reason, "trade_id": trade_id, "run_id": run_id}
             try:
-                self.event_logger.info(json.dumps(evt))
+                self.event_logger.info(json.dumps(evt), extra=_LOSSLESS)
             except Exception:
                 pass
 
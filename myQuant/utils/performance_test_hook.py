@@ -22,6 +22,11 @@ class PerformanceTestConfig:
     enable_post_convergence: bool = True
     auto_stop_after_target: bool = True
     generate_report: bool = True
+    enable_trace: bool = False
+    trace_buffer_events: int = 200000
+    enable_profiler: bool = False
+    profiler_interval_ms: float = 5.0
+    enable_alloc_audit: bool = False
     
 
 class PerformanceTestHook:
@@ -54,6 +59,9 @@ class PerformanceTestHook:
         # Instrumentation
         self.pre_instrumentor = None
         self.post_instrumentor = None
+        self.tracer = None
+        self.profiler = None
+        self.alloc_audit = None
         
         # Statistics
         self.tick_count = 0
@@ -65,7 +73,12 @@ class PerformanceTestHook:
         target_ticks: int = 1000,
         enable_pre: bool = True,
         enable_post: bool = True,
-        auto_stop: bool = True
+        auto_stop: bool = True,
+        trace: bool = False,
+        trace_buffer_events: int = 200000,
+        profile: bool = False,
+        profile_interval_ms: float = 5.0,
+        alloc_audit: bool = False
     ):
         """
         Enable performance testing mode
@@ -75,12 +88,26 @@ class PerformanceTestHook:
             enable_pre: Enable pre-convergence instrumentation
             enable_post: Enable post-convergence instrumentation
             auto_stop: Automatically stop after target_ticks reached
+            trace: Record per-tick spans (all layers + logging) to a Chrome Trace
+                Event JSON file in results/ (open in ui.perfetto.dev)
+            trace_buffer_events: Trace ring size; older spans are overwritten
+            profile: Sample all thread stacks while the test runs and write folded
+                stacks (flamegraph input) to results/
+            profile_interval_ms: Profiler sampling interval
+            alloc_audit: tracemalloc allocation audit per tick (bytes per tick,
+                retaining source lines); slows the hot path, so latency figures
+                from the same run are not representative
         """
         self.enabled = True
         self.config.target_ticks = target_ticks
         self.config.enable_pre_convergence = enable_pre
         self.config.enable_post_convergence = enable_post
         self.config.auto_stop_after_target = auto_stop
+        self.config.enable_trace = trace
+        self.config.trace_buffer_events = trace_buffer_events
+        self.config.enable_profiler = profile
+        self.config.profiler_interval_ms = profile_interval_ms
+        self.config.enable_alloc_audit = alloc_audit
         
         logger.info(f"🔬 Performance testing ENABLED - Target: {target_ticks} ticks")
         
@@ -94,6 +121,25 @@ class PerformanceTestHook:
             from myQuant.utils.performance_metrics import PerformanceInstrumentor
             self.post_instrumentor = PerformanceInstrumentor(window_size=target_ticks)
             logger.info("✓ Post-convergence instrumentation ready")
+
+        if trace:
+            from myQuant.utils.trace_export import TraceRecorder
+            self.tracer = TraceRecorder(capacity=trace_buffer_events)
+            for instrumentor in (self.pre_instrumentor, self.post_instrumentor):
+                if instrumentor is not None:
+                    instrumentor.tracer = self.tracer
+            self.tracer.attach_logging()
+            logger.info(f"✓ Span tracing ready (buffer {trace_buffer_events} spans)")
+
+        if profile:
+            from myQuant.utils.sampling_profiler import SamplingProfiler
+            self.profiler = SamplingProfiler(interval_ms=profile_interval_ms)
+            logger.info(f"✓ Sampling profiler ready ({profile_interval_ms} ms interval)")
+
+        if alloc_audit:
+            from myQuant.utils.allocation_audit import AllocationAudit
+            self.alloc_audit = AllocationAudit()
+            logger.info("✓ Allocation audit ready (tracemalloc - latency figures will be inflated)")
     
     def inject_into_trader(self, trader):
         """
@@ -212,6 +258,7 @@ class PerformanceTestHook:
         if self.config.enable_post_convergence and self.post_instrumentor:
             if hasattr(trader, 'strategy') and trader.strategy:
                 if hasattr(trader.strategy, 'instrumentor'):
+                    trader.strategy.instrumentor.close()  # Replaced: stop its sampler thread
                     trader.strategy.instrumentor = self.post_instrumentor
                     # CRITICAL: Enable instrumentation flag so strategy actually uses it
                     trader.strategy.instrumentation_enabled = True
@@ -221,6 +268,11 @@ class PerformanceTestHook:
         if self.config.auto_stop_after_target:
             self._wrap_tick_callback(trader)
         
+        if self.profiler:
+            self.profiler.start()
+        if self.alloc_audit:
+            self.alloc_audit.start()
+        
         self.start_time = datetime.now()
         logger.info(f"🎯 Performance testing active - will collect {self.config.target_ticks} ticks")
     
@@ -236,7 +288,12 @@ class PerformanceTestHook:
         def instrumented_on_tick(tick, symbol):
             """Wrapped callback that monitors tick count"""
             # Call original
+            audit = hook_self.alloc_audit if not hook_self.test_complete else None
+            if audit:
+                audit.begin_tick()
             result = original_on_tick(tick, symbol)
+            if audit:
+                audit.end_tick()
             
             # Track progress
             hook_self.tick_count += 1
@@ -291,6 +348,39 @@ class PerformanceTestHook:
             logger.info("\n--- POST-CONVERGENCE METRICS ---")
             report = self.post_instrumentor.get_baseline_report()
             self._log_report(report)
+
+        # Span trace (Chrome Trace Event JSON) - an empty recorder is falsy (__len__)
+        if self.tracer is not None:
+            self.tracer.detach_logging()
+            try:
+                self.tracer.write(output_dir="results")
+            except OSError as e:
+                logger.error(f"Could not write trace file: {e}")
+
+        # Sampling profile (folded stacks for flamegraphs)
+        if self.profiler:
+            self.profiler.stop()
+            logger.info("\n--- SAMPLING PROFILE ---")
+            idle = self.profiler.idle_totals()
+            for thread_name, count in sorted(self.profiler.thread_totals().items(), key=lambda kv: -kv[1]):
+                logger.info(f"  {thread_name}: {count} samples ({idle.get(thread_name, 0)} idle)")
+            logger.info("  hottest frames (idle waits excluded):")
+            for label, count in self.profiler.top_frames(10):
+                logger.info(f"  {count:6d}  {label}")
+            try:
+                self.profiler.write_folded(output_dir="results")
+            except OSError as e:
+                logger.error(f"Could not write profile file: {e}")
+
+        # Allocation audit (tracemalloc)
+        if self.alloc_audit:
+            logger.info("\n--- ALLOCATION AUDIT ---")
+            self.alloc_audit.stop()
+            self.alloc_audit.log_report()
+            try:
+                self.alloc_audit.export_json(output_dir="results")
+            except OSError as e:
+                logger.error(f"Could not write allocation audit: {e}")
         
         logger.info("="*80 + "\n")
     
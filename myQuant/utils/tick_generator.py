@@ -0,0 +1,266 @@
+"""
+utils/tick_generator.py
+
+Deterministic synthetic tick streams for stress and scaling tests.
+
+Prices follow a geometric Brownian motion with Poisson jumps (and an overnight
+gap between sessions); on top of that the stream carries the irregularities a
+live feed has:
+- volume bursts: runs of ticks arriving within microseconds with inflated volume
+- duplicate timestamps: consecutive ticks with the same exchange time
+- gaps: feed outages with no ticks for gap_min_s..gap_max_s
+- multi-day: `days` weekday sessions (session.start/end times, IST)
+
+Output is generated in fixed blocks of NumPy arrays (epoch ns, price, volume),
+seeded per (seed, day, block), so the same spec always produces the same
+stream and 10^8 ticks never have to be in memory at once. Writers:
+- write_csv()      timestamp,price,volume (load_data_simple, DataSimulator, aTest.csv layout)
+- write_journal()  length-prefixed SmartAPI binary frames (read_frames, scripts/ws_replay_server.py)
+- encode_frames() / frame_packets()  the same frames in memory, per block / per packet
+- to_frame()       DataFrame as load_data_simple returns it (skips CSV parsing)
+- ticks()          core.tick.Tick records for the in-process live path
+
+Usage:
+    gen = SyntheticTickGenerator(SyntheticTickSpec(ticks_per_day=2_000_000, days=5, seed=7))
+    gen.write_csv("stress_10M.csv")
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Iterator, List, NamedTuple
+
+import numpy as np
+
+from core.tick import Tick
+from live.smartapi_binary import (LTP_MODE, QUOTE_MODE, LTP_PACKET_SIZE, QUOTE_PACKET_SIZE)
+from utils.time_utils import IST
+
+BLOCK_TICKS = 1_000_000  # Generation block (fixed: part of the determinism contract)
+_GAP_STREAM = 1 << 30  # RNG stream id for per-day gap placement
+
+# Length-prefixed frames as written by smartapi_binary.write_frames (packed, little endian)
+_LTP_FRAME = np.dtype([('length', '<u4'), ('mode', 'u1'), ('exchange_type', 'u1'), ('token', 'S25'),
+                       ('sequence_number', '<i8'), ('exchange_timestamp', '<i8'), ('ltp', '<i8')])
+_QUOTE_FRAME = np.dtype(_LTP_FRAME.descr + [
+    ('last_traded_quantity', '<i8'), ('average_traded_price', '<i8'), ('volume_for_day', '<i8'),
+    ('total_buy_quantity', '<f8'), ('total_sell_quantity', '<f8'),
+    ('open', '<i8'), ('high', '<i8'), ('low', '<i8'), ('close', '<i8')])
+
+
+@dataclass
+class SyntheticTickSpec:
+    """Shape of a synthetic stream. All rates are per trading day."""
+    ticks_per_day: int = 100_000
+    days: int = 1
+    start_date: date = date(2025, 10, 1)
+    session_start: str = "09:15"
+    session_end: str = "15:30"
+    start_price: float = 200.0
+    daily_volatility: float = 0.04  # Std of the diffusive log return over one session
+    daily_drift: float = 0.0
+    jumps_per_day: float = 5.0
+    jump_std: float = 0.01  # Log-return std of a jump
+    overnight_std: float = 0.02
+    tick_size: float = 0.05
+    lot_size: int = 75
+    mean_lots: float = 2.0
+    bursts_per_day: float = 20.0
+    burst_ticks: int = 200
+    burst_volume_mult: int = 5
+    duplicate_ts_prob: float = 0.05
+    gaps_per_day: int = 2
+    gap_min_s: float = 30.0
+    gap_max_s: float = 300.0
+    seed: int = 42
+
+    def __post_init__(self):
+        if self.ticks_per_day < 1 or self.days < 1:
+            raise ValueError(f"ticks_per_day and days must be >= 1, got {self.ticks_per_day}, {self.days}")
+        if self.start_price <= 0 or self.tick_size <= 0:
+            raise ValueError("start_price and tick_size must be positive")
+        if not 0 <= self.duplicate_ts_prob < 1:
+            raise ValueError(f"duplicate_ts_prob must be in [0, 1), got {self.duplicate_ts_prob}")
+        if self.mean_lots < 1 or self.lot_size < 1:
+            raise ValueError("mean_lots and lot_size must be >= 1")
+        if not 0 <= self.gap_min_s <= self.gap_max_s:
+            raise ValueError(f"Need 0 <= gap_min_s <= gap_max_s, got {self.gap_min_s}, {self.gap_max_s}")
+        session_s = (self._minutes(self.session_end) - self._minutes(self.session_start)) * 60
+        if session_s <= 0:
+            raise ValueError(f"session_end {self.session_end} must be after session_start {self.session_start}")
+        if self.gaps_per_day * self.gap_max_s >= session_s / 2:
+            raise ValueError("Gaps may cover at most half the session (reduce gaps_per_day or gap_max_s)")
+
+    @staticmethod
+    def _minutes(hhmm: str) -> int:
+        hours, minutes = hhmm.split(':')
+        return int(hours) * 60 + int(minutes)
+
+    @property
+    def total_ticks(self) -> int:
+        return self.ticks_per_day * self.days
+
+
+class TickBlock(NamedTuple):
+    ts_ns: np.ndarray  # int64 epoch ns (exchange time)
+    price: np.ndarray  # float64, rounded to tick_size
+    volume: np.ndarray  # int64 last traded quantity
+
+
+class SyntheticTickGenerator:
+    """Block-wise, seeded generator for a SyntheticTickSpec."""
+
+    def __init__(self, spec: SyntheticTickSpec):
+        self.spec = spec
+
+    def trading_days(self) -> Iterator[date]:
+        day, produced = self.spec.start_date, 0
+        while produced < self.spec.days:
+            if day.weekday() < 5:
+                yield day
+                produced += 1
+            day += timedelta(days=1)
+
+    def _session_bounds_ns(self, day: date):
+        s = self.spec
+        start = IST.localize(datetime.combine(day, datetime.min.time()) +
+                             timedelta(minutes=s._minutes(s.session_start)))
+        start_ns = int(start.timestamp()) * 1_000_000_000
+        length_ns = (s._minutes(s.session_end) - s._minutes(s.session_start)) * 60 * 1_000_000_000
+        return start_ns, length_ns
+
+    def blocks(self) -> Iterator[TickBlock]:
+        """Yield the stream as consecutive TickBlocks of at most BLOCK_TICKS ticks."""
+        s = self.spec
+        n = s.ticks_per_day
+        sigma = s.daily_volatility / math.sqrt(n)
+        drift = s.daily_drift / n - 0.5 * sigma * sigma
+        jump_p = min(1.0, s.jumps_per_day / n)
+        log_price = math.log(s.start_price)
+
+        for day_index, day in enumerate(self.trading_days()):
+            start_ns, length_ns = self._session_bounds_ns(day)
+            gap_rng = np.random.default_rng([s.seed, day_index, _GAP_STREAM])
+            gap_len = gap_rng.uniform(s.gap_min_s, s.gap_max_s, s.gaps_per_day) * 1e9
+            active_ns = length_ns - gap_len.sum()
+            gap_at = np.sort(gap_rng.uniform(0, active_ns, s.gaps_per_day))
+            gap_shift = np.concatenate(([0.0], np.cumsum(gap_len)))
+            if day_index:
+                log_price += gap_rng.normal(0.0, s.overnight_std)
+
+            for block_index, first in enumerate(range(0, n, BLOCK_TICKS)):
+                count = min(BLOCK_TICKS, n - first)
+                rng = np.random.default_rng([s.seed, day_index, block_index])
+
+                # Arrival times: exponential spacing, bursts squeezed, duplicates at zero spacing
+                spacing = rng.exponential(1.0, count)
+                bursts = np.zeros(count, dtype=bool)
+                for burst_start in rng.integers(0, count, rng.poisson(s.bursts_per_day * count / n)):
+                    bursts[burst_start:burst_start + s.burst_ticks] = True
+                spacing[bursts] *= 1e-4
+                spacing[rng.random(count) < s.duplicate_ts_prob] = 0.0
+                spacing[0] = 0.0
+                window_start = active_ns * first / n
+                window = active_ns * count / n
+                total = spacing.sum()
+                offsets = window_start + (np.cumsum(spacing) * (window / total) if total else np.zeros(count))
+                offsets += gap_shift[np.searchsorted(gap_at, offsets, side='right')]
+                ts_ns = start_ns + offsets.astype(np.int64)
+
+                # GBM + jumps
+                returns = drift + sigma * rng.standard_normal(count)
+                jumps = rng.random(count) < jump_p
+                returns[jumps] += rng.normal(0.0, s.jump_std, int(jumps.sum()))
+                path = log_price + np.cumsum(returns)
+                log_price = float(path[-1])
+                price = np.maximum(np.round(np.exp(path) / s.tick_size) * s.tick_size, s.tick_size)
+
+                volume = rng.geometric(1.0 / s.mean_lots, count).astype(np.int64) * s.lot_size
+                volume[bursts] *= s.burst_volume_mult
+                yield TickBlock(ts_ns, np.round(price, 2), volume)
+
+    def arrays(self) -> TickBlock:
+        """Whole stream as one TickBlock (mind memory above ~10^7 ticks)."""
+        parts = list(self.blocks())
+        return TickBlock(*(np.concatenate([getattr(p, f) for p in parts]) for f in TickBlock._fields))
+
+    def ticks(self, symbol: str = "SYNTH") -> Iterator[Tick]:
+        """Tick records (timestamp, price, volume, ts_ns, exchange_ts_ns) in stream order."""
+        for block in self.blocks():
+            for ts, price, volume in zip(block.ts_ns.tolist(), block.price.tolist(), block.volume.tolist()):
+                yield Tick(timestamp=datetime.fromtimestamp(ts / 1e9, IST), price=price, volume=volume,
+                           symbol=symbol, ts_ns=ts, exchange_ts_ns=ts)
+
+    def to_frame(self):
+        """DataFrame shaped like load_data_simple(..., process_as_ticks=True) output."""
+        import pandas as pd
+        data = self.arrays()
+        index = pd.DatetimeIndex(data.ts_ns, tz='UTC').tz_convert(IST)
+        df = pd.DataFrame({'price': data.price, 'volume': data.volume}, index=index)
+        df['open'] = df['high'] = df['low'] = df['close'] = df['price']
+        return df
+
+    def write_csv(self, path: str) -> int:
+        """timestamp,price,volume CSV with IST ms timestamps; returns the tick count."""
+        offset_s = int(IST.utcoffset(datetime(2025, 1, 1)).total_seconds())
+        offset = np.timedelta64(offset_s, 's')
+        suffix = f"{'+' if offset_s >= 0 else '-'}{abs(offset_s) // 3600:02d}:{abs(offset_s) % 3600 // 60:02d}"
+        count = 0
+        with open(path, 'w', newline='') as f:
+            f.write("timestamp,price,volume\n")
+            for block in self.blocks():
+                local = block.ts_ns.astype('datetime64[ns]').astype('datetime64[ms]') + offset
+                stamps = np.datetime_as_string(local, unit='ms')
+                f.write(''.join(f"{t.replace('T', ' ')}{suffix},{p:.2f},{v}\n"
+                                for t, p, v in zip(stamps.tolist(), block.price.tolist(), block.volume.tolist())))
+                count += len(stamps)
+        return count
+
+    def write_journal(self, path: str, token: str = "99926000", exchange_type: int = 2,
+                      mode: int = QUOTE_MODE) -> int:
+        """Length-prefixed SmartAPI binary frames (smartapi_binary.read_frames format); returns the count."""
+        count = 0
+        volume_for_day = 0
+        with open(path, 'wb') as f:
+            for block in self.blocks():
+                frames = encode_frames(block, count + 1, token, exchange_type, mode, volume_for_day)
+                if mode == QUOTE_MODE:
+                    volume_for_day = int(frames['volume_for_day'][-1])
+                frames.tofile(f)
+                count += len(frames)
+        return count
+
+
+def frame_packets(records: np.ndarray) -> List[bytes]:
+    """Per-packet bytes of an encode_frames() array, length prefix dropped (what the WebSocket delivers)."""
+    raw, stride = records.tobytes(), records.dtype.itemsize
+    return [raw[i + 4:i + stride] for i in range(0, len(raw), stride)]
+
+
+def encode_frames(block: TickBlock, first_sequence: int = 1, token: str = "99926000", exchange_type: int = 2,
+                  mode: int = QUOTE_MODE, volume_for_day: int = 0) -> np.ndarray:
+    """
+    Length-prefixed packets for a TickBlock as one structured array.
+
+    `.tofile()` / `.tobytes()` gives exactly what smartapi_binary.write_frames writes
+    for encode_packet() frames; each record is [u32 length][packet].
+    """
+    if mode not in (LTP_MODE, QUOTE_MODE):
+        raise ValueError(f"encode_frames supports LTP (1) and Quote (2) packets, got mode {mode}")
+    dtype, size = (_QUOTE_FRAME, QUOTE_PACKET_SIZE) if mode == QUOTE_MODE else (_LTP_FRAME, LTP_PACKET_SIZE)
+    frames = np.zeros(len(block.ts_ns), dtype=dtype)
+    paise = np.round(block.price * 100).astype(np.int64)
+    frames['length'] = size
+    frames['mode'] = mode
+    frames['exchange_type'] = exchange_type
+    frames['token'] = token.encode('ascii')
+    frames['sequence_number'] = np.arange(first_sequence, first_sequence + len(paise))
+    frames['exchange_timestamp'] = block.ts_ns // 1_000_000
+    frames['ltp'] = paise
+    if mode == QUOTE_MODE:
+        frames['last_traded_quantity'] = block.volume
+        frames['average_traded_price'] = paise
+        frames['volume_for_day'] = volume_for_day + np.cumsum(block.volume)
+        for field in ('open', 'high', 'low', 'close'):
+            frames[field] = paise
+    return frames
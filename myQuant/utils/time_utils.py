@@ -31,12 +31,90 @@ DEFAULT_POST_MARKET_CLOSE = time(15, 40)  # 3:40 PM
 
 ISTDateTime = NewType('ISTDateTime', datetime)
 
+# =====================================================
+# CLOCK ABSTRACTION (wall-clock or data-driven replay)
+# =====================================================
+
+class WallClock:
+    """Default clock: reads the system wall clock in IST."""
+
+    def now(self) -> ISTDateTime:
+        return ISTDateTime(datetime.now(IST))
+
+class ReplayClock:
+    """
+    Data-driven clock for file simulation and deterministic replays.
+
+    Time only moves when advance() is called with a data timestamp, so a
+    recorded session can be replayed at full CPU speed while session-end
+    checks and trade timestamps still see the recorded times.
+
+    Timestamps are monotonic: an out-of-order (older) timestamp is ignored.
+    Until the first advance() the clock reports wall-clock time, so objects
+    created before the first tick (e.g. results start time) still get a value.
+    """
+
+    def __init__(self):
+        self._current: Optional[ISTDateTime] = None
+
+    def advance(self, timestamp: datetime) -> ISTDateTime:
+        """Move the clock to the given data timestamp (never backwards)."""
+        ts = normalize_datetime_to_ist(timestamp)
+        if self._current is None or ts > self._current:
+            self._current = ts
+        return self._current
+
+    def now(self) -> ISTDateTime:
+        if self._current is None:
+            return ISTDateTime(datetime.now(IST))
+        return self._current
+
+    @property
+    def started(self) -> bool:
+        """True once at least one data timestamp has been applied."""
+        return self._current is not None
+
+_active_clock = WallClock()
+
+def set_clock(clock) -> None:
+    """
+    Install the clock read by now_ist().
+
+    Args:
+        clock: WallClock, ReplayClock or any object exposing now() -> IST datetime
+    """
+    global _active_clock
+    if not callable(getattr(clock, 'now', None)):
+        raise TypeError(f"Clock must provide a now() method, got {type(clock).__name__}")
+    _active_clock = clock
+
+def get_clock():
+    """Return the currently installed clock."""
+    return _active_clock
+
+def create_clock(mode: str):
+    """
+    Build a clock from the 'live.clock_mode' config value.
+
+    Args:
+        mode: "wall" for the system clock, "replay" for data-driven time
+
+    Returns:
+        WallClock or ReplayClock instance
+    """
+    if mode == "wall":
+        return WallClock()
+    if mode == "replay":
+        return ReplayClock()
+    raise ValueError(f"Invalid clock_mode '{mode}'. Use 'wall' or 'replay' (live.clock_mode in defaults.py)")
+
 def now_ist() -> ISTDateTime:
     """
     SINGLE SOURCE OF TRUTH for current time.
-    Always returns timezone-aware datetime in IST.
+    Always returns timezone-aware datetime in IST, read through the active clock
+    (wall clock by default, data-driven during replays - see set_clock()).
     """
-    return ISTDateTime(datetime.now(IST))
+    return _active_clock.now()
 
 def normalize_datetime_to_ist(dt: datetime) -> ISTDateTime:
     """
@@ -0,0 +1,168 @@
+"""
+utils/trace_export.py
+
+Per-tick span tracing in Chrome Trace Event format (chrome://tracing, ui.perfetto.dev).
+
+TraceRecorder keeps the most recent `capacity` spans in a preallocated ring (older
+spans are overwritten and counted as dropped), so a long session never grows
+memory. Spans are complete events ("ph": "X") with the OS thread id, so the
+WebSocket thread, the trading thread and the log listener appear as separate
+tracks and individual slow ticks can be inspected with their interleavings.
+
+Spans come from the existing instrumentors once a recorder is attached:
+- PreConvergenceInstrumentor.tracer: websocket / broker / trader layer totals and
+  their measured components (binary_decode, queue_ops, session_check,
+  strategy_call, signal_handling, position_mgmt, logging, ...)
+- PerformanceInstrumentor.tracer: strategy tick, indicator stages
+  (indicator_update, indicator_ema, ...) and signal_eval
+- attach_logging(): one "logging.<Handler>" span per record a handler handles -
+  the root logger's handlers on the calling thread (with async logging that is
+  the enqueue) and, with async logging, the file/console/GUI handlers on the
+  QueueListener thread (utils.logger.get_emitting_handlers)
+
+Usage:
+    tracer = TraceRecorder(capacity=200000)
+    pre_instrumentor.tracer = tracer
+    strategy.instrumentor.tracer = tracer
+    ...
+    tracer.attach_logging()
+    ...
+    tracer.detach_logging()
+    tracer.write("results/trace_20250101.json")
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from utils.logger import get_emitting_handlers
+
+logger = logging.getLogger(__name__)
+
+_perf_ns = time.perf_counter_ns
+_native_id = threading.get_native_id
+
+
+class TraceRecorder:
+    """Bounded ring of complete spans (name, category, start_ns, duration_ns, tid)."""
+
+    def __init__(self, capacity: int = 200000):
+        if capacity <= 0:
+            raise ValueError(f"Trace capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self._events = [None] * capacity
+        self._next = 0  # Total spans recorded (ring index = _next % capacity)
+        self._thread_names: Dict[int, str] = {}
+        self._origin_ns = _perf_ns()
+        self._lock = threading.Lock()  # Spans arrive from several threads
+        self._traced_handlers = []
+
+    def complete(self, name: str, category: str, start_ns: int, end_ns: int) -> None:
+        """Record a finished span measured on the perf_counter_ns clock."""
+        tid = _native_id()
+        with self._lock:
+            if tid not in self._thread_names:  # Under the lock: to_trace_events iterates it
+                self._thread_names[tid] = threading.current_thread().name
+            self._events[self._next % self.capacity] = (name, category, start_ns, end_ns - start_ns, tid)
+            self._next += 1
+
+    def span(self, name: str, category: str = "app") -> "_TraceSpan":
+        """Context manager recording one span (allocates; use complete() on hot paths)."""
+        return _TraceSpan(self, name, category)
+
+    def attach_logging(self, target: Optional[logging.Logger] = None) -> None:
+        """
+        Trace every record handled by the handlers of `target`.
+
+        Default: the root logger's handlers plus, when async logging is on, the
+        handlers on the QueueListener thread (where records are actually written).
+        Handlers added later (e.g. add_log_handler) are not traced.
+        """
+        handlers = list(target.handlers) if target is not None else \
+            list(logging.getLogger().handlers) + get_emitting_handlers()
+        for handler in handlers:
+            if handler in self._traced_handlers:
+                continue
+            name = f"logging.{type(handler).__name__}"
+            handle = handler.handle
+
+            def traced_handle(record, _handle=handle, _name=name):
+                start = _perf_ns()
+                try:
+                    return _handle(record)
+                finally:
+                    self.complete(_name, 'logging', start, _perf_ns())
+
+            handler.handle = traced_handle  # Instance attribute shadows the class method
+            self._traced_handlers.append(handler)
+
+    def detach_logging(self) -> None:
+        """Restore handlers wrapped by attach_logging()."""
+        for handler in self._traced_handlers:
+            handler.__dict__.pop('handle', None)
+        self._traced_handlers = []
+
+    @property
+    def dropped(self) -> int:
+        """Spans overwritten because the ring was full."""
+        return max(0, self._next - self.capacity)
+
+    def __len__(self) -> int:
+        return min(self._next, self.capacity)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events = [None] * self.capacity
+            self._next = 0
+
+    def to_trace_events(self) -> Dict:
+        """Chrome Trace Event JSON object (oldest span first)."""
+        with self._lock:
+            count = min(self._next, self.capacity)
+            start = self._next - count
+            events = [self._events[i % self.capacity] for i in range(start, self._next)]
+            thread_names = list(self._thread_names.items())
+        pid = os.getpid()
+        trace = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "myQuant"}}]
+        for tid, tname in thread_names:
+            trace.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": tname}})
+        origin = self._origin_ns
+        for name, category, start_ns, dur_ns, tid in events:
+            trace.append({"name": name, "cat": category, "ph": "X", "pid": pid, "tid": tid,
+                          "ts": (start_ns - origin) / 1000.0, "dur": dur_ns / 1000.0})
+        return {"traceEvents": trace, "displayTimeUnit": "ns",
+                "otherData": {"spans": count, "dropped": self.dropped, "capacity": self.capacity}}
+
+    def write(self, path: Optional[str] = None, output_dir: str = "results") -> str:
+        """Write the trace JSON; default path results/trace_<timestamp>.json. Returns the path."""
+        if path is None:
+            os.makedirs(output_dir, exist_ok=True)
+            path = os.path.join(output_dir, f"trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        data = self.to_trace_events()
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        logger.info(f"Trace written to {path} ({data['otherData']['spans']} spans, "
+                    f"{data['otherData']['dropped']} dropped) - open in ui.perfetto.dev or chrome://tracing")
+        return path
+
+
+class _TraceSpan:
+    __slots__ = ('_recorder', '_name', '_category', '_start')
+
+    def __init__(self, recorder: TraceRecorder, name: str, category: str):
+        self._recorder = recorder
+        self._name = name
+        self._category = category
+        self._start = 0
+
+    def __enter__(self):
+        self._start = _perf_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._recorder.complete(self._name, self._category, self._start, _perf_ns())
+        return False
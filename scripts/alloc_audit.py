@@ -0,0 +1,149 @@
+"""
+Per-tick allocation audit of the live hot path, gated against a stored budget.
+
+Decodes replay ticks (binary SmartAPI packets, as the WebSocket fast path does)
+and feeds them through BrokerAdapter._handle_websocket_tick -> LiveTrader._on_tick_direct
+(strategy + position manager) in-process, with utils.allocation_audit.AllocationAudit
+around each tick. No network, no broker login.
+
+Ticks run on a ReplayClock advanced to each packet's exchange time, so the
+strategy sees in-session times whatever the wall clock says (the default
+synthetic stream, utils.tick_generator, stays inside 09:30-14:30 IST - no
+session-end exits). A recorded --source replays its own times.
+
+Reports peak/net bytes per tick and the lines in liveStrategy / trader /
+broker_adapter / position_manager that keep allocations alive - including
+memory allocated in the indicators/pandas/helpers they call - then compares
+with the budget file (scripts/fixtures/alloc_budget.json). Exits 1 on a budget
+violation.
+
+Usage:
+    python scripts/alloc_audit.py [--ticks 20000] [--warmup 2000] [--source ticks.csv]
+    python scripts/alloc_audit.py --update-budget      # accept current figures as the budget
+"""
+import sys
+import json
+import struct
+import argparse
+from pathlib import Path
+from datetime import datetime
+
+# Add project root and myQuant to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "myQuant"))
+
+from utils.allocation_audit import AllocationAudit, budget_from_report, check_budget
+from live.broker_adapter import BrokerAdapter
+from live.trader import LiveTrader
+from live.smartapi_binary import BinaryTickDecoder
+from utils.benchmark import local_feed_config
+from utils.tick_generator import SyntheticTickGenerator, SyntheticTickSpec, encode_frames, frame_packets
+from utils.time_utils import IST, ReplayClock, WallClock, set_clock
+from ws_replay_server import load_source
+
+DEFAULT_BUDGET = project_root / "scripts" / "fixtures" / "alloc_budget.json"
+_EXCHANGE_TS = struct.Struct('<q')  # Packet offset 35: exchange timestamp (epoch ms)
+
+
+def synthetic_frames(count: int, token: str, seed: int = 42):
+    """Quote packets for one in-session day (09:30-14:30 IST) of seeded synthetic ticks."""
+    gen = SyntheticTickGenerator(SyntheticTickSpec(ticks_per_day=count, session_start="09:30",
+                                                   session_end="14:30", seed=seed))
+    frames = []
+    for block in gen.blocks():
+        frames.extend(frame_packets(encode_frames(block, len(frames) + 1, token=token)))
+    return frames
+
+
+def exchange_time(frame: bytes) -> datetime:
+    return datetime.fromtimestamp(_EXCHANGE_TS.unpack_from(frame, 35)[0] / 1000.0, IST)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-tick allocation audit with budget gate")
+    parser.add_argument("--source", default=None, help="Tick CSV or .bin frame recording (default: synthetic)")
+    parser.add_argument("--ticks", type=int, default=20000, help="Audited ticks")
+    parser.add_argument("--warmup", type=int, default=2000, help="Untraced ticks first (indicator warm-up, caches)")
+    parser.add_argument("--token", default="99926000")
+    parser.add_argument("--exchange", default="NFO")
+    parser.add_argument("--budget", default=str(DEFAULT_BUDGET))
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative excess over budget")
+    parser.add_argument("--update-budget", action="store_true", help="Write this run's figures as the budget")
+    args = parser.parse_args()
+
+    frames = load_source(args.source, token=args.token) if args.source else \
+        synthetic_frames(args.warmup + args.ticks, args.token)
+    if len(frames) <= args.warmup:
+        print(f"ERROR: source has {len(frames)} ticks, need more than --warmup {args.warmup}")
+        return 1
+
+    config = local_feed_config(args.token, args.exchange)
+    broker = BrokerAdapter(config)
+    trader = LiveTrader(frozen_config=config, broker=broker)
+    trader.prepare_session()  # start() would log in and run its own loop
+    broker.on_tick_callback = trader._on_tick_direct
+    decoder = BinaryTickDecoder()
+    handle_tick = broker._handle_websocket_tick
+    clock = ReplayClock()
+    set_clock(clock)  # After BrokerAdapter(), which installs its own (wall) clock
+
+    try:
+        for frame in frames[:args.warmup]:
+            clock.advance(exchange_time(frame))
+            tick = decoder.decode(frame)
+            handle_tick(tick, tick.symbol)
+
+        audit = AllocationAudit()
+        audit.start()
+        for frame in frames[args.warmup:args.warmup + args.ticks]:
+            clock.advance(exchange_time(frame))
+            tick = decoder.decode(frame)
+            audit.begin_tick()
+            handle_tick(tick, tick.symbol)
+            audit.end_tick()
+        report = audit.stop()
+    finally:
+        set_clock(WallClock())
+
+    peak, net = report['peak_bytes_per_tick'], report['net_bytes_per_tick']
+    print("=" * 80)
+    print(f"ALLOCATION AUDIT - {report['ticks']:,} ticks after {args.warmup:,} warm-up")
+    print("=" * 80)
+    print(f"  peak bytes/tick   p50 {peak['p50']:,}  p90 {peak['p90']:,}  p99 {peak['p99']:,}  max {peak['max']:,}")
+    print(f"  net bytes/tick    mean {net['mean']:,.1f}  max {net['max']:,}")
+    print(f"  replay time {exchange_time(frames[0]):%Y-%m-%d %H:%M:%S} -> {clock.now():%H:%M:%S} IST, "
+          f"{len(trader.position_manager.completed_trades)} trades closed")
+    print("\n  Retained per tick by module:")
+    for module, entry in report['modules'].items():
+        print(f"    {module:22s} {entry['bytes_per_tick']:10.1f} B  {entry['blocks_per_tick']:8.3f} blocks")
+    print("\n  Top lines:")
+    for entry in report['top_lines'][:15]:
+        via = f"  via {entry['via']}" if entry['via'] else ""
+        print(f"    {entry['line']:40s} {entry['bytes_per_tick']:10.1f} B  {entry['blocks_per_tick']:8.3f} blocks{via}")
+    print(f"\n✓ Report saved: {audit.export_json(str(project_root / 'results'))}")
+
+    budget_path = Path(args.budget)
+    if args.update_budget:
+        budget_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(budget_path, 'w') as f:
+            json.dump(budget_from_report(report), f, indent=2)
+        print(f"✓ Budget updated: {budget_path}")
+        return 0
+    if not budget_path.exists():
+        print(f"⚠️  No budget at {budget_path} - run with --update-budget to create one")
+        return 0
+    with open(budget_path) as f:
+        budget = json.load(f)
+    violations = check_budget(report, budget, tolerance=args.tolerance)
+    if violations:
+        print(f"\n✗ ALLOCATION BUDGET EXCEEDED ({budget_path.name}, tolerance {args.tolerance:.0%}):")
+        for v in violations:
+            print(f"    {v}")
+        return 1
+    print(f"\n✓ Within allocation budget ({budget_path.name}, tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+PerformanceInstrumentor overhead microbenchmark.
+
+Measures what instrumentation adds to the code it measures:
+  1. span    - one `with instrumentor.measure(name):` around an empty body
+  2. tick    - one start_tick()/end_tick() pair (no spans)
+  3. record  - record_measurement(name, ms) (external timing fed in)
+
+Each figure is net of the empty-loop cost, best of --repeat runs. Exits non-zero
+when the span cost exceeds --budget-us (default 1.0 us).
+
+Usage:
+    python scripts/bench_instrumentor.py [--spans 200000] [--repeat 7] [--budget-us 1.0]
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add project root and myQuant to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "myQuant"))
+
+from utils.performance_metrics import PerformanceInstrumentor
+
+
+def best_ns(fn, n: int, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        fn(n)
+        best = min(best, (time.perf_counter_ns() - start) / n)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PerformanceInstrumentor overhead microbenchmark")
+    parser.add_argument("--spans", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--budget-us", type=float, default=1.0)
+    args = parser.parse_args()
+
+    inst = PerformanceInstrumentor(window_size=1000)
+    inst.start_tick()
+
+    def empty(n):
+        for _ in range(n):
+            pass
+
+    def spans(n):
+        measure = inst.measure
+        for _ in range(n):
+            with measure('indicator_update'):
+                pass
+
+    def ticks(n):
+        for _ in range(n):
+            inst.start_tick()
+            inst.end_tick()
+
+    def records(n):
+        for _ in range(n):
+            inst.record_measurement('signal_eval', 0.01)
+
+    loop = best_ns(empty, args.spans, args.repeat)
+    span = best_ns(spans, args.spans, args.repeat) - loop
+    tick = best_ns(ticks, args.spans // 10, args.repeat) - loop
+    record = best_ns(records, args.spans, args.repeat) - loop
+    inst.close()
+
+    print("=" * 80)
+    print(f"INSTRUMENTOR OVERHEAD - best of {args.repeat}, net of empty loop ({loop:.0f} ns)")
+    print("=" * 80)
+    print(f"  measured span (with measure())   {span:8.0f} ns")
+    print(f"  start_tick + end_tick            {tick:8.0f} ns")
+    print(f"  record_measurement()             {record:8.0f} ns")
+    ok = span <= args.budget_us * 1000
+    print(f"  span budget {args.budget_us:.2f} us: {'✓ PASS' if ok else '✗ FAIL'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+Throughput scaling of the live pipeline and the backtester on synthetic ticks.
+
+For each stream size (utils.tick_generator, seeded - identical streams every run):
+  generate   SyntheticTickGenerator blocks (NumPy)
+  decode     SmartAPI binary frames -> Tick via BinaryTickDecoder (live fast path)
+  on_tick    decoded ticks through ModularIntradayStrategy.on_tick (--strategy), restamped
+             with the generator's session times so the in-session path is measured
+  backtest   BacktestRunner.run() on the stream written as CSV (--backtest, up to --backtest-max)
+
+Reports ticks/s per stage and size; flat ticks/s across sizes means linear scaling,
+a falling figure points at super-linear cost (growing lists, O(n) lookups, memory).
+Logging is disabled while a size runs, as in bench_suite.py.
+
+Usage:
+    python scripts/bench_scaling.py --sizes 1e6,1e7
+    python scripts/bench_scaling.py --sizes 1e6,1e7,1e8 --strategy --backtest --backtest-max 1e7
+"""
+import sys
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import datetime
+
+# Add project root and myQuant to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "myQuant"))
+
+from utils.tick_generator import SyntheticTickGenerator, SyntheticTickSpec, encode_frames, frame_packets
+from live.smartapi_binary import BinaryTickDecoder
+from utils.benchmark import frozen_default_config, quiet_logging
+from utils.time_utils import IST
+
+
+def spec_for(total: int, ticks_per_day: int, seed: int) -> SyntheticTickSpec:
+    days = max(1, -(-total // ticks_per_day))
+    return SyntheticTickSpec(ticks_per_day=-(-total // days), days=days, seed=seed)
+
+
+def run_size(total: int, args, tmp: str):
+    spec = spec_for(total, args.ticks_per_day, args.seed)
+    gen = SyntheticTickGenerator(spec)
+    row = {'ticks': spec.total_ticks, 'days': spec.days}
+
+    started = time.perf_counter()
+    for _ in gen.blocks():
+        pass
+    row['generate_tps'] = spec.total_ticks / (time.perf_counter() - started)
+
+    strategy = None
+    if args.strategy:
+        from core.liveStrategy import ModularIntradayStrategy
+        strategy = ModularIntradayStrategy(frozen_default_config())
+
+    decode = BinaryTickDecoder().decode
+    decode_s = strategy_s = 0.0
+    seq = 1
+    for block in gen.blocks():
+        frames = frame_packets(encode_frames(block, seq))
+        seq += len(frames)
+        started = time.perf_counter()
+        ticks = [decode(frame) for frame in frames]
+        decode_s += time.perf_counter() - started
+        if strategy is not None:
+            # The decoder stamps receive (wall-clock) time; the strategy must see session time
+            for tick, ts in zip(ticks, block.ts_ns.tolist()):
+                tick.timestamp = datetime.fromtimestamp(ts / 1e9, IST)
+                tick.ts_ns = ts
+            on_tick = strategy.on_tick
+            started = time.perf_counter()
+            for tick in ticks:
+                on_tick(tick)
+            strategy_s += time.perf_counter() - started
+    row['decode_tps'] = spec.total_ticks / decode_s
+    if strategy is not None:
+        row['on_tick_tps'] = spec.total_ticks / strategy_s
+
+    if args.backtest and spec.total_ticks <= args.backtest_max:
+        from backtest.backtest_runner import BacktestRunner
+        csv_path = str(Path(tmp) / f"synthetic_{spec.total_ticks}.csv")
+        gen.write_csv(csv_path)
+        config = frozen_default_config(results_dir=tmp)
+        started = time.perf_counter()
+        BacktestRunner(config=config, data_path=csv_path).run()
+        row['backtest_tps'] = spec.total_ticks / (time.perf_counter() - started)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput scaling on synthetic tick streams")
+    parser.add_argument("--sizes", default="1e6,1e7", help="Comma-separated tick counts (e.g. 1e6,1e7,1e8)")
+    parser.add_argument("--ticks-per-day", type=int, default=2_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--strategy", action="store_true", help="Include strategy.on_tick (needs pandas)")
+    parser.add_argument("--backtest", action="store_true", help="Include BacktestRunner on the CSV form")
+    parser.add_argument("--backtest-max", type=float, default=1e7, help="Largest size to backtest")
+    args = parser.parse_args()
+    sizes = [int(float(s)) for s in args.sizes.split(',') if s.strip()]
+
+    print("=" * 80)
+    print(f"THROUGHPUT SCALING - sizes {', '.join(f'{s:,}' for s in sizes)}")
+    print("=" * 80)
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="scaling_") as tmp:
+        for size in sizes:
+            with quiet_logging():
+                row = run_size(size, args, tmp)
+            rows.append(row)
+            stages = "  ".join(f"{k[:-4]} {v:,.0f}/s" for k, v in row.items() if k.endswith('_tps'))
+            print(f"  {row['ticks']:>12,} ticks ({row['days']} days): {stages}")
+
+    base = rows[0]
+    for row in rows[1:]:
+        row['relative_to_smallest'] = {k: round(v / base[k], 3) for k, v in row.items()
+                                       if k.endswith('_tps') and k in base}
+    results_dir = project_root / "results"
+    results_dir.mkdir(exist_ok=True)
+    out = results_dir / f"bench_scaling_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(out, 'w') as f:
+        json.dump({'timestamp': datetime.now().isoformat(), 'seed': args.seed, 'rows': rows}, f, indent=2)
+    print(f"✓ Report saved: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,341 @@
+"""
+Benchmark suite with machine-tagged baselines and regression gates.
+
+One run covers the whole pipeline (replaces ad-hoc comparisons of the
+run_phase1* / test_live_performance JSON files):
+
+  data_load               load_data_simple(aTest.csv)
+  indicators_batch        calculate_ema/macd/vwap/atr over the loaded frame
+  indicators_incremental  IncrementalEMA/MACD/VWAP/ATR update per tick
+  on_tick                 ModularIntradayStrategy.on_tick latency per tick
+  backtest                BacktestRunner.run() on aTest.csv (incl. Excel export)
+  position_manager        open/close cycles and process_price with an open position
+  results_export          Results.export_to_csv / export_to_excel, synthetic trades
+  ws_decode               BinaryTickDecoder per packet
+  instrumentor            PerformanceInstrumentor span overhead
+
+Every metric is compared with the baseline stored for this machine
+(scripts/fixtures/bench_baselines/<machine tag>.json - run --update-baseline
+once per reference machine). The tag hashes CPU model/count, Python and
+numpy/pandas versions, and a baseline whose stored machine info differs from
+this machine is refused (exit 2) rather than compared. Only commit baselines
+from named reference machines, not from throwaway VMs or containers.
+Logging is disabled while benchmarks run: timings measure the code, not log I/O. A metric that moved the
+wrong way by more than --threshold (relative, default 15%) is a regression and
+the suite exits 1. Benchmarks whose dependencies are missing are skipped.
+
+Usage:
+    python scripts/bench_suite.py                       # run all, gate against baseline
+    python scripts/bench_suite.py --only on_tick,ws_decode
+    python scripts/bench_suite.py --update-baseline     # accept this run as the baseline
+"""
+import sys
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+
+# Add project root and myQuant to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "myQuant"))
+
+from utils.benchmark import (BaselineMismatch, BenchMetric, BaselineStore, best_of, compare_to_baseline,
+                             frozen_default_config, git_commit, machine_tag, percentiles_us, quiet_logging)
+
+DEFAULT_DATA = project_root / "aTest.csv"
+DEFAULT_BASELINES = project_root / "scripts" / "fixtures" / "bench_baselines"
+
+
+def load_frame(ctx):
+    if 'frame' not in ctx:
+        from utils.simple_loader import load_data_simple
+        ctx['frame'] = load_data_simple(str(ctx['data']), process_as_ticks=True)
+    return ctx['frame']
+
+
+def load_ticks(ctx):
+    """Tick records for the first --ticks rows of the data file."""
+    if 'ticks' not in ctx:
+        from core.tick import Tick
+        df = load_frame(ctx).iloc[:ctx['args'].ticks]
+        ctx['ticks'] = [Tick(timestamp=ts.to_pydatetime(), price=float(price), volume=int(volume), ts_ns=ts.value)
+                        for ts, price, volume in zip(df.index, df['close'], df['volume'])]
+    return ctx['ticks']
+
+
+# ---- Benchmarks: fn(ctx) -> List[BenchMetric] ----
+
+def bench_data_load(ctx):
+    from utils.simple_loader import load_data_simple
+    rows = []
+    seconds = best_of(lambda: rows.append(len(load_data_simple(str(ctx['data']), process_as_ticks=True))),
+                      ctx['args'].repeat)
+    return [BenchMetric('data_load.seconds', seconds, 's'),
+            BenchMetric('data_load.rows_per_s', rows[-1] / seconds, 'rows/s', higher_is_better=True)]
+
+
+def bench_indicators_batch(ctx):
+    import core.indicators as ind
+    df = load_frame(ctx)
+    close, high, low, volume = df['close'], df['high'], df['low'], df['volume']
+
+    def run():
+        ind.calculate_ema(close, 9)
+        ind.calculate_ema(close, 21)
+        ind.calculate_macd(close)
+        ind.calculate_vwap(high, low, close, volume)
+        ind.calculate_atr(high, low, close)
+    seconds = best_of(run, ctx['args'].repeat)
+    return [BenchMetric('indicators_batch.seconds', seconds, 's'),
+            BenchMetric('indicators_batch.ns_per_row', seconds * 1e9 / len(df), 'ns')]
+
+
+def bench_indicators_incremental(ctx):
+    from core.indicators import IncrementalEMA, IncrementalMACD, IncrementalVWAP, IncrementalATR
+    df = load_frame(ctx)
+    prices = df['close'].tolist()
+    volumes = df['volume'].tolist()
+
+    def run():
+        fast, slow, macd, vwap, atr = IncrementalEMA(9), IncrementalEMA(21), IncrementalMACD(), IncrementalVWAP(), IncrementalATR()
+        for price, volume in zip(prices, volumes):
+            fast.update(price)
+            slow.update(price)
+            macd.update(price)
+            vwap.update(price, volume)
+            atr.update(price, price, price)
+    seconds = best_of(run, ctx['args'].repeat)
+    return [BenchMetric('indicators_incremental.ns_per_tick', seconds * 1e9 / len(prices), 'ns')]
+
+
+def bench_on_tick(ctx):
+    from core.liveStrategy import ModularIntradayStrategy
+    ticks = load_ticks(ctx)
+    strategy = ModularIntradayStrategy(frozen_default_config())
+    on_tick = strategy.on_tick
+    warmup = min(len(ticks) // 10, 1000)
+    for tick in ticks[:warmup]:
+        on_tick(tick)
+    samples = []
+    clock = time.perf_counter_ns
+    for tick in ticks[warmup:]:
+        start = clock()
+        on_tick(tick)
+        samples.append(clock() - start)
+    stats = percentiles_us(samples)
+    return [BenchMetric('on_tick.p50_us', stats['p50'], 'us'),
+            BenchMetric('on_tick.p99_us', stats['p99'], 'us', threshold=0.30),
+            BenchMetric('on_tick.mean_us', stats['mean'], 'us')]
+
+
+def bench_backtest(ctx):
+    from backtest.backtest_runner import BacktestRunner
+    config = frozen_default_config(results_dir=ctx['tmp'])
+    seconds = best_of(lambda: BacktestRunner(config=config, data_path=str(ctx['data'])).run(),
+                      ctx['args'].backtest_repeat)
+    return [BenchMetric('backtest.seconds', seconds, 's')]
+
+
+def bench_position_manager(ctx):
+    from core.position_manager import PositionManager
+    ticks = load_ticks(ctx)
+    pm = PositionManager(frozen_default_config())
+
+    def cycles():
+        for tick in ticks[:1000]:
+            position_id = pm.open_position("BENCH", tick.price, tick.timestamp)
+            if position_id:
+                pm.close_position_full(position_id, tick.price + 1.0, tick.timestamp, "Strategy Exit")
+    cycle_s = best_of(cycles, ctx['args'].repeat)
+
+    pm.reset()
+    entry = ticks[0]
+    pm.open_position("BENCH", entry.price, entry.timestamp)
+    process_price = pm.process_price
+    # Live callers always pass the tick's datetime along with ts_ns
+    flat = [(entry.price + (0.05 if i % 2 else -0.05), tick.ts_ns, tick.timestamp) for i, tick in enumerate(ticks)]
+
+    def prices():
+        for price, ts_ns, timestamp in flat:
+            process_price(price, ts_ns, timestamp)
+    price_s = best_of(prices, ctx['args'].repeat)
+    return [BenchMetric('position_manager.open_close_per_s', 1000 / cycle_s, 'cycles/s', higher_is_better=True),
+            BenchMetric('position_manager.process_price_ns', price_s * 1e9 / len(flat), 'ns')]
+
+
+def bench_results_export(ctx):
+    import pandas as pd
+    from backtest.results import Results
+    start = datetime(2025, 10, 1, 9, 20)
+    trades = [{'entry_time': start + timedelta(minutes=i), 'exit_time': start + timedelta(minutes=i, seconds=40),
+               'entry_price': 200.0 + i % 17, 'exit_price': 200.0 + i % 17 + (3 if i % 3 else -5),
+               'quantity': 75, 'pnl': 75 * (3 if i % 3 else -5), 'commission': 40.0,
+               'exit_reason': 'Take Profit' if i % 3 else 'Stop Loss'} for i in range(ctx['args'].trades)]
+
+    def build():
+        results = Results(100000.0)
+        results.set_config(frozen_default_config())
+        for trade in trades:
+            results.add_trade(trade)
+        return results
+    frame = pd.DataFrame(trades)
+
+    def ingest():
+        results = Results(100000.0)
+        results.add_trades(frame)
+        results.calculate_metrics()
+    ingest_s = best_of(ingest, ctx['args'].repeat)
+    csv_s = best_of(lambda: build().export_to_csv(output_dir=ctx['tmp']), ctx['args'].repeat)
+    excel_s = best_of(lambda: build().export_to_excel(output_dir=ctx['tmp']), ctx['args'].backtest_repeat)
+    streamed_s = best_of(lambda: build().export_to_excel(output_dir=ctx['tmp'], write_only=True),
+                         ctx['args'].backtest_repeat)
+    return [BenchMetric('results_export.ingest_metrics_seconds', ingest_s, 's'),
+            BenchMetric('results_export.csv_seconds', csv_s, 's'),
+            BenchMetric('results_export.excel_seconds', excel_s, 's'),
+            BenchMetric('results_export.excel_write_only_seconds', streamed_s, 's')]
+
+
+def bench_ws_decode(ctx):
+    from live.smartapi_binary import BinaryTickDecoder, read_frames
+    frames = list(read_frames(str(project_root / "scripts" / "fixtures" / "smartapi_quote_frames.bin")))
+    decode = BinaryTickDecoder().decode
+    batch = frames * max(1, 100000 // len(frames))
+
+    def run():
+        for frame in batch:
+            decode(frame)
+    seconds = best_of(run, ctx['args'].repeat)
+    return [BenchMetric('ws_decode.ns_per_packet', seconds * 1e9 / len(batch), 'ns')]
+
+
+def bench_instrumentor(ctx):
+    from utils.performance_metrics import PerformanceInstrumentor
+    inst = PerformanceInstrumentor(window_size=1000)
+    inst.start_tick()
+    n = 200000
+
+    def run():
+        measure = inst.measure
+        for _ in range(n):
+            with measure('indicator_update'):
+                pass
+    seconds = best_of(run, ctx['args'].repeat)
+    inst.close()
+    return [BenchMetric('instrumentor.span_ns', seconds * 1e9 / n, 'ns')]
+
+
+BENCHMARKS = {
+    'data_load': bench_data_load,
+    'indicators_batch': bench_indicators_batch,
+    'indicators_incremental': bench_indicators_incremental,
+    'on_tick': bench_on_tick,
+    'backtest': bench_backtest,
+    'position_manager': bench_position_manager,
+    'results_export': bench_results_export,
+    'ws_decode': bench_ws_decode,
+    'instrumentor': bench_instrumentor,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite with machine-tagged baselines")
+    parser.add_argument("--only", default="", help=f"Comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--data", default=str(DEFAULT_DATA), help="Tick CSV (timestamp, price, volume)")
+    parser.add_argument("--ticks", type=int, default=20000, help="Ticks for on_tick / position_manager")
+    parser.add_argument("--trades", type=int, default=500, help="Synthetic trades for results_export")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeats per timing (best is kept)")
+    parser.add_argument("--backtest-repeat", type=int, default=1, help="Repeats for backtest / Excel export")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Relative regression threshold")
+    parser.add_argument("--baseline-dir", default=str(DEFAULT_BASELINES))
+    parser.add_argument("--machine", default=None, help="Baseline tag (default: this machine)")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the baseline")
+    args = parser.parse_args()
+
+    selected = [name.strip() for name in args.only.split(',') if name.strip()] or list(BENCHMARKS)
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        print(f"ERROR: unknown benchmark(s) {unknown}; choose from {list(BENCHMARKS)}")
+        return 2
+
+    tag = args.machine or machine_tag()
+    store = BaselineStore(args.baseline_dir)
+    baseline = store.load(tag)
+    if not args.update_baseline:
+        try:
+            compare_to_baseline([], baseline)
+        except BaselineMismatch as e:
+            print(f"ERROR: {e}")
+            print("Run with --update-baseline to record a baseline for this machine")
+            return 2
+
+    print("=" * 80)
+    print(f"BENCHMARK SUITE - machine {tag} - baseline {'found' if baseline else 'none'}")
+    print("=" * 80)
+
+    metrics, skipped, errors = [], {}, {}
+    with tempfile.TemporaryDirectory(prefix="bench_") as tmp:
+        ctx = {'args': args, 'data': Path(args.data), 'tmp': tmp}
+        for name in selected:
+            started = time.perf_counter()
+            try:
+                with quiet_logging():
+                    produced = BENCHMARKS[name](ctx)
+            except ImportError as e:
+                skipped[name] = str(e)
+                print(f"  - {name:24s} skipped ({e})")
+                continue
+            except Exception as e:
+                errors[name] = f"{type(e).__name__}: {e}"
+                print(f"  ✗ {name:24s} error: {errors[name]}")
+                continue
+            metrics.extend(produced)
+            print(f"  ✓ {name:24s} {time.perf_counter() - started:6.1f}s")
+
+    rows = compare_to_baseline(metrics, baseline, args.threshold)
+    print(f"\n  {'metric':40s} {'value':>14s} {'baseline':>14s} {'change':>8s}  status")
+    for row in rows:
+        base = f"{row.baseline:,.3f}" if row.baseline is not None else "-"
+        change = f"{row.change:+.1%}" if row.change is not None else "-"
+        print(f"  {row.name:40s} {row.value:14,.3f} {base:>14s} {change:>8s}  {row.status} ({row.unit})")
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'machine': tag,
+        'commit': git_commit(str(project_root)),
+        'threshold': args.threshold,
+        'metrics': {row.name: {'value': row.value, 'baseline': row.baseline, 'unit': row.unit,
+                               'change': row.change, 'status': row.status} for row in rows},
+        'skipped': skipped,
+        'errors': errors,
+    }
+    results_dir = project_root / "results"
+    results_dir.mkdir(exist_ok=True)
+    out = results_dir / f"bench_suite_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✓ Report saved: {out}")
+
+    if args.update_baseline:
+        if errors:
+            print("✗ Not updating baseline: some benchmarks failed")
+            return 1
+        if metrics:
+            print(f"✓ Baseline updated: {store.save(tag, metrics, report['commit'])}")
+        return 0
+
+    regressions = [row for row in rows if row.status == 'regression']
+    if regressions or errors:
+        print(f"\n✗ {len(regressions)} regression(s) beyond threshold, {len(errors)} error(s)")
+        return 1
+    if baseline is None:
+        print("⚠️  No baseline for this machine - run with --update-baseline to create one")
+    else:
+        print(f"\n✓ No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
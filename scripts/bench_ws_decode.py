@@ -0,0 +1,155 @@
+"""
+WebSocket tick decode microbenchmark (SmartWebSocketV2 binary packets).
+
+Compares per-tick decode cost of:
+  1. legacy path  - SmartWebSocketV2._parse_binary_data into a dict, then the real
+                    WebSocketTickStreamer._on_data (dict -> Tick)
+  2. fast path    - live.smartapi_binary.BinaryTickDecoder (precompiled struct -> Tick)
+
+Frames come from a recorded feed capture (length-prefixed binary frames): set
+live.ws_record_frames to scripts/fixtures/smartapi_recorded_frames.bin for a
+session and the streamer appends every tick frame it receives. Without a
+capture the bench falls back to the synthetic fixture (--build-fixture encodes
+one from a recorded tick CSV) and says so - its packets only carry LTP,
+quantity and exchange time, so numbers from it are indicative only.
+
+Requires smartapi-python (the legacy path runs the library's own parser).
+
+Usage:
+    python scripts/bench_ws_decode.py [--fixture PATH] [--repeat 20]
+    python scripts/bench_ws_decode.py --build-fixture
+"""
+import sys
+import csv
+import time
+import logging
+import argparse
+from pathlib import Path
+from datetime import datetime
+
+# Add project root and myQuant to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "myQuant"))
+
+from core.tick import Tick
+from live.smartapi_binary import BinaryTickDecoder, encode_packet, write_frames, read_frames, QUOTE_MODE, LTP_MODE
+from live.websocket_stream import WebSocketTickStreamer, SmartWebSocketV2
+from utils.exchange_mapper import map_to_angel_exchange_type
+
+DEFAULT_CSV = project_root / "live_ticks_20251003_154716.csv"
+DEFAULT_FIXTURE = project_root / "scripts" / "fixtures" / "smartapi_recorded_frames.bin"
+SYNTHETIC_FIXTURE = project_root / "scripts" / "fixtures" / "smartapi_quote_frames.bin"
+FIXTURE_TOKEN = "54452"
+FIXTURE_SYMBOL = "NIFTY07OCT2524800CE"
+
+
+def build_fixture(csv_file: Path, fixture: Path, limit: int = 1000) -> int:
+    """Encode recorded ticks (timestamp, price, volume) as Quote packets, plus a few LTP packets."""
+    exchange_type = map_to_angel_exchange_type("NFO")
+    frames = []
+    with open(csv_file, newline='') as f:
+        for seq, row in enumerate(csv.DictReader(f), start=1):
+            if seq > limit:
+                break
+            ts_ms = int(datetime.fromisoformat(row['timestamp']).timestamp() * 1000)
+            mode = LTP_MODE if seq % 50 == 0 else QUOTE_MODE
+            frames.append(encode_packet(mode, exchange_type, FIXTURE_TOKEN, seq, ts_ms,
+                                        int(round(float(row['price']) * 100)),
+                                        last_traded_quantity=int(float(row['volume'])),
+                                        volume_for_day=seq * 75))
+    fixture.parent.mkdir(parents=True, exist_ok=True)
+    return write_frames(str(fixture), frames)
+
+
+class LegacyDecoder:
+    """
+    The dict path exactly as live runs it with binary_decode off: SmartWebSocketV2's
+    own _parse_binary_data, then the real WebSocketTickStreamer._on_data.
+    """
+
+    def __init__(self, token_symbols: dict):
+        symbol_tokens = [{"symbol": symbol, "token": token, "exchange": "NFO"}
+                         for token, symbol in token_symbols.items()]
+        self.streamer = WebSocketTickStreamer("", "", "", symbol_tokens, on_tick=self._capture,
+                                              binary_decode=False)
+        # Parser only - SmartWebSocketV2.__init__ opens a logzero file under ./logs
+        self.parser = SmartWebSocketV2.__new__(SmartWebSocketV2)
+        self.tick = None
+
+    def _capture(self, tick, symbol):
+        self.tick = tick
+
+    def decode(self, frame: bytes) -> Tick:
+        self.tick = None
+        self.streamer._on_data(None, self.parser._parse_binary_data(frame))
+        return self.tick
+
+
+def bench(label: str, fn, frames, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for frame in frames:
+            fn(frame)
+        best = min(best, (time.perf_counter_ns() - start) / len(frames))
+    print(f"  {label:<28} {best:8.0f} ns/tick  ({1e9 / best:,.0f} ticks/s)")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SmartWebSocketV2 binary decode microbenchmark")
+    parser.add_argument("--fixture", default=str(DEFAULT_FIXTURE), help="Recorded frame capture")
+    parser.add_argument("--csv", default=str(DEFAULT_CSV), help="Recorded tick CSV for --build-fixture")
+    parser.add_argument("--build-fixture", action="store_true")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if SmartWebSocketV2 is None:
+        print("ERROR: smartapi-python is required (the legacy path runs SmartWebSocketV2's parser)")
+        return 1
+
+    fixture = Path(args.fixture)
+    if args.build_fixture:
+        count = build_fixture(Path(args.csv), SYNTHETIC_FIXTURE)
+        print(f"✓ Wrote {count} synthetic frames to {SYNTHETIC_FIXTURE}")
+    synthetic = not fixture.exists() and fixture == DEFAULT_FIXTURE
+    if synthetic:
+        print(f"⚠ No recorded capture at {fixture} - using the synthetic fixture (indicative only)")
+        fixture = SYNTHETIC_FIXTURE
+
+    frames = list(read_frames(str(fixture)))
+    if not frames:
+        print(f"ERROR: no frames in {fixture}")
+        return 1
+
+    # A capture holds whatever tokens were subscribed; label them by token
+    token_symbols = {FIXTURE_TOKEN: FIXTURE_SYMBOL}
+    for frame in frames:
+        token = frame[2:27].split(b'\x00', 1)[0].decode('ascii')
+        token_symbols.setdefault(token, token)
+    decoder = BinaryTickDecoder(token_symbols)
+    legacy_decoder = LegacyDecoder(token_symbols)
+    logging.getLogger("live.websocket_stream").setLevel(logging.ERROR)  # _on_data's one-off debug lines
+
+    # Both paths must agree on every field the trading path uses
+    for frame in frames:
+        a, b = legacy_decoder.decode(frame), decoder.decode(frame)
+        if a is None or (a.price, a.volume, a.symbol_id, a.symbol, a.exchange_ts_ns, a.last_trade_ts_ns) != \
+                (b.price, b.volume, b.symbol_id, b.symbol, b.exchange_ts_ns, b.last_trade_ts_ns):
+            print(f"ERROR: decode mismatch\n  legacy: {a!r}\n  fast:   {b!r}")
+            return 1
+
+    print("=" * 80)
+    print(f"WEBSOCKET DECODE BENCHMARK - {len(frames)} frames from {fixture.name}"
+          f"{' (synthetic)' if synthetic else ''}, best of {args.repeat}")
+    print("=" * 80)
+    print("  ✓ legacy and fast path agree on price/volume/token/symbol/exchange time for every frame")
+    legacy = bench("legacy (_on_data dict path)", legacy_decoder.decode, frames, args.repeat)
+    fast = bench("fast (struct -> Tick)", decoder.decode, frames, args.repeat)
+    print(f"  speedup: {legacy / fast:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""
+Forward test a basket of instruments through live.tick_router.TickRouter and
+write per-symbol + portfolio results.
+
+Instruments come from a JSON list or a CSV (symbol, token[, exchange, instrument_type,
+capital]) or repeated --instrument SYMBOL:TOKEN[:EXCHANGE]. Capital is NOT pooled:
+capital.initial_capital is split evenly across the symbols (an instrument's
+'capital' column overrides its share) and each symbol trades only its share.
+
+Tick sources:
+  (default)   seeded synthetic ticks per instrument (utils.tick_generator, 09:30-14:30 IST),
+              merged in time order and routed in-process - no broker login
+  --source    tick CSV with timestamp, price, volume and symbol or token columns
+  --live      SmartAPI login (PIN/TOTP from config, else saved session) and one
+              WebSocket connection per MAX_TOKENS_PER_CONNECTION tokens; runs for
+              --duration seconds or until Ctrl+C. Simulation only - no orders sent.
+
+Replays run on a ReplayClock advanced to each tick's time, so session checks see
+the data's times whatever the wall clock says.
+
+Writes results/tick_router_<timestamp>_trades.csv (every trade, tagged with its
+symbol) and results/tick_router_<timestamp>_summary.json (per-symbol capital,
+P&L, trades + the portfolio snapshot).
+
+Usage:
+    python scripts/run_tick_router.py --instruments basket.csv [--ticks 20000]
+    python scripts/run_tick_router.py --instrument NIFTY25JAN23500CE:43512 --instrument BANKNIFTY25JAN50000CE:43620
+    python scripts/run_tick_router.py --instruments basket.json --source ticks.csv
+    python scripts/run_tick_router.py --instruments basket.json --live --duration 3600
+"""
+import sys
+import csv
+import json
+import time
+import heapq
+import argparse
+from pathlib import Path
+from datetime import datetime
+
+# Add project root and myQuant to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "myQuant"))
+
+from config.defaults import DEFAULT_CONFIG
+from core.tick import Tick
+from live.tick_router import TickRouter
+from utils.config_helper import create_config_from_defaults, freeze_config
+from utils.time_utils import IST, ReplayClock, WallClock, normalize_datetime_to_ist, set_clock
+
+
+def load_instruments(path: str, specs) -> list:
+    """Instrument dicts from a JSON list / CSV file and SYMBOL:TOKEN[:EXCHANGE] specs."""
+    instruments = []
+    if path:
+        if path.endswith('.json'):
+            with open(path) as f:
+                instruments.extend(json.load(f))
+        else:
+            with open(path, newline='') as f:
+                for row in csv.DictReader(f):
+                    inst = {k: v for k, v in row.items() if v not in (None, '')}
+                    if 'capital' in inst:
+                        inst['capital'] = float(inst['capital'])
+                    instruments.append(inst)
+    for spec in specs or []:
+        parts = spec.split(':')
+        if len(parts) < 2:
+            raise ValueError(f"--instrument expects SYMBOL:TOKEN[:EXCHANGE], got '{spec}'")
+        inst = {'symbol': parts[0], 'token': parts[1]}
+        if len(parts) > 2:
+            inst['exchange'] = parts[2]
+        instruments.append(inst)
+    return instruments
+
+
+def csv_ticks(path: str, instruments: list):
+    """Ticks from a multi-symbol CSV (timestamp, price, volume, symbol or token)."""
+    by_token = {str(i['token']): str(i.get('symbol') or i['token']) for i in instruments}
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            symbol = row.get('symbol') or by_token.get(str(row.get('token')))
+            ts = normalize_datetime_to_ist(datetime.fromisoformat(row['timestamp']))
+            ts_ns = int(ts.timestamp() * 1e9)
+            yield Tick(timestamp=ts, price=float(row['price']), volume=int(float(row.get('volume') or 0)),
+                       symbol=symbol, ts_ns=ts_ns, exchange_ts_ns=ts_ns)
+
+
+def synthetic_ticks(instruments: list, count: int, seed: int):
+    """Seeded synthetic in-session ticks per instrument, merged in time order."""
+    from utils.tick_generator import SyntheticTickGenerator, SyntheticTickSpec
+    streams = [SyntheticTickGenerator(SyntheticTickSpec(ticks_per_day=count, session_start="09:30",
+                                                        session_end="14:30", seed=seed + n))
+               .ticks(symbol=str(i.get('symbol') or i['token']))
+               for n, i in enumerate(instruments)]
+    return heapq.merge(*streams, key=lambda t: t.ts_ns)
+
+
+def replay(router: TickRouter, ticks, max_backlog: int) -> int:
+    """Route ticks in-process on a ReplayClock; waits for workers instead of dropping ticks."""
+    clock = ReplayClock()
+    set_clock(clock)
+    routed = 0
+    try:
+        for tick in ticks:
+            clock.advance(tick.timestamp)
+            while router.backlog() >= max_backlog:
+                time.sleep(0.0005)
+            router.route(tick)
+            routed += 1
+        while router.backlog():
+            time.sleep(0.001)
+        router.stop("Replay Complete")
+    finally:
+        set_clock(WallClock())
+    return routed
+
+
+def live_session_info(config) -> dict:
+    """SmartAPI session for the router's streams (as BrokerAdapter._connect_with_retry logs in)."""
+    from live.login import SmartAPISessionManager
+    live = config['live']
+    if not live.get('api_key') or not live.get('client_code'):
+        raise ValueError("SmartAPI credentials missing: api_key and client_code required")
+    if live.get('pin') and live.get('totp_secret'):
+        return SmartAPISessionManager(live['api_key'], live['client_code'],
+                                      live['pin'], live['totp_secret']).login()
+    session_info = SmartAPISessionManager(live['api_key'], live['client_code'], "", "").load_session()
+    if not session_info:
+        raise RuntimeError("No saved session found and PIN/TOTP not provided. Please provide credentials or run interactive login.")
+    return session_info
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-instrument forward test via TickRouter")
+    parser.add_argument("--instruments", default=None, help="JSON list or CSV (symbol, token[, exchange, instrument_type, capital])")
+    parser.add_argument("--instrument", action="append", help="SYMBOL:TOKEN[:EXCHANGE] (repeatable)")
+    parser.add_argument("--source", default=None, help="Tick CSV (timestamp, price, volume, symbol|token)")
+    parser.add_argument("--ticks", type=int, default=20000, help="Synthetic ticks per instrument")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--live", action="store_true", help="Stream live from SmartAPI (simulation only)")
+    parser.add_argument("--duration", type=float, default=0, help="Live run length in seconds (0 = until Ctrl+C)")
+    parser.add_argument("--capital", type=float, default=None,
+                        help=f"Total capital split evenly across symbols "
+                             f"(default capital.initial_capital = {DEFAULT_CONFIG['capital']['initial_capital']:,.0f})")
+    parser.add_argument("--workers", type=int, default=None, help="live.router_workers override")
+    parser.add_argument("--output-dir", default=str(project_root / "results"))
+    args = parser.parse_args()
+
+    instruments = load_instruments(args.instruments, args.instrument)
+    if not instruments:
+        print("ERROR: no instruments - pass --instruments FILE or --instrument SYMBOL:TOKEN")
+        return 1
+
+    config = create_config_from_defaults()
+    if args.capital is not None:
+        config['capital']['initial_capital'] = args.capital
+    if args.workers is not None:
+        config['live']['router_workers'] = args.workers
+    config = freeze_config(config)
+
+    router = TickRouter(config, instruments)
+    total = config['capital']['initial_capital']
+    print("=" * 80)
+    print(f"TICK ROUTER - {len(router.workers)} symbols on {router.num_workers} workers, "
+          f"₹{total:,.0f} split evenly (not pooled)")
+    print("=" * 80)
+
+    router.start()
+    started = time.perf_counter()
+    if args.live:
+        router.start_streams(live_session_info(config))
+        try:
+            while not args.duration or time.perf_counter() - started < args.duration:
+                time.sleep(1.0)
+        except KeyboardInterrupt:
+            print("Interrupted - stopping router")
+        router.stop("Session Stopped")
+        routed = sum(w.tick_count for w in router.workers)
+    else:
+        ticks = csv_ticks(args.source, instruments) if args.source else \
+            synthetic_ticks(instruments, args.ticks, args.seed)
+        routed = replay(router, ticks, max(1, config['live']['router_queue_size'] // 2))
+    elapsed = time.perf_counter() - started
+
+    prefix = f"tick_router_{datetime.now(IST).strftime('%Y%m%d_%H%M%S')}"
+    paths = router.export_results(args.output_dir, prefix=prefix)
+    status = router.get_status()
+    for symbol, s in status['symbols'].items():
+        worker = next(w for w in router.workers if w.symbol == symbol)
+        pnl = sum(t.net_pnl for t in worker.position_manager.completed_trades)
+        print(f"  {symbol:<28} ticks {s['ticks']:>9,}  trades {len(worker.position_manager.completed_trades):>4}  "
+              f"P&L ₹{pnl:>12,.2f}  errors {s['errors']}")
+    p = status['portfolio']
+    print(f"  {'PORTFOLIO':<28} ticks {routed:>9,}  trades {p['total_trades']:>4}  "
+          f"P&L ₹{p['realized_pnl']:>12,.2f}  return {p['total_return_percent']:.2f}%  ({elapsed:.1f}s)")
+    if status['dropped_ticks'] or status['unrouted_ticks']:
+        print(f"  dropped {status['dropped_ticks']:,}  unrouted {status['unrouted_ticks']:,}")
+    print(f"✓ Trades saved: {paths['trades']}")
+    print(f"✓ Summary saved: {paths['summary']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
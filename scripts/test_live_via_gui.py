@@ -37,6 +37,9 @@ def main():
     parser.add_argument('--no-pre', action='store_true', help='Disable pre-convergence instrumentation')
     parser.add_argument('--no-post', action='store_true', help='Disable post-convergence instrumentation')
     parser.add_argument('--no-auto-stop', action='store_true', help='Do not auto-stop after target ticks')
+    parser.add_argument('--trace', action='store_true', help='Write per-tick spans as Chrome Trace JSON (results/trace_*.json)')
+    parser.add_argument('--profile', action='store_true', help='Sample thread stacks and write folded stacks (results/profile_*.folded)')
+    parser.add_argument('--alloc-audit', action='store_true', help='tracemalloc allocation audit per tick (results/alloc_audit_*.json)')
     
     args = parser.parse_args()
     
@@ -55,7 +58,10 @@ def main():
         target_ticks=args.ticks,
         enable_pre=not args.no_pre,
         enable_post=not args.no_post,
-        auto_stop=not args.no_auto_stop
+        auto_stop=not args.no_auto_stop,
+        trace=args.trace,
+        profile=args.profile,
+        alloc_audit=args.alloc_audit
     )
     print(f"✓ Performance testing enabled - hook will inject into GUI workflow\n")
     
@@ -0,0 +1,198 @@
+"""
+Live path load test against the local SmartAPI WebSocket stand-in.
+
+Starts ReplayServer (scripts/ws_replay_server.py) on localhost, points BrokerAdapter
+at it (live.ws_url) and measures, per tick, the time from the server's send to:
+  callback - BrokerAdapter on_tick_callback returned (LiveTrader._on_tick_direct with --trader)
+  polling  - tick dequeued by a get_next_tick() consumer thread and, with --trader,
+             run through LiveTrader._process_polled_tick (the polling loop's own
+             per-tick code: session check, strategy, entries/exits, TP/SL/trailing)
+
+With --trader the ticks run on a ReplayClock advanced to each packet's exchange
+time (as scripts/alloc_audit.py does), so session checks see the data's times
+whatever the wall clock says; the default synthetic stream is then one in-session
+day (utils.tick_generator, 09:30-14:30 IST) instead of untimed packets.
+
+Deliveries are matched to sends by the packet sequence number (Tick.seq), so
+reconnects, evictions and lost frames never shift the match.
+
+Reports end-to-end latency percentiles, throughput and dropped ticks
+(sent but never delivered - queue evictions, ticks lost on injected disconnects).
+
+Needs the smartapi + websocket-client packages (same as live trading); no broker login.
+
+Usage:
+    python scripts/ws_load_test.py --rate 10000 --burst 10 --ticks 100000
+    python scripts/ws_load_test.py --source live_ticks_20251003_154716.csv --token 54452 --trader
+    python scripts/ws_load_test.py --mode polling --rate 20000 --disconnect-after 5000
+"""
+import sys
+import json
+import time
+import argparse
+import threading
+from pathlib import Path
+from datetime import datetime
+
+# Add project root and myQuant to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "myQuant"))
+
+from utils.benchmark import local_feed_config, percentiles_us
+from utils.time_utils import IST, ReplayClock, WallClock, set_clock
+from live.broker_adapter import BrokerAdapter
+from live.smartapi_binary import QUOTE_MODE, LTP_MODE
+from ws_replay_server import ReplayServer, load_source
+from alloc_audit import synthetic_frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live path load test against a local WebSocket replay server")
+    parser.add_argument("--source", default=None, help="Tick CSV or .bin frame recording (default: synthetic)")
+    parser.add_argument("--ticks", type=int, default=50000, help="Synthetic tick count")
+    parser.add_argument("--rate", type=float, default=10000, help="Ticks per second")
+    parser.add_argument("--burst", type=int, default=1, help="Packets sent back-to-back per interval")
+    parser.add_argument("--ltp", action="store_true", help="LTP packets instead of Quote (CSV / synthetic without --trader)")
+    parser.add_argument("--token", default="99926000")
+    parser.add_argument("--exchange", default="NFO")
+    parser.add_argument("--mode", choices=["callback", "polling"], default="callback")
+    parser.add_argument("--trader", action="store_true",
+                        help="Run ticks through LiveTrader's per-tick path for --mode (strategy + positions)")
+    parser.add_argument("--disconnect-after", type=int, default=0, help="Drop the connection after N ticks")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    if args.trader and not args.source:
+        frames = synthetic_frames(args.ticks, args.token)  # In-session exchange times for the trader
+    else:
+        frames = load_source(args.source, token=args.token, mode=LTP_MODE if args.ltp else QUOTE_MODE,
+                             synthetic_ticks=args.ticks)
+    server = ReplayServer(frames, rate=args.rate, burst=args.burst,
+                          disconnect_after=args.disconnect_after, start_delay=0.5).start()
+    config = local_feed_config(args.token, args.exchange, ws_url=server.url)
+
+    broker = BrokerAdapter(config)
+    trader = None
+    clock = None
+    if args.trader:
+        from live.trader import LiveTrader
+        trader = LiveTrader(frozen_config=config, broker=broker)
+        trader.prepare_session()  # start() would log in and run its own loop
+        clock = ReplayClock()
+        set_clock(clock)  # After BrokerAdapter(), which installs its own (wall) clock
+
+    def replay_time(tick):
+        # Decoders stamp tick.timestamp from the clock before it reaches here - restamp with exchange time
+        tick.timestamp = clock.advance(datetime.fromtimestamp(tick.exchange_ts_ns / 1e9, IST))
+
+    # Each packet carries its send sequence number; server.sent_ns is keyed on it
+    latencies_ns = []
+    sent_ns = server.sent_ns
+
+    def delivered(tick):
+        sent = sent_ns.get(tick.seq)
+        if sent is not None:
+            latencies_ns.append(time.perf_counter_ns() - sent)
+
+    def deliver_direct(tick, symbol):
+        if trader is not None:
+            replay_time(tick)
+            trader._on_tick_direct(tick, symbol)
+        delivered(tick)
+
+    callback = deliver_direct if args.mode == "callback" else None
+
+    session_info = {'feed_token': "LOCAL", 'jwt_token': "LOCAL"}
+    broker._initialize_websocket_streaming(session_info, on_tick_callback=callback)
+    if not broker.streaming_mode:
+        print("ERROR: WebSocket streaming did not start (smartapi / websocket-client installed?)")
+        server.stop()
+        set_clock(WallClock())
+        return 1
+
+    consumer_stop = threading.Event()
+    trader_ended_at = []  # Tick count at which the trader's session ended (session end / NaN streak)
+
+    def consume():
+        polled = 0
+        while not consumer_stop.is_set():
+            tick = broker.get_next_tick()
+            if tick is None:
+                time.sleep(0.0001)
+                continue
+            polled += 1
+            if trader is not None and not trader_ended_at:
+                replay_time(tick)
+                # The live polling loop would stop here; keep draining to measure delivery
+                if not trader._process_polled_tick(tick, polled, None):
+                    trader_ended_at.append(polled)
+            delivered(tick)
+
+    consumer = None
+    if args.mode == "polling":
+        consumer = threading.Thread(target=consume, name="LoadTestConsumer", daemon=True)
+        consumer.start()
+
+    print("=" * 80)
+    print(f"WS LOAD TEST - {len(frames)} ticks @ {args.rate:,.0f}/s burst {args.burst} "
+          f"({args.mode}{' + LiveTrader' if trader else ''}) -> {server.url}")
+    print("=" * 80)
+    started = time.perf_counter()
+    if not server.wait_done(args.timeout):
+        print(f"  WARNING: server still sending after {args.timeout:.0f}s")
+    send_elapsed = time.perf_counter() - started
+    time.sleep(1.0)  # let in-flight ticks land
+    consumer_stop.set()
+    if consumer:
+        consumer.join(2.0)
+    broker.ws_streamer.stop_stream()
+    server.stop()
+    set_clock(WallClock())
+
+    sent = len(server.sent_ns)
+    received = len(latencies_ns)
+    wire_received = getattr(broker, '_broker_tick_count', 0)  # ticks BrokerAdapter took off the socket
+    stats = percentiles_us(latencies_ns)
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'source': args.source or f"synthetic:{args.ticks}",
+        'mode': args.mode,
+        'trader': bool(trader),
+        'rate_target': args.rate,
+        'burst': args.burst,
+        'sent': sent,
+        'wire_received': wire_received,
+        'delivered': received,
+        'dropped': sent - received,
+        'broker_queue_evictions': broker.dropped_ticks if args.mode == "polling" else None,
+        'connections': server.connections,
+        'heartbeats': server.heartbeats,
+        'achieved_rate': sent / send_elapsed if send_elapsed else 0.0,
+        'latency_us': stats,
+        'trader_session_ended_at_tick': trader_ended_at[0] if trader_ended_at else None,
+        'trader_trades': len(trader.position_manager.completed_trades) if trader else None,
+    }
+
+    print(f"  sent {sent:,}  wire {wire_received:,}  delivered {received:,}  "
+          f"dropped {sent - received:,}  connections {server.connections}")
+    print(f"  achieved send rate: {report['achieved_rate']:,.0f} ticks/s")
+    if stats:
+        print("  latency (us): " + "  ".join(f"{k} {v:,.1f}" for k, v in stats.items()))
+    if trader:
+        print(f"  replay time -> {clock.now():%Y-%m-%d %H:%M:%S} IST, "
+              f"{len(trader.position_manager.completed_trades)} trades closed")
+    if trader_ended_at:
+        print(f"  WARNING: LiveTrader session ended at tick {trader_ended_at[0]:,} - later ticks skipped the trader")
+
+    results_dir = project_root / "results"
+    results_dir.mkdir(exist_ok=True)
+    out = results_dir / f"ws_load_test_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"✓ Report saved: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
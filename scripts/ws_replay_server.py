@@ -0,0 +1,310 @@
+"""
+scripts/ws_replay_server.py
+
+Local stand-in for the SmartAPI WebSocket (SmartWebSocketV2) used to load-test
+the live tick path without the broker.
+
+Speaks enough of the protocol for WebSocketTickStreamer / SmartWebSocketV2:
+- RFC 6455 handshake on any path (auth headers accepted, not verified)
+- subscribe/unsubscribe JSON messages ({"action": 1|0, "params": {"mode", "tokenList"}})
+- text heartbeat "ping" -> "pong", control ping -> pong, close handshake
+- binary tick packets (live.smartapi_binary layout) for the subscribed tokens
+
+Replay sources: recorded frame files (.bin), recorded tick CSVs (timestamp, price,
+volume) or a synthetic random walk. Pacing: ticks/second with optional bursts
+(N packets back-to-back per interval); 10k+ ticks/s is reachable on localhost.
+Fault injection: drop the connection after N ticks (exercises auto-reconnect).
+
+Every packet carries its send sequence number (packet sequence_number, Tick.seq on
+the client) so a harness can match deliveries to sends across reconnects and drops.
+
+Stdlib only (socket + threading); test tooling, not part of the live package - never
+exposed beyond localhost by default.
+"""
+
+import base64
+import csv
+import hashlib
+import json
+import logging
+import random
+import socket
+import struct
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from live.smartapi_binary import encode_packet, read_frames, QUOTE_MODE
+
+logger = logging.getLogger(__name__)
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_OP_TEXT, _OP_BINARY, _OP_CLOSE, _OP_PING, _OP_PONG = 0x1, 0x2, 0x8, 0x9, 0xA
+_SEQ_OFFSET, _EXCH_TS_OFFSET = 27, 35
+_I64 = struct.Struct('<q')
+
+
+def load_source(path: Optional[str] = None, token: str = "99926000", mode: int = QUOTE_MODE,
+                exchange_type: int = 1, synthetic_ticks: int = 100000, seed: int = 42) -> List[bytes]:
+    """
+    Tick packets to replay.
+
+    path: .bin frame recording, .csv tick file (timestamp, price, volume), or None for a
+    synthetic random walk of `synthetic_ticks` ticks (seeded, reproducible).
+    """
+    if path and path.endswith('.bin'):
+        return list(read_frames(path))
+    frames = []
+    if path:
+        with open(path, newline='') as f:
+            for seq, row in enumerate(csv.DictReader(f), start=1):
+                ts_ms = int(datetime.fromisoformat(row['timestamp']).timestamp() * 1000)
+                frames.append(encode_packet(mode, exchange_type, token, seq, ts_ms,
+                                            int(round(float(row['price']) * 100)),
+                                            last_traded_quantity=int(float(row.get('volume') or 0))))
+        return frames
+    rng = random.Random(seed)
+    price = 200.0
+    for seq in range(1, synthetic_ticks + 1):
+        price = max(0.05, price + rng.gauss(0, 0.25))
+        frames.append(encode_packet(mode, exchange_type, token, seq, 0, int(round(price * 100)),
+                                    last_traded_quantity=75 * rng.randint(1, 4)))
+    return frames
+
+
+class ReplayServer:
+    """
+    Single-process WebSocket replay server.
+
+    Usage:
+        server = ReplayServer(load_source("ticks.csv", token="54452"), rate=10000, burst=10)
+        server.start()                # server.url -> ws://127.0.0.1:<port>
+        ... point WebSocketTickStreamer(ws_url=server.url) at it ...
+        server.wait_done(); server.stop()
+
+    server.sent_ns maps each packet's sequence number (1, 2, ...) to its perf_counter_ns
+    send stamp, so an in-process harness can compute end-to-end latency per Tick.seq.
+    """
+
+    def __init__(self, frames: List[bytes], rate: float = 1000.0, burst: int = 1,
+                 host: str = "127.0.0.1", port: int = 0, disconnect_after: int = 0,
+                 loop: bool = False, start_delay: float = 0.0):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive ticks/s, got {rate}")
+        if burst < 1:
+            raise ValueError(f"burst must be >= 1, got {burst}")
+        if not frames:
+            raise ValueError("ReplayServer requires at least one frame to replay")
+        self.frames = frames
+        self.rate = float(rate)
+        self.burst = int(burst)
+        self.host = host
+        self.port = port
+        self.disconnect_after = int(disconnect_after)
+        self.loop = loop
+        self.start_delay = start_delay
+
+        self.sent_ns: Dict[int, int] = {}
+        self._seq = 0  # last sequence number sent (survives reconnects)
+        self.connections = 0
+        self.subscriptions: List[dict] = []
+        self.heartbeats = 0
+        self.done = threading.Event()
+        self._position = 0  # next frame index (survives reconnects)
+        self._stop = threading.Event()
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/smart-stream"
+
+    # ---- Lifecycle ----
+
+    def start(self) -> "ReplayServer":
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((self.host, self.port))
+        self.port = self._sock.getsockname()[1]
+        self._sock.listen(4)
+        self._sock.settimeout(0.2)
+        self._thread = threading.Thread(target=self._accept_loop, name="ReplayServer", daemon=True)
+        self._thread.start()
+        logger.info(f"ReplayServer listening on {self.url} ({len(self.frames)} frames, "
+                    f"{self.rate:,.0f} ticks/s, burst {self.burst})")
+        return self
+
+    def wait_done(self, timeout: Optional[float] = None) -> bool:
+        return self.done.wait(timeout)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._sock:
+            self._sock.close()
+        if self._thread:
+            self._thread.join(2.0)
+
+    def _accept_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self.connections += 1
+            threading.Thread(target=self._serve, args=(conn,), name="ReplayConn", daemon=True).start()
+
+    # ---- Protocol ----
+
+    def _handshake(self, conn: socket.socket) -> bool:
+        request = b""
+        while b"\r\n\r\n" not in request:
+            chunk = conn.recv(4096)
+            if not chunk:
+                return False
+            request += chunk
+        key = None
+        for line in request.decode('latin-1').split("\r\n")[1:]:
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "sec-websocket-key":
+                key = value.strip()
+        if not key:
+            conn.sendall(b"HTTP/1.1 400 Bad Request\r\n\r\n")
+            return False
+        accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode()).digest()).decode()
+        conn.sendall(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+        return True
+
+    @staticmethod
+    def _frame(opcode: int, payload: bytes) -> bytes:
+        n = len(payload)
+        if n < 126:
+            header = struct.pack('!BB', 0x80 | opcode, n)
+        elif n < 65536:
+            header = struct.pack('!BBH', 0x80 | opcode, 126, n)
+        else:
+            header = struct.pack('!BBQ', 0x80 | opcode, 127, n)
+        return header + payload
+
+    @staticmethod
+    def _recv_exact(conn: socket.socket, n: int) -> bytes:
+        data = b""
+        while len(data) < n:
+            chunk = conn.recv(n - len(data))
+            if not chunk:
+                raise ConnectionError("client closed")
+            data += chunk
+        return data
+
+    def _read_message(self, conn: socket.socket):
+        b0, b1 = self._recv_exact(conn, 2)
+        opcode, length = b0 & 0x0F, b1 & 0x7F
+        if length == 126:
+            length = struct.unpack('!H', self._recv_exact(conn, 2))[0]
+        elif length == 127:
+            length = struct.unpack('!Q', self._recv_exact(conn, 8))[0]
+        mask = self._recv_exact(conn, 4) if b1 & 0x80 else None
+        payload = self._recv_exact(conn, length)
+        if mask:
+            payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        return opcode, payload
+
+    def _serve(self, conn: socket.socket) -> None:
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        send_lock = threading.Lock()
+        subscribed = threading.Event()
+        closed = threading.Event()
+        try:
+            if not self._handshake(conn):
+                return
+        except OSError:
+            conn.close()
+            return
+
+        def send(opcode: int, payload: bytes) -> None:
+            with send_lock:
+                conn.sendall(self._frame(opcode, payload))
+
+        def reader() -> None:
+            try:
+                while not closed.is_set():
+                    opcode, payload = self._read_message(conn)
+                    if opcode == _OP_TEXT:
+                        text = payload.decode('utf-8', 'replace')
+                        if text == "ping":
+                            self.heartbeats += 1
+                            send(_OP_TEXT, b"pong")
+                            continue
+                        try:
+                            msg = json.loads(text)
+                        except ValueError:
+                            continue
+                        self.subscriptions.append(msg)
+                        if msg.get("action") == 1:
+                            subscribed.set()
+                    elif opcode == _OP_PING:
+                        send(_OP_PONG, payload)
+                    elif opcode == _OP_CLOSE:
+                        send(_OP_CLOSE, payload[:2])
+                        break
+            except (OSError, ConnectionError, ValueError):
+                pass
+            closed.set()
+
+        threading.Thread(target=reader, name="ReplayReader", daemon=True).start()
+        try:
+            while not subscribed.wait(0.1):
+                if closed.is_set() or self._stop.is_set():
+                    return
+            if self.start_delay:
+                time.sleep(self.start_delay)
+            self._stream(conn, send_lock, closed)
+        except OSError:
+            pass
+        finally:
+            closed.set()
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    def _stream(self, conn: socket.socket, send_lock: threading.Lock, closed: threading.Event) -> None:
+        interval_ns = int(self.burst * 1e9 / self.rate)
+        next_ns = time.perf_counter_ns()
+        sent_this_conn = 0
+        frames, total = self.frames, len(self.frames)
+        while not closed.is_set() and not self._stop.is_set():
+            batch = []
+            for _ in range(self.burst):
+                if self._position >= total:
+                    if not self.loop:
+                        break
+                    self._position = 0
+                packet = bytearray(frames[self._position])
+                self._seq += 1
+                _I64.pack_into(packet, _SEQ_OFFSET, self._seq)
+                _I64.pack_into(packet, _EXCH_TS_OFFSET, time.time_ns() // 1_000_000)
+                batch.append((self._seq, self._frame(_OP_BINARY, bytes(packet))))
+                self._position += 1
+            if not batch:
+                self.done.set()
+                return
+            with send_lock:
+                for seq, frame in batch:
+                    self.sent_ns[seq] = time.perf_counter_ns()
+                    conn.sendall(frame)
+            sent_this_conn += len(batch)
+            if self.disconnect_after and sent_this_conn >= self.disconnect_after:
+                logger.info(f"ReplayServer: injected disconnect after {sent_this_conn} ticks")
+                conn.shutdown(socket.SHUT_RDWR)
+                return
+            # Pace to the schedule (sleep for the coarse part, spin the last ~0.2 ms)
+            next_ns += interval_ns
+            remaining = next_ns - time.perf_counter_ns()
+            if remaining > 300_000:
+                time.sleep((remaining - 200_000) / 1e9)
+            while time.perf_counter_ns() < next_ns:
+                pass